@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Benchmark the vectorized cost anomaly engine against the previous detector.
+
+The previous detector built per-day dicts, ran ``statistics.stdev`` over
+the tenancy total only, and sorted per-day dicts for root causes. The
+engine builds a (day x service) matrix once and scores every service and
+the total against rolling baselines.
+
+Usage:
+    python scripts/benchmark_cost_anomalies.py
+    python scripts/benchmark_cost_anomalies.py --days 365 --services 200 --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mcp_server_oci.tools.cost.anomaly import CostMatrix, detect_cost_anomalies  # noqa: E402
+
+
+def make_items(
+    days: int, services: int, seed: int = 7
+) -> tuple[list[SimpleNamespace], set[tuple[int, int]]]:
+    """Synthetic DAILY usage items grouped by service, with a weekend uplift.
+
+    Returns:
+        Tuple of (items, injected spikes as (day, service) positions)
+    """
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    base = rng.lognormal(mean=3.0, sigma=1.0, size=services)
+    weekly = 1.0 + 0.2 * (np.arange(days) % 7 >= 5)[:, None]
+    costs = base * weekly * rng.normal(1.0, 0.05, size=(days, services))
+    spikes = rng.integers(0, days, size=services // 10)
+    spiked = rng.integers(0, services, size=spikes.size)
+    costs[spikes, spiked] *= 6
+    items = [
+        SimpleNamespace(
+            time_usage_started=start + timedelta(days=d),
+            service=f"service-{s:03d}",
+            computed_amount=float(costs[d, s]),
+        )
+        for d in range(days)
+        for s in range(services)
+    ]
+    return items, set(zip(spikes.tolist(), spiked.tolist(), strict=True))
+
+
+def legacy_detect(items: list, threshold: float, top_n: int) -> list[dict]:
+    """Previous tenancy-total z-score detector (dict-per-day, statistics.stdev)."""
+    # Group by date
+    daily_costs = {}
+    daily_services = {}
+
+    for item in items:
+        cost = float(item.computed_amount or 0)
+        service = item.service or "Unknown"
+
+        if item.time_usage_started:
+            date = item.time_usage_started.strftime("%Y-%m-%d")
+
+            if date in daily_costs:
+                daily_costs[date] += cost
+            else:
+                daily_costs[date] = cost
+                daily_services[date] = {}
+
+            if service in daily_services[date]:
+                daily_services[date][service] += cost
+            else:
+                daily_services[date][service] = cost
+
+    if len(daily_costs) < 3:
+        return []
+
+    # Calculate statistics
+    costs = list(daily_costs.values())
+    mean = statistics.mean(costs)
+    stdev = statistics.stdev(costs) if len(costs) > 1 else 0
+
+    if stdev == 0:
+        return []
+
+    anomalies = []
+    for date, cost in daily_costs.items():
+        z_score = (cost - mean) / stdev
+
+        if z_score > threshold:
+            deviation_pct = ((cost - mean) / mean) * 100 if mean > 0 else 0
+
+            # Determine severity
+            if z_score > 4:
+                severity = "critical"
+            elif z_score > 3:
+                severity = "high"
+            elif z_score > 2.5:
+                severity = "medium"
+            else:
+                severity = "low"
+
+            # Get top contributing services
+            services = daily_services.get(date, {})
+            contributors = sorted(
+                services.items(),
+                key=lambda x: x[1],
+                reverse=True
+            )[:3]
+
+            anomalies.append({
+                "date": date,
+                "cost": cost,
+                "expected_cost": mean,
+                "deviation_percent": deviation_pct,
+                "severity": severity,
+                "root_cause": {
+                    "contributors": [
+                        {"service": s, "increase": c}
+                        for s, c in contributors
+                    ]
+                }
+            })
+
+    # Sort by severity and return top N
+    severity_order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+    anomalies.sort(key=lambda x: (severity_order.get(x["severity"], 4), -x["cost"]))
+
+    return anomalies[:top_n]
+
+
+def _time(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--services", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    items, spikes = make_items(args.days, args.services)
+    print(f"{len(items):,} items ({args.days} days x {args.services} services)\n")
+
+    legacy = _time(lambda: legacy_detect(items, threshold=2.0, top_n=50), args.repeat)
+    matrix = _time(lambda: CostMatrix.from_items(items), args.repeat)
+    m = CostMatrix.from_items(items)
+    rows = [("previous detector (total only)", legacy), ("matrix build", matrix)]
+    for method, weekday in (("median", False), ("median", True), ("ewma", False)):
+        elapsed = _time(
+            lambda method=method, weekday=weekday: detect_cost_anomalies(
+                m, threshold=3.0, method=method, by_weekday=weekday, top_n=50
+            ),
+            args.repeat,
+        )
+        label = f"engine {method}{' by weekday' if weekday else ''} (all services + total)"
+        rows.append((label, elapsed))
+
+    width = max(len(label) for label, _ in rows)
+    for label, elapsed in rows:
+        print(f"{label:<{width}}  {elapsed * 1000:9.1f} ms")
+
+    # The default (weekday-adjusted median) must find every injected spike
+    # that has a full baseline window behind it, without flagging the
+    # weekend uplift
+    found = detect_cost_anomalies(m, threshold=3.0, top_n=None)
+    index = {name: i for i, name in enumerate(m.services)}
+    flagged = {
+        ((date.fromisoformat(a["date"]) - m.start).days, index[a["service"]])
+        for a in found["services"]
+    }
+    expected = {(d, s) for d, s in spikes if d >= 28}
+    missed = expected - flagged
+    print(f"\nengine median: {len(found['services'])} service anomalies, "
+          f"{len(found['total'])} total anomalies, "
+          f"{len(expected) - len(missed)}/{len(expected)} injected spikes recovered")
+    assert not missed, f"missed injected spikes (day, service): {sorted(missed)}"
+    cells = args.days * args.services
+    assert len(flagged) <= len(expected) + 0.005 * cells, "weekly cycle flagged as anomalies"
+
+
+if __name__ == "__main__":
+    main()
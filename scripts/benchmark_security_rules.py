@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Benchmark the indexed security rule engine against linear rule scans.
+
+The previous analyzer walked every ingress rule dict and compared it with
+a fixed list of TCP ports; it had no redundancy or reachability checks.
+For those, the baseline here is the straightforward scan: every rule pair
+for redundancy (per list), every rule per reachability query.
+
+Usage:
+    python scripts/benchmark_security_rules.py
+    python scripts/benchmark_security_rules.py --rules 50000 --lists 250 --queries 2000
+"""
+from __future__ import annotations
+
+import argparse
+import ipaddress
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mcp_server_oci.tools.network.rules import RuleTable  # noqa: E402
+
+RISKY_SOURCES = ["0.0.0.0/0", "::/0"]
+RISKY_PORTS = [22, 3389, 1521, 3306, 5432, 27017]
+
+
+def make_owners(rules: int, lists: int, seed: int = 11) -> list[dict]:
+    """Synthetic security lists with nested CIDRs, mixed protocols and ports."""
+    rng = np.random.default_rng(seed)
+    per_list = max(1, rules // lists)
+    owners = []
+    for i in range(lists):
+        items = []
+        for _ in range(per_list):
+            prefix = int(rng.choice([0, 8, 16, 24, 32], p=[0.05, 0.15, 0.3, 0.3, 0.2]))
+            address = int(rng.integers(0, 1 << 32)) >> (32 - prefix) << (32 - prefix) \
+                if prefix else 0
+            cidr = f"{ipaddress.IPv4Address(address)}/{prefix}"
+            protocol = str(rng.choice(["6", "17", "all", "1"], p=[0.6, 0.2, 0.1, 0.1]))
+            port = int(rng.choice([22, 80, 443, 1521, 3306, 8080, int(rng.integers(1024, 65535))]))
+            width = int(rng.choice([0, 0, 0, 10, 1000]))
+            rule = {
+                "direction": "INGRESS" if rng.random() < 0.8 else "EGRESS",
+                "protocol": protocol,
+                "is_stateless": False,
+            }
+            side = "source" if rule["direction"] == "INGRESS" else "destination"
+            rule[side] = cidr
+            rule[f"{side}_type"] = "CIDR_BLOCK"
+            if protocol in ("6", "17"):
+                key = "tcp_options" if protocol == "6" else "udp_options"
+                rule[key] = {"destination_port_range": {
+                    "min": port, "max": min(port + width, 65535)
+                }}
+            items.append(rule)
+        owners.append({"id": f"ocid1.securitylist.{i}", "display_name": f"sl-{i}",
+                       "rules": items})
+    return owners
+
+
+def legacy_exposure(owners: list[dict]) -> int:
+    """Previous analyzer: linear scan of TCP destination ports only."""
+    found = 0
+    for owner in owners:
+        for rule in owner["rules"]:
+            if rule["direction"] != "INGRESS" or rule.get("source") not in RISKY_SOURCES:
+                continue
+            found += 1
+            port_range = (rule.get("tcp_options") or {}).get("destination_port_range", {})
+            if port_range:
+                for port in RISKY_PORTS:
+                    if port_range["min"] <= port <= port_range["max"]:
+                        break
+    return found
+
+
+def _interval(rule: dict) -> tuple[int, int, int, int, str, str]:
+    side = "source" if rule["direction"] == "INGRESS" else "destination"
+    net = ipaddress.ip_network(rule[side])
+    options = rule.get("tcp_options") or rule.get("udp_options") or {}
+    ports = options.get("destination_port_range", {"min": 0, "max": 65535})
+    return (int(net.network_address), int(net.broadcast_address), ports["min"], ports["max"],
+            rule["protocol"], rule["direction"])
+
+
+def scan_redundant(owners: list[dict]) -> int:
+    """All-pairs coverage check inside each list."""
+    found = 0
+    for owner in owners:
+        parsed = [_interval(r) for r in owner["rules"]]
+        for a, (alo, ahi, aplo, aphi, aproto, adir) in enumerate(parsed):
+            for b, (blo, bhi, bplo, bphi, bproto, bdir) in enumerate(parsed):
+                if a == b or adir != bdir or bproto not in ("all", aproto):
+                    continue
+                if blo <= alo and bhi >= ahi and bplo <= aplo and bphi >= aphi:
+                    found += 1
+                    break
+    return found
+
+
+def scan_reachable(parsed: list[tuple], port: int, lo: int, hi: int) -> int:
+    return sum(
+        1 for rlo, rhi, plo, phi, proto, direction in parsed
+        if direction == "INGRESS" and proto in ("all", "6")
+        and plo <= port <= phi and rlo <= hi and rhi >= lo
+    )
+
+
+def _time(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rules", type=int, default=20000)
+    parser.add_argument("--lists", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    owners = make_owners(args.rules, args.lists)
+    total = sum(len(o["rules"]) for o in owners)
+    print(f"{total:,} rules in {len(owners)} security lists\n")
+
+    rng = np.random.default_rng(5)
+    queries = []
+    for _ in range(args.queries):
+        prefix = int(rng.choice([16, 24, 32]))
+        address = int(rng.integers(0, 1 << 32)) >> (32 - prefix) << (32 - prefix)
+        queries.append((int(rng.choice([22, 443, 1521, 8080])),
+                        f"{ipaddress.IPv4Address(address)}/{prefix}"))
+
+    table = RuleTable.build(owners)
+    parsed = [_interval(r) for o in owners for r in o["rules"]]
+    query_ranges = [
+        (port, int(ipaddress.ip_network(c).network_address),
+         int(ipaddress.ip_network(c).broadcast_address))
+        for port, c in queries
+    ]
+
+    def engine_queries() -> None:
+        # limit=0: count matches like the linear scan, without describing rules
+        for port, cidr in queries:
+            table.reachable(port, cidr, limit=0)
+
+    def fresh_exposure() -> None:
+        RuleTable.build(owners).exposed()
+
+    rows = [
+        ("previous analyzer (TCP exposure only)", _time(lambda: legacy_exposure(owners),
+                                                        args.repeat)),
+        ("engine build", _time(lambda: RuleTable.build(owners), args.repeat)),
+        ("engine build + exposure (TCP + UDP)", _time(fresh_exposure, args.repeat)),
+        ("engine redundant rules", _time(table.redundant, args.repeat)),
+        ("all-pairs redundant scan", _time(lambda: scan_redundant(owners), 1)),
+        (f"engine {len(queries)} reachability queries", _time(engine_queries, args.repeat)),
+        (f"linear {len(queries)} reachability queries", _time(
+            lambda: [scan_reachable(parsed, p, lo, hi) for p, lo, hi in query_ranges], 1
+        )),
+    ]
+
+    width = max(len(label) for label, _ in rows)
+    for label, elapsed in rows:
+        print(f"{label:<{width}}  {elapsed * 1000:9.1f} ms")
+
+    print(f"\nengine: {len(table.exposed())} internet-exposed rules, "
+          f"{len(table.redundant())} redundant rules")
+
+
+if __name__ == "__main__":
+    main()
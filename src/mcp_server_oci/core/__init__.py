@@ -3,13 +3,19 @@ Core infrastructure modules for OCI MCP Server.
 
 This package contains:
 - client: OCI SDK wrapper with async support
+- compartments: Cached, indexed compartment hierarchy
+- concurrency: Bounded fan-out helpers for OCI calls
 - errors: Structured error handling
 - formatters: Response formatting utilities
+- metrics: Batched Monitoring query planner
 - models: Base Pydantic models
 - observability: OCI APM and Logging integration
 - pagination: Pagination utilities
 - cache: High-performance TTL-based caching
 - shared_memory: Inter-agent communication (ATP or in-memory)
+- timeseries: Array-backed metric time series with vectorized stats
+- timestamps: Conversions for SDK timestamps
+- waiters: Shared async lifecycle waiters with backoff
 """
 
 # Cache module
@@ -30,6 +36,13 @@ from .cache import (
     prefetch_compartments,
 )
 from .client import OCIClientManager, get_client_manager, get_oci_client, get_oci_config
+from .compartments import (
+    Compartment,
+    CompartmentTree,
+    compartment_scope,
+    get_compartment_tree,
+)
+from .concurrency import call_oci, gather_bounded, max_concurrency
 from .errors import (
     ErrorCategory,
     OCIError,
@@ -46,6 +59,14 @@ from .formatters import (
     format_response,
     format_success_response,
 )
+from .metrics import (
+    MetricBatch,
+    build_query,
+    fetch_grouped_metric,
+    fetch_metrics,
+    query_series,
+    rank_resources,
+)
 from .models import (
     BaseSkillInput,
     BaseToolInput,
@@ -88,6 +109,9 @@ from .shared_memory import (
     share_finding,
     share_recommendation,
 )
+from .timeseries import TimeSeries
+from .timestamps import epoch_seconds, timestamp_str
+from .waiters import WaitOutcome, report_transitions, wait_for_state
 
 __all__ = [
     # Errors
@@ -128,6 +152,31 @@ __all__ = [
     "get_client_manager",
     "get_oci_client",
     "get_oci_config",
+    # Compartments
+    "Compartment",
+    "CompartmentTree",
+    "compartment_scope",
+    "get_compartment_tree",
+    # Concurrency
+    "call_oci",
+    "gather_bounded",
+    "max_concurrency",
+    # Metrics
+    "MetricBatch",
+    "build_query",
+    "fetch_grouped_metric",
+    "fetch_metrics",
+    "query_series",
+    "rank_resources",
+    # Time series
+    "TimeSeries",
+    # Timestamps
+    "epoch_seconds",
+    "timestamp_str",
+    # Waiters
+    "WaitOutcome",
+    "report_transitions",
+    "wait_for_state",
     # Observability
     "get_logger",
     "init_observability",
@@ -7,6 +7,7 @@ Provides TTL-based caching with:
 - LRU eviction policy
 - Cache statistics
 - Decorator-based caching
+- Tag-based invalidation
 
 This significantly reduces API calls and improves response times
 for frequently accessed data like compartments, instances, and metrics.
@@ -22,7 +23,7 @@ from collections import OrderedDict
 from collections.abc import Callable
 from dataclasses import dataclass
 from functools import wraps
-from typing import Any, ParamSpec, TypeVar
+from typing import Any, Generic, ParamSpec, TypeVar
 
 from .observability import get_logger
 
@@ -39,6 +40,7 @@ class CacheEntry:
     created_at: float
     ttl_seconds: float
     hits: int = 0
+    tags: tuple[str, ...] = ()
 
     @property
     def is_expired(self) -> bool:
@@ -90,6 +92,7 @@ class TTLCache:
     - Configurable TTL per entry
     - Maximum size with LRU eviction
     - Automatic cleanup of expired entries
+    - Tags for invalidating related entries together
     - Performance statistics
 
     Example:
@@ -103,6 +106,10 @@ class TTLCache:
 
         # Get (returns None if expired or missing)
         value = cache.get("key")
+
+        # Tag entries, then drop every entry with a tag
+        cache.set("topology", value, tags=["vcn:ocid1.vcn..."])
+        cache.invalidate_tag("vcn:ocid1.vcn...")
     """
 
     def __init__(
@@ -116,6 +123,7 @@ class TTLCache:
         self._cleanup_interval = cleanup_interval
 
         self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
         self._lock = asyncio.Lock()
         self._stats = CacheStats()
         self._last_cleanup = time.time()
@@ -137,7 +145,7 @@ class TTLCache:
                 return None
 
             if entry.is_expired:
-                del self._cache[key]
+                self._remove(key)
                 self._stats.expirations += 1
                 self._stats.misses += 1
                 self._stats.size = len(self._cache)
@@ -155,6 +163,7 @@ class TTLCache:
         key: str,
         value: Any,
         ttl: float | None = None,
+        tags: list[str] | None = None,
     ) -> None:
         """Set value in cache.
 
@@ -162,16 +171,16 @@ class TTLCache:
             key: Cache key
             value: Value to cache
             ttl: Optional TTL override (uses default if not specified)
+            tags: Optional tags; ``invalidate_tag`` drops every entry with a tag
         """
         async with self._lock:
             # Remove if exists (to update order)
             if key in self._cache:
-                del self._cache[key]
+                self._remove(key)
 
             # Evict if at capacity
             while len(self._cache) >= self._max_size:
-                evicted_key = next(iter(self._cache))
-                del self._cache[evicted_key]
+                self._remove(next(iter(self._cache)))
                 self._stats.evictions += 1
 
             # Add new entry
@@ -179,7 +188,10 @@ class TTLCache:
                 value=value,
                 created_at=time.time(),
                 ttl_seconds=ttl or self._default_ttl,
+                tags=tuple(tags or ()),
             )
+            for tag in tags or ():
+                self._tags.setdefault(tag, set()).add(key)
             self._stats.size = len(self._cache)
 
             # Periodic cleanup
@@ -196,17 +208,46 @@ class TTLCache:
         """
         async with self._lock:
             if key in self._cache:
-                del self._cache[key]
+                self._remove(key)
                 self._stats.size = len(self._cache)
                 return True
             return False
 
+    async def invalidate_tag(self, tag: str) -> int:
+        """Delete every entry set with ``tag``.
+
+        Args:
+            tag: Tag passed to ``set``
+
+        Returns:
+            Number of entries deleted
+        """
+        async with self._lock:
+            keys = self._tags.pop(tag, set())
+            for key in keys:
+                self._remove(key)
+            self._stats.size = len(self._cache)
+            return len(keys)
+
     async def clear(self) -> None:
         """Clear all entries from cache."""
         async with self._lock:
             self._cache.clear()
+            self._tags.clear()
             self._stats.size = 0
 
+    def _remove(self, key: str) -> None:
+        """Drop ``key`` and its tag memberships. Caller holds the lock."""
+        entry = self._cache.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
     async def get_or_set(
         self,
         key: str,
@@ -249,7 +290,7 @@ class TTLCache:
         ]
 
         for key in expired_keys:
-            del self._cache[key]
+            self._remove(key)
             self._stats.expirations += 1
 
         self._stats.size = len(self._cache)
@@ -271,7 +312,9 @@ class RedisTTLCache:
     Redis-backed TTL cache.
 
     Provides the same async interface as TTLCache, but stores values in Redis.
-    Uses in-memory stats tracking for hit/miss accounting.
+    Uses in-memory stats tracking for hit/miss accounting. Each tag is a
+    Redis set of the keys stored with it, kept alive as long as its
+    longest-lived entry.
     """
 
     def __init__(
@@ -290,6 +333,9 @@ class RedisTTLCache:
     def _key(self, key: str) -> str:
         return f"{self._prefix}:{key}"
 
+    def _tag_key(self, tag: str) -> str:
+        return f"{self._prefix}:tag:{tag}"
+
     async def _get_client(self):
         if self._client is None:
             import redis.asyncio as redis
@@ -313,8 +359,14 @@ class RedisTTLCache:
             except json.JSONDecodeError:
                 return value
 
-    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
-        """Set value in Redis with TTL."""
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float | None = None,
+        tags: list[str] | None = None,
+    ) -> None:
+        """Set value in Redis with TTL and optional tags."""
         if ttl is None:
             ttl = self._default_ttl
         if ttl <= 0:
@@ -325,6 +377,12 @@ class RedisTTLCache:
         async with self._lock:
             client = await self._get_client()
             await client.setex(self._key(key), int(ttl), payload)
+            for tag in tags or ():
+                tag_key = self._tag_key(tag)
+                await client.sadd(tag_key, key)
+                # Only ever extend the tag set's lifetime
+                if await client.ttl(tag_key) < int(ttl):
+                    await client.expire(tag_key, int(ttl))
             self._stats.size += 1
 
     async def delete(self, key: str) -> bool:
@@ -337,6 +395,17 @@ class RedisTTLCache:
                 return True
             return False
 
+    async def invalidate_tag(self, tag: str) -> int:
+        """Delete every key set with ``tag``; returns how many existed."""
+        async with self._lock:
+            client = await self._get_client()
+            tag_key = self._tag_key(tag)
+            keys = await client.smembers(tag_key)
+            deleted = await client.delete(*(self._key(k) for k in keys)) if keys else 0
+            await client.delete(tag_key)
+            self._stats.size = max(0, self._stats.size - deleted)
+            return deleted
+
     async def clear(self) -> None:
         """Clear all keys for this cache prefix."""
         async with self._lock:
@@ -457,6 +526,44 @@ def cached(
     return decorator
 
 
+# =============================================================================
+# Built Object Memo
+# =============================================================================
+
+class PayloadMemo(Generic[T]):
+    """Objects built from cached payloads, kept per process.
+
+    Caches hold JSON-safe payloads, so every hit would otherwise rebuild
+    the indexed object. The memo keeps the object built for a key together
+    with the payload's stamp (e.g. its ``built_at``), and rebuilds only when
+    the cached payload carries a different stamp.
+
+    Example:
+        _built: PayloadMemo[CompartmentTree] = PayloadMemo()
+
+        tree = _built.load(tenancy_id, payload["built_at"],
+                           lambda: CompartmentTree.from_payload(payload))
+    """
+
+    def __init__(self) -> None:
+        self._built: dict[str, tuple[Any, T]] = {}
+
+    def load(self, key: str, stamp: Any, build: Callable[[], T]) -> T:
+        """The object for ``key``, built with ``build`` unless ``stamp`` matches."""
+        built = self._built.get(key)
+        if built is None or built[0] != stamp:
+            built = (stamp, build())
+            self._built[key] = built
+        return built[1]
+
+    def store(self, key: str, stamp: Any, obj: T) -> None:
+        """Remember an object just built alongside the payload it was cached as."""
+        self._built[key] = (stamp, obj)
+
+    def clear(self) -> None:
+        self._built.clear()
+
+
 # =============================================================================
 # Tiered Cache Configuration
 # =============================================================================
@@ -504,7 +611,15 @@ CACHE_TIERS = {
         description="Metrics and monitoring data",
     ),
 
-    # Tier 5: No cache (pass-through)
+    # Tier 5: Immutable history (closed metric time buckets)
+    "history": CacheTier(
+        name="history",
+        ttl_seconds=604800,  # 7 days
+        max_size=5000,
+        description="Closed metric time buckets (never change once settled)",
+    ),
+
+    # Tier 6: No cache (pass-through)
     "realtime": CacheTier(
         name="realtime",
         ttl_seconds=0,
@@ -553,18 +668,19 @@ _static_cache: TTLCache | RedisTTLCache | None = None
 _config_cache: TTLCache | RedisTTLCache | None = None
 _operational_cache: TTLCache | RedisTTLCache | None = None
 _metrics_cache: TTLCache | RedisTTLCache | None = None
+_history_cache: TTLCache | RedisTTLCache | None = None
 
 
 def get_cache(tier: str = "operational") -> TTLCache:
     """Get cache instance for specified tier.
 
     Args:
-        tier: Cache tier name (static, config, operational, metrics)
+        tier: Cache tier name (static, config, operational, metrics, history)
 
     Returns:
         TTLCache instance for the tier
     """
-    global _static_cache, _config_cache, _operational_cache, _metrics_cache
+    global _static_cache, _config_cache, _operational_cache, _metrics_cache, _history_cache
 
     _apply_cache_overrides()
     tier_config = CACHE_TIERS.get(tier, CACHE_TIERS["operational"])
@@ -616,6 +732,21 @@ def get_cache(tier: str = "operational") -> TTLCache:
                 )
         return _metrics_cache
 
+    elif tier == "history":
+        if _history_cache is None:
+            if backend == "redis" and redis_url:
+                _history_cache = RedisTTLCache(
+                    redis_url=redis_url,
+                    prefix=cache_prefix,
+                    default_ttl=tier_config.ttl_seconds,
+                )
+            else:
+                _history_cache = TTLCache(
+                    max_size=tier_config.max_size,
+                    default_ttl=tier_config.ttl_seconds,
+                )
+        return _history_cache
+
     else:  # operational (default)
         if _operational_cache is None:
             if backend == "redis" and redis_url:
@@ -643,6 +774,7 @@ async def get_all_cache_stats() -> dict[str, Any]:
         "config": get_cache("config").stats.to_dict(),
         "operational": get_cache("operational").stats.to_dict(),
         "metrics": get_cache("metrics").stats.to_dict(),
+        "history": get_cache("history").stats.to_dict(),
     }
 
 
@@ -652,6 +784,7 @@ async def clear_all_caches() -> None:
     await get_cache("config").clear()
     await get_cache("operational").clear()
     await get_cache("metrics").clear()
+    await get_cache("history").clear()
     logger.info("All caches cleared")
 
 
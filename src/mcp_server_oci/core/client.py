@@ -347,6 +347,11 @@ class OCIClientManager:
         """Get CloudGuard client for security operations."""
         return self.get_client(oci.cloud_guard.CloudGuardClient)
 
+    @property
+    def work_requests(self) -> oci.work_requests.WorkRequestClient:
+        """Get WorkRequest client for tracking asynchronous operations."""
+        return self.get_client(oci.work_requests.WorkRequestClient)
+
     def clear_cache(self) -> None:
         """Clear the client cache."""
         with self._lock:
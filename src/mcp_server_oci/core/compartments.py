@@ -0,0 +1,289 @@
+"""
+Compartment hierarchy index.
+
+The whole compartment tree of a tenancy is fetched with a single
+paginated ``list_compartments(compartment_id_in_subtree=True)`` call,
+cached in the static tier, and indexed so that parent/child, path and
+subtree questions are answered locally:
+
+- parent, children, depth, path: O(1) lookups
+- is_within(a, b): O(1) via pre-order interval numbering
+- subtree(id): O(size of subtree) slice of the pre-order walk
+- resolve(ref): OCID, path ('prod/apps') or unique name to OCID
+
+Example:
+    tree = await get_compartment_tree(identity_client, tenancy_id)
+    ids = tree.subtree(tree.resolve("prod"))
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from time import time
+from typing import Any
+
+import oci
+
+from .cache import PayloadMemo, get_cache
+from .concurrency import call_oci
+from .observability import get_logger
+
+logger = get_logger("oci-mcp.compartments")
+
+ROOT_NAME = "root"
+
+# Built trees per tenancy, keyed by the cached payload's build stamp, so a
+# cache hit does not re-index the payload
+_built: PayloadMemo[CompartmentTree] = PayloadMemo()
+
+
+@dataclass(frozen=True)
+class Compartment:
+    """A node of the compartment tree."""
+    id: str
+    name: str
+    parent_id: str | None
+    path: str
+    depth: int
+
+
+class CompartmentTree:
+    """Indexed compartment hierarchy for one tenancy."""
+
+    def __init__(self, tenancy_id: str, nodes: list[tuple[str, str, str | None]]):
+        """Index ``(id, name, parent_id)`` rows.
+
+        The tenancy itself is the root. Compartments whose parent is not
+        visible (e.g. restricted access) are attached to the root.
+        """
+        self.tenancy_id = tenancy_id
+        self._ids: list[str] = [tenancy_id]
+        self._names: list[str] = [ROOT_NAME]
+        self._index: dict[str, int] = {tenancy_id: 0}
+        for comp_id, name, _ in nodes:
+            if comp_id not in self._index:
+                self._index[comp_id] = len(self._ids)
+                self._ids.append(comp_id)
+                self._names.append(name)
+
+        n = len(self._ids)
+        self._parent = [-1] * n
+        self._children: list[list[int]] = [[] for _ in range(n)]
+        for comp_id, _, parent_id in nodes:
+            i = self._index[comp_id]
+            if i == 0:
+                continue
+            p = self._index.get(parent_id or "", 0)
+            self._parent[i] = p
+            self._children[p].append(i)
+        for kids in self._children:
+            kids.sort(key=lambda i: self._names[i].lower())
+
+        # Pre-order walk: the subtree of i is order[tin[i]:tout[i]]
+        self._order: list[int] = []
+        self._tin = [0] * n
+        self._tout = [0] * n
+        self._depth = [0] * n
+        self._paths = [""] * n
+        stack: list[tuple[int, bool]] = [(0, False)]
+        while stack:
+            i, done = stack.pop()
+            if done:
+                self._tout[i] = len(self._order)
+                continue
+            self._tin[i] = len(self._order)
+            self._order.append(i)
+            p = self._parent[i]
+            if p >= 0:
+                self._depth[i] = self._depth[p] + 1
+                prefix = f"{self._paths[p]}/" if self._paths[p] else ""
+                self._paths[i] = prefix + self._names[i]
+            stack.append((i, True))
+            stack.extend((c, False) for c in reversed(self._children[i]))
+
+        self._by_path = {self._paths[i].lower(): i for i in range(1, n)}
+        self._by_name: dict[str, list[int]] = {}
+        for i in range(1, n):
+            self._by_name.setdefault(self._names[i].lower(), []).append(i)
+        self.names: dict[str, str] = dict(zip(self._ids, self._names, strict=True))
+
+    # -------------------------------------------------------------------------
+    # Serialization (JSON-safe so the tree can live in any cache backend)
+    # -------------------------------------------------------------------------
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "tenancy_id": self.tenancy_id,
+            "nodes": [
+                [self._ids[i], self._names[i], self._ids[self._parent[i]]]
+                for i in range(1, len(self._ids))
+            ],
+        }
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> CompartmentTree:
+        return cls(payload["tenancy_id"], [tuple(node) for node in payload["nodes"]])
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, compartment_id: object) -> bool:
+        return compartment_id in self._index
+
+    def get(self, compartment_id: str) -> Compartment | None:
+        i = self._index.get(compartment_id)
+        if i is None:
+            return None
+        p = self._parent[i]
+        return Compartment(
+            id=compartment_id,
+            name=self._names[i],
+            parent_id=self._ids[p] if p >= 0 else None,
+            path=self._paths[i],
+            depth=self._depth[i],
+        )
+
+    def name(self, compartment_id: str) -> str | None:
+        i = self._index.get(compartment_id)
+        return self._names[i] if i is not None else None
+
+    def parent(self, compartment_id: str) -> str | None:
+        p = self._parent[self._require(compartment_id)]
+        return self._ids[p] if p >= 0 else None
+
+    def children(self, compartment_id: str) -> list[str]:
+        return [self._ids[c] for c in self._children[self._require(compartment_id)]]
+
+    def path(self, compartment_id: str) -> str:
+        return self._paths[self._require(compartment_id)]
+
+    def depth(self, compartment_id: str) -> int:
+        return self._depth[self._require(compartment_id)]
+
+    def ancestors(self, compartment_id: str) -> list[str]:
+        """Ancestors from the direct parent up to the root."""
+        result = []
+        p = self._parent[self._require(compartment_id)]
+        while p >= 0:
+            result.append(self._ids[p])
+            p = self._parent[p]
+        return result
+
+    def subtree(self, compartment_id: str, include_self: bool = True) -> list[str]:
+        """The compartment and all of its descendants, in pre-order."""
+        i = self._require(compartment_id)
+        lo = self._tin[i] if include_self else self._tin[i] + 1
+        return [self._ids[j] for j in self._order[lo:self._tout[i]]]
+
+    def is_within(self, compartment_id: str, ancestor_id: str) -> bool:
+        """Whether ``compartment_id`` is ``ancestor_id`` or one of its descendants."""
+        i = self._index.get(compartment_id)
+        a = self._index.get(ancestor_id)
+        if i is None or a is None:
+            return False
+        return self._tin[a] <= self._tin[i] < self._tout[a]
+
+    def resolve(self, ref: str) -> str:
+        """Resolve an OCID, a path ('prod/apps') or a unique name to an OCID.
+
+        Raises:
+            ValueError: If the reference is unknown or the name is ambiguous
+        """
+        ref = ref.strip()
+        if ref in self._index:
+            return ref
+        key = ref.strip("/").lower()
+        if key in (ROOT_NAME, ""):
+            return self.tenancy_id
+        if key in self._by_path:
+            return self._ids[self._by_path[key]]
+        matches = self._by_name.get(key, [])
+        if len(matches) == 1:
+            return self._ids[matches[0]]
+        if matches:
+            paths = ", ".join(sorted(self._paths[i] for i in matches))
+            raise ValueError(f"Compartment name '{ref}' is ambiguous; use a path: {paths}")
+        raise ValueError(f"Compartment not found: {ref}")
+
+    def scope(self, ref: str, include_subcompartments: bool = False) -> list[str]:
+        """Resolve a reference to the list of compartment OCIDs it covers."""
+        compartment_id = self.resolve(ref)
+        if include_subcompartments:
+            return self.subtree(compartment_id)
+        return [compartment_id]
+
+    def _require(self, compartment_id: str) -> int:
+        i = self._index.get(compartment_id)
+        if i is None:
+            raise ValueError(f"Compartment not found: {compartment_id}")
+        return i
+
+
+async def get_compartment_tree(
+    identity_client: Any,
+    tenancy_id: str,
+    refresh: bool = False,
+) -> CompartmentTree:
+    """Get the indexed compartment tree for a tenancy.
+
+    The listing is cached in the static tier; the indexed tree is kept per
+    process and rebuilt only when the cached listing changes.
+
+    Args:
+        identity_client: OCI IdentityClient
+        tenancy_id: Tenancy OCID (root compartment)
+        refresh: Bypass the cache and re-list compartments
+    """
+    cache = get_cache("static")
+    key = f"compartment_tree:{tenancy_id}"
+    payload = None if refresh else await cache.get(key)
+
+    if payload is None:
+        response = await call_oci(
+            oci.pagination.list_call_get_all_results,
+            identity_client.list_compartments,
+            tenancy_id,
+            compartment_id_in_subtree=True,
+            access_level="ANY",
+            lifecycle_state="ACTIVE",
+        )
+        tree = CompartmentTree(
+            tenancy_id,
+            [(c.id, c.name, c.compartment_id) for c in response.data],
+        )
+        payload = {**tree.to_payload(), "built_at": time()}
+        await cache.set(key, payload)
+        _built.store(tenancy_id, payload["built_at"], tree)
+        logger.debug("Indexed compartment tree", tenancy_id=tenancy_id, size=len(tree))
+        return tree
+
+    return _built.load(
+        tenancy_id, payload.get("built_at"), lambda: CompartmentTree.from_payload(payload)
+    )
+
+
+async def compartment_scope(
+    client_mgr: Any,
+    compartment_id: str,
+    include_subcompartments: bool = False,
+) -> list[str]:
+    """Compartments a compartment-scoped listing covers.
+
+    Without ``include_subcompartments`` this is ``compartment_id`` alone and
+    no call is made; with it, the compartment's subtree from the cached tree.
+
+    Args:
+        client_mgr: Client manager with ``identity`` and ``tenancy_id``
+        compartment_id: Compartment OCID, name or path
+        include_subcompartments: Include every compartment below it
+
+    Raises:
+        ValueError: If the compartment is not in the tenancy's tree
+    """
+    if not include_subcompartments:
+        return [compartment_id]
+    tree = await get_compartment_tree(client_mgr.identity, client_mgr.tenancy_id)
+    return tree.scope(compartment_id, include_subcompartments=True)
@@ -0,0 +1,149 @@
+"""
+Bounded concurrency helpers for fan-out OCI calls.
+
+OCI SDK clients are synchronous, so every call is pushed to a worker
+thread with ``asyncio.to_thread``. When a tool fans out over many
+resources, the number of in-flight calls must be capped to stay within
+API rate limits and the default thread pool size.
+
+``gather_bounded`` caps one fan-out. ``CallBudget`` caps every call of an
+operation whose independent parts fan out concurrently at several levels,
+so nesting does not multiply the number of in-flight calls.
+
+Environment Variables:
+- OCI_MAX_CONCURRENCY: Default cap for concurrent OCI calls (default: 8)
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+from collections.abc import AsyncIterator, Awaitable, Iterable
+from typing import Any, Literal, TypeVar, overload
+
+import oci
+
+from .observability import get_logger
+
+logger = get_logger("oci-mcp.concurrency")
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+def max_concurrency() -> int:
+    """Get the default concurrency cap from the environment."""
+    value = os.getenv("OCI_MAX_CONCURRENCY")
+    if value:
+        try:
+            return max(1, int(value))
+        except ValueError:
+            logger.warning("Invalid OCI_MAX_CONCURRENCY", value=value)
+    return DEFAULT_MAX_CONCURRENCY
+
+
+@overload
+async def gather_bounded(
+    aws: Iterable[Awaitable[T]],
+    limit: int | None = None,
+    return_exceptions: Literal[False] = False,
+) -> list[T]: ...
+
+
+@overload
+async def gather_bounded(
+    aws: Iterable[Awaitable[T]],
+    limit: int | None = None,
+    *,
+    return_exceptions: Literal[True],
+) -> list[T | BaseException]: ...
+
+
+async def gather_bounded(
+    aws: Iterable[Awaitable[T]],
+    limit: int | None = None,
+    return_exceptions: bool = False,
+) -> list[T] | list[T | BaseException]:
+    """Await many awaitables with at most ``limit`` running at once.
+
+    Results are returned in input order, like ``asyncio.gather``.
+
+    Args:
+        aws: Awaitables to run (typically coroutines wrapping OCI calls)
+        limit: Maximum in-flight awaitables (default: OCI_MAX_CONCURRENCY)
+        return_exceptions: Return exceptions as results instead of raising
+
+    Returns:
+        List of results in the same order as ``aws``
+
+    Example:
+        results = await gather_bounded(
+            (asyncio.to_thread(compute.get_instance, i) for i in ids),
+            limit=10,
+        )
+    """
+    semaphore = asyncio.Semaphore(limit or max_concurrency())
+
+    async def _run(aw: Awaitable[T]) -> T:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(
+        *(_run(aw) for aw in aws),
+        return_exceptions=return_exceptions,
+    )
+
+
+async def call_oci(func: Any, *args: Any, **kwargs: Any) -> Any:
+    """Run a synchronous OCI SDK call without blocking the event loop."""
+    return await asyncio.to_thread(func, *args, **kwargs)
+
+
+class CallBudget:
+    """One concurrency cap shared by every OCI call of an operation.
+
+    Only the SDK calls take a slot, so structure can nest freely with
+    ``asyncio.gather`` without deadlocking or exceeding the cap.
+
+    Example:
+        budget = CallBudget()
+        users, policies = await asyncio.gather(
+            budget.list_all(identity.list_users, compartment_id=tenancy_id),
+            budget.list_all(identity.list_policies, compartment_id=tenancy_id),
+        )
+    """
+
+    def __init__(self, limit: int | None = None) -> None:
+        self.limit = limit or max_concurrency()
+        self.calls = 0
+        self._semaphore = asyncio.Semaphore(self.limit)
+
+    async def call(self, func: Any, *args: Any, **kwargs: Any) -> Any:
+        """Run a synchronous OCI SDK call within the budget."""
+        async with self._semaphore:
+            self.calls += 1
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def list_all(self, func: Any, *args: Any, **kwargs: Any) -> list[Any]:
+        """Every page of a list call (pages follow each other in one slot)."""
+        response = await self.call(
+            oci.pagination.list_call_get_all_results, func, *args, **kwargs
+        )
+        return response.data or []
+
+    async def pages(self, func: Any, *args: Any, **kwargs: Any) -> AsyncIterator[list[Any]]:
+        """Yield the items of each page of a list call as it arrives.
+
+        Each page takes its own slot, so a caller can aggregate or report
+        progress while the listing continues. Collection responses
+        (``data.items``) are unwrapped.
+        """
+        page = kwargs.pop("page", None)
+        while True:
+            response = await self.call(func, *args, page=page, **kwargs)
+            data = response.data
+            items = data.items if hasattr(data, "items") and not isinstance(data, list) else data
+            yield list(items or [])
+            if not response.has_next_page:
+                return
+            page = response.next_page
@@ -0,0 +1,506 @@
+"""
+Monitoring query planner.
+
+Combines metric requests for many resources into as few
+``summarize_metrics_data`` calls as possible: one MQL query per metric and
+namespace with a ``resourceId =~ "a|b|c"`` selector. Different metrics
+run concurrently and the returned streams are split back per resource.
+
+Example:
+    batch = await fetch_metrics(
+        monitoring,
+        compartment_id,
+        namespace="oci_computeagent",
+        metric_names=["CpuUtilization", "MemoryUtilization"],
+        resource_ids=instance_ids,
+        start_time=start,
+        end_time=end,
+    )
+    cpu = batch.get(instance_ids[0], "CpuUtilization")  # TimeSeries
+
+Fleet-wide questions ("which instance has the highest CPU?") use a single
+grouped query instead, ranked server-side with NumPy so per-resource series
+never leave the process:
+
+    batch = await fetch_grouped_metric(monitoring, tenancy_id, "oci_computeagent",
+                                       "CpuUtilization", start, end,
+                                       compartment_id_in_subtree=True)
+    top, fleet = rank_resources(batch, "CpuUtilization", by="p95", top_n=10)
+
+Closed time buckets are cached in the ``history`` tier, so repeating a
+rolling-window query only fetches the open tail (see ``query_series``).
+"""
+from __future__ import annotations
+
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from enum import Enum
+from typing import Any
+
+import numpy as np
+import oci
+
+from .cache import generate_cache_key, get_cache
+from .concurrency import call_oci, gather_bounded
+from .observability import get_logger
+from .timeseries import TimeSeries
+
+logger = get_logger("oci-mcp.metrics")
+
+# Resource IDs per MQL selector. Keeps query text well under service limits
+# while still collapsing a 100-instance check into a handful of calls.
+MAX_IDS_PER_QUERY = 50
+
+# Intervals per cache bucket (1m data -> 1h buckets, 5m -> 5h, 1h -> 60h)
+BUCKET_POINTS = 60
+
+# Monitoring ingestion delay; buckets ending earlier than this are final
+SETTLE_SECONDS = 300
+
+
+
+class RankStatistic(str, Enum):
+    """Statistic used to rank resources."""
+
+    MEAN = "mean"
+    P95 = "p95"
+    MAX = "max"
+
+
+@dataclass
+class MetricBatch:
+    """Metric series split per resource and metric."""
+    series: dict[str, dict[str, TimeSeries]] = field(default_factory=dict)
+    # Failed queries per metric, then per resource the query selected
+    errors: dict[str, dict[str, str]] = field(default_factory=dict)
+    dimensions: dict[str, dict[str, str]] = field(default_factory=dict)
+    calls: int = 0
+
+    def add(self, metric_name: str, result: SeriesResult) -> None:
+        """Merge one query result into the batch under ``metric_name``."""
+        for resource_id, series in result.series.items():
+            self.series.setdefault(resource_id, {})[metric_name] = series
+        for resource_id, dims in result.dimensions.items():
+            self.dimensions.setdefault(resource_id, {}).update(dims)
+        self.calls += result.calls
+
+    def get(self, resource_id: str, metric_name: str) -> TimeSeries:
+        """Get the series for one resource and metric (empty if none)."""
+        return self.series.get(resource_id, {}).get(metric_name) or TimeSeries.empty()
+
+    def error(self, resource_id: str, metric_name: str) -> str | None:
+        """Error of the query that selected ``resource_id`` for a metric, if it failed."""
+        return self.errors.get(metric_name, {}).get(resource_id)
+
+
+def build_query(
+    metric_name: str,
+    resource_ids: Sequence[str] = (),
+    interval: str = "1m",
+    statistic: str = "mean",
+    dimension: str = "resourceId",
+    group_by: Sequence[str] = (),
+) -> str:
+    """Build an MQL query selecting one or more resources.
+
+    Args:
+        metric_name: Metric name (e.g., CpuUtilization)
+        resource_ids: Resource OCIDs to select (empty selects all)
+        interval: Aggregation interval (e.g., 1m, 1h)
+        statistic: Aggregation statistic (mean, max, sum, ...)
+        dimension: Dimension holding the resource OCID
+        group_by: Dimensions to aggregate streams by
+
+    Returns:
+        MQL query string
+    """
+    selector = ""
+    if len(resource_ids) == 1:
+        selector = f'{{{dimension} = "{resource_ids[0]}"}}'
+    elif resource_ids:
+        selector = f'{{{dimension} =~ "{"|".join(resource_ids)}"}}'
+    grouping = f".groupBy({', '.join(group_by)})" if group_by else ""
+    return f"{metric_name}[{interval}]{selector}{grouping}.{statistic}()"
+
+
+async def fetch_metrics(
+    monitoring_client: Any,
+    compartment_id: str,
+    namespace: str,
+    metric_names: Sequence[str],
+    resource_ids: Sequence[str],
+    start_time: datetime,
+    end_time: datetime,
+    interval: str = "1m",
+    statistic: str = "mean",
+    resolution: str | None = None,
+    dimension: str = "resourceId",
+    compartment_id_in_subtree: bool = False,
+    limit: int | None = None,
+    raise_on_error: bool = False,
+    use_cache: bool = True,
+) -> MetricBatch:
+    """Fetch several metrics for many resources with batched queries.
+
+    Issues one query per metric per chunk of ``MAX_IDS_PER_QUERY`` resources,
+    all running concurrently. A failing query is recorded in
+    ``MetricBatch.errors`` against the resources of its chunk rather than
+    failing the whole batch, unless ``raise_on_error`` is set.
+
+    Args:
+        monitoring_client: OCI MonitoringClient
+        compartment_id: Compartment holding the metrics
+        namespace: Metric namespace (e.g., oci_computeagent)
+        metric_names: Metrics to fetch
+        resource_ids: Resource OCIDs to split results by
+        start_time: Window start
+        end_time: Window end
+        interval: MQL aggregation interval
+        statistic: MQL statistic
+        resolution: Optional response resolution
+        dimension: Dimension holding the resource OCID
+        compartment_id_in_subtree: Include metrics from subcompartments
+        limit: Maximum concurrent calls (default: OCI_MAX_CONCURRENCY)
+        raise_on_error: Re-raise the first failed query instead of recording it
+        use_cache: Serve closed time buckets from the metrics history cache
+
+    Returns:
+        MetricBatch keyed by resource ID, then metric name
+    """
+    resource_ids = list(dict.fromkeys(resource_ids))
+    chunks = [
+        resource_ids[i:i + MAX_IDS_PER_QUERY]
+        for i in range(0, len(resource_ids), MAX_IDS_PER_QUERY)
+    ]
+    plan = [(metric, chunk) for metric in metric_names for chunk in chunks]
+
+    results = await gather_bounded(
+        (
+            query_series(
+                monitoring_client,
+                compartment_id,
+                namespace,
+                build_query(metric, chunk, interval, statistic, dimension),
+                start_time,
+                end_time,
+                interval=interval,
+                resolution=resolution,
+                dimension=dimension,
+                compartment_id_in_subtree=compartment_id_in_subtree,
+                use_cache=use_cache,
+            )
+            for metric, chunk in plan
+        ),
+        limit=limit,
+        return_exceptions=True,
+    )
+
+    batch = MetricBatch(series={rid: {} for rid in resource_ids})
+    for (metric, chunk), result in zip(plan, results, strict=True):
+        if isinstance(result, BaseException):
+            if raise_on_error:
+                raise result
+            logger.warning("Metric query failed", metric=metric, resources=len(chunk),
+                           error=str(result))
+            batch.errors.setdefault(metric, {}).update(dict.fromkeys(chunk, str(result)))
+            continue
+        batch.add(metric, result)
+    return batch
+
+
+async def fetch_grouped_metric(
+    monitoring_client: Any,
+    compartment_id: str,
+    namespace: str,
+    metric_name: str,
+    start_time: datetime,
+    end_time: datetime,
+    interval: str = "5m",
+    statistic: str = "mean",
+    group_by: Sequence[str] = ("resourceId", "resourceDisplayName"),
+    dimension: str = "resourceId",
+    compartment_id_in_subtree: bool = False,
+    use_cache: bool = True,
+) -> MetricBatch:
+    """Fetch one metric for every resource in a compartment with one query.
+
+    Streams are aggregated with ``groupBy`` so the response holds exactly
+    one stream per resource. Non-key grouping dimensions (such as the
+    display name) are kept in ``MetricBatch.dimensions``.
+
+    Args:
+        monitoring_client: OCI MonitoringClient
+        compartment_id: Compartment (or tenancy) to query
+        namespace: Metric namespace
+        metric_name: Metric to fetch
+        start_time: Window start
+        end_time: Window end
+        interval: MQL aggregation interval
+        statistic: MQL statistic
+        group_by: Dimensions to group streams by (must include ``dimension``)
+        dimension: Dimension holding the resource OCID
+        compartment_id_in_subtree: Include all subcompartments
+        use_cache: Serve closed time buckets from the metrics history cache
+
+    Returns:
+        MetricBatch keyed by resource ID
+    """
+    result = await query_series(
+        monitoring_client,
+        compartment_id,
+        namespace,
+        build_query(metric_name, (), interval, statistic, dimension, group_by),
+        start_time,
+        end_time,
+        interval=interval,
+        dimension=dimension,
+        compartment_id_in_subtree=compartment_id_in_subtree,
+        use_cache=use_cache,
+    )
+    batch = MetricBatch()
+    batch.add(metric_name, result)
+    return batch
+
+
+# =============================================================================
+# Bucket-Aligned Query Cache
+# =============================================================================
+
+@dataclass
+class SeriesResult:
+    """Result of a single MQL query, split per resource."""
+    series: dict[str, TimeSeries] = field(default_factory=dict)
+    dimensions: dict[str, dict[str, str]] = field(default_factory=dict)
+    calls: int = 0
+
+
+def interval_seconds(interval: str) -> int:
+    """Convert an MQL interval or resolution (e.g., '1m', '5m', '1h', '1d') to seconds."""
+    value, unit = int(interval[:-1]), interval[-1].lower()
+    return value * {"m": 60, "h": 3600, "d": 86400}[unit]
+
+
+def bucket_seconds(interval: str) -> int:
+    """Length of one cache bucket: ``BUCKET_POINTS`` intervals."""
+    return interval_seconds(interval) * BUCKET_POINTS
+
+
+async def query_series(
+    monitoring_client: Any,
+    compartment_id: str,
+    namespace: str,
+    query: str,
+    start_time: datetime,
+    end_time: datetime,
+    interval: str = "1m",
+    resolution: str | None = None,
+    dimension: str = "resourceId",
+    compartment_id_in_subtree: bool = False,
+    use_cache: bool = True,
+) -> SeriesResult:
+    """Run one MQL query, serving closed time buckets from cache.
+
+    The window is aligned to interval boundaries and split into fixed
+    buckets of ``BUCKET_POINTS`` intervals. Buckets that ended more than
+    ``SETTLE_SECONDS`` ago never change, so they are kept in the long-lived
+    ``history`` cache tier keyed by (namespace, query, resolution, bucket).
+    Only the span from the first uncached bucket to ``end_time`` is fetched,
+    in a single call, so a repeated "last 24h" query costs one small
+    incremental request.
+
+    Returns:
+        SeriesResult with per-resource series for the whole window
+    """
+    step = interval_seconds(resolution or interval)
+    start = _floor(start_time.timestamp(), step)
+    end = _ceil(end_time.timestamp(), step)
+
+    if not use_cache:
+        return await _query_range(
+            monitoring_client, compartment_id, namespace, query, start, end,
+            resolution, dimension, compartment_id_in_subtree,
+        )
+
+    size = bucket_seconds(resolution or interval)
+    closed_before = _floor(time.time() - SETTLE_SECONDS, size)
+    buckets = list(range(_floor(start, size), end, size))
+    cache = get_cache("history")
+
+    def _key(bucket: int) -> str:
+        return generate_cache_key(
+            namespace, query, resolution or interval, bucket,
+            prefix="metrics", compartment_id=compartment_id,
+            subtree=compartment_id_in_subtree,
+        )
+
+    # Walk closed buckets in order; stop at the first miss. Fetches start on
+    # a bucket boundary so the first bucket is fully covered and cacheable.
+    cached: list[dict[str, Any]] = []
+    fetch_from = buckets[0] if buckets else start
+    for bucket in buckets:
+        if bucket + size > closed_before:
+            break
+        payload = await cache.get(_key(bucket))
+        if payload is None:
+            break
+        cached.append(payload)
+        fetch_from = bucket + size
+
+    result = SeriesResult()
+    fetched = SeriesResult()
+    if fetch_from < end:
+        fetched = await _query_range(
+            monitoring_client, compartment_id, namespace, query, fetch_from, end,
+            resolution, dimension, compartment_id_in_subtree,
+        )
+        # Store newly closed buckets (fully covered by this fetch)
+        for bucket in buckets:
+            if bucket < fetch_from or bucket + size > closed_before:
+                continue
+            await cache.set(_key(bucket), _bucket_payload(fetched, bucket, bucket + size))
+
+    parts: dict[str, list[TimeSeries]] = {}
+    for payload in cached:
+        for rid, (ts, values) in payload["series"].items():
+            parts.setdefault(rid, []).append(TimeSeries(np.asarray(ts), np.asarray(values)))
+        for rid, dims in payload["dimensions"].items():
+            result.dimensions.setdefault(rid, {}).update(dims)
+    for rid, series in fetched.series.items():
+        parts.setdefault(rid, []).append(series)
+    for rid, dims in fetched.dimensions.items():
+        result.dimensions.setdefault(rid, {}).update(dims)
+
+    window_start = datetime.fromtimestamp(start, tz=UTC)
+    result.series = {
+        rid: TimeSeries.concat(series).between(window_start)
+        for rid, series in parts.items()
+    }
+    result.calls = fetched.calls
+    return result
+
+
+async def _query_range(
+    monitoring_client: Any,
+    compartment_id: str,
+    namespace: str,
+    query: str,
+    start: float,
+    end: float,
+    resolution: str | None,
+    dimension: str,
+    compartment_id_in_subtree: bool,
+) -> SeriesResult:
+    """Issue one summarize_metrics_data call and split streams per resource."""
+    details = oci.monitoring.models.SummarizeMetricsDataDetails(
+        namespace=namespace,
+        query=query,
+        start_time=datetime.fromtimestamp(start, tz=UTC),
+        end_time=datetime.fromtimestamp(end, tz=UTC),
+        resolution=resolution,
+    )
+    response = await call_oci(
+        monitoring_client.summarize_metrics_data,
+        compartment_id,
+        details,
+        compartment_id_in_subtree=compartment_id_in_subtree,
+    )
+
+    result = SeriesResult(calls=1)
+    parts: dict[str, list[TimeSeries]] = {}
+    for item in response.data or []:
+        dimensions = item.dimensions or {}
+        resource_id = dimensions.get(dimension) or dimensions.get(dimension.lower())
+        if not resource_id:
+            continue
+        extra = {k: v for k, v in dimensions.items() if k != dimension}
+        if extra:
+            result.dimensions.setdefault(resource_id, {}).update(extra)
+        # Multiple streams per resource (e.g., differing dimensions) are merged
+        parts.setdefault(resource_id, []).append(
+            TimeSeries.from_datapoints(item.aggregated_datapoints)
+        )
+    result.series = {rid: TimeSeries.concat(p) for rid, p in parts.items()}
+    return result
+
+
+def _bucket_payload(result: SeriesResult, start: float, end: float) -> dict[str, Any]:
+    """Serialize the part of a result inside [start, end) for caching."""
+    series = {}
+    for rid, ts in result.series.items():
+        lo, hi = np.searchsorted(ts.timestamps, [start, end])
+        series[rid] = [ts.timestamps[lo:hi].tolist(), ts.values[lo:hi].tolist()]
+    return {"series": series, "dimensions": result.dimensions}
+
+
+def _floor(epoch: float, step: int) -> int:
+    return int(epoch // step) * step
+
+
+def _ceil(epoch: float, step: int) -> int:
+    return -int(-epoch // step) * step
+
+
+def rank_resources(
+    batch: MetricBatch,
+    metric_name: str,
+    by: RankStatistic | str = RankStatistic.MEAN,
+    top_n: int = 10,
+    ascending: bool = False,
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """Rank resources by mean, p95, or max of a metric.
+
+    Series are packed into a NaN-padded matrix so all reductions run as
+    single vectorized NumPy calls, regardless of fleet size.
+
+    Args:
+        batch: Metric batch holding the series
+        metric_name: Metric to rank on
+        by: Statistic to rank by
+        top_n: Number of resources to return
+        ascending: Rank lowest first (e.g., to find idle resources)
+
+    Returns:
+        Tuple of (top resources with stats, fleet-wide summary)
+    """
+    resource_ids = [rid for rid in batch.series if batch.get(rid, metric_name)]
+    if not resource_ids:
+        return [], {"resource_count": 0}
+
+    rows = [batch.get(rid, metric_name).values for rid in resource_ids]
+    width = max(len(row) for row in rows)
+    matrix = np.full((len(rows), width), np.nan)
+    for i, row in enumerate(rows):
+        matrix[i, :len(row)] = row
+
+    stats = {
+        "mean": np.nanmean(matrix, axis=1),
+        "p95": np.nanpercentile(matrix, 95, axis=1),
+        "max": np.nanmax(matrix, axis=1),
+    }
+
+    key = stats[RankStatistic(by).value]
+    n = min(top_n, len(resource_ids))
+    order = key if ascending else -key
+    top = np.argpartition(order, n - 1)[:n] if n < len(order) else np.arange(len(order))
+    top = top[np.argsort(order[top], kind="stable")]
+
+    ranked = [
+        {
+            "resource_id": resource_ids[i],
+            "display_name": batch.dimensions.get(resource_ids[i], {}).get("resourceDisplayName"),
+            "mean": round(float(stats["mean"][i]), 2),
+            "p95": round(float(stats["p95"][i]), 2),
+            "max": round(float(stats["max"][i]), 2),
+            "samples": len(rows[i]),
+        }
+        for i in top
+    ]
+    fleet = {
+        "resource_count": len(resource_ids),
+        "mean": round(float(np.nanmean(matrix)), 2),
+        "p95": round(float(np.nanpercentile(matrix, 95)), 2),
+        "max": round(float(np.nanmax(matrix)), 2),
+    }
+    return ranked, fleet
@@ -0,0 +1,24 @@
+"""
+Conversions for SDK timestamps.
+
+OCI SDK models carry datetimes that may be naive (UTC by convention),
+timezone-aware, ISO strings (after a cache round trip) or missing.
+"""
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import Any
+
+
+def timestamp_str(value: Any) -> str | None:
+    """String form of an SDK timestamp, or None when it is missing."""
+    return str(value) if value else None
+
+
+def epoch_seconds(value: Any) -> float | None:
+    """Epoch seconds of an SDK datetime (naive values are UTC)."""
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return (value if value.tzinfo else value.replace(tzinfo=UTC)).timestamp()
@@ -0,0 +1,293 @@
+"""
+Async lifecycle waiters.
+
+OCI's own ``oci.wait_until`` sleeps in the calling thread, which would pin
+a worker thread per waiting tool call. These waiters instead poll from the
+event loop: every read is a ``call_oci`` worker-thread call and every pause
+is an ``asyncio.sleep`` with exponential backoff and jitter.
+
+Waiters on the same resource and target states share one poller: a second
+tool call waiting for the same instance to reach RUNNING subscribes to the
+first poll loop instead of starting its own, so N concurrent waits cost one
+stream of GET requests. Every subscriber is told about each observed state
+transition as it happens.
+
+Example:
+    outcome = await wait_for_state(
+        lambda: compute.get_instance(instance_id),
+        instance_id,
+        targets={"RUNNING"},
+        on_transition=report_transitions(ctx, "Instance", timeout_seconds=900),
+    )
+
+Environment Variables:
+- OCI_WAIT_TIMEOUT: Default seconds to wait for a target state (default: 900)
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from contextlib import suppress
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any
+
+from .concurrency import call_oci
+from .observability import get_logger
+
+logger = get_logger("oci-mcp.waiters")
+
+DEFAULT_TIMEOUT_SECONDS = 900.0
+POLL_INITIAL_DELAY = 2.0
+POLL_MAX_DELAY = 30.0
+POLL_JITTER = 0.2
+
+TransitionCallback = Callable[[str, float], Awaitable[None]]
+
+# (resource id, target states) -> shared poller
+_pollers: dict[tuple[str, frozenset[str]], _Poller] = {}
+
+
+def default_timeout() -> float:
+    """Get the default wait timeout from the environment."""
+    value = os.getenv("OCI_WAIT_TIMEOUT")
+    if value:
+        try:
+            return max(1.0, float(value))
+        except ValueError:
+            logger.warning("Invalid OCI_WAIT_TIMEOUT", value=value)
+    return DEFAULT_TIMEOUT_SECONDS
+
+
+@dataclass
+class WaitOutcome:
+    """Result of waiting for a resource to reach a target state."""
+    status: str                  # succeeded, failed, or timeout
+    state: str | None            # last observed state
+    message: str
+    elapsed: float
+    transitions: list[tuple[str, float]] = field(default_factory=list)
+    data: Any = None             # last fetched resource model
+    error: BaseException | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status == "succeeded"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "status": self.status,
+            "state": self.state,
+            "message": self.message,
+            "elapsed_seconds": round(self.elapsed, 1),
+            "transitions": [
+                {"state": state, "at_seconds": round(at, 1)} for state, at in self.transitions
+            ],
+        }
+
+
+def backoff_delays(
+    initial: float = POLL_INITIAL_DELAY,
+    maximum: float = POLL_MAX_DELAY,
+    jitter: float = POLL_JITTER,
+) -> Iterable[float]:
+    """Endless exponential backoff delays with +/- ``jitter`` proportional noise."""
+    delay = initial
+    while True:
+        yield delay * random.uniform(1 - jitter, 1 + jitter)
+        delay = min(delay * 2, maximum)
+
+
+class _Poller:
+    """One poll loop for a resource, fanning transitions out to subscribers.
+
+    The loop (see ``run``, which takes ``args``) is scheduled on creation.
+    """
+
+    def __init__(self, resource_id: str, *args: Any) -> None:
+        self.resource_id = resource_id
+        self.subscribers: list[TransitionCallback] = []
+        self.transitions: list[tuple[str, float]] = []
+        self.task: asyncio.Task[WaitOutcome] = asyncio.ensure_future(self.run(*args))
+
+    async def notify(self, state: str, elapsed: float) -> None:
+        self.transitions.append((state, elapsed))
+        for callback in list(self.subscribers):
+            try:
+                await callback(state, elapsed)
+            except Exception as e:
+                logger.debug("Transition callback failed", error=str(e))
+
+    async def run(
+        self,
+        fetch: Callable[[], Any],
+        targets: frozenset[str],
+        failures: frozenset[str],
+        state_of: Callable[[Any], str | None],
+        timeout_seconds: float,
+        initial_delay: float,
+        max_delay: float,
+    ) -> WaitOutcome:
+        started = time.monotonic()
+        deadline = started + timeout_seconds
+        delays = iter(backoff_delays(initial_delay, max_delay))
+        state: str | None = None
+        data: Any = None
+
+        while True:
+            elapsed = time.monotonic() - started
+            try:
+                response = await call_oci(fetch)
+            except Exception as e:
+                return WaitOutcome(
+                    "failed", state, f"Polling failed: {e}", elapsed,
+                    list(self.transitions), data, e,
+                )
+            data = getattr(response, "data", response)
+            observed = state_of(data)
+            if observed != state:
+                state = observed
+                await self.notify(state or "UNKNOWN", elapsed)
+
+            if state in targets:
+                return WaitOutcome(
+                    "succeeded", state, f"Reached {state}", elapsed, list(self.transitions), data
+                )
+            if state in failures:
+                return WaitOutcome(
+                    "failed", state, f"Entered {state}", elapsed, list(self.transitions), data
+                )
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return WaitOutcome(
+                    "timeout", state,
+                    f"Still {state} after {int(timeout_seconds)}s",
+                    time.monotonic() - started, list(self.transitions), data,
+                )
+            await asyncio.sleep(min(next(delays), remaining))
+
+
+async def wait_for_state(
+    fetch: Callable[[], Any],
+    resource_id: str,
+    targets: Iterable[str],
+    failures: Iterable[str] = (),
+    timeout_seconds: float | None = None,
+    state_of: Callable[[Any], str | None] | None = None,
+    on_transition: TransitionCallback | None = None,
+    initial_delay: float = POLL_INITIAL_DELAY,
+    max_delay: float = POLL_MAX_DELAY,
+) -> WaitOutcome:
+    """Poll a resource until it reaches one of ``targets``.
+
+    Concurrent waits on the same ``resource_id`` and ``targets`` share one
+    poll loop; each caller still gets its own timeout and transition
+    callback. A failed GET ends the wait with status 'failed'
+    and the exception in ``WaitOutcome.error``.
+
+    Args:
+        fetch: Synchronous SDK call returning a response (or model)
+        resource_id: OCID used to deduplicate waiters
+        targets: States that end the wait successfully
+        failures: States that end the wait as failed
+        timeout_seconds: Maximum wait (default: OCI_WAIT_TIMEOUT)
+        state_of: Extract the state from the model (default: lifecycle_state)
+        on_transition: Awaited with (state, elapsed seconds) on every change
+        initial_delay: First pause between polls
+        max_delay: Cap on the pause between polls
+
+    Returns:
+        WaitOutcome with status succeeded, failed, or timeout
+    """
+    timeout = timeout_seconds if timeout_seconds is not None else default_timeout()
+    target_set = frozenset(targets)
+    extract = state_of or (lambda data: getattr(data, "lifecycle_state", None))
+    started = time.monotonic()
+    deadline = started + timeout
+
+    while True:
+        remaining = deadline - time.monotonic()
+        poller = await _subscribe(
+            resource_id, target_set, on_transition,
+            partial(
+                _Poller, resource_id, fetch, target_set, frozenset(failures), extract,
+                remaining, initial_delay, max_delay,
+            ),
+        )
+        try:
+            # Shielded so one caller timing out or being cancelled never
+            # stops the poll loop other callers are waiting on
+            outcome = await asyncio.wait_for(asyncio.shield(poller.task), remaining)
+        except TimeoutError:
+            state = poller.transitions[-1][0] if poller.transitions else None
+            return WaitOutcome(
+                "timeout", state, f"Still {state} after {int(timeout)}s",
+                time.monotonic() - started, list(poller.transitions),
+            )
+        finally:
+            if on_transition is not None and on_transition in poller.subscribers:
+                poller.subscribers.remove(on_transition)
+
+        # A shared loop started by a caller with a shorter timeout ran out
+        # first; keep waiting on a fresh loop until our own deadline
+        if outcome.status == "timeout" and deadline - time.monotonic() > initial_delay:
+            continue
+        return outcome
+
+
+async def _subscribe(
+    resource_id: str,
+    targets: frozenset[str],
+    on_transition: TransitionCallback | None,
+    start: Callable[[], _Poller],
+) -> _Poller:
+    """Join the running poller for a resource, or start one."""
+    key = (resource_id, targets)
+    poller = _pollers.get(key)
+    if poller is None or poller.task.done():
+        poller = start()
+        _pollers[key] = poller
+
+        def _forget(_: asyncio.Task[WaitOutcome]) -> None:
+            if _pollers.get(key) is poller:
+                del _pollers[key]
+
+        poller.task.add_done_callback(_forget)
+    else:
+        logger.debug("Joining existing waiter", resource_id=resource_id)
+        # Replay what the shared poller has already seen
+        if on_transition is not None:
+            for state, elapsed in list(poller.transitions):
+                with suppress(Exception):
+                    await on_transition(state, elapsed)
+    if on_transition is not None:
+        poller.subscribers.append(on_transition)
+    return poller
+
+
+def report_transitions(
+    ctx: Any,
+    label: str,
+    timeout_seconds: float | None = None,
+    start: float = 0.5,
+    end: float = 0.9,
+) -> TransitionCallback:
+    """Transition callback streaming states to an MCP context as progress.
+
+    Progress moves from ``start`` to ``end`` with the elapsed share of the
+    timeout, so clients see both the state and how long the wait has run.
+    """
+    timeout = timeout_seconds if timeout_seconds is not None else default_timeout()
+
+    async def _report(state: str, elapsed: float) -> None:
+        progress = start + (end - start) * min(elapsed / timeout, 1.0) if timeout else start
+        with suppress(Exception):
+            await ctx.report_progress(
+                progress, total=1.0, message=f"{label} is {state} ({int(elapsed)}s)"
+            )
+
+    return _report
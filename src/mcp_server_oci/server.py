@@ -191,15 +191,17 @@ async def oci_list_domains(include_tool_count: bool = True) -> str:
             "description": "Instance management, shapes, and performance metrics",
             "tools": [
                 "list_instances", "start_instance", "stop_instance",
-                "restart_instance", "get_instance_metrics"
+                "restart_instance", "get_instance_metrics",
+                "oci_compute_bulk_instance_action"
             ],
         },
         "cost": {
             "description": "Cost analysis, budgeting, forecasting, and FinOps",
             "tools": [
                 "oci_cost_get_summary", "oci_cost_by_service",
-                "oci_cost_by_compartment", "oci_cost_monthly_trend",
-                "oci_cost_detect_anomalies"
+                "oci_cost_by_compartment", "oci_cost_by_tag", "oci_cost_monthly_trend",
+                "oci_cost_detect_anomalies", "oci_cost_budget_forecast",
+                "oci_cost_refresh"
             ],
         },
         "database": {
@@ -207,7 +209,7 @@ async def oci_list_domains(include_tool_count: bool = True) -> str:
             "tools": [
                 "oci_database_list_autonomous", "oci_database_get_autonomous",
                 "oci_database_start_autonomous", "oci_database_stop_autonomous",
-                "oci_database_list_dbsystems"
+                "oci_database_list_dbsystems", "oci_database_backup_report"
             ],
         },
         "network": {
@@ -215,7 +217,7 @@ async def oci_list_domains(include_tool_count: bool = True) -> str:
             "tools": [
                 "oci_network_list_vcns", "oci_network_get_vcn",
                 "oci_network_list_subnets", "oci_network_list_security_lists",
-                "oci_network_analyze_security"
+                "oci_network_analyze_security", "oci_network_check_path"
             ],
         },
         "security": {
@@ -223,7 +225,9 @@ async def oci_list_domains(include_tool_count: bool = True) -> str:
             "tools": [
                 "oci_security_list_users", "oci_security_get_user",
                 "oci_security_list_groups", "oci_security_list_policies",
-                "oci_security_list_cloud_guard_problems", "oci_security_audit"
+                "oci_security_who_can", "oci_security_what_can",
+                "oci_security_list_cloud_guard_problems", "oci_security_scan_credentials",
+                "oci_security_audit"
             ],
         },
         "observability": {
@@ -231,7 +235,7 @@ async def oci_list_domains(include_tool_count: bool = True) -> str:
             "tools": [
                 "oci_observability_get_metrics", "oci_observability_list_alarms",
                 "oci_observability_get_alarm", "oci_observability_query_logs",
-                "oci_observability_get_log_source"
+                "oci_observability_get_log_source", "oci_observability_top_utilization"
             ],
         },
         "skills": {
@@ -348,7 +352,7 @@ async def get_cache_stats() -> str:
     Get cache performance statistics for all cache tiers.
 
     Returns hit rates, eviction counts, and cache sizes for
-    static, config, operational, and metrics caches.
+    static, config, operational, metrics, and history caches.
 
     Useful for monitoring and debugging cache effectiveness.
     """
@@ -399,22 +403,25 @@ async def get_manifest() -> str:
                     "oci_security_list_users", "oci_security_list_policies"
                 ],
                 "tier3_heavy": [
-                    "oci_security_audit", "oci_skill_troubleshoot_instance"
+                    "oci_security_audit", "oci_security_scan_credentials",
+                    "oci_skill_troubleshoot_instance",
+                    "oci_observability_top_utilization"
                 ],
                 "tier4_admin": [
                     "oci_compute_start_instance",
                     "oci_compute_stop_instance",
-                    "oci_compute_restart_instance"
+                    "oci_compute_restart_instance",
+                    "oci_compute_bulk_instance_action"
                 ],
             }
         },
         domains=[
-            {"name": "compute", "tool_count": 5, "skill_count": 1},
-            {"name": "cost", "tool_count": 5, "skill_count": 0},
+            {"name": "compute", "tool_count": 6, "skill_count": 1},
+            {"name": "cost", "tool_count": 6, "skill_count": 0},
             {"name": "database", "tool_count": 5, "skill_count": 0},
-            {"name": "network", "tool_count": 5, "skill_count": 0},
-            {"name": "security", "tool_count": 6, "skill_count": 0},
-            {"name": "observability", "tool_count": 6, "skill_count": 0},
+            {"name": "network", "tool_count": 6, "skill_count": 0},
+            {"name": "security", "tool_count": 9, "skill_count": 0},
+            {"name": "observability", "tool_count": 7, "skill_count": 0},
             {"name": "discovery", "tool_count": 4, "skill_count": 0},
         ],
         environment_variables=[
@@ -668,7 +675,7 @@ async def stop_instance_alias(params: InstanceActionInput, ctx: Context) -> str:
         )
         previous_state = current.data.lifecycle_state
 
-        action = "RESET" if params.force else "STOP"
+        action = "STOP" if params.force else "SOFTSTOP"
         await asyncio.to_thread(
             compute_client.instance_action,
             params.instance_id,
@@ -25,6 +25,7 @@ from mcp_server_oci.core import (
     get_client_manager,
     get_logger,
 )
+from mcp_server_oci.core.metrics import fetch_metrics
 from mcp_server_oci.skills.discovery import register_skill_from_metadata
 from mcp_server_oci.skills.executor import SkillExecutor, register_skill
 
@@ -330,7 +331,7 @@ async def _get_instance_details(client_manager: Any, instance_id: str) -> dict[s
 async def _get_instance_metrics(
     client_manager: Any,
     instance_id: str,
-    compartment_id: str | None,
+    compartment_id: str,
     time_window: str,
 ) -> dict[str, Any]:
     """Fetch CPU and memory metrics for an instance."""
@@ -348,52 +349,23 @@ async def _get_instance_metrics(
         delta = timedelta(hours=1)
     start_time = end_time - delta
 
-    # CPU query
-    cpu_query = f'CpuUtilization[1m]{{resourceId = "{instance_id}"}}.mean()'
-    cpu_response = await asyncio.to_thread(
-        monitoring.summarize_metrics_data,
-        compartment_id=compartment_id,
-        summarize_metrics_data_details={
-            "namespace": "oci_computeagent",
-            "query": cpu_query,
-            "startTime": start_time.isoformat(),
-            "endTime": end_time.isoformat(),
-        },
+    batch = await fetch_metrics(
+        monitoring,
+        compartment_id,
+        namespace="oci_computeagent",
+        metric_names=["CpuUtilization", "MemoryUtilization"],
+        resource_ids=[instance_id],
+        start_time=start_time,
+        end_time=end_time,
+        raise_on_error=True,
     )
 
-    cpu_data = {"current": 0, "average": 0, "max": 0, "min": 100}
-    if cpu_response.data:
-        for item in cpu_response.data:
-            if item.aggregated_datapoints:
-                values = [dp.value for dp in item.aggregated_datapoints if dp.value is not None]
-                if values:
-                    cpu_data["current"] = round(values[-1], 2)
-                    cpu_data["average"] = round(sum(values) / len(values), 2)
-                    cpu_data["max"] = round(max(values), 2)
-                    cpu_data["min"] = round(min(values), 2)
-
-    # Memory query
-    memory_query = f'MemoryUtilization[1m]{{resourceId = "{instance_id}"}}.mean()'
-    memory_response = await asyncio.to_thread(
-        monitoring.summarize_metrics_data,
-        compartment_id=compartment_id,
-        summarize_metrics_data_details={
-            "namespace": "oci_computeagent",
-            "query": memory_query,
-            "startTime": start_time.isoformat(),
-            "endTime": end_time.isoformat(),
-        },
-    )
+    cpu_data: dict[str, float] = {"current": 0, "average": 0, "max": 0, "min": 100}
+    cpu_data.update(batch.get(instance_id, "CpuUtilization").stats())
 
-    memory_data = {"current": 0, "average": 0, "max": 0}
-    if memory_response.data:
-        for item in memory_response.data:
-            if item.aggregated_datapoints:
-                values = [dp.value for dp in item.aggregated_datapoints if dp.value is not None]
-                if values:
-                    memory_data["current"] = round(values[-1], 2)
-                    memory_data["average"] = round(sum(values) / len(values), 2)
-                    memory_data["max"] = round(max(values), 2)
+    memory_data: dict[str, float] = {"current": 0, "average": 0, "max": 0}
+    memory_stats = batch.get(instance_id, "MemoryUtilization").stats()
+    memory_data.update({k: v for k, v in memory_stats.items() if k in memory_data})
 
     return {
         "cpu": cpu_data,
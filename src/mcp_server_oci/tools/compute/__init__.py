@@ -2,7 +2,8 @@
 OCI Compute domain tools.
 
 Provides compute instance management capabilities including listing,
-getting details, and lifecycle actions (start/stop/restart).
+getting details, and lifecycle actions (start/stop/restart), individually
+or in bulk.
 """
 from __future__ import annotations
 
@@ -10,6 +11,10 @@ from mcp_server_oci.core.formatters import ResponseFormat
 
 from .formatters import ComputeFormatter
 from .models import (
+    BulkAction,
+    BulkInstanceActionInput,
+    BulkInstanceActionOutput,
+    BulkInstanceResult,
     GetInstanceInput,
     GetInstanceMetricsInput,
     InstanceActionInput,
@@ -30,15 +35,19 @@ __all__ = [
     "GetInstanceInput",
     "InstanceActionInput",
     "GetInstanceMetricsInput",
+    "BulkInstanceActionInput",
 
     # Enums
     "ResponseFormat",
     "LifecycleState",
+    "BulkAction",
 
     # Output models
     "InstanceSummary",
     "ListInstancesOutput",
     "InstanceActionOutput",
+    "BulkInstanceResult",
+    "BulkInstanceActionOutput",
 
     # Formatter
     "ComputeFormatter",
@@ -0,0 +1,349 @@
+"""
+Bulk power actions for compute instances.
+
+Targets are resolved either from explicit OCIDs (fetched concurrently) or
+from a paginated, filtered instance listing. Actions are issued with a
+bounded fan-out and, optionally, tracked through their work requests
+with the shared async waiter (``core.waiters``).
+"""
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import oci
+
+from mcp_server_oci.core.concurrency import call_oci, gather_bounded
+from mcp_server_oci.core.observability import get_logger
+from mcp_server_oci.core.waiters import TransitionCallback, wait_for_state
+
+from .models import BulkAction
+
+logger = get_logger("oci-mcp.compute.bulk")
+
+ProgressCallback = Callable[[int, int, str], Awaitable[None]]
+
+# action -> (OCI action, forced OCI action, target state). SOFTSTOP and
+# SOFTRESET shut the OS down gracefully; STOP and RESET power off at once.
+ACTION_MAP: dict[BulkAction, tuple[str, str, str]] = {
+    BulkAction.START: ("START", "START", "RUNNING"),
+    BulkAction.STOP: ("SOFTSTOP", "STOP", "STOPPED"),
+    BulkAction.RESTART: ("SOFTRESET", "RESET", "RUNNING"),
+}
+
+# States in which an instance is skipped instead of acted on
+SKIP_STATES: dict[BulkAction, frozenset[str]] = {
+    BulkAction.START: frozenset({"RUNNING", "STARTING"}),
+    BulkAction.STOP: frozenset({"STOPPED", "STOPPING"}),
+    BulkAction.RESTART: frozenset({"STOPPED", "STOPPING", "STARTING"}),
+}
+
+# Instances in these states cannot accept power actions at all
+UNACTIONABLE_STATES = frozenset({"TERMINATED", "TERMINATING", "PROVISIONING"})
+
+WORK_REQUEST_TERMINAL = frozenset({"SUCCEEDED", "FAILED", "CANCELED"})
+
+
+def resolve_action(action: BulkAction, force: bool) -> tuple[str, str]:
+    """Map a bulk action to its OCI instance action and target state."""
+    soft, hard, target_state = ACTION_MAP[action]
+    return (hard if force else soft), target_state
+
+
+def skip_reason(inst: dict[str, Any], action: BulkAction) -> str | None:
+    """Why an instance would be skipped for an action (None if acted on)."""
+    state = inst.get("lifecycle_state")
+    if state in UNACTIONABLE_STATES:
+        return f"Instance is {state}"
+    if state in SKIP_STATES[action]:
+        return f"Already {state}"
+    return None
+
+
+def plan_bulk_action(
+    targets: list[dict[str, Any]], action: BulkAction, force: bool = False
+) -> list[dict[str, Any]]:
+    """Per-instance results a bulk action would produce, without acting."""
+    oci_action, _ = resolve_action(action, force)
+    results = []
+    for inst in targets:
+        reason = skip_reason(inst, action)
+        results.append({
+            "instance_id": inst["id"],
+            "display_name": inst.get("display_name"),
+            "previous_state": inst.get("lifecycle_state"),
+            "status": "planned" if reason is None else "skipped",
+            "work_request_id": None,
+            "message": f"Would send {oci_action}" if reason is None else reason,
+        })
+    return results
+
+
+async def resolve_targets(
+    compute_client: Any,
+    instance_ids: list[str] | None = None,
+    compartment_id: str | None = None,
+    display_name: str | None = None,
+    lifecycle_state: str | None = None,
+    limit: int = 10,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Resolve bulk action targets.
+
+    Args:
+        compute_client: OCI ComputeClient
+        instance_ids: Explicit instance OCIDs (takes precedence over filters)
+        compartment_id: Compartment to list instances from
+        display_name: Case-insensitive partial display name filter
+        lifecycle_state: Lifecycle state filter
+        limit: Maximum concurrent get_instance calls
+
+    Returns:
+        Tuple of (resolved instances, lookup failures)
+    """
+    if instance_ids:
+        responses = await gather_bounded(
+            (call_oci(compute_client.get_instance, iid) for iid in instance_ids),
+            limit=limit,
+            return_exceptions=True,
+        )
+        targets: list[dict[str, Any]] = []
+        failures: list[dict[str, Any]] = []
+        for iid, response in zip(instance_ids, responses, strict=True):
+            if isinstance(response, BaseException):
+                failures.append({
+                    "instance_id": iid,
+                    "status": "failed",
+                    "message": f"Lookup failed: {_error_message(response)}",
+                })
+            else:
+                targets.append(_instance_dict(response.data))
+        return targets, failures
+
+    kwargs: dict[str, Any] = {"compartment_id": compartment_id}
+    if lifecycle_state:
+        kwargs["lifecycle_state"] = lifecycle_state
+    response = await call_oci(
+        oci.pagination.list_call_get_all_results,
+        compute_client.list_instances,
+        **kwargs,
+    )
+
+    name_filter = display_name.lower() if display_name else None
+    targets = [
+        _instance_dict(inst)
+        for inst in response.data
+        if not name_filter or name_filter in (inst.display_name or "").lower()
+    ]
+    return targets, []
+
+
+async def run_bulk_action(
+    compute_client: Any,
+    work_request_client: Any,
+    targets: list[dict[str, Any]],
+    action: BulkAction,
+    force: bool = False,
+    limit: int = 10,
+    wait_for_completion: bool = False,
+    timeout_seconds: float = 900,
+    progress: ProgressCallback | None = None,
+) -> list[dict[str, Any]]:
+    """Apply a power action to many instances concurrently.
+
+    At most ``limit`` instances are in flight at once. Each instance reports
+    progress as soon as it finishes, regardless of ordering, and while
+    waiting for completion every state transition it goes through.
+
+    Returns:
+        Per-instance result dicts in target order
+    """
+    oci_action, target_state = resolve_action(action, force)
+    total = len(targets)
+    done = 0
+
+    async def _one(inst: dict[str, Any]) -> dict[str, Any]:
+        nonlocal done
+        label = inst.get("display_name") or inst["id"]
+
+        async def _transition(state: str, elapsed: float) -> None:
+            if progress:
+                await progress(done, total, f"{label} is {state} ({int(elapsed)}s)")
+
+        result = await _act_on_instance(
+            compute_client,
+            work_request_client,
+            inst,
+            action,
+            oci_action,
+            target_state,
+            wait_for_completion,
+            timeout_seconds,
+            on_transition=_transition if progress else None,
+        )
+        done += 1
+        if progress:
+            await progress(done, total, f"{label}: {result['status']}")
+        return result
+
+    return await gather_bounded((_one(inst) for inst in targets), limit=limit)
+
+
+def summarize_results(results: list[dict[str, Any]]) -> dict[str, int]:
+    """Count results by status."""
+    summary: dict[str, int] = {}
+    for result in results:
+        summary[result["status"]] = summary.get(result["status"], 0) + 1
+    return summary
+
+
+async def wait_for_work_request(
+    work_request_client: Any,
+    work_request_id: str,
+    timeout_seconds: float,
+    compute_client: Any | None = None,
+    instance_id: str | None = None,
+    target_state: str | None = None,
+    on_transition: TransitionCallback | None = None,
+) -> tuple[str, str]:
+    """Wait for a work request to reach a terminal status.
+
+    Polls through the shared async waiter. If the work request cannot be
+    read, falls back to waiting on the instance lifecycle state for the
+    rest of the timeout.
+
+    Returns:
+        Tuple of (status, message) where status is succeeded, failed, or timeout
+    """
+    outcome = await wait_for_state(
+        lambda: work_request_client.get_work_request(work_request_id),
+        work_request_id,
+        targets={"SUCCEEDED"},
+        failures=WORK_REQUEST_TERMINAL - {"SUCCEEDED"},
+        timeout_seconds=timeout_seconds,
+        state_of=lambda data: data.status,
+        on_transition=on_transition,
+    )
+    if outcome.error is None:
+        if outcome.status == "succeeded":
+            return "succeeded", "Work request succeeded"
+        if outcome.status == "failed":
+            return "failed", f"Work request {(outcome.state or 'failed').lower()}"
+        return "timeout", f"Still in progress after {int(timeout_seconds)}s"
+
+    if compute_client is None or not instance_id or not target_state:
+        return "failed", f"Polling failed: {_error_message(outcome.error)}"
+    logger.debug(
+        "Work request unavailable, polling instance state",
+        work_request_id=work_request_id,
+        error=str(outcome.error),
+    )
+    return await wait_for_instance_state(
+        compute_client,
+        instance_id,
+        target_state,
+        max(timeout_seconds - outcome.elapsed, 1.0),
+        on_transition=on_transition,
+    )
+
+
+async def wait_for_instance_state(
+    compute_client: Any,
+    instance_id: str,
+    target_state: str,
+    timeout_seconds: float,
+    on_transition: TransitionCallback | None = None,
+) -> tuple[str, str]:
+    """Wait for an instance to reach the target lifecycle state."""
+    outcome = await wait_for_state(
+        lambda: compute_client.get_instance(instance_id),
+        instance_id,
+        targets={target_state},
+        failures=UNACTIONABLE_STATES - {"PROVISIONING"},
+        timeout_seconds=timeout_seconds,
+        on_transition=on_transition,
+    )
+    if outcome.error is not None:
+        return "failed", f"Polling failed: {_error_message(outcome.error)}"
+    if outcome.status == "succeeded":
+        return "succeeded", f"Instance reached {target_state}"
+    if outcome.status == "failed":
+        return "failed", f"Instance is {outcome.state}"
+    return "timeout", f"Still in progress after {int(timeout_seconds)}s"
+
+
+async def _act_on_instance(
+    compute_client: Any,
+    work_request_client: Any,
+    inst: dict[str, Any],
+    action: BulkAction,
+    oci_action: str,
+    target_state: str,
+    wait_for_completion: bool,
+    timeout_seconds: float,
+    on_transition: TransitionCallback | None = None,
+) -> dict[str, Any]:
+    """Issue a single instance action and optionally wait for it.
+
+    ``on_transition`` is passed to the waiter, so it sees every state the
+    work request (or instance) goes through.
+    """
+    state = inst.get("lifecycle_state")
+    result: dict[str, Any] = {
+        "instance_id": inst["id"],
+        "display_name": inst.get("display_name"),
+        "previous_state": state,
+        "work_request_id": None,
+    }
+
+    reason = skip_reason(inst, action)
+    if reason is not None:
+        result.update(status="skipped", message=reason)
+        return result
+
+    try:
+        response = await call_oci(compute_client.instance_action, inst["id"], oci_action)
+    except Exception as e:
+        result.update(status="failed", message=_error_message(e))
+        return result
+
+    work_request_id = (response.headers or {}).get("opc-work-request-id")
+    result["work_request_id"] = work_request_id
+
+    if not wait_for_completion:
+        result.update(status="initiated", message=f"{oci_action} accepted")
+        return result
+
+    if work_request_id:
+        status, message = await wait_for_work_request(
+            work_request_client,
+            work_request_id,
+            timeout_seconds,
+            compute_client=compute_client,
+            instance_id=inst["id"],
+            target_state=target_state,
+            on_transition=on_transition,
+        )
+    else:
+        status, message = await wait_for_instance_state(
+            compute_client, inst["id"], target_state, timeout_seconds,
+            on_transition=on_transition,
+        )
+    result.update(status=status, message=message)
+    return result
+
+
+def _instance_dict(inst: Any) -> dict[str, Any]:
+    """Reduce an OCI Instance model to the fields bulk actions need."""
+    return {
+        "id": inst.id,
+        "display_name": inst.display_name,
+        "lifecycle_state": inst.lifecycle_state,
+        "compartment_id": inst.compartment_id,
+    }
+
+
+def _error_message(e: BaseException) -> str:
+    """Extract a short error message from an OCI or generic exception."""
+    if isinstance(e, oci.exceptions.ServiceError):
+        return f"{e.status} {e.code}: {e.message}"
+    return str(e)
@@ -141,8 +141,12 @@ class ComputeFormatter:
         success = data.get("success", False)
         action = data.get("action", "action")
 
-        if success:
-            md = f"# ✅ Instance {action.title()} Initiated\n\n"
+        wait_status = data.get("wait_status")
+        if wait_status == "timeout":
+            md = f"# ⏳ Instance {action.title()} Still In Progress\n\n"
+        elif success:
+            outcome = "Completed" if wait_status else "Initiated"
+            md = f"# ✅ Instance {action.title()} {outcome}\n\n"
         else:
             md = f"# ❌ Instance {action.title()} Failed\n\n"
 
@@ -152,10 +156,55 @@ class ComputeFormatter:
             md += f"**Previous State:** {data['previous_state']}\n"
 
         md += f"**Target State:** {data.get('target_state', '—')}\n"
+        if data.get("work_request_id"):
+            md += f"**Work Request:** `{data['work_request_id']}`\n"
         md += f"\n{data.get('message', '')}\n"
 
         return md
 
+    @staticmethod
+    def bulk_action_markdown(data: dict) -> str:
+        """Format bulk action results as markdown."""
+        action = data.get("action", "action")
+        title = f"Bulk Instance {action.title()}"
+        if data.get("dry_run"):
+            title += " (Dry Run)"
+        md = MarkdownFormatter.header(title, 1)
+
+        results = data.get("results", [])
+        if not results:
+            md += "*No instances matched the criteria.*\n"
+            return md
+
+        status_icons = {
+            "succeeded": "✅",
+            "initiated": "🟡",
+            "planned": "📝",
+            "skipped": "⏭️",
+            "timeout": "⏳",
+            "failed": "❌",
+        }
+
+        summary = data.get("summary", {})
+        summary_str = " | ".join(
+            f"{status_icons.get(s, '⚪')} {s}: {c}" for s, c in sorted(summary.items())
+        )
+        md += f"**Targets:** {data.get('total', len(results))} | {summary_str}\n\n"
+
+        headers = ["Name", "Previous State", "Status", "Detail"]
+        rows = []
+        for result in results:
+            status = result.get("status", "unknown")
+            rows.append([
+                result.get("display_name") or result.get("instance_id", "—"),
+                result.get("previous_state") or "—",
+                f"{status_icons.get(status, '⚪')} {status}",
+                result.get("message") or "—",
+            ])
+        md += MarkdownFormatter.table(headers, rows)
+
+        return md
+
     @staticmethod
     def metrics_markdown(data: dict) -> str:
         """Format instance metrics as markdown."""
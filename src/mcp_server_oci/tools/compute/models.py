@@ -42,6 +42,10 @@ class ListInstancesInput(BaseModel):
         default=None,
         description="Compartment OCID (defaults to COMPARTMENT_OCID env var)"
     )
+    include_subcompartments: bool = Field(
+        default=False,
+        description="Also list instances in every compartment below compartment_id"
+    )
     lifecycle_state: LifecycleState | None = Field(
         default=None,
         description="Filter by lifecycle state (RUNNING, STOPPED, etc.)"
@@ -122,6 +126,12 @@ class InstanceActionInput(BaseModel):
         default=False,
         description="Wait for the instance to reach target state"
     )
+    timeout_seconds: int = Field(
+        default=900,
+        description="Maximum time to wait when wait_for_state is set",
+        ge=30,
+        le=3600
+    )
     response_format: ResponseFormat = Field(
         default=ResponseFormat.MARKDOWN,
         description="Output format"
@@ -135,6 +145,86 @@ class InstanceActionInput(BaseModel):
         return v
 
 
+class BulkAction(str, Enum):
+    """Power actions supported by bulk instance operations."""
+    START = "start"
+    STOP = "stop"
+    RESTART = "restart"
+
+
+class BulkInstanceActionInput(BaseModel):
+    """Input for power actions on many instances at once."""
+    model_config = ConfigDict(
+        str_strip_whitespace=True,
+        validate_assignment=True,
+        extra='forbid'
+    )
+
+    action: BulkAction = Field(
+        ...,
+        description="Action to perform: 'start', 'stop', or 'restart'"
+    )
+    instance_ids: list[str] | None = Field(
+        default=None,
+        description="Instance OCIDs to act on. If omitted, targets are selected by filter",
+        max_length=500
+    )
+    compartment_id: str | None = Field(
+        default=None,
+        description="Compartment OCID for filter-based selection "
+                    "(defaults to COMPARTMENT_OCID env var)"
+    )
+    display_name: str | None = Field(
+        default=None,
+        description="Filter targets by display name (partial match)"
+    )
+    lifecycle_state: LifecycleState | None = Field(
+        default=None,
+        description="Filter targets by lifecycle state (e.g., RUNNING)"
+    )
+    force: bool = Field(
+        default=False,
+        description="Force the action (hard stop / hard reset)"
+    )
+    max_concurrency: int = Field(
+        default=10,
+        description="Maximum instances acted on concurrently",
+        ge=1,
+        le=50
+    )
+    wait_for_completion: bool = Field(
+        default=False,
+        description="Poll the resulting work requests until they finish"
+    )
+    timeout_seconds: int = Field(
+        default=900,
+        description="Maximum time to wait for work requests when wait_for_completion is set",
+        ge=30,
+        le=3600
+    )
+    dry_run: bool = Field(
+        default=False,
+        description="Only resolve and report the target instances, do not act"
+    )
+    response_format: ResponseFormat = Field(
+        default=ResponseFormat.MARKDOWN,
+        description="Output format"
+    )
+
+    @field_validator('instance_ids')
+    @classmethod
+    def validate_instance_ids(cls, v: list[str] | None) -> list[str] | None:
+        if v is None:
+            return v
+        for instance_id in v:
+            if not instance_id.startswith('ocid1.instance.'):
+                raise ValueError(
+                    f"Invalid instance OCID: {instance_id}. Expected format: ocid1.instance.oc1..."
+                )
+        # Preserve order, drop duplicates
+        return list(dict.fromkeys(v))
+
+
 class GetInstanceMetricsInput(BaseModel):
     """Input for getting instance metrics."""
     model_config = ConfigDict(
@@ -210,6 +300,25 @@ class InstanceActionOutput(BaseModel):
     message: str = Field(description="Status message")
 
 
+class BulkInstanceResult(BaseModel):
+    """Per-instance outcome of a bulk action."""
+    instance_id: str = Field(description="Instance OCID")
+    display_name: str | None = Field(default=None, description="Display name")
+    previous_state: str | None = Field(default=None, description="State before action")
+    status: str = Field(description="initiated, succeeded, failed, skipped, or planned")
+    work_request_id: str | None = Field(default=None, description="Work request OCID")
+    message: str | None = Field(default=None, description="Detail or error message")
+
+
+class BulkInstanceActionOutput(BaseModel):
+    """Output for bulk instance actions."""
+    action: str = Field(description="Action performed")
+    dry_run: bool = Field(default=False, description="Whether this was a dry run")
+    total: int = Field(description="Number of targeted instances")
+    summary: dict[str, int] = Field(description="Counts by status")
+    results: list[BulkInstanceResult] = Field(description="Per-instance results")
+
+
 class MetricDataPoint(BaseModel):
     """Single metric data point."""
     timestamp: str = Field(description="ISO timestamp")
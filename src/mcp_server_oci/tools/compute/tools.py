@@ -5,16 +5,30 @@ Uses FastMCP patterns with Pydantic models and proper error handling.
 """
 import asyncio
 import os
+from contextlib import suppress
 from typing import Any
 
 from fastmcp import Context, FastMCP
 
 from mcp_server_oci.core.client import get_client_manager
+from mcp_server_oci.core.compartments import get_compartment_tree
+from mcp_server_oci.core.concurrency import call_oci, gather_bounded
 from mcp_server_oci.core.errors import format_error_response, handle_oci_error
 from mcp_server_oci.core.formatters import ResponseFormat
-
+from mcp_server_oci.core.metrics import fetch_metrics
+from mcp_server_oci.core.waiters import report_transitions
+
+from .bulk import (
+    plan_bulk_action,
+    resolve_targets,
+    run_bulk_action,
+    summarize_results,
+    wait_for_instance_state,
+    wait_for_work_request,
+)
 from .formatters import ComputeFormatter
 from .models import (
+    BulkInstanceActionInput,
     GetInstanceInput,
     InstanceActionInput,
     ListInstancesInput,
@@ -39,10 +53,12 @@ def register_compute_tools(mcp: FastMCP) -> None:
 
         Retrieves instances with their current state, shape, and optionally
         IP addresses. Supports filtering by lifecycle state and display name.
+        With include_subcompartments, the compartment subtree is resolved from
+        the cached compartment tree and listed concurrently.
 
         Args:
-            params: ListInstancesInput with compartment_id, lifecycle_state,
-                   limit, offset, and response_format
+            params: ListInstancesInput with compartment_id, include_subcompartments,
+                   lifecycle_state, limit, offset, and response_format
 
         Returns:
             Instance list in requested format (markdown table or json)
@@ -63,20 +79,31 @@ def register_compute_tools(mcp: FastMCP) -> None:
                 )
                 return format_error_response(msg, params.response_format.value)
 
+            compartment_ids = [compartment_id]
+            if params.include_subcompartments:
+                tree = await get_compartment_tree(client_mgr.identity, client_mgr.tenancy_id)
+                if compartment_id in tree:
+                    compartment_ids = tree.subtree(compartment_id)
+
             # Build query parameters
-            kwargs = {"compartment_id": compartment_id, "limit": params.limit}
+            kwargs: dict[str, Any] = {"limit": params.limit}
             if params.lifecycle_state:
                 kwargs["lifecycle_state"] = params.lifecycle_state.value
 
-            # Execute API call
-            response = await asyncio.to_thread(
-                compute_client.list_instances,
-                **kwargs
+            # Execute API calls, one per compartment
+            responses = await gather_bounded(
+                call_oci(compute_client.list_instances, compartment_id=cid, **kwargs)
+                for cid in compartment_ids
+            )
+            found = [inst for response in responses for inst in response.data]
+            has_more = (
+                any(len(response.data) == params.limit for response in responses)
+                or len(found) > params.limit
             )
 
             # Process instances
             instances = []
-            for inst in response.data:
+            for inst in found[:params.limit]:
                 instance_data = {
                     "id": inst.id,
                     "display_name": inst.display_name,
@@ -102,7 +129,6 @@ def register_compute_tools(mcp: FastMCP) -> None:
                 instances = await _fetch_instance_ips(client_mgr, instances)
 
             # Build output
-            has_more = len(response.data) == params.limit
             next_offset = params.offset + len(instances) if has_more else None
             output_data = {
                 "total": len(instances),
@@ -227,7 +253,7 @@ def register_compute_tools(mcp: FastMCP) -> None:
             previous_state = current.data.lifecycle_state
 
             # Perform action
-            await asyncio.to_thread(
+            response = await asyncio.to_thread(
                 compute_client.instance_action,
                 params.instance_id,
                 "START"
@@ -241,6 +267,8 @@ def register_compute_tools(mcp: FastMCP) -> None:
                 "target_state": "RUNNING",
                 "message": "Start action initiated successfully. Instance will be running shortly."
             }
+            if params.wait_for_state:
+                await _wait_for_action(client_mgr, params, response, "RUNNING", result, ctx)
 
             if params.response_format == ResponseFormat.JSON:
                 return ComputeFormatter.to_json(result)
@@ -265,7 +293,8 @@ def register_compute_tools(mcp: FastMCP) -> None:
         """Stop a running compute instance.
 
         Initiates the stop action on an instance. Requires ALLOW_MUTATIONS=true.
-        Use force=true for a hard stop (RESET action).
+        Use force=true for a hard stop (STOP action) instead of a graceful
+        shutdown (SOFTSTOP).
 
         Args:
             params: InstanceActionInput with instance_id and force option
@@ -291,8 +320,8 @@ def register_compute_tools(mcp: FastMCP) -> None:
             previous_state = current.data.lifecycle_state
 
             # Perform action
-            action = "RESET" if params.force else "STOP"
-            await asyncio.to_thread(
+            action = "STOP" if params.force else "SOFTSTOP"
+            response = await asyncio.to_thread(
                 compute_client.instance_action,
                 params.instance_id,
                 action
@@ -307,6 +336,8 @@ def register_compute_tools(mcp: FastMCP) -> None:
                 "target_state": "STOPPED",
                 "message": f"{stop_type} stop initiated. Instance will be stopped shortly.",
             }
+            if params.wait_for_state:
+                await _wait_for_action(client_mgr, params, response, "STOPPED", result, ctx)
 
             if params.response_format == ResponseFormat.JSON:
                 return ComputeFormatter.to_json(result)
@@ -358,7 +389,7 @@ def register_compute_tools(mcp: FastMCP) -> None:
 
             # Perform action
             action = "RESET" if params.force else "SOFTRESET"
-            await asyncio.to_thread(
+            response = await asyncio.to_thread(
                 compute_client.instance_action,
                 params.instance_id,
                 action
@@ -373,6 +404,8 @@ def register_compute_tools(mcp: FastMCP) -> None:
                 "target_state": "RUNNING",
                 "message": f"{restart_type} restart initiated. Instance will be running shortly.",
             }
+            if params.wait_for_state:
+                await _wait_for_action(client_mgr, params, response, "RUNNING", result, ctx)
 
             if params.response_format == ResponseFormat.JSON:
                 return ComputeFormatter.to_json(result)
@@ -383,10 +416,145 @@ def register_compute_tools(mcp: FastMCP) -> None:
             return format_error_response(error, params.response_format.value)
 
 
+    @mcp.tool(
+        name="oci_compute_bulk_instance_action",
+        annotations={
+            "title": "Bulk Instance Power Action",
+            "readOnlyHint": False,
+            "destructiveHint": False,
+            "idempotentHint": True,
+            "openWorldHint": True
+        }
+    )
+    async def bulk_instance_action(params: BulkInstanceActionInput, ctx: Context) -> str:
+        """Start, stop, or restart many compute instances at once.
+
+        Targets are given as explicit instance OCIDs or selected by compartment,
+        display name, and lifecycle state filters. Actions run concurrently up to
+        max_concurrency; instances already in the target state are skipped.
+        Progress is reported per instance. Requires ALLOW_MUTATIONS=true unless
+        dry_run is set.
+
+        Args:
+            params: BulkInstanceActionInput with action, targets, and options
+
+        Returns:
+            Per-instance results with a status summary
+
+        Example:
+            {"action": "stop", "compartment_id": "ocid1.compartment...",
+             "lifecycle_state": "RUNNING", "display_name": "dev-"}
+        """
+        if not params.dry_run and os.getenv("ALLOW_MUTATIONS", "").lower() != "true":
+            return format_error_response(
+                "Mutations not allowed. Set ALLOW_MUTATIONS=true to enable.",
+                params.response_format.value
+            )
+
+        try:
+            client_mgr = get_client_manager()
+            compute_client = client_mgr.compute
+
+            compartment_id = params.compartment_id or os.getenv("COMPARTMENT_OCID")
+            if not params.instance_ids and not compartment_id:
+                msg = (
+                    "Provide instance_ids, or a compartment_id "
+                    "(or COMPARTMENT_OCID env var) to select instances by filter."
+                )
+                return format_error_response(msg, params.response_format.value)
+
+            targets, failures = await resolve_targets(
+                compute_client,
+                instance_ids=params.instance_ids,
+                compartment_id=compartment_id,
+                display_name=params.display_name,
+                lifecycle_state=(
+                    params.lifecycle_state.value if params.lifecycle_state else None
+                ),
+                limit=params.max_concurrency,
+            )
+
+            if params.dry_run:
+                results = plan_bulk_action(targets, params.action, params.force)
+            else:
+                async def _progress(done: int, total: int, message: str) -> None:
+                    with suppress(Exception):
+                        await ctx.report_progress(done, total=total, message=message)
+
+                results = await run_bulk_action(
+                    compute_client,
+                    client_mgr.work_requests,
+                    targets,
+                    params.action,
+                    force=params.force,
+                    limit=params.max_concurrency,
+                    wait_for_completion=params.wait_for_completion,
+                    timeout_seconds=params.timeout_seconds,
+                    progress=_progress,
+                )
+
+            results = failures + results
+            output_data = {
+                "action": params.action.value + (" (forced)" if params.force else ""),
+                "dry_run": params.dry_run,
+                "total": len(results),
+                "summary": summarize_results(results),
+                "results": results,
+            }
+
+            if params.response_format == ResponseFormat.JSON:
+                return ComputeFormatter.to_json(output_data)
+            return ComputeFormatter.bulk_action_markdown(output_data)
+
+        except Exception as e:
+            error = handle_oci_error(e, "running bulk instance action")
+            return format_error_response(error, params.response_format.value)
+
+
 # =============================================================================
 # Helper Functions
 # =============================================================================
 
+async def _wait_for_action(
+    client_mgr: Any,
+    params: InstanceActionInput,
+    response: Any,
+    target_state: str,
+    result: dict[str, Any],
+    ctx: Context,
+) -> None:
+    """Wait for an instance action and record the outcome in ``result``.
+
+    Tracks the action's work request (so a restart that never leaves
+    RUNNING is still observed), falling back to the instance state.
+    """
+    work_request_id = (getattr(response, "headers", None) or {}).get("opc-work-request-id")
+    if work_request_id:
+        status, message = await wait_for_work_request(
+            client_mgr.work_requests,
+            work_request_id,
+            params.timeout_seconds,
+            compute_client=client_mgr.compute,
+            instance_id=params.instance_id,
+            target_state=target_state,
+            on_transition=report_transitions(ctx, "Work request", params.timeout_seconds),
+        )
+    else:
+        status, message = await wait_for_instance_state(
+            client_mgr.compute,
+            params.instance_id,
+            target_state,
+            params.timeout_seconds,
+            on_transition=report_transitions(ctx, "Instance", params.timeout_seconds),
+        )
+    result.update(
+        success=status == "succeeded",
+        wait_status=status,
+        work_request_id=work_request_id,
+        message=message,
+    )
+
+
 async def _fetch_instance_ips(
     client_mgr: Any,
     instances: list[dict[str, Any]]
@@ -434,48 +602,37 @@ async def _fetch_instance_metrics(
     compartment_id: str
 ) -> dict[str, Any]:
     """Fetch recent metrics for an instance."""
-    from datetime import datetime, timedelta
+    return (await _fetch_instances_metrics(client_mgr, [instance_id], compartment_id))[instance_id]
 
-    import oci
-
-    metrics = {}
-
-    try:
-        monitoring_client = client_mgr.get_client(oci.monitoring.MonitoringClient)
 
-        end_time = datetime.utcnow()
-        start_time = end_time - timedelta(hours=1)
-
-        metric_names = ["CpuUtilization", "MemoryUtilization"]
+async def _fetch_instances_metrics(
+    client_mgr: Any,
+    instance_ids: list[str],
+    compartment_id: str
+) -> dict[str, dict[str, Any]]:
+    """Fetch recent metrics for many instances with batched queries."""
+    from datetime import UTC, datetime, timedelta
 
-        for metric_name in metric_names:
-            try:
-                query = f'{metric_name}[1h]{{resourceId="{instance_id}"}}.mean()'
-
-                response = await asyncio.to_thread(
-                    monitoring_client.summarize_metrics_data,
-                    compartment_id,
-                    oci.monitoring.models.SummarizeMetricsDataDetails(
-                        namespace="oci_computeagent",
-                        query=query,
-                        start_time=start_time,
-                        end_time=end_time
-                    )
-                )
+    metrics: dict[str, dict[str, Any]] = {iid: {} for iid in instance_ids}
 
-                if response.data:
-                    values = [dp.value for dp in response.data[0].aggregated_datapoints]
-                    if values:
-                        metrics[metric_name] = {
-                            "statistics": {
-                                "average": sum(values) / len(values),
-                                "max": max(values),
-                                "min": min(values),
-                            }
-                        }
-            except Exception:
-                # Skip individual metric errors
-                pass
+    try:
+        end_time = datetime.now(UTC)
+        batch = await fetch_metrics(
+            client_mgr.monitoring,
+            compartment_id,
+            namespace="oci_computeagent",
+            metric_names=["CpuUtilization", "MemoryUtilization"],
+            resource_ids=instance_ids,
+            start_time=end_time - timedelta(hours=1),
+            end_time=end_time,
+            interval="1h",
+        )
+        for iid in instance_ids:
+            for metric_name in ("CpuUtilization", "MemoryUtilization"):
+                stats = batch.get(iid, metric_name).stats(digits=None)
+                if stats:
+                    stats.pop("current")
+                    metrics[iid][metric_name] = {"statistics": stats}
 
     except Exception:
         # Return empty metrics if monitoring fails
@@ -4,6 +4,7 @@ OCI Cost Domain Tools
 Tools for cost analysis, budgeting, and FinOps operations.
 """
 
+from .store import CostStore, get_cost_store
 from .tools import register_cost_tools
 
-__all__ = ["register_cost_tools"]
+__all__ = ["CostStore", "get_cost_store", "register_cost_tools"]
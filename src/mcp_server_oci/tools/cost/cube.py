@@ -0,0 +1,225 @@
+"""
+Cost cube shared by the cost tools.
+
+A window of daily cost is loaded from the local store once and encoded as
+a sparse (day, service, compartment) cube: integer-coded coordinate
+arrays plus a cost array, one entry per non-empty cell. Every tool then
+rolls up, slices and ranks from the cube with ``np.bincount`` in
+O(cells) instead of re-walking usage items with nested dict loops.
+
+Cubes are cached per (tenancy, window, store version), so follow-up
+questions over the same period reuse the same arrays until the store
+syncs new data.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any
+
+import numpy as np
+
+from mcp_server_oci.core.cache import TTLCache
+
+# Cubes hold NumPy arrays, so they stay in a process-local cache rather
+# than a (possibly Redis-backed) shared tier
+_cube_cache = TTLCache(max_size=16, default_ttl=3600)
+
+AXES = ("day", "service", "compartment", "month")
+
+
+@dataclass
+class CostCube:
+    """Sparse daily cost cube over days x services x compartments."""
+    start: date
+    n_days: int
+    services: list[str]
+    compartments: list[str]
+    compartment_names: list[str]
+    day: np.ndarray          # int32 day offset from ``start`` per cell
+    service: np.ndarray      # int32 service code per cell
+    compartment: np.ndarray  # int32 compartment code per cell
+    cost: np.ndarray         # float64 cost per cell
+    currency: str = "USD"
+    _month: np.ndarray | None = field(default=None, repr=False)
+    _months: list[str] | None = field(default=None, repr=False)
+
+    @classmethod
+    def from_records(cls, days: Sequence[date], records: Iterable[Any]) -> CostCube:
+        """Encode DAILY records grouped by service and compartment.
+
+        Args:
+            days: Days covered by the window (defines the day axis)
+            records: Items with time_usage_started, service, compartment_id,
+                compartment_name, computed_amount, and currency
+        """
+        start = days[0] if days else date.today()
+        services: dict[str, int] = {}
+        compartments: dict[str, int] = {}
+        names: list[str] = []
+        day_codes: list[int] = []
+        service_codes: list[int] = []
+        compartment_codes: list[int] = []
+        costs: list[float] = []
+        currency = None
+        origin = start.toordinal()
+
+        for record in records:
+            service = record.service or "Unknown"
+            svc = services.get(service)
+            if svc is None:
+                svc = services[service] = len(services)
+            comp_id = record.compartment_id or "unknown"
+            comp = compartments.get(comp_id)
+            if comp is None:
+                comp = compartments[comp_id] = len(compartments)
+                names.append(getattr(record, "compartment_name", None) or "")
+            day_codes.append(record.time_usage_started.toordinal() - origin)
+            service_codes.append(svc)
+            compartment_codes.append(comp)
+            costs.append(float(record.computed_amount or 0))
+            currency = currency or getattr(record, "currency", None)
+
+        return cls(
+            start=start,
+            n_days=len(days),
+            services=list(services),
+            compartments=list(compartments),
+            compartment_names=names,
+            day=np.asarray(day_codes, dtype=np.int32),
+            service=np.asarray(service_codes, dtype=np.int32),
+            compartment=np.asarray(compartment_codes, dtype=np.int32),
+            cost=np.asarray(costs, dtype=np.float64),
+            currency=currency or "USD",
+        )
+
+    # -------------------------------------------------------------------------
+    # Axes
+    # -------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return int(self.cost.size)
+
+    @property
+    def days(self) -> list[date]:
+        return [self.start + timedelta(days=i) for i in range(self.n_days)]
+
+    @property
+    def months(self) -> list[str]:
+        """Calendar months (YYYY-MM) covered by the day axis."""
+        self._month_index()
+        return self._months or []
+
+    def total(self, mask: np.ndarray | None = None) -> float:
+        """Total cost, optionally over a cell mask."""
+        return float(self.cost.sum() if mask is None else self.cost[mask].sum())
+
+    def mask(
+        self,
+        services: Iterable[str] | None = None,
+        compartments: Iterable[str] | None = None,
+        first_day: date | None = None,
+        last_day: date | None = None,
+    ) -> np.ndarray:
+        """Boolean cell mask for a slice of the cube."""
+        keep = np.ones(self.cost.size, dtype=bool)
+        if services is not None:
+            keep &= np.isin(self.service, self._codes(self.services, services))
+        if compartments is not None:
+            keep &= np.isin(self.compartment, self._codes(self.compartments, compartments))
+        if first_day is not None:
+            keep &= self.day >= (first_day - self.start).days
+        if last_day is not None:
+            keep &= self.day <= (last_day - self.start).days
+        return keep
+
+    def rollup(self, *axes: str, mask: np.ndarray | None = None) -> np.ndarray:
+        """Dense cost totals over the given axes.
+
+        Example:
+            cube.rollup("service")                 # cost per service
+            cube.rollup("day", "service")          # (n_days, n_services)
+            cube.rollup("service", "compartment")  # window totals per pair
+        """
+        codes, sizes = [], []
+        for axis in axes:
+            code, size = self._axis(axis)
+            codes.append(code if mask is None else code[mask])
+            sizes.append(size)
+        weights = self.cost if mask is None else self.cost[mask]
+        if not axes:
+            return np.asarray(weights.sum())
+        flat = np.ravel_multi_index(codes, sizes) if len(codes) > 1 else codes[0]
+        return np.bincount(flat, weights=weights, minlength=int(np.prod(sizes))).reshape(sizes)
+
+    def occupied(self, axis: str) -> np.ndarray:
+        """Whether each position on ``axis`` has at least one cell."""
+        code, size = self._axis(axis)
+        return np.bincount(code, minlength=size) > 0
+
+    def _axis(self, axis: str) -> tuple[np.ndarray, int]:
+        if axis == "day":
+            return self.day, self.n_days
+        if axis == "service":
+            return self.service, len(self.services)
+        if axis == "compartment":
+            return self.compartment, len(self.compartments)
+        if axis == "month":
+            return self._month_index(), len(self.months)
+        raise ValueError(f"Unknown cube axis: {axis}. Expected one of {AXES}")
+
+    def _month_index(self) -> np.ndarray:
+        if self._month is None:
+            labels: dict[str, int] = {}
+            day_to_month = np.empty(max(self.n_days, 1), dtype=np.int32)
+            for i, day in enumerate(self.days):
+                day_to_month[i] = labels.setdefault(f"{day:%Y-%m}", len(labels))
+            self._months = list(labels)
+            self._month = day_to_month[self.day] if self.n_days else self.day
+        return self._month
+
+    @staticmethod
+    def _codes(labels: list[str], wanted: Iterable[str]) -> np.ndarray:
+        index = {label: i for i, label in enumerate(labels)}
+        return np.asarray([index[w] for w in wanted if w in index], dtype=np.int32)
+
+
+def top_k(values: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` largest values, largest first."""
+    k = min(k, values.size)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    idx = np.argpartition(-values, k - 1)[:k]
+    return idx[np.argsort(-values[idx], kind="stable")]
+
+
+async def get_cube(
+    tenancy_id: str,
+    days: Sequence[date],
+    version: Any,
+    loader: Any,
+    kind: str = "cost",
+) -> Any:
+    """Get the cube for a window, building it with ``loader`` on a miss.
+
+    Args:
+        tenancy_id: Tenancy OCID
+        days: Window days
+        version: Store version for the window (changes whenever it re-syncs)
+        loader: Async callable returning a freshly built cube
+        kind: Cube family ('cost' or 'tag'), part of the cache key
+    """
+    if not days:
+        return await loader()
+    key = f"{kind}_cube:{tenancy_id}:{days[0]}:{days[-1]}:{version}"
+    cube = await _cube_cache.get(key)
+    if cube is None:
+        cube = await loader()
+        await _cube_cache.set(key, cube)
+    return cube
+
+
+async def clear_cube_cache() -> None:
+    """Drop all cached cubes."""
+    await _cube_cache.clear()
@@ -0,0 +1,215 @@
+"""
+Vectorized cost forecasting and budget burn-rate projection.
+
+Daily cost for every column (services, budget scopes, the total) is fitted
+in one batched least-squares solve with a linear trend and day-of-week
+effects:
+
+    cost[t] = a + b * t + w[weekday(t)]
+
+Period-end spend is the actual cost so far plus the fitted cost of the
+days left in the period, with a band from the residual spread. Budgets
+are then judged by their projected spend against their amount and alert
+rule thresholds.
+"""
+from __future__ import annotations
+
+import calendar
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any
+
+import numpy as np
+
+# Two full weeks are needed before weekday effects can be separated from
+# the trend; shorter histories are fitted with the trend only
+MIN_SEASONAL_DAYS = 14
+
+# Relative change of the fitted daily cost over 30 days that counts as a
+# trend rather than noise
+TREND_THRESHOLD = 0.10
+
+# Half-width of the projection band in residual standard deviations (~95%)
+BAND_Z = 1.96
+
+STATUS_ORDER = {"over_budget": 0, "at_risk": 1, "on_track": 2}
+
+
+@dataclass
+class Forecast:
+    """Fitted trend + weekday model for every column of a daily matrix."""
+    start: date
+    n_days: int
+    coef: np.ndarray          # (n_features, n_columns)
+    residual_std: np.ndarray  # (n_columns,)
+    seasonal: bool
+
+    def predict(self, first_day: date, n: int) -> np.ndarray:
+        """Fitted daily cost for ``n`` days from ``first_day`` (never negative)."""
+        if n <= 0:
+            return np.zeros((0, self.coef.shape[1]))
+        offsets = np.arange(n) + (first_day - self.start).days
+        return np.maximum(design_matrix(self.start, offsets, self.seasonal) @ self.coef, 0.0)
+
+    @property
+    def daily_slope(self) -> np.ndarray:
+        """Fitted change in daily cost per day, per column."""
+        return self.coef[1]
+
+
+def design_matrix(start: date, offsets: np.ndarray, seasonal: bool) -> np.ndarray:
+    """Regressors for day offsets from ``start``: intercept, trend, weekday dummies."""
+    t = np.asarray(offsets, dtype=np.float64)
+    columns = [np.ones_like(t), t]
+    if seasonal:
+        weekday = (start.weekday() + np.asarray(offsets)) % 7
+        # Monday is the reference day; one dummy per other weekday
+        columns.extend((weekday == k).astype(np.float64) for k in range(1, 7))
+    return np.column_stack(columns)
+
+
+def fit_forecast(values: np.ndarray, start: date, seasonal: bool = True) -> Forecast:
+    """Fit every column of a (n_days, n_columns) daily matrix in one solve.
+
+    Args:
+        values: Daily cost, one row per day starting at ``start``
+        start: Date of the first row
+        seasonal: Include day-of-week effects (ignored for short histories)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    n_days, n_columns = values.shape
+    seasonal = seasonal and n_days >= MIN_SEASONAL_DAYS
+    design = design_matrix(start, np.arange(n_days), seasonal)
+
+    if n_days == 0:
+        coef = np.zeros((design.shape[1], n_columns))
+        return Forecast(start, 0, coef, np.zeros(n_columns), seasonal)
+
+    coef, *_ = np.linalg.lstsq(design, values, rcond=None)
+    residuals = values - design @ coef
+    dof = max(n_days - design.shape[1], 1)
+    residual_std = np.sqrt((residuals ** 2).sum(axis=0) / dof)
+    return Forecast(start, n_days, coef, residual_std, seasonal)
+
+
+def budget_period(as_of: date, start_day: int = 1) -> tuple[date, date]:
+    """Monthly budget period containing ``as_of``.
+
+    Args:
+        as_of: Day inside the period
+        start_day: Day of the month the period starts on (OCI's
+            budget_processing_period_start_offset; 1 for calendar months)
+    """
+    start_day = min(max(int(start_day or 1), 1), 28)
+    if as_of.day >= start_day:
+        first = as_of.replace(day=start_day)
+    else:
+        first = _add_months(as_of.replace(day=1), -1).replace(day=start_day)
+    last = _add_months(first, 1) - timedelta(days=1)
+    return first, last
+
+
+def month_bounds(day: date) -> tuple[date, date]:
+    """First and last day of the calendar month containing ``day``."""
+    return day.replace(day=1), day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+
+def project_period(
+    values: np.ndarray,
+    start: date,
+    forecast: Forecast,
+    period_start: date,
+    period_end: date,
+    as_of: date,
+) -> dict[str, np.ndarray]:
+    """Project spend over a period for every column.
+
+    Args:
+        values: Actual daily cost (n_days, n_columns) starting at ``start``
+        start: Date of the first row of ``values``
+        forecast: Fitted model for the same columns
+        period_start: First day of the period
+        period_end: Last day of the period
+        as_of: Last day with complete actuals
+
+    Returns:
+        Dict of per-column arrays: actual, forecast, projected, low, high
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    lo = max((period_start - start).days, 0)
+    hi = min((min(as_of, period_end) - start).days + 1, values.shape[0])
+    actual = values[lo:hi].sum(axis=0) if hi > lo else np.zeros(values.shape[1])
+
+    first_remaining = max(as_of + timedelta(days=1), period_start)
+    remaining = max((period_end - first_remaining).days + 1, 0)
+    future = forecast.predict(first_remaining, remaining).sum(axis=0)
+    band = BAND_Z * forecast.residual_std * np.sqrt(remaining)
+
+    projected = actual + future
+    return {
+        "actual": actual,
+        "forecast": future,
+        "projected": projected,
+        "low": np.maximum(projected - band, actual),
+        "high": projected + band,
+    }
+
+
+def trend_direction(forecast: Forecast, column: int = -1) -> str:
+    """Classify the fitted trend of a column as increasing/decreasing/stable."""
+    if forecast.n_days < 2:
+        return "insufficient_data"
+    mid = forecast.predict(forecast.start + timedelta(days=forecast.n_days // 2), 1)[0, column]
+    change = float(forecast.daily_slope[column]) * 30
+    if mid <= 0:
+        return "increasing" if change > 0 else "stable"
+    if change > TREND_THRESHOLD * mid:
+        return "increasing"
+    if change < -TREND_THRESHOLD * mid:
+        return "decreasing"
+    return "stable"
+
+
+def alert_thresholds(amount: float, rules: Iterable[Any]) -> list[float]:
+    """Absolute spend thresholds of a budget's alert rules."""
+    thresholds = []
+    for rule in rules:
+        threshold = float(getattr(rule, "threshold", 0) or 0)
+        if getattr(rule, "threshold_type", "PERCENTAGE") == "PERCENTAGE":
+            threshold = amount * threshold / 100
+        if threshold > 0:
+            thresholds.append(threshold)
+    return sorted(thresholds)
+
+
+def budget_status(amount: float, projected: float, high: float, thresholds: list[float]) -> str:
+    """Judge a budget by its projected period spend.
+
+    - over_budget: the projection exceeds the budget amount
+    - at_risk: the projection crosses an alert threshold, or the upper
+      band exceeds the amount
+    - on_track: otherwise
+    """
+    if amount > 0 and projected >= amount:
+        return "over_budget"
+    if any(projected >= t for t in thresholds) or (amount > 0 and high >= amount):
+        return "at_risk"
+    return "on_track"
+
+
+def rank_budgets(budgets: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Sort assessed budgets by status, then by projected utilization."""
+    return sorted(
+        budgets,
+        key=lambda b: (STATUS_ORDER[b["status"]], -(b.get("projected_percent") or 0)),
+    )
+
+
+def _add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    return day.replace(year=day.year + month // 12, month=month % 12 + 1)
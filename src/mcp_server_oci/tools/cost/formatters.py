@@ -17,6 +17,56 @@ class CostFormatter:
         """Format as JSON."""
         return json.dumps(data, indent=2, default=str)
 
+    @staticmethod
+    def freshness_lines(freshness: dict | None) -> list[str]:
+        """Format the local cost store freshness note."""
+        if not freshness:
+            return []
+        as_of = freshness.get('as_of') or 'never'
+        note = f"_Cost data as of {as_of}"
+        if freshness.get('missing_days'):
+            note += f"; {freshness['missing_days']} of {freshness.get('days', 0)} days missing"
+        if freshness.get('stale'):
+            note += " (stale — run oci_cost_refresh)"
+        lines = ["", note + "_"]
+        if freshness.get('sync_error'):
+            lines.append(f"_Last sync failed: {freshness['sync_error']}_")
+        return lines
+
+    @staticmethod
+    def scope_lines(scope: dict | None) -> list[str]:
+        """Format the compartment scope note."""
+        if not scope:
+            return []
+        count = scope.get('compartments', 1)
+        suffix = f" ({count} compartments)" if count > 1 else ""
+        return ["", f"_Scope: {scope.get('path', scope.get('compartment_id'))}{suffix}_"]
+
+    @staticmethod
+    def refresh_markdown(data: dict) -> str:
+        """Format a cost store refresh report as markdown."""
+        lines = ["# Cost Store Refresh\n"]
+
+        sync = data.get('sync', {})
+        lines.append(f"**Store:** `{data.get('store_path', 'N/A')}`")
+        lines.append(f"**Days Requested:** {sync.get('days_requested', 0)}")
+        lines.append(f"**Days Fetched:** {sync.get('days_fetched', 0)}")
+        lines.append(f"**Rows Written:** {sync.get('rows', 0)}")
+        lines.append(f"**API Calls:** {sync.get('calls', 0)}")
+        if sync.get('error'):
+            lines.append(f"**Error:** {sync['error']}")
+        lines.append("")
+
+        coverage = data.get('coverage', {})
+        if coverage.get('synced_days'):
+            lines.append("## Stored Coverage\n")
+            lines.append(f"**Range:** {coverage.get('first_day')} to {coverage.get('last_day')}")
+            lines.append(f"**Synced Days:** {coverage.get('synced_days')}")
+            lines.append(f"**Rows:** {coverage.get('rows')}")
+
+        lines.extend(CostFormatter.freshness_lines(data.get('data_freshness')))
+        return "\n".join(lines)
+
     @staticmethod
     def summary_markdown(data: dict) -> str:
         """Format cost summary as markdown."""
@@ -70,6 +120,8 @@ class CostFormatter:
             if forecast.get('confidence'):
                 lines.append(f"**Confidence:** {forecast['confidence']}%")
 
+        lines.extend(CostFormatter.scope_lines(data.get('scope')))
+        lines.extend(CostFormatter.freshness_lines(data.get('data_freshness')))
         return "\n".join(lines)
 
     @staticmethod
@@ -85,7 +137,7 @@ class CostFormatter:
         lines.append("")
 
         for comp in data.get('compartments', []):
-            lines.append(f"## {comp.get('name', 'Unknown')}")
+            lines.append(f"## {comp.get('path') or comp.get('name', 'Unknown')}")
             lines.append(f"**Total:** {Formatter.format_currency(comp.get('cost', 0))}")
 
             if comp.get('services'):
@@ -96,6 +148,8 @@ class CostFormatter:
                     lines.append(f"| {svc.get('service', 'Unknown')} | {cost} |")
             lines.append("")
 
+        lines.extend(CostFormatter.scope_lines(data.get('scope')))
+        lines.extend(CostFormatter.freshness_lines(data.get('data_freshness')))
         return "\n".join(lines)
 
     @staticmethod
@@ -123,6 +177,8 @@ class CostFormatter:
                     lines.append(f"- {comp.get('name', 'Unknown')}: {comp_cost}")
             lines.append("")
 
+        lines.extend(CostFormatter.scope_lines(data.get('scope')))
+        lines.extend(CostFormatter.freshness_lines(data.get('data_freshness')))
         return "\n".join(lines)
 
     @staticmethod
@@ -159,8 +215,23 @@ class CostFormatter:
             estimate = Formatter.format_currency(forecast.get('estimate', 0))
             trend = forecast.get('trend', 'stable')
             lines.append("## Forecast\n")
+            current = forecast.get('current_month')
+            if current:
+                projected = Formatter.format_currency(current.get('projected', 0))
+                low = Formatter.format_currency(current.get('low', 0))
+                high = Formatter.format_currency(current.get('high', 0))
+                lines.append(
+                    f"**{current.get('month')} Month-End Projection:** {projected} "
+                    f"({low} – {high})"
+                )
             lines.append(f"**Next Month Estimate:** {estimate}")
-            lines.append(f"**Trend:** {trend.capitalize()}")
+            lines.append(f"**Trend:** {trend.replace('_', ' ').capitalize()}")
+            if forecast.get('top_services'):
+                lines.append("\n| Service | Next Month |")
+                lines.append("|---------|------------|")
+                for svc in forecast['top_services']:
+                    cost = Formatter.format_currency(svc.get('estimate', 0))
+                    lines.append(f"| {svc.get('service', 'Unknown')} | {cost} |")
 
         # Budget status
         if data.get('budget_variance'):
@@ -168,10 +239,109 @@ class CostFormatter:
             lines.append("\n## Budget Status\n")
             lines.append(f"**Budget:** {Formatter.format_currency(bv.get('budget_amount', 0))}")
             lines.append(f"**Actual:** {Formatter.format_currency(bv.get('actual_spend', 0))}")
+            if bv.get('projected_spend') is not None:
+                projected = Formatter.format_currency(bv['projected_spend'])
+                lines.append(f"**Projected:** {projected} by {bv.get('period_end', 'period end')}")
             variance = bv.get('variance_percent', 0)
             status = "Under budget ✅" if variance < 0 else "Over budget ⚠️"
             lines.append(f"**Variance:** {variance:+.1f}% ({status})")
 
+        lines.extend(CostFormatter.scope_lines(data.get('scope')))
+        lines.extend(CostFormatter.freshness_lines(data.get('data_freshness')))
+        return "\n".join(lines)
+
+    @staticmethod
+    def tag_markdown(data: dict) -> str:
+        """Format tag cost allocation as markdown."""
+        lines = ["# Cost by Tag\n"]
+
+        dims = data.get('group_by', [])
+        total = Formatter.format_currency(data.get('total_cost', 0))
+        lines.append(f"**Total:** {total}")
+        period_start = data.get('period_start', 'N/A')
+        lines.append(f"**Period:** {period_start} to {data.get('period_end', 'N/A')}")
+        lines.append(f"**Grouped By:** {', '.join(dims)} ({data.get('group_count', 0)} groups)")
+        if data.get('filters'):
+            filters = "; ".join(f"{k} in {', '.join(v)}" for k, v in data['filters'].items())
+            lines.append(f"**Filters:** {filters}")
+        for key, pct in data.get('tag_coverage', {}).items():
+            lines.append(f"**Tagged with {key}:** {pct:.1f}% of cost")
+        lines.append("")
+
+        if data.get('groups'):
+            lines.append("| " + " | ".join(dims) + " | Cost | % |")
+            lines.append("|" + "---|" * (len(dims) + 2))
+            for group in data['groups']:
+                labels = [str(group['keys'].get(d, '')) or '—' for d in dims]
+                cost = Formatter.format_currency(group.get('cost', 0))
+                pct = group.get('percentage', 0)
+                lines.append(f"| {' | '.join(labels)} | {cost} | {pct:.1f}% |")
+        else:
+            lines.append("_No cost matched the filters._")
+
+        if data.get('tag_keys'):
+            keys = ", ".join(
+                f"{k['key']} ({k['tagged_percent']:.0f}%)" for k in data['tag_keys'][:10]
+            )
+            lines.append(f"\n**Tag keys in window:** {keys}")
+
+        lines.extend(CostFormatter.scope_lines(data.get('scope')))
+        lines.extend(CostFormatter.freshness_lines(data.get('data_freshness')))
+        return "\n".join(lines)
+
+    @staticmethod
+    def budget_forecast_markdown(data: dict) -> str:
+        """Format a month-end projection and budget risk report as markdown."""
+        lines = ["# Budget Burn-Rate Forecast\n"]
+
+        total = data.get('total', {})
+        lines.append(f"**Month:** {data.get('month', 'N/A')} (actuals through {data.get('as_of')})")
+        lines.append(f"**Month to Date:** {Formatter.format_currency(total.get('actual', 0))}")
+        projected = Formatter.format_currency(total.get('projected', 0))
+        low = Formatter.format_currency(total.get('low', 0))
+        high = Formatter.format_currency(total.get('high', 0))
+        lines.append(f"**Projected Month-End:** {projected} ({low} – {high})")
+        lines.append(f"**Trend:** {total.get('trend', 'stable').replace('_', ' ').capitalize()}")
+        lines.append(f"**Days Remaining:** {data.get('days_remaining', 0)}")
+        lines.append("")
+
+        summary = data.get('summary', {})
+        lines.append("## Budgets\n")
+        lines.append(
+            f"**{summary.get('budgets', 0)} budgets:** {summary.get('over_budget', 0)} over, "
+            f"{summary.get('at_risk', 0)} at risk, {summary.get('on_track', 0)} on track"
+        )
+
+        at_risk = data.get('budgets_at_risk', [])
+        if at_risk:
+            lines.append("\n| Budget | Amount | Actual | Projected | % | Status |")
+            lines.append("|--------|--------|--------|-----------|---|--------|")
+            for b in at_risk:
+                pct = b.get('projected_percent')
+                pct_str = f"{pct:.0f}%" if pct is not None else "—"
+                status = "🔴 Over" if b.get('status') == "over_budget" else "🟠 At risk"
+                lines.append(
+                    f"| {b.get('name', 'Unknown')} "
+                    f"| {Formatter.format_currency(b.get('amount', 0))} "
+                    f"| {Formatter.format_currency(b.get('actual_spend', 0))} "
+                    f"| {Formatter.format_currency(b.get('projected_spend', 0))} "
+                    f"| {pct_str} | {status} |"
+                )
+        lines.append("")
+
+        if data.get('services'):
+            lines.append("## Top Services (Projected Month-End)\n")
+            lines.append("| Service | Month to Date | Projected | Daily Trend |")
+            lines.append("|---------|---------------|-----------|-------------|")
+            for svc in data['services']:
+                lines.append(
+                    f"| {svc.get('service', 'Unknown')} "
+                    f"| {Formatter.format_currency(svc.get('actual', 0))} "
+                    f"| {Formatter.format_currency(svc.get('projected', 0))} "
+                    f"| {svc.get('daily_trend', 0):+.2f}/day |"
+                )
+
+        lines.extend(CostFormatter.freshness_lines(data.get('data_freshness')))
         return "\n".join(lines)
 
     @staticmethod
@@ -190,9 +360,15 @@ class CostFormatter:
 
         # Detection parameters
         params = data.get('detection_params', {})
-        threshold = params.get('threshold_std_dev', 2.0)
-        lines.append(f"**Detection Threshold:** {threshold} standard deviations")
+        threshold = params.get('threshold', 3.0)
+        method = params.get('method', 'median')
+        baseline = f"{method}, {params.get('baseline_days', 28)}-day baseline"
+        if params.get('by_weekday'):
+            baseline += ", weekday-adjusted"
+        lines.append(f"**Detection Threshold:** score > {threshold} ({baseline})")
         lines.append(f"**Period:** {params.get('period', 'N/A')}")
+        if params.get('services_analyzed') is not None:
+            lines.append(f"**Services Analyzed:** {params['services_analyzed']}")
         lines.append("")
 
         # Individual anomalies
@@ -218,7 +394,7 @@ class CostFormatter:
                 deviation = anomaly.get('deviation_percent', 0)
 
                 lines.append(f"**Cost:** {cost} (Expected: {expected})")
-                lines.append(f"**Deviation:** +{deviation:.1f}% above average")
+                lines.append(f"**Deviation:** +{deviation:.1f}% above baseline")
 
                 if anomaly.get('root_cause'):
                     lines.append("\n**Root Cause Analysis:**")
@@ -229,6 +405,23 @@ class CostFormatter:
 
                 lines.append("")
         else:
-            lines.append("✅ No significant anomalies detected in the specified period.")
+            lines.append("✅ No significant anomalies detected in the tenancy total.")
+            lines.append("")
 
+        # Service-level anomalies
+        if data.get('service_anomalies'):
+            lines.append("## Service-Level Anomalies\n")
+            lines.append("| Date | Service | Cost | Expected | Score | Severity |")
+            lines.append("|------|---------|------|----------|-------|----------|")
+            for anomaly in data['service_anomalies']:
+                cost = Formatter.format_currency(anomaly.get('cost', 0))
+                expected = Formatter.format_currency(anomaly.get('expected_cost', 0))
+                lines.append(
+                    f"| {anomaly.get('date')} | {anomaly.get('service', 'Unknown')} | {cost} "
+                    f"| {expected} | {anomaly.get('score', 0):.1f} "
+                    f"| {anomaly.get('severity', 'low').upper()} |"
+                )
+
+        lines.extend(CostFormatter.scope_lines(data.get('scope')))
+        lines.extend(CostFormatter.freshness_lines(data.get('data_freshness')))
         return "\n".join(lines)
@@ -6,7 +6,7 @@ from __future__ import annotations
 from datetime import datetime
 from enum import Enum
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, field_validator
 
 
 class Granularity(str, Enum):
@@ -15,6 +15,12 @@ class Granularity(str, Enum):
     MONTHLY = "MONTHLY"
 
 
+class AnomalyMethod(str, Enum):
+    """Baseline method for cost anomaly detection."""
+    MEDIAN = "median"
+    EWMA = "ewma"
+
+
 class ResponseFormat(str, Enum):
     """Output format for responses."""
     MARKDOWN = "markdown"
@@ -55,6 +61,15 @@ class CostSummaryInput(BaseCostInput):
         default=Granularity.DAILY,
         description="Time granularity: DAILY or MONTHLY"
     )
+    scope_compartment_id: str | None = Field(
+        default=None,
+        description="Limit to a compartment: OCID, name, or path (e.g., 'prod/apps')"
+    )
+    include_subcompartments: bool = Field(
+        default=False,
+        validation_alias=AliasChoices("include_subcompartments", "include_children"),
+        description="With scope_compartment_id, include every compartment below it"
+    )
 
     @field_validator('tenancy_ocid')
     @classmethod
@@ -92,11 +107,12 @@ class CostByCompartmentInput(BaseCostInput):
     )
     scope_compartment_id: str | None = Field(
         default=None,
-        description="Limit to specific compartment OCID"
+        description="Limit to a compartment: OCID, name, or path (e.g., 'prod/apps')"
     )
-    include_children: bool = Field(
+    include_subcompartments: bool = Field(
         default=False,
-        description="Include child compartment costs"
+        validation_alias=AliasChoices("include_subcompartments", "include_children"),
+        description="With scope_compartment_id, include every compartment below it"
     )
     compartment_depth: int = Field(
         default=0,
@@ -140,11 +156,12 @@ class CostByServiceInput(BaseCostInput):
     )
     scope_compartment_id: str | None = Field(
         default=None,
-        description="Limit to specific compartment"
+        description="Limit to a compartment: OCID, name, or path (e.g., 'prod/apps')"
     )
-    include_children: bool = Field(
+    include_subcompartments: bool = Field(
         default=False,
-        description="Include child compartment costs"
+        validation_alias=AliasChoices("include_subcompartments", "include_children"),
+        description="With scope_compartment_id, include every compartment below it"
     )
 
 
@@ -164,11 +181,20 @@ class MonthlyTrendInput(BaseCostInput):
     )
     include_forecast: bool = Field(
         default=True,
-        description="Include cost forecast for next month"
+        description="Include month-end and next-month cost forecast"
     )
     budget_ocid: str | None = Field(
         default=None,
-        description="Budget OCID for variance analysis"
+        description="Budget OCID for projected variance against the budget amount"
+    )
+    scope_compartment_id: str | None = Field(
+        default=None,
+        description="Limit to a compartment: OCID, name, or path (e.g., 'prod/apps')"
+    )
+    include_subcompartments: bool = Field(
+        default=False,
+        validation_alias=AliasChoices("include_subcompartments", "include_children"),
+        description="With scope_compartment_id, include every compartment below it"
     )
 
 
@@ -189,25 +215,164 @@ class CostAnomalyInput(BaseCostInput):
         description="End date in ISO format"
     )
     threshold: float = Field(
-        default=2.0,
-        description="Standard deviations for anomaly detection",
+        default=3.0,
+        description="Robust z-score (deviations from the baseline) for anomaly detection",
         ge=1.0,
         le=5.0
     )
+    method: AnomalyMethod = Field(
+        default=AnomalyMethod.MEDIAN,
+        description="Baseline: 'median' (rolling median/MAD) or 'ewma' (exponentially weighted)"
+    )
+    baseline_days: int = Field(
+        default=28,
+        description="Days of history behind each scored day",
+        ge=7,
+        le=90
+    )
+    by_weekday: bool = Field(
+        default=True,
+        description="Adjust for the weekly cycle so regular weekend swings are not flagged"
+    )
+    min_increase: float = Field(
+        default=1.0,
+        description="Ignore increases smaller than this amount (currency units)",
+        ge=0
+    )
     top_n: int = Field(
         default=10,
-        description="Maximum number of anomalies to return",
+        description="Maximum number of anomalies to return per level (total and service)",
         ge=1,
         le=50
     )
     scope_compartment_id: str | None = Field(
         default=None,
-        description="Limit to specific compartment"
+        description="Limit to a compartment: OCID, name, or path (e.g., 'prod/apps')"
     )
-    include_children: bool = Field(
+    include_subcompartments: bool = Field(
         default=False,
-        description="Include child compartments"
+        validation_alias=AliasChoices("include_subcompartments", "include_children"),
+        description="With scope_compartment_id, include every compartment below it"
+    )
+
+
+class CostByTagInput(BaseCostInput):
+    """Input for tag-based cost allocation."""
+
+    tenancy_ocid: str = Field(
+        ...,
+        description="OCI Tenancy OCID",
+        min_length=20
     )
+    time_start: str = Field(
+        ...,
+        description="Start date in ISO format"
+    )
+    time_end: str = Field(
+        ...,
+        description="End date in ISO format"
+    )
+    group_by: list[str] = Field(
+        ...,
+        description=(
+            "Dimensions to group by: tag keys (freeform 'team', defined "
+            "'Finance.CostCenter') and/or service, compartment, resource, month, day"
+        ),
+        min_length=1,
+        max_length=4
+    )
+    filters: dict[str, list[str]] | None = Field(
+        default=None,
+        description=(
+            "Keep only these values per dimension, e.g. {'env': ['prod']}; "
+            "use '(untagged)' to select cost without the tag"
+        )
+    )
+    top_n: int = Field(
+        default=20,
+        description="Number of top groups to return",
+        ge=1,
+        le=100
+    )
+    scope_compartment_id: str | None = Field(
+        default=None,
+        description="Limit to a compartment: OCID, name, or path (e.g., 'prod/apps')"
+    )
+    include_subcompartments: bool = Field(
+        default=False,
+        validation_alias=AliasChoices("include_subcompartments", "include_children"),
+        description="With scope_compartment_id, include every compartment below it"
+    )
+
+    @field_validator('time_start', 'time_end')
+    @classmethod
+    def validate_datetime(cls, v: str) -> str:
+        try:
+            datetime.fromisoformat(v.replace('Z', '+00:00'))
+        except ValueError as e:
+            msg = f"Invalid datetime: {v}. Use ISO format (e.g., '2024-01-01T00:00:00Z')."
+            raise ValueError(msg) from e
+        return v
+
+
+class BudgetForecastInput(BaseCostInput):
+    """Input for budget burn-rate projection."""
+
+    tenancy_ocid: str = Field(
+        ...,
+        description="OCI Tenancy OCID",
+        min_length=20
+    )
+    history_days: int = Field(
+        default=56,
+        description="Days of daily cost history the forecast is fitted on",
+        ge=7,
+        le=180
+    )
+    seasonal: bool = Field(
+        default=True,
+        description="Model day-of-week effects (needs at least 14 days of history)"
+    )
+    top_n: int = Field(
+        default=10,
+        description="Number of services to include in the month-end projection",
+        ge=1,
+        le=50
+    )
+
+    @field_validator('tenancy_ocid')
+    @classmethod
+    def validate_tenancy_ocid(cls, v: str) -> str:
+        if not v.startswith('ocid1.tenancy.'):
+            raise ValueError("Invalid tenancy OCID format. Expected 'ocid1.tenancy.oc1...'")
+        return v
+
+
+class CostRefreshInput(BaseCostInput):
+    """Input for refreshing the local cost store."""
+
+    tenancy_ocid: str = Field(
+        ...,
+        description="OCI Tenancy OCID",
+        min_length=20
+    )
+    days_back: int = Field(
+        default=30,
+        description="Number of days, ending today, to sync",
+        ge=1,
+        le=730
+    )
+    force: bool = Field(
+        default=True,
+        description="Re-fetch every day in the range, not only missing or unsettled days"
+    )
+
+    @field_validator('tenancy_ocid')
+    @classmethod
+    def validate_tenancy_ocid(cls, v: str) -> str:
+        if not v.startswith('ocid1.tenancy.'):
+            raise ValueError("Invalid tenancy OCID format. Expected 'ocid1.tenancy.oc1...'")
+        return v
 
 
 # Output models for structured responses
@@ -254,9 +419,11 @@ class CostSummaryOutput(BaseModel):
 class CostAnomaly(BaseModel):
     """Cost anomaly detection result."""
     date: str
+    service: str | None = None  # None for tenancy-total anomalies
     cost: float
     expected_cost: float
     deviation_percent: float
+    score: float | None = None
     severity: str  # low, medium, high, critical
     root_cause: dict | None = None
 
@@ -264,5 +431,6 @@ class CostAnomaly(BaseModel):
 class AnomalyDetectionOutput(BaseModel):
     """Output for cost anomaly detection."""
     anomalies: list[CostAnomaly]
+    service_anomalies: list[CostAnomaly] = []
     detection_params: dict
     summary: dict
@@ -0,0 +1,679 @@
+"""
+Local incremental store for OCI Usage API cost data.
+
+Daily cost is synced once per (date, service, compartment, SKU) into a
+SQLite database and every cost tool answers from it, so repeated
+questions about the same period never go back to the Usage API. Only
+days that were never synced, or that are still settling (the Usage API
+keeps revising the last few days), are fetched again. Missing days are
+requested in month-sized chunks fetched concurrently, every
+``opc-next-page`` is followed, and pages are summed as they arrive.
+
+Two datasets are kept, each with its own sync bookkeeping:
+- usage: cost by (date, service, compartment, SKU), used by every cost tool
+- tags: cost by (date, resource, service, compartment, tag key, tag value),
+  synced only when a tag breakdown is requested
+
+Environment Variables:
+- OCI_COST_STORE_PATH: SQLite file (default: ~/.cache/oci-mcp/cost.db;
+  ":memory:" keeps the store in process memory)
+- OCI_COST_STORE_MAX_AGE: Seconds before unsettled days are re-synced (default: 21600)
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time, timedelta
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from mcp_server_oci.core.concurrency import call_oci, gather_bounded
+from mcp_server_oci.core.observability import get_logger
+
+logger = get_logger("oci-mcp.cost.store")
+
+ProgressCallback = Callable[[int, int, str], Awaitable[None]]
+
+# Days younger than this are still being revised by the Usage API
+SETTLE_DAYS = 3
+
+# Concurrent Usage API requests per sync (each covers at most one month)
+DEFAULT_SYNC_CONCURRENCY = 4
+
+DEFAULT_MAX_AGE_SECONDS = 6 * 3600
+
+# Usage API group-by keys and the matching store columns
+USAGE_GROUP_BY = ["service", "compartmentId", "compartmentName", "skuName"]
+GROUP_COLUMNS = ("service", "compartment_id", "compartment_name", "sku_name")
+
+# Tag rows are per resource so that a resource's tags can be joined back
+# together locally; the Usage API returns one row per (resource, tag)
+TAG_GROUP_BY = ["resourceId", "service", "compartmentId", "tagNamespace", "tagKey", "tagValue"]
+
+# Dataset -> (data table, sync bookkeeping table)
+DATASETS = {
+    "usage": ("daily_usage", "synced_days"),
+    "tags": ("daily_tag_usage", "synced_tag_days"),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_usage (
+    tenancy_id       TEXT NOT NULL,
+    usage_date       TEXT NOT NULL,
+    service          TEXT NOT NULL,
+    compartment_id   TEXT NOT NULL,
+    compartment_name TEXT NOT NULL,
+    sku_name         TEXT NOT NULL,
+    cost             REAL NOT NULL,
+    currency         TEXT NOT NULL,
+    PRIMARY KEY (tenancy_id, usage_date, service, compartment_id, sku_name)
+);
+CREATE TABLE IF NOT EXISTS synced_days (
+    tenancy_id TEXT NOT NULL,
+    usage_date TEXT NOT NULL,
+    synced_at  REAL NOT NULL,
+    settled    INTEGER NOT NULL,
+    PRIMARY KEY (tenancy_id, usage_date)
+);
+CREATE TABLE IF NOT EXISTS daily_tag_usage (
+    tenancy_id     TEXT NOT NULL,
+    usage_date     TEXT NOT NULL,
+    resource_id    TEXT NOT NULL,
+    service        TEXT NOT NULL,
+    compartment_id TEXT NOT NULL,
+    tag_key        TEXT NOT NULL,
+    tag_value      TEXT NOT NULL,
+    cost           REAL NOT NULL,
+    currency       TEXT NOT NULL,
+    PRIMARY KEY (tenancy_id, usage_date, resource_id, service, compartment_id, tag_key, tag_value)
+);
+CREATE TABLE IF NOT EXISTS synced_tag_days (
+    tenancy_id TEXT NOT NULL,
+    usage_date TEXT NOT NULL,
+    synced_at  REAL NOT NULL,
+    settled    INTEGER NOT NULL,
+    PRIMARY KEY (tenancy_id, usage_date)
+);
+"""
+
+
+class CostRecord(NamedTuple):
+    """Aggregated cost row.
+
+    Attribute names mirror the Usage API ``UsageSummary`` model so the
+    cost processing helpers accept either.
+    """
+    time_usage_started: datetime
+    service: str | None
+    compartment_id: str | None
+    compartment_name: str | None
+    sku_name: str | None
+    computed_amount: float
+    currency: str
+
+
+class TagRecord(NamedTuple):
+    """Stored tag row: the cost of one resource on one day under one tag.
+
+    Untagged resources have a single row with an empty tag key.
+    """
+    usage_date: date
+    resource_id: str
+    service: str
+    compartment_id: str
+    tag_key: str
+    tag_value: str
+    cost: float
+    currency: str
+
+
+@dataclass
+class SyncResult:
+    """Outcome of one store sync."""
+    tenancy_id: str
+    days_requested: int = 0
+    days_fetched: int = 0
+    rows: int = 0
+    calls: int = 0
+    error: str | None = None
+    exception: BaseException | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "days_requested": self.days_requested,
+            "days_fetched": self.days_fetched,
+            "rows": self.rows,
+            "calls": self.calls,
+            "error": self.error,
+        }
+
+
+class UsageAggregator:
+    """Streaming sum of Usage API items by (date, service, compartment, SKU).
+
+    Pages are folded in as they arrive, so memory is bounded by the number
+    of distinct keys rather than the number of items fetched.
+    """
+
+    __slots__ = ("rows", "items")
+
+    def __init__(self) -> None:
+        self.rows: dict[tuple[str, str, str, str], list[Any]] = {}
+        self.items = 0
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def add(self, items: Iterable[Any]) -> UsageAggregator:
+        """Fold a page of items into the running totals."""
+        rows = self.rows
+        for item in items:
+            self.items += 1
+            amount = float(item.computed_amount or 0)
+            key = (
+                _item_date(item),
+                item.service or "",
+                item.compartment_id or "",
+                getattr(item, "sku_name", None) or "",
+            )
+            row = rows.get(key)
+            if row is None:
+                rows[key] = [
+                    getattr(item, "compartment_name", None) or "",
+                    amount,
+                    getattr(item, "currency", None) or "USD",
+                ]
+            else:
+                row[1] += amount
+        return self
+
+
+class TagUsageAggregator:
+    """Streaming sum of tag-grouped Usage API items.
+
+    Keys are (date, resource, service, compartment, tag key, tag value);
+    defined tags are keyed as 'Namespace.key', freeform tags by key alone.
+    """
+
+    __slots__ = ("rows", "items")
+
+    def __init__(self) -> None:
+        self.rows: dict[tuple[str, str, str, str, str, str], list[Any]] = {}
+        self.items = 0
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def add(self, items: Iterable[Any]) -> TagUsageAggregator:
+        """Fold a page of items into the running totals."""
+        rows = self.rows
+        for item in items:
+            self.items += 1
+            amount = float(item.computed_amount or 0)
+            base = (
+                _item_date(item),
+                getattr(item, "resource_id", None) or "",
+                item.service or "",
+                item.compartment_id or "",
+            )
+            for tag_key, tag_value in _item_tags(item):
+                key = (*base, tag_key, tag_value)
+                row = rows.get(key)
+                if row is None:
+                    rows[key] = [amount, getattr(item, "currency", None) or "USD"]
+                else:
+                    row[0] += amount
+        return self
+
+
+class CostStore:
+    """SQLite-backed daily cost store keyed by tenancy.
+
+    A single connection is shared across threads and serialized with a
+    lock, so methods can be called from ``asyncio.to_thread`` workers.
+    """
+
+    def __init__(self, path: str | Path = ":memory:"):
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            if self.path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # -------------------------------------------------------------------------
+    # Sync bookkeeping
+    # -------------------------------------------------------------------------
+
+    def days_to_sync(
+        self,
+        tenancy_id: str,
+        days: Sequence[date],
+        max_age_seconds: float | None = None,
+        now: datetime | None = None,
+        dataset: str = "usage",
+    ) -> list[date]:
+        """Days that were never synced or are unsettled and older than ``max_age_seconds``."""
+        if not days:
+            return []
+        max_age = max_age_seconds if max_age_seconds is not None else store_max_age()
+        cutoff = (now or datetime.now(UTC)).timestamp() - max_age
+        synced = self._synced(tenancy_id, days[0], days[-1], dataset)
+        result = []
+        for day in days:
+            entry = synced.get(day.isoformat())
+            if entry is None:
+                result.append(day)
+                continue
+            synced_at, settled = entry
+            if not settled and synced_at < cutoff:
+                result.append(day)
+        return result
+
+    def replace_days(
+        self,
+        tenancy_id: str,
+        days: Iterable[date],
+        items: UsageAggregator | TagUsageAggregator | Iterable[Any],
+        now: datetime | None = None,
+        dataset: str = "usage",
+    ) -> int:
+        """Replace stored rows of a dataset for ``days`` with aggregated Usage API items.
+
+        Returns the number of rows written.
+        """
+        now = now or datetime.now(UTC)
+        day_keys = [d.isoformat() for d in days]
+        data_table, sync_table = DATASETS[dataset]
+        values: list[tuple[Any, ...]]
+        if dataset == "tags":
+            if isinstance(items, UsageAggregator):
+                raise TypeError("The tags dataset needs tag-grouped usage items")
+            tags = (
+                items if isinstance(items, TagUsageAggregator)
+                else TagUsageAggregator().add(items)
+            )
+            values = [
+                (tenancy_id, *key, cost, currency)
+                for key, (cost, currency) in tags.rows.items()
+            ]
+        else:
+            if isinstance(items, TagUsageAggregator):
+                raise TypeError("The usage dataset needs usage items, not tag-grouped ones")
+            usage = items if isinstance(items, UsageAggregator) else UsageAggregator().add(items)
+            values = [
+                (tenancy_id, d, svc, comp, name, sku, cost, currency)
+                for (d, svc, comp, sku), (name, cost, currency) in usage.rows.items()
+            ]
+
+        settled_before = (now.date() - timedelta(days=SETTLE_DAYS)).isoformat()
+        placeholders = ", ".join("?" * (len(values[0]) if values else 1))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"DELETE FROM {data_table} WHERE tenancy_id = ? AND usage_date = ?",
+                [(tenancy_id, d) for d in day_keys],
+            )
+            if values:
+                self._conn.executemany(
+                    f"INSERT INTO {data_table} VALUES ({placeholders})", values
+                )
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {sync_table} VALUES (?, ?, ?, ?)",
+                [(tenancy_id, d, now.timestamp(), int(d < settled_before)) for d in day_keys],
+            )
+        return len(values)
+
+    def freshness(
+        self,
+        tenancy_id: str,
+        days: Sequence[date],
+        max_age_seconds: float | None = None,
+        now: datetime | None = None,
+        dataset: str = "usage",
+    ) -> dict[str, Any]:
+        """Describe how current the stored data of a dataset for ``days`` is."""
+        now = now or datetime.now(UTC)
+        max_age = max_age_seconds if max_age_seconds is not None else store_max_age()
+        synced = self._synced(tenancy_id, days[0], days[-1], dataset) if days else {}
+        present = [synced[d.isoformat()] for d in days if d.isoformat() in synced]
+        missing = len(days) - len(present)
+        oldest = min((s for s, _ in present), default=None)
+        newest = max((s for s, _ in present), default=None)
+        unsettled_oldest = min((s for s, settled in present if not settled), default=None)
+        stale = missing > 0 or (
+            unsettled_oldest is not None and now.timestamp() - unsettled_oldest > max_age
+        )
+        return {
+            "as_of": (
+                datetime.fromtimestamp(oldest, tz=UTC).isoformat() if oldest else None
+            ),
+            "age_seconds": int(now.timestamp() - oldest) if oldest else None,
+            "last_synced": (
+                datetime.fromtimestamp(newest, tz=UTC).isoformat() if newest else None
+            ),
+            "days": len(days),
+            "missing_days": missing,
+            "stale": stale,
+        }
+
+    def coverage(self, tenancy_id: str) -> dict[str, Any]:
+        """Stored date range and row count for a tenancy."""
+        with self._lock:
+            first, last, days = self._conn.execute(
+                "SELECT MIN(usage_date), MAX(usage_date), COUNT(*) "
+                "FROM synced_days WHERE tenancy_id = ?",
+                (tenancy_id,),
+            ).fetchone()
+            (rows,) = self._conn.execute(
+                "SELECT COUNT(*) FROM daily_usage WHERE tenancy_id = ?", (tenancy_id,)
+            ).fetchone()
+        return {"first_day": first, "last_day": last, "synced_days": days, "rows": rows}
+
+    def clear(self, tenancy_id: str | None = None) -> None:
+        """Drop stored data for one tenancy, or everything."""
+        where, args = ("WHERE tenancy_id = ?", (tenancy_id,)) if tenancy_id else ("", ())
+        with self._lock, self._conn:
+            for data_table, sync_table in DATASETS.values():
+                self._conn.execute(f"DELETE FROM {data_table} {where}", args)
+                self._conn.execute(f"DELETE FROM {sync_table} {where}", args)
+
+    def _synced(
+        self,
+        tenancy_id: str,
+        first: date,
+        last: date,
+        dataset: str = "usage",
+    ) -> dict[str, tuple[float, int]]:
+        sync_table = DATASETS[dataset][1]
+        with self._lock:
+            cursor = self._conn.execute(
+                f"SELECT usage_date, synced_at, settled FROM {sync_table} "
+                "WHERE tenancy_id = ? AND usage_date BETWEEN ? AND ?",
+                (tenancy_id, first.isoformat(), last.isoformat()),
+            )
+            return {d: (s, settled) for d, s, settled in cursor}
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def query(
+        self,
+        tenancy_id: str,
+        days: Sequence[date],
+        group_by: Sequence[str] = ("service",),
+        granularity: str = "DAILY",
+    ) -> list[CostRecord]:
+        """Aggregate stored cost over ``days``.
+
+        Args:
+            tenancy_id: Tenancy OCID
+            days: Contiguous, sorted days to include
+            group_by: Any of service, compartment_id, compartment_name, sku_name
+            granularity: DAILY or MONTHLY (rows are keyed by period start)
+
+        Returns:
+            One CostRecord per (period, group) combination
+        """
+        if not days:
+            return []
+        unknown = set(group_by) - set(GROUP_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unsupported group_by columns: {sorted(unknown)}")
+        period = "substr(usage_date, 1, 7) || '-01'" if granularity == "MONTHLY" else "usage_date"
+        columns = ", ".join(group_by)
+        select = f"{period} AS period{', ' + columns if columns else ''}"
+        sql = (
+            f"SELECT {select}, SUM(cost), MAX(currency) FROM daily_usage "
+            "WHERE tenancy_id = ? AND usage_date BETWEEN ? AND ? "
+            f"GROUP BY period{', ' + columns if columns else ''}"
+        )
+        with self._lock:
+            rows = self._conn.execute(
+                sql, (tenancy_id, days[0].isoformat(), days[-1].isoformat())
+            ).fetchall()
+
+        records = []
+        for row in rows:
+            values = dict(zip(group_by, row[1:-2], strict=True))
+            records.append(CostRecord(
+                time_usage_started=datetime.fromisoformat(row[0]).replace(tzinfo=UTC),
+                service=values.get("service"),
+                compartment_id=values.get("compartment_id"),
+                compartment_name=values.get("compartment_name"),
+                sku_name=values.get("sku_name"),
+                computed_amount=row[-2],
+                currency=row[-1],
+            ))
+        return records
+
+    def query_tags(self, tenancy_id: str, days: Sequence[date]) -> list[TagRecord]:
+        """Stored tag rows over contiguous, sorted ``days``."""
+        if not days:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT usage_date, resource_id, service, compartment_id, tag_key, tag_value, "
+                "cost, currency FROM daily_tag_usage "
+                "WHERE tenancy_id = ? AND usage_date BETWEEN ? AND ?",
+                (tenancy_id, days[0].isoformat(), days[-1].isoformat()),
+            ).fetchall()
+        return [TagRecord(date.fromisoformat(row[0]), *row[1:]) for row in rows]
+
+
+# =============================================================================
+# Window helpers
+# =============================================================================
+
+def window_days(start: datetime, end: datetime, today: date | None = None) -> list[date]:
+    """UTC days covered by [start, end), capped at today.
+
+    An ``end`` that is not exactly midnight includes its own day, so both
+    '...T00:00:00Z' (exclusive) and '...T23:59:59Z' (inclusive) ends work.
+    """
+    start, end = _utc(start), _utc(end)
+    first = start.date()
+    last = end.date() if end.time() != time(0) else end.date() - timedelta(days=1)
+    last = min(last, today or datetime.now(UTC).date())
+    if last < first:
+        return []
+    return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+
+def month_chunks(days: Sequence[date]) -> list[list[date]]:
+    """Split sorted days into runs of consecutive days within one calendar month."""
+    chunks: list[list[date]] = []
+    for day in days:
+        prev = chunks[-1][-1] if chunks else None
+        if (
+            prev is not None
+            and day - prev == timedelta(days=1)
+            and (day.year, day.month) == (prev.year, prev.month)
+        ):
+            chunks[-1].append(day)
+        else:
+            chunks.append([day])
+    return chunks
+
+
+# =============================================================================
+# Sync
+# =============================================================================
+
+async def fetch_daily_usage(
+    usage_client: Any,
+    tenancy_id: str,
+    days: Sequence[date],
+    aggregator: UsageAggregator | TagUsageAggregator | None = None,
+    dataset: str = "usage",
+) -> tuple[UsageAggregator | TagUsageAggregator, int]:
+    """Fetch DAILY cost of a dataset for a contiguous run of days, following pagination.
+
+    Each page is folded into ``aggregator`` as soon as it arrives.
+
+    Returns:
+        Tuple of (aggregator, number of API calls)
+    """
+    from oci.usage_api.models import RequestSummarizedUsagesDetails
+
+    if aggregator is None:
+        aggregator = TagUsageAggregator() if dataset == "tags" else UsageAggregator()
+    details = RequestSummarizedUsagesDetails(
+        tenant_id=tenancy_id,
+        time_usage_started=_midnight(days[0]),
+        time_usage_ended=_midnight(days[-1] + timedelta(days=1)),
+        granularity="DAILY",
+        query_type="COST",
+        group_by=TAG_GROUP_BY if dataset == "tags" else USAGE_GROUP_BY,
+    )
+    calls = 0
+    page = None
+    while True:
+        kwargs: dict[str, Any] = {"page": page} if page else {}
+        response = await call_oci(usage_client.request_summarized_usages, details, **kwargs)
+        calls += 1
+        aggregator.add(response.data.items or [])
+        page = getattr(response, "next_page", None)
+        if not page:
+            return aggregator, calls
+
+
+async def sync_usage(
+    usage_client: Any,
+    tenancy_id: str,
+    days: Sequence[date],
+    store: CostStore | None = None,
+    force: bool = False,
+    max_age_seconds: float | None = None,
+    limit: int = DEFAULT_SYNC_CONCURRENCY,
+    progress: ProgressCallback | None = None,
+    dataset: str = "usage",
+) -> SyncResult:
+    """Bring a dataset of the store up to date for ``days``.
+
+    Days needing a fetch are split into month-sized chunks that are
+    fetched concurrently (at most ``limit`` at once) and written to the
+    store as each completes. Only never-synced and stale unsettled days
+    are fetched unless ``force`` is set.
+
+    Errors are recorded on the result rather than raised so callers can
+    still answer from whatever is already stored; chunks that succeeded
+    are kept.
+    """
+    store = store or get_cost_store()
+    result = SyncResult(tenancy_id=tenancy_id, days_requested=len(days))
+    todo = (
+        list(days) if force
+        else store.days_to_sync(tenancy_id, days, max_age_seconds, dataset=dataset)
+    )
+    chunks = month_chunks(todo)
+    done = 0
+
+    async def _sync_chunk(chunk: list[date]) -> None:
+        nonlocal done
+        try:
+            aggregator, calls = await fetch_daily_usage(
+                usage_client, tenancy_id, chunk, dataset=dataset
+            )
+        except Exception as e:
+            logger.warning(
+                "Cost store sync failed",
+                tenancy_id=tenancy_id,
+                dataset=dataset,
+                start=chunk[0].isoformat(),
+                error=str(e),
+            )
+            if result.exception is None:
+                result.error = str(e)
+                result.exception = e
+            return
+        result.calls += calls
+        result.rows += await call_oci(
+            store.replace_days, tenancy_id, chunk, aggregator, dataset=dataset
+        )
+        result.days_fetched += len(chunk)
+        done += 1
+        if progress:
+            await progress(done, len(chunks), f"Synced {chunk[0]:%Y-%m}")
+
+    await gather_bounded((_sync_chunk(c) for c in chunks), limit=limit)
+    return result
+
+
+# =============================================================================
+# Store singleton
+# =============================================================================
+
+_store: CostStore | None = None
+
+
+def store_path() -> str:
+    """Resolve the store location from the environment."""
+    path = os.getenv("OCI_COST_STORE_PATH")
+    if path:
+        return path
+    cache_home = os.getenv("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return str(Path(cache_home) / "oci-mcp" / "cost.db")
+
+
+def store_max_age() -> float:
+    """Seconds before unsettled days are considered stale."""
+    value = os.getenv("OCI_COST_STORE_MAX_AGE")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            logger.warning("Invalid OCI_COST_STORE_MAX_AGE", value=value)
+    return float(DEFAULT_MAX_AGE_SECONDS)
+
+
+def get_cost_store() -> CostStore:
+    """Get the process-wide cost store."""
+    global _store
+    if _store is None:
+        _store = CostStore(store_path())
+    return _store
+
+
+def set_cost_store(store: CostStore | None) -> None:
+    """Replace the process-wide cost store (used by tests)."""
+    global _store
+    _store = store
+
+
+def _item_date(item: Any) -> str:
+    started = item.time_usage_started
+    if isinstance(started, datetime):
+        return _utc(started).date().isoformat()
+    return str(started)[:10]
+
+
+def _item_tags(item: Any) -> list[tuple[str, str]]:
+    """(key, value) pairs of an item's tags; one empty pair when untagged."""
+    pairs = []
+    for tag in getattr(item, "tags", None) or []:
+        key = getattr(tag, "key", None)
+        if not key:
+            continue
+        namespace = getattr(tag, "namespace", None)
+        label = f"{namespace}.{key}" if namespace else key
+        pairs.append((label, getattr(tag, "value", None) or ""))
+    return pairs or [("", "")]
+
+
+def _utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+
+
+def _midnight(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day, tzinfo=UTC)
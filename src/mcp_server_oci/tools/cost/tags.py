@@ -0,0 +1,256 @@
+"""
+Tag cost allocation cube.
+
+Tag-grouped usage is stored per (day, resource, service, compartment, tag),
+so a resource carrying three tags appears in three rows. The cube joins
+those rows back into one *line* per (day, resource, service, compartment)
+and encodes every dimension categorically: each dimension is an int32 code
+array over lines plus a short list of distinct labels, and each tag key
+becomes such a column on first use (code 0 = untagged).
+
+Group-bys over any mix of tag keys, services, compartments, days and
+months are then one ``np.unique`` over combined codes plus ``np.bincount``,
+so chargeback questions never go back to the Usage API.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any
+
+import numpy as np
+
+UNTAGGED = "(untagged)"
+
+BUILTIN_DIMENSIONS = ("service", "compartment", "resource", "day", "month")
+
+
+@dataclass
+class TagCube:
+    """Categorically encoded cost lines with lazily built tag columns."""
+    start: date
+    n_days: int
+    day: np.ndarray          # int32 day offset per line
+    service: np.ndarray      # int32 service code per line
+    compartment: np.ndarray  # int32 compartment code per line
+    resource: np.ndarray     # int32 resource code per line
+    cost: np.ndarray         # float64 cost per line
+    services: list[str]
+    compartments: list[str]
+    resources: list[str]
+    tag_keys: list[str]
+    tag_values: list[list[str]]  # per tag key; index 0 is UNTAGGED
+    tag_line: np.ndarray         # (line, key, value) triplets, one per tag
+    tag_key: np.ndarray
+    tag_value: np.ndarray
+    currency: str = "USD"
+    _columns: dict[str, tuple[np.ndarray, list[str]]] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_records(cls, days: Sequence[date], records: Iterable[Any]) -> TagCube:
+        """Encode stored tag rows (see ``store.TagRecord``)."""
+        start = days[0] if days else date.today()
+        origin = start.toordinal()
+        services: dict[str, int] = {}
+        compartments: dict[str, int] = {}
+        resources: dict[str, int] = {}
+        tag_keys: dict[str, int] = {}
+        tag_values: list[dict[str, int]] = []
+        lines: dict[tuple[int, int, int, int], int] = {}
+        day_codes: list[int] = []
+        service_codes: list[int] = []
+        compartment_codes: list[int] = []
+        resource_codes: list[int] = []
+        costs: list[float] = []
+        triplets: list[tuple[int, int, int]] = []
+        currency = None
+
+        for record in records:
+            key = (
+                record.usage_date.toordinal() - origin,
+                services.setdefault(record.service or "Unknown", len(services)),
+                compartments.setdefault(record.compartment_id or "unknown", len(compartments)),
+                resources.setdefault(record.resource_id or "", len(resources)),
+            )
+            line = lines.get(key)
+            if line is None:
+                # Every tag row of a line carries the line's full cost
+                line = lines[key] = len(costs)
+                day_codes.append(key[0])
+                service_codes.append(key[1])
+                compartment_codes.append(key[2])
+                resource_codes.append(key[3])
+                costs.append(float(record.cost or 0))
+            if record.tag_key:
+                k = tag_keys.get(record.tag_key)
+                if k is None:
+                    k = tag_keys[record.tag_key] = len(tag_keys)
+                    tag_values.append({UNTAGGED: 0})
+                values = tag_values[k]
+                v = values.setdefault(record.tag_value or "", len(values))
+                triplets.append((line, k, v))
+            currency = currency or record.currency
+
+        tags = np.asarray(triplets, dtype=np.int32).reshape(-1, 3)
+        return cls(
+            start=start,
+            n_days=len(days),
+            day=np.asarray(day_codes, dtype=np.int32),
+            service=np.asarray(service_codes, dtype=np.int32),
+            compartment=np.asarray(compartment_codes, dtype=np.int32),
+            resource=np.asarray(resource_codes, dtype=np.int32),
+            cost=np.asarray(costs, dtype=np.float64),
+            services=list(services),
+            compartments=list(compartments),
+            resources=list(resources),
+            tag_keys=list(tag_keys),
+            tag_values=[list(values) for values in tag_values],
+            tag_line=tags[:, 0],
+            tag_key=tags[:, 1],
+            tag_value=tags[:, 2],
+            currency=currency or "USD",
+        )
+
+    def __len__(self) -> int:
+        return int(self.cost.size)
+
+    # -------------------------------------------------------------------------
+    # Dimensions
+    # -------------------------------------------------------------------------
+
+    def resolve(self, name: str) -> str:
+        """Canonical dimension name for a built-in or tag key (case-insensitive).
+
+        Tag keys may be prefixed with 'tag:' to avoid clashing with a
+        built-in dimension name; a defined tag may be named by its key
+        alone when no other namespace uses that key.
+
+        Raises:
+            ValueError: If no such dimension exists in the window
+        """
+        wanted = name.strip()
+        is_tag = wanted.lower().startswith("tag:")
+        if is_tag:
+            wanted = wanted[4:]
+        elif wanted.lower() in BUILTIN_DIMENSIONS:
+            return wanted.lower()
+        if wanted in self.tag_keys:
+            return wanted
+        lowered = wanted.lower()
+        matches = [k for k in self.tag_keys if k.lower() == lowered]
+        if not matches:
+            matches = [k for k in self.tag_keys if k.lower().rsplit(".", 1)[-1] == lowered]
+        if len(matches) == 1:
+            return matches[0]
+        available = ", ".join(sorted(self.tag_keys)[:20]) or "none"
+        raise ValueError(f"Unknown cost dimension '{name}'. Tag keys in this window: {available}")
+
+    def column(self, name: str) -> tuple[np.ndarray, list[str]]:
+        """Per-line codes and labels for a dimension."""
+        name = self.resolve(name)
+        cached = self._columns.get(name)
+        if cached is not None:
+            return cached
+        if name == "service":
+            result = (self.service, self.services)
+        elif name == "compartment":
+            result = (self.compartment, self.compartments)
+        elif name == "resource":
+            result = (self.resource, self.resources)
+        elif name == "day":
+            labels = [(self.start + timedelta(days=i)).isoformat() for i in range(self.n_days)]
+            result = (self.day, labels)
+        elif name == "month":
+            months: dict[str, int] = {}
+            day_to_month = np.asarray(
+                [
+                    months.setdefault(f"{self.start + timedelta(days=i):%Y-%m}", len(months))
+                    for i in range(self.n_days)
+                ],
+                dtype=np.int32,
+            )
+            result = (day_to_month[self.day] if self.n_days else self.day, list(months))
+        else:
+            k = self.tag_keys.index(name)
+            codes = np.zeros(self.cost.size, dtype=np.int32)
+            selected = self.tag_key == k
+            codes[self.tag_line[selected]] = self.tag_value[selected]
+            result = (codes, self.tag_values[k])
+        self._columns[name] = result
+        return result
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def total(self, mask: np.ndarray | None = None) -> float:
+        return float(self.cost.sum() if mask is None else self.cost[mask].sum())
+
+    def mask(self, filters: Mapping[str, Iterable[str]] | None = None) -> np.ndarray:
+        """Line mask keeping only the listed labels of each dimension.
+
+        Use ``UNTAGGED`` to select lines without a value for a tag key.
+        """
+        keep = np.ones(self.cost.size, dtype=bool)
+        for name, wanted in (filters or {}).items():
+            codes, labels = self.column(name)
+            index = {label: i for i, label in enumerate(labels)}
+            selected = [index[w] for w in wanted if w in index]
+            keep &= np.isin(codes, np.asarray(selected, dtype=np.int32))
+        return keep
+
+    def group_by(
+        self,
+        dimensions: Sequence[str],
+        mask: np.ndarray | None = None,
+    ) -> tuple[list[tuple[str, ...]], np.ndarray]:
+        """Cost per occupied combination of ``dimensions``.
+
+        Returns:
+            Tuple of (label tuples, totals), one entry per combination
+            that has at least one line
+        """
+        columns = [self.column(d) for d in dimensions]
+        weights = self.cost if mask is None else self.cost[mask]
+        if not columns:
+            return [()], np.asarray([weights.sum()])
+        codes = [c if mask is None else c[mask] for c, _ in columns]
+        sizes = [max(len(labels), 1) for _, labels in columns]
+
+        flat = np.ravel_multi_index(codes, sizes) if len(codes) > 1 else codes[0]
+        groups, inverse = np.unique(flat, return_inverse=True)
+        totals = np.bincount(inverse, weights=weights, minlength=groups.size)
+        unravelled = np.unravel_index(groups, sizes) if len(codes) > 1 else (groups,)
+        keys = [
+            tuple(labels[i] for (_, labels), i in zip(columns, combo, strict=True))
+            for combo in zip(*(u.tolist() for u in unravelled), strict=True)
+        ]
+        return keys, totals
+
+    def tagged_share(self, tag: str, mask: np.ndarray | None = None) -> float:
+        """Fraction of cost carrying a value for ``tag``."""
+        codes, _ = self.column(tag)
+        total = self.total(mask)
+        tagged = codes > 0 if mask is None else (codes > 0) & mask
+        return self.total(tagged) / total if total else 0.0
+
+    def key_summary(self, limit: int = 20) -> list[dict[str, Any]]:
+        """Tag keys ranked by the cost they cover."""
+        if not self.tag_keys:
+            return []
+        # A line has at most one value per key, so each triplet counts once
+        covered = np.bincount(
+            self.tag_key, weights=self.cost[self.tag_line], minlength=len(self.tag_keys)
+        )
+        total = self.total()
+        order = np.argsort(-covered, kind="stable")[:limit]
+        return [
+            {
+                "key": self.tag_keys[k],
+                "values": len(self.tag_values[k]) - 1,
+                "tagged_cost": float(covered[k]),
+                "tagged_percent": float(covered[k] / total * 100) if total else 0.0,
+            }
+            for k in order.tolist()
+        ]
@@ -1,28 +1,54 @@
 """
 OCI Cost domain tool implementations.
+
+All cost tools answer from the local cost store (see ``store.py``); each
+call first syncs only the days of its window that are missing or still
+settling, then aggregates locally. Compartment scopes are resolved
+against the cached compartment tree and applied as a cube mask.
 """
 from __future__ import annotations
 
 import asyncio
-import statistics
-from datetime import datetime, timedelta
+from contextlib import suppress
+from datetime import UTC, date, datetime, timedelta
 from typing import Any
 
+import numpy as np
+import oci
 from mcp.server.fastmcp import Context, FastMCP
 
 from mcp_server_oci.core.client import get_oci_client
+from mcp_server_oci.core.compartments import CompartmentTree, get_compartment_tree
+from mcp_server_oci.core.concurrency import call_oci, gather_bounded
 from mcp_server_oci.core.errors import format_error_response, handle_oci_error
 from mcp_server_oci.skills.discovery import ToolInfo, tool_registry
 
+from .anomaly import CostMatrix, detect_cost_anomalies
+from .cube import CostCube, get_cube, top_k
+from .forecast import (
+    alert_thresholds,
+    budget_period,
+    budget_status,
+    fit_forecast,
+    month_bounds,
+    project_period,
+    rank_budgets,
+    trend_direction,
+)
 from .formatters import CostFormatter
 from .models import (
+    BudgetForecastInput,
     CostAnomalyInput,
     CostByCompartmentInput,
     CostByServiceInput,
+    CostByTagInput,
+    CostRefreshInput,
     CostSummaryInput,
     MonthlyTrendInput,
     ResponseFormat,
 )
+from .store import CostStore, get_cost_store, sync_usage, window_days
+from .tags import TagCube
 
 
 def register_cost_tools(mcp: FastMCP) -> None:
@@ -62,6 +88,7 @@ def register_cost_tools(mcp: FastMCP) -> None:
             - Total cost for period
             - Daily/monthly breakdown
             - Cost by service (top 10)
+            - Data freshness of the local cost store
 
         Example:
             {"tenancy_ocid": "ocid1.tenancy...", "time_start": "2024-01-01T00:00:00Z",
@@ -73,36 +100,21 @@ def register_cost_tools(mcp: FastMCP) -> None:
             async with get_oci_client() as client:
                 usage_client = client.usage_api
 
-                await ctx.report_progress(0.3, "Fetching cost data...")
+                scope = await _resolve_scope(client.identity, params)
 
-                # Build request
-                from oci.usage_api.models import RequestSummarizedUsagesDetails
-
-                start = datetime.fromisoformat(params.time_start.replace('Z', '+00:00'))
-                end = datetime.fromisoformat(params.time_end.replace('Z', '+00:00'))
-                request_details = RequestSummarizedUsagesDetails(
-                    tenant_id=params.tenancy_ocid,
-                    time_usage_started=start,
-                    time_usage_ended=end,
-                    granularity=params.granularity.value,
-                    query_type="COST",
-                    group_by=["service"],
-                )
+                await ctx.report_progress(0.3, "Syncing local cost store...")
 
-                # Execute query
-                response = await asyncio.to_thread(
-                    usage_client.request_summarized_usages,
-                    request_details
+                cube, freshness = await _load_cube(
+                    usage_client, params.tenancy_ocid, params.time_start, params.time_end
                 )
 
                 await ctx.report_progress(0.7, "Processing results...")
 
-                # Process response
                 data = _process_cost_summary(
-                    response.data.items,
-                    params.time_start,
-                    params.time_end
+                    cube, params.time_start, params.time_end, mask=_scope_mask(cube, scope)
                 )
+                _add_scope(data, scope)
+                data["data_freshness"] = freshness
 
                 await ctx.report_progress(0.9, "Formatting output...")
 
@@ -110,6 +122,8 @@ def register_cost_tools(mcp: FastMCP) -> None:
                     return CostFormatter.to_json(data)
                 return CostFormatter.summary_markdown(data)
 
+        except ValueError as e:
+            return format_error_response(str(e), params.response_format.value)
         except Exception as e:
             error = handle_oci_error(e, "fetching cost summary")
             return format_error_response(error, params.response_format.value)
@@ -149,6 +163,7 @@ def register_cost_tools(mcp: FastMCP) -> None:
             - Top N services by cost
             - Compartment breakdown per service
             - Percentage of total spend
+            - Data freshness of the local cost store
         """
         await ctx.report_progress(0.1, "Starting service cost analysis...")
 
@@ -156,39 +171,32 @@ def register_cost_tools(mcp: FastMCP) -> None:
             async with get_oci_client() as client:
                 usage_client = client.usage_api
 
-                await ctx.report_progress(0.3, "Fetching service costs...")
-
-                from oci.usage_api.models import RequestSummarizedUsagesDetails
+                scope = await _resolve_scope(client.identity, params)
 
-                start = datetime.fromisoformat(params.time_start.replace('Z', '+00:00'))
-                end = datetime.fromisoformat(params.time_end.replace('Z', '+00:00'))
-                request_details = RequestSummarizedUsagesDetails(
-                    tenant_id=params.tenancy_ocid,
-                    time_usage_started=start,
-                    time_usage_ended=end,
-                    granularity="MONTHLY",
-                    query_type="COST",
-                    group_by=["service"],
-                )
+                await ctx.report_progress(0.3, "Syncing local cost store...")
 
-                response = await asyncio.to_thread(
-                    usage_client.request_summarized_usages,
-                    request_details
+                cube, freshness = await _load_cube(
+                    usage_client, params.tenancy_ocid, params.time_start, params.time_end
                 )
 
                 await ctx.report_progress(0.7, "Analyzing service breakdown...")
 
                 data = _process_service_costs(
-                    response.data.items,
+                    cube,
                     params.top_n,
                     params.time_start,
-                    params.time_end
+                    params.time_end,
+                    mask=_scope_mask(cube, scope),
                 )
+                _add_scope(data, scope)
+                data["data_freshness"] = freshness
 
                 if params.response_format == ResponseFormat.JSON:
                     return CostFormatter.to_json(data)
                 return CostFormatter.service_drilldown_markdown(data)
 
+        except ValueError as e:
+            return format_error_response(str(e), params.response_format.value)
         except Exception as e:
             error = handle_oci_error(e, "fetching service costs")
             return format_error_response(error, params.response_format.value)
@@ -217,7 +225,8 @@ def register_cost_tools(mcp: FastMCP) -> None:
         """Get daily cost breakdown by compartment and service.
 
         Provides hierarchical cost breakdown showing spending across
-        compartments with optional child compartment inclusion.
+        compartments. The scope may be an OCID, a name, or a path
+        ('prod/apps'); include_subcompartments adds everything below it.
 
         Args:
             params: CostByCompartmentInput with compartment filtering options
@@ -226,6 +235,7 @@ def register_cost_tools(mcp: FastMCP) -> None:
             Cost breakdown by compartment including:
             - Compartment hierarchy costs
             - Service breakdown per compartment
+            - Data freshness of the local cost store
         """
         await ctx.report_progress(0.1, "Initializing compartment cost query...")
 
@@ -236,46 +246,36 @@ def register_cost_tools(mcp: FastMCP) -> None:
 
                 await ctx.report_progress(0.2, "Fetching compartment hierarchy...")
 
-                # Get compartment names
-                compartments = await _get_compartment_map(
-                    identity_client,
-                    params.tenancy_ocid
+                scope = await _resolve_scope(identity_client, params)
+                tree = scope[0] if scope else await _compartment_tree(
+                    identity_client, params.tenancy_ocid
                 )
 
-                await ctx.report_progress(0.4, "Fetching cost data...")
-
-                from oci.usage_api.models import RequestSummarizedUsagesDetails
+                await ctx.report_progress(0.4, "Syncing local cost store...")
 
-                start = datetime.fromisoformat(params.time_start.replace('Z', '+00:00'))
-                end = datetime.fromisoformat(params.time_end.replace('Z', '+00:00'))
-                request_details = RequestSummarizedUsagesDetails(
-                    tenant_id=params.tenancy_ocid,
-                    time_usage_started=start,
-                    time_usage_ended=end,
-                    granularity=params.granularity.value,
-                    query_type="COST",
-                    group_by=["compartmentId", "service"],
-                )
-
-                response = await asyncio.to_thread(
-                    usage_client.request_summarized_usages,
-                    request_details
+                cube, freshness = await _load_cube(
+                    usage_client, params.tenancy_ocid, params.time_start, params.time_end
                 )
 
                 await ctx.report_progress(0.7, "Processing compartment data...")
 
                 data = _process_compartment_costs(
-                    response.data.items,
-                    compartments,
+                    cube,
+                    tree,
                     params.top_n,
                     params.time_start,
-                    params.time_end
+                    params.time_end,
+                    mask=_scope_mask(cube, scope),
                 )
+                _add_scope(data, scope)
+                data["data_freshness"] = freshness
 
                 if params.response_format == ResponseFormat.JSON:
                     return CostFormatter.to_json(data)
                 return CostFormatter.compartment_markdown(data)
 
+        except ValueError as e:
+            return format_error_response(str(e), params.response_format.value)
         except Exception as e:
             error = handle_oci_error(e, "fetching compartment costs")
             return format_error_response(error, params.response_format.value)
@@ -290,6 +290,84 @@ def register_cost_tools(mcp: FastMCP) -> None:
     ))
 
 
+    @mcp.tool(
+        name="oci_cost_by_tag",
+        annotations={
+            "title": "Get Cost by Tag",
+            "readOnlyHint": True,
+            "destructiveHint": False,
+            "idempotentHint": True,
+            "openWorldHint": True
+        }
+    )
+    async def cost_by_tag(params: CostByTagInput, ctx: Context) -> str:
+        """Allocate cost by freeform or defined tags for chargeback.
+
+        Tag-grouped usage is synced once per window into the local cost
+        store; group-bys over any mix of tag keys, service, compartment,
+        resource, month and day, filters and top-N ranking then run in
+        memory over a categorically encoded cube.
+
+        Args:
+            params: CostByTagInput with group_by dimensions, filters, and top_n
+
+        Returns:
+            Tag allocation including:
+            - Top groups by cost with their share of the filtered total
+            - Share of cost carrying each grouped tag (tag coverage)
+            - Tag keys present in the window, ranked by cost covered
+            - Data freshness of the local cost store
+        """
+        await ctx.report_progress(0.1, "Connecting to OCI Usage API...")
+
+        try:
+            async with get_oci_client() as client:
+                scope = await _resolve_scope(client.identity, params)
+
+                await ctx.report_progress(0.3, "Syncing tag-grouped usage...")
+
+                cube, freshness = await _load_tag_cube(
+                    client.usage_api, params.tenancy_ocid, params.time_start, params.time_end
+                )
+                tree = scope[0] if scope else None
+                if tree is None and any(d.lower() == "compartment" for d in params.group_by):
+                    tree = await _compartment_tree(client.identity, params.tenancy_ocid)
+
+                await ctx.report_progress(0.7, "Aggregating by tag...")
+
+                data = _process_tag_costs(
+                    cube,
+                    params.group_by,
+                    params.filters,
+                    params.top_n,
+                    params.time_start,
+                    params.time_end,
+                    scope=scope[2] if scope else None,
+                    tree=tree,
+                )
+                _add_scope(data, scope)
+                data["data_freshness"] = freshness
+
+                if params.response_format == ResponseFormat.JSON:
+                    return CostFormatter.to_json(data)
+                return CostFormatter.tag_markdown(data)
+
+        except ValueError as e:
+            return format_error_response(str(e), params.response_format.value)
+        except Exception as e:
+            error = handle_oci_error(e, "fetching tag costs")
+            return format_error_response(error, params.response_format.value)
+
+    tool_registry.register(ToolInfo(
+        name="oci_cost_by_tag",
+        domain="cost",
+        summary="Allocate cost by freeform or defined tags",
+        full_description=cost_by_tag.__doc__ or "",
+        input_schema=CostByTagInput.model_json_schema(),
+        annotations={"readOnlyHint": True, "destructiveHint": False}
+    ))
+
+
     @mcp.tool(
         name="oci_cost_monthly_trend",
         annotations={
@@ -303,8 +381,8 @@ def register_cost_tools(mcp: FastMCP) -> None:
     async def monthly_trend(params: MonthlyTrendInput, ctx: Context) -> str:
         """Analyze month-over-month cost trends with forecasting.
 
-        Provides historical cost trends and projects future spending
-        based on historical patterns.
+        Provides historical cost trends and projects future spending from a
+        least-squares fit of the daily cost trend and weekday pattern.
 
         Args:
             params: MonthlyTrendInput with months_back and optional budget_ocid
@@ -313,8 +391,9 @@ def register_cost_tools(mcp: FastMCP) -> None:
             Trend analysis including:
             - Monthly costs for specified period
             - Month-over-month change percentages
-            - Next month forecast
-            - Budget variance (if budget_ocid provided)
+            - Current month-end projection and next month forecast
+            - Projected budget variance (if budget_ocid provided)
+            - Data freshness of the local cost store
         """
         await ctx.report_progress(0.1, "Calculating date ranges...")
 
@@ -322,39 +401,52 @@ def register_cost_tools(mcp: FastMCP) -> None:
             async with get_oci_client() as client:
                 usage_client = client.usage_api
 
+                scope = await _resolve_scope(client.identity, params)
+
                 # Calculate time range
-                end_date = datetime.utcnow()
+                end_date = datetime.now(UTC)
                 start_date = end_date - timedelta(days=params.months_back * 30)
+                as_of = end_date.date() - timedelta(days=1)
 
-                await ctx.report_progress(0.3, f"Fetching {params.months_back} months of data...")
+                await ctx.report_progress(0.3, f"Syncing {params.months_back} months of data...")
 
-                from oci.usage_api.models import RequestSummarizedUsagesDetails
-
-                request_details = RequestSummarizedUsagesDetails(
-                    tenant_id=params.tenancy_ocid,
-                    time_usage_started=start_date,
-                    time_usage_ended=end_date,
-                    granularity="MONTHLY",
-                    query_type="COST",
-                )
-
-                response = await asyncio.to_thread(
-                    usage_client.request_summarized_usages,
-                    request_details
+                (cube, freshness), budget = await asyncio.gather(
+                    _load_cube(usage_client, params.tenancy_ocid, start_date, end_date),
+                    _fetch_budget(client.budgets, params.budget_ocid)
+                    if params.budget_ocid else _none(),
                 )
 
                 await ctx.report_progress(0.6, "Calculating trends...")
 
-                data = _process_monthly_trend(response.data.items, params.months_back)
+                data = _process_monthly_trend(
+                    cube, params.months_back, mask=_scope_mask(cube, scope)
+                )
+                _add_scope(data, scope)
+                data["data_freshness"] = freshness
 
                 if params.include_forecast:
                     await ctx.report_progress(0.8, "Generating forecast...")
-                    data["forecast"] = _generate_forecast(data["monthly_costs"])
+                    data["forecast"] = _trend_forecast(
+                        cube, as_of, mask=_scope_mask(cube, scope)
+                    )
+
+                if budget is not None:
+                    tree = await _compartment_tree(client.identity, params.tenancy_ocid)
+                    assessed = _project_budgets(cube, tree, [budget], as_of)[0]
+                    amount = assessed["amount"]
+                    projected = assessed["projected_spend"]
+                    data["budget_variance"] = {
+                        **assessed,
+                        "budget_amount": amount,
+                        "variance_percent": (projected - amount) / amount * 100 if amount else 0,
+                    }
 
                 if params.response_format == ResponseFormat.JSON:
                     return CostFormatter.to_json(data)
                 return CostFormatter.trend_markdown(data)
 
+        except ValueError as e:
+            return format_error_response(str(e), params.response_format.value)
         except Exception as e:
             error = handle_oci_error(e, "analyzing cost trends")
             return format_error_response(error, params.response_format.value)
@@ -382,17 +474,21 @@ def register_cost_tools(mcp: FastMCP) -> None:
     async def detect_anomalies(params: CostAnomalyInput, ctx: Context) -> str:
         """Find and explain cost spikes and anomalies.
 
-        Uses statistical analysis to identify unusual spending patterns
-        and provides root cause explanations.
+        Scores every service and the tenancy total against its own trailing
+        baseline (rolling median/MAD or EWMA, adjusted for the weekly cycle) and
+        explains total-level spikes by the services that moved most.
 
         Args:
-            params: CostAnomalyInput with threshold and filtering options
+            params: CostAnomalyInput with threshold, method, baseline window,
+                   and filtering options
 
         Returns:
             Anomaly detection results including:
-            - Days with anomalous spending
+            - Days with anomalous total spending
+            - Service-level anomalies
             - Severity classification (low/medium/high/critical)
             - Root cause analysis (service breakdown)
+            - Data freshness of the local cost store
         """
         await ctx.report_progress(0.1, "Fetching daily cost data...")
 
@@ -400,56 +496,68 @@ def register_cost_tools(mcp: FastMCP) -> None:
             async with get_oci_client() as client:
                 usage_client = client.usage_api
 
-                await ctx.report_progress(0.3, "Running anomaly detection...")
-
-                from oci.usage_api.models import RequestSummarizedUsagesDetails
+                scope = await _resolve_scope(client.identity, params)
 
-                start = datetime.fromisoformat(params.time_start.replace('Z', '+00:00'))
-                end = datetime.fromisoformat(params.time_end.replace('Z', '+00:00'))
-                request_details = RequestSummarizedUsagesDetails(
-                    tenant_id=params.tenancy_ocid,
-                    time_usage_started=start,
-                    time_usage_ended=end,
-                    granularity="DAILY",
-                    query_type="COST",
-                    group_by=["service"],
-                )
+                await ctx.report_progress(0.3, "Syncing local cost store...")
 
-                response = await asyncio.to_thread(
-                    usage_client.request_summarized_usages,
-                    request_details
+                # Extend the window backwards so the first reported day has
+                # a full baseline behind it
+                start = _parse_time(params.time_start)
+                history_start = start - timedelta(days=params.baseline_days)
+                cube, freshness = await _load_cube(
+                    usage_client, params.tenancy_ocid, history_start, params.time_end
                 )
 
                 await ctx.report_progress(0.6, "Analyzing patterns...")
 
-                # Detect anomalies
-                anomalies = _detect_cost_anomalies(
-                    response.data.items,
+                matrix = CostMatrix(
+                    start=cube.start,
+                    services=cube.services,
+                    values=cube.rollup("day", "service", mask=_scope_mask(cube, scope)),
+                )
+                detected = detect_cost_anomalies(
+                    matrix,
                     threshold=params.threshold,
-                    top_n=params.top_n
+                    method=params.method.value,
+                    window=params.baseline_days,
+                    by_weekday=params.by_weekday,
+                    min_increase=params.min_increase,
+                    report_from=_utc_date(start),
+                    top_n=params.top_n,
                 )
+                anomalies = detected["total"]
 
                 await ctx.report_progress(0.9, "Generating report...")
 
                 result = {
                     "anomalies": anomalies,
+                    "service_anomalies": detected["services"],
                     "detection_params": {
-                        "threshold_std_dev": params.threshold,
+                        "threshold": params.threshold,
+                        "method": params.method.value,
+                        "baseline_days": params.baseline_days,
+                        "by_weekday": params.by_weekday,
+                        "services_analyzed": len(matrix.services),
                         "period": f"{params.time_start} to {params.time_end}"
                     },
                     "summary": {
                         "total_anomalies": len(anomalies),
+                        "service_anomalies": len(detected["services"]),
                         "critical": len([a for a in anomalies if a["severity"] == "critical"]),
                         "high": len([a for a in anomalies if a["severity"] == "high"]),
                         "medium": len([a for a in anomalies if a["severity"] == "medium"]),
                         "low": len([a for a in anomalies if a["severity"] == "low"]),
-                    }
+                    },
+                    "data_freshness": freshness,
                 }
+                _add_scope(result, scope)
 
                 if params.response_format == ResponseFormat.JSON:
                     return CostFormatter.to_json(result)
                 return CostFormatter.anomaly_markdown(result)
 
+        except ValueError as e:
+            return format_error_response(str(e), params.response_format.value)
         except Exception as e:
             error = handle_oci_error(e, "detecting cost anomalies")
             return format_error_response(error, params.response_format.value)
@@ -464,48 +572,334 @@ def register_cost_tools(mcp: FastMCP) -> None:
     ))
 
 
+    @mcp.tool(
+        name="oci_cost_budget_forecast",
+        annotations={
+            "title": "Forecast Budget Burn Rate",
+            "readOnlyHint": True,
+            "destructiveHint": False,
+            "idempotentHint": True,
+            "openWorldHint": True
+        }
+    )
+    async def budget_forecast(params: BudgetForecastInput, ctx: Context) -> str:
+        """Project month-end spend and flag budgets at risk.
+
+        Fits daily cost for every service, the tenancy total and each
+        compartment budget's scope in one least-squares solve (linear trend
+        plus weekday pattern), then projects spend to the end of each
+        budget period. Budgets are fetched concurrently with the cost data.
+
+        Args:
+            params: BudgetForecastInput with tenancy_ocid, history_days,
+                   seasonal, and top_n
+
+        Returns:
+            Burn-rate projection including:
+            - Month-to-date and projected month-end total, with a ~95% band
+            - Projected month-end spend for the top services
+            - Every budget with projected spend, alert thresholds and status
+              (over_budget / at_risk / on_track)
+            - Data freshness of the local cost store
+        """
+        await ctx.report_progress(0.1, "Connecting to OCI Usage and Budget APIs...")
+
+        try:
+            async with get_oci_client() as client:
+                as_of = datetime.now(UTC).date() - timedelta(days=1)
+                month_start, _ = month_bounds(as_of)
+                first = min(as_of - timedelta(days=params.history_days - 1), month_start)
+
+                await ctx.report_progress(0.3, "Syncing cost data and fetching budgets...")
+
+                (cube, freshness), budgets, tree = await asyncio.gather(
+                    _load_cube(
+                        client.usage_api,
+                        params.tenancy_ocid,
+                        _utc_midnight(first),
+                        _utc_midnight(as_of + timedelta(days=1)),
+                    ),
+                    _fetch_budgets(client.budgets, params.tenancy_ocid),
+                    _compartment_tree(client.identity, params.tenancy_ocid),
+                )
+
+                await ctx.report_progress(0.7, "Projecting month-end spend...")
+
+                data = _process_budget_forecast(
+                    cube,
+                    tree,
+                    budgets,
+                    as_of,
+                    history_days=params.history_days,
+                    seasonal=params.seasonal,
+                    top_n=params.top_n,
+                )
+                data["data_freshness"] = freshness
+
+                if params.response_format == ResponseFormat.JSON:
+                    return CostFormatter.to_json(data)
+                return CostFormatter.budget_forecast_markdown(data)
+
+        except ValueError as e:
+            return format_error_response(str(e), params.response_format.value)
+        except Exception as e:
+            error = handle_oci_error(e, "forecasting budget spend")
+            return format_error_response(error, params.response_format.value)
+
+    tool_registry.register(ToolInfo(
+        name="oci_cost_budget_forecast",
+        domain="cost",
+        summary="Project month-end spend and flag budgets at risk",
+        full_description=budget_forecast.__doc__ or "",
+        input_schema=BudgetForecastInput.model_json_schema(),
+        annotations={"readOnlyHint": True, "destructiveHint": False}
+    ))
+
+
+    @mcp.tool(
+        name="oci_cost_refresh",
+        annotations={
+            "title": "Refresh Local Cost Store",
+            "readOnlyHint": False,
+            "destructiveHint": False,
+            "idempotentHint": True,
+            "openWorldHint": True
+        }
+    )
+    async def refresh_cost_store(params: CostRefreshInput, ctx: Context) -> str:
+        """Re-sync the local cost store from the Usage API.
+
+        Cost tools sync missing and still-settling days automatically; use
+        this to force a re-fetch after late adjustments or to pre-load a
+        long history before analysis.
+
+        Args:
+            params: CostRefreshInput with tenancy_ocid, days_back, and force
+
+        Returns:
+            Sync report including:
+            - Days requested and fetched, rows written, API calls
+            - Data freshness for the refreshed window
+            - Stored coverage for the tenancy
+        """
+        await ctx.report_progress(0.1, "Connecting to OCI Usage API...")
+
+        try:
+            async with get_oci_client() as client:
+                store = get_cost_store()
+                end = datetime.now(UTC)
+                days = window_days(end - timedelta(days=params.days_back - 1), end)
+
+                await ctx.report_progress(0.3, f"Syncing {len(days)} days of cost data...")
+
+                async def _progress(done: int, total: int, message: str) -> None:
+                    with suppress(Exception):
+                        await ctx.report_progress(done, total=total, message=message)
+
+                result = await sync_usage(
+                    client.usage_api,
+                    params.tenancy_ocid,
+                    days,
+                    store=store,
+                    force=params.force,
+                    progress=_progress,
+                )
+                if result.exception is not None and result.days_fetched == 0:
+                    raise result.exception
+
+                await ctx.report_progress(0.9, "Summarizing store state...")
+
+                freshness = await asyncio.to_thread(store.freshness, params.tenancy_ocid, days)
+                coverage = await asyncio.to_thread(store.coverage, params.tenancy_ocid)
+                data = {
+                    "tenancy_ocid": params.tenancy_ocid,
+                    "store_path": store.path,
+                    "sync": result.to_dict(),
+                    "data_freshness": freshness,
+                    "coverage": coverage,
+                }
+
+                if params.response_format == ResponseFormat.JSON:
+                    return CostFormatter.to_json(data)
+                return CostFormatter.refresh_markdown(data)
+
+        except Exception as e:
+            error = handle_oci_error(e, "refreshing cost store")
+            return format_error_response(error, params.response_format.value)
+
+    tool_registry.register(ToolInfo(
+        name="oci_cost_refresh",
+        domain="cost",
+        summary="Re-sync the local cost store from the Usage API",
+        full_description=refresh_cost_store.__doc__ or "",
+        input_schema=CostRefreshInput.model_json_schema(),
+        annotations={"readOnlyHint": False, "destructiveHint": False}
+    ))
+
+
 # Helper functions
 
-def _process_cost_summary(items: list, time_start: str, time_end: str) -> dict:
-    """Process raw OCI usage API response into cost summary."""
-    service_costs = {}
-    total_cost = 0.0
+async def _sync_window(
+    usage_client: Any,
+    tenancy_id: str,
+    time_start: str | datetime,
+    time_end: str | datetime,
+    dataset: str = "usage",
+) -> tuple[CostStore, list[date], dict[str, Any]]:
+    """Sync a dataset of the local store for a window and describe its freshness.
+
+    A failed sync is tolerated when the store already holds data for the
+    window; the failure is surfaced in the freshness report instead.
+    """
+    start = _parse_time(time_start)
+    end = _parse_time(time_end)
+    store = get_cost_store()
+    days = window_days(start, end)
 
-    for item in items:
-        cost = float(item.computed_amount or 0)
-        service = item.service or "Unknown"
-        total_cost += cost
+    result = await sync_usage(usage_client, tenancy_id, days, store=store, dataset=dataset)
+    freshness = await asyncio.to_thread(store.freshness, tenancy_id, days, dataset=dataset)
+    if result.exception is not None and days and freshness["missing_days"] == len(days):
+        raise result.exception
 
-        if service in service_costs:
-            service_costs[service] += cost
-        else:
-            service_costs[service] = cost
+    freshness["days_synced_now"] = result.days_fetched
+    freshness["sync_error"] = result.error
+    return store, days, freshness
+
+
+def _parse_time(value: str | datetime) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _utc_date(value: datetime) -> date:
+    return (value.astimezone(UTC) if value.tzinfo else value).date()
+
+
+def _utc_midnight(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day, tzinfo=UTC)
+
+
+async def _load_cube(
+    usage_client: Any,
+    tenancy_id: str,
+    time_start: str | datetime,
+    time_end: str | datetime,
+) -> tuple[CostCube, dict[str, Any]]:
+    """Sync a window and return its (cached) cost cube and freshness."""
+    store, days, freshness = await _sync_window(usage_client, tenancy_id, time_start, time_end)
+
+    async def _build() -> CostCube:
+        records = await asyncio.to_thread(
+            store.query,
+            tenancy_id,
+            days,
+            group_by=("service", "compartment_id", "compartment_name"),
+        )
+        return CostCube.from_records(days, records)
+
+    cube = await get_cube(tenancy_id, days, freshness.get("last_synced"), _build)
+    return cube, freshness
+
+
+async def _load_tag_cube(
+    usage_client: Any,
+    tenancy_id: str,
+    time_start: str | datetime,
+    time_end: str | datetime,
+) -> tuple[TagCube, dict[str, Any]]:
+    """Sync tag-grouped usage for a window and return its (cached) tag cube."""
+    store, days, freshness = await _sync_window(
+        usage_client, tenancy_id, time_start, time_end, dataset="tags"
+    )
+
+    async def _build() -> TagCube:
+        records = await asyncio.to_thread(store.query_tags, tenancy_id, days)
+        return TagCube.from_records(days, records)
+
+    cube = await get_cube(tenancy_id, days, freshness.get("last_synced"), _build, kind="tag")
+    return cube, freshness
+
+
+def _process_tag_costs(
+    cube: TagCube,
+    group_by: list[str],
+    filters: dict[str, list[str]] | None,
+    top_n: int,
+    time_start: str,
+    time_end: str,
+    scope: list[str] | None = None,
+    tree: CompartmentTree | None = None,
+) -> dict:
+    """Group, filter and rank tag-allocated cost in memory."""
+    dimensions = [cube.resolve(d) for d in group_by]
+    mask = cube.mask(filters)
+    if scope is not None:
+        mask &= cube.mask({"compartment": scope})
+
+    keys, totals = cube.group_by(dimensions, mask)
+    total = cube.total(mask)
+    groups = []
+    for i in top_k(totals, top_n).tolist():
+        labels = {}
+        for dim, label in zip(dimensions, keys[i], strict=True):
+            if dim == "compartment" and tree is not None and label in tree:
+                label = tree.path(label) or "root"
+            labels[dim] = label
+        cost = float(totals[i])
+        groups.append({
+            "keys": labels,
+            "cost": cost,
+            "percentage": (cost / total * 100) if total else 0,
+        })
+
+    return {
+        "group_by": dimensions,
+        "filters": filters or {},
+        "total_cost": total,
+        "currency": cube.currency,
+        "period_start": time_start,
+        "period_end": time_end,
+        "group_count": len(keys),
+        "groups": groups,
+        "tag_coverage": {
+            dim: round(cube.tagged_share(dim, mask) * 100, 1)
+            for dim in dimensions
+            if dim in cube.tag_keys
+        },
+        "tag_keys": cube.key_summary(),
+    }
+
+
+def _process_cost_summary(
+    cube: CostCube,
+    time_start: str,
+    time_end: str,
+    mask: np.ndarray | None = None,
+) -> dict:
+    """Summarize total and per-service cost from a cost cube."""
+    service_costs = cube.rollup("service", mask=mask)
+    total_cost = float(service_costs.sum())
 
     # Calculate days in period
     start = datetime.fromisoformat(time_start.replace('Z', '+00:00'))
     end = datetime.fromisoformat(time_end.replace('Z', '+00:00'))
     days = max((end - start).days, 1)
 
-    # Sort services by cost
-    sorted_services = sorted(
-        service_costs.items(),
-        key=lambda x: x[1],
-        reverse=True
-    )
-
     by_service = []
-    for service, cost in sorted_services[:10]:
+    for i in top_k(service_costs, 10).tolist():
+        cost = float(service_costs[i])
         pct = (cost / total_cost * 100) if total_cost > 0 else 0
         by_service.append({
-            "service": service,
+            "service": cube.services[i],
             "cost": cost,
             "percentage": pct,
-            "currency": "USD"
+            "currency": cube.currency
         })
 
     return {
         "total_cost": total_cost,
-        "currency": "USD",
+        "currency": cube.currency,
         "period_start": time_start,
         "period_end": time_end,
         "daily_average": total_cost / days,
@@ -513,34 +907,31 @@ def _process_cost_summary(items: list, time_start: str, time_end: str) -> dict:
     }
 
 
-def _process_service_costs(items: list, top_n: int, time_start: str, time_end: str) -> dict:
-    """Process service cost drilldown."""
-    service_costs = {}
-    total = 0.0
-
-    for item in items:
-        cost = float(item.computed_amount or 0)
-        service = item.service or "Unknown"
-        total += cost
-
-        if service in service_costs:
-            service_costs[service] += cost
-        else:
-            service_costs[service] = cost
-
-    sorted_services = sorted(
-        service_costs.items(),
-        key=lambda x: x[1],
-        reverse=True
-    )[:top_n]
+def _process_service_costs(
+    cube: CostCube,
+    top_n: int,
+    time_start: str,
+    time_end: str,
+    mask: np.ndarray | None = None,
+) -> dict:
+    """Rank services by cost, with their top compartments."""
+    by_pair = cube.rollup("service", "compartment", mask=mask)
+    service_costs = by_pair.sum(axis=1)
+    total = float(service_costs.sum())
 
     services = []
-    for service, cost in sorted_services:
+    for i in top_k(service_costs, top_n).tolist():
+        cost = float(service_costs[i])
         pct = (cost / total * 100) if total > 0 else 0
         services.append({
-            "service": service,
+            "service": cube.services[i],
             "cost": cost,
-            "percentage": pct
+            "percentage": pct,
+            "top_compartments": [
+                {"name": _compartment_label(cube, j), "cost": float(by_pair[i, j])}
+                for j in top_k(by_pair[i], 3).tolist()
+                if by_pair[i, j] > 0
+            ],
         })
 
     return {
@@ -551,111 +942,102 @@ def _process_service_costs(items: list, top_n: int, time_start: str, time_end: s
     }
 
 
-async def _get_compartment_map(identity_client: Any, tenancy_id: str) -> dict[str, str]:
-    """Build OCID to name mapping for compartments."""
-    compartments = {}
-
+async def _compartment_tree(identity_client: Any, tenancy_id: str) -> CompartmentTree | None:
+    """Compartment tree for display names; None if it cannot be listed."""
     try:
-        response = await asyncio.to_thread(
-            identity_client.list_compartments,
-            tenancy_id,
-            compartment_id_in_subtree=True,
-            lifecycle_state="ACTIVE"
-        )
+        return await get_compartment_tree(identity_client, tenancy_id)
+    except Exception:
+        return None  # Fall back to the names recorded with the usage data
 
-        for comp in response.data:
-            compartments[comp.id] = comp.name
 
-        # Add root compartment
-        compartments[tenancy_id] = "root"
+async def _resolve_scope(
+    identity_client: Any,
+    params: Any,
+) -> tuple[CompartmentTree, str, list[str]] | None:
+    """Resolve a tool's compartment scope against the compartment tree.
 
-    except Exception:
-        pass  # Return empty map on error
+    Returns:
+        (tree, scope compartment OCID, covered OCIDs), or None when the
+        tool is not scoped
 
-    return compartments
+    Raises:
+        ValueError: If the scope does not name a known compartment
+    """
+    if not params.scope_compartment_id:
+        return None
+    tree = await get_compartment_tree(identity_client, params.tenancy_ocid)
+    compartment_id = tree.resolve(params.scope_compartment_id)
+    covered = tree.scope(compartment_id, params.include_subcompartments)
+    return tree, compartment_id, covered
+
+
+def _scope_mask(
+    cube: CostCube,
+    scope: tuple[CompartmentTree, str, list[str]] | None,
+) -> np.ndarray | None:
+    return cube.mask(compartments=scope[2]) if scope else None
+
+
+def _add_scope(data: dict, scope: tuple[CompartmentTree, str, list[str]] | None) -> None:
+    if scope:
+        tree, compartment_id, covered = scope
+        data["scope"] = {
+            "compartment_id": compartment_id,
+            "path": tree.path(compartment_id) or "root",
+            "compartments": len(covered),
+        }
 
 
 def _process_compartment_costs(
-    items: list,
-    compartments: dict[str, str],
+    cube: CostCube,
+    tree: CompartmentTree | None,
     top_n: int,
     time_start: str,
-    time_end: str
+    time_end: str,
+    mask: np.ndarray | None = None,
 ) -> dict:
-    """Process costs grouped by compartment."""
-    compartment_data = {}
-    total = 0.0
-
-    for item in items:
-        cost = float(item.computed_amount or 0)
-        comp_id = item.compartment_id or "unknown"
-        service = item.service or "Unknown"
-        total += cost
-
-        if comp_id not in compartment_data:
-            compartment_data[comp_id] = {
-                "name": compartments.get(comp_id, comp_id[:20] + "..."),
-                "cost": 0.0,
-                "services": {}
-            }
-
-        compartment_data[comp_id]["cost"] += cost
-
-        if service in compartment_data[comp_id]["services"]:
-            compartment_data[comp_id]["services"][service] += cost
-        else:
-            compartment_data[comp_id]["services"][service] = cost
-
-    # Sort and format
-    sorted_comps = sorted(
-        compartment_data.items(),
-        key=lambda x: x[1]["cost"],
-        reverse=True
-    )[:top_n]
+    """Rank compartments by cost, with their top services."""
+    by_pair = cube.rollup("compartment", "service", mask=mask)
+    compartment_costs = by_pair.sum(axis=1)
+    names = tree.names if tree else None
 
     compartments_list = []
-    for _comp_id, data in sorted_comps:
-        services = sorted(
-            data["services"].items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:5]
-
+    for j in top_k(compartment_costs, top_n).tolist():
+        if compartment_costs[j] <= 0 and mask is not None:
+            continue
+        comp_id = cube.compartments[j]
         compartments_list.append({
-            "name": data["name"],
-            "cost": data["cost"],
-            "services": [{"service": s, "cost": c} for s, c in services]
+            "name": _compartment_label(cube, j, names),
+            "path": tree.path(comp_id) if tree and comp_id in tree else None,
+            "cost": float(compartment_costs[j]),
+            "services": [
+                {"service": cube.services[i], "cost": float(by_pair[j, i])}
+                for i in top_k(by_pair[j], 5).tolist()
+            ]
         })
 
     return {
-        "total_cost": total,
+        "total_cost": float(compartment_costs.sum()),
         "period_start": time_start,
         "period_end": time_end,
         "compartments": compartments_list
     }
 
 
-def _process_monthly_trend(items: list, months_back: int) -> dict:
-    """Process monthly trend data."""
-    monthly = {}
-
-    for item in items:
-        cost = float(item.computed_amount or 0)
-        if item.time_usage_started:
-            month = item.time_usage_started.strftime("%Y-%m")
-            if month in monthly:
-                monthly[month] += cost
-            else:
-                monthly[month] = cost
-
-    # Sort by month
-    sorted_months = sorted(monthly.items())
+def _process_monthly_trend(
+    cube: CostCube,
+    months_back: int,
+    mask: np.ndarray | None = None,
+) -> dict:
+    """Monthly totals and month-over-month change from a cost cube."""
+    monthly = cube.rollup("month", mask=mask)
+    present = cube.occupied("month")
 
     monthly_costs = []
     prev_cost = None
-    total = 0.0
-
-    for month, cost in sorted_months:
+    for month, cost, has_data in zip(cube.months, monthly.tolist(), present.tolist(), strict=True):
+        if not has_data:
+            continue
         change = None
         if prev_cost is not None and prev_cost > 0:
             change = ((cost - prev_cost) / prev_cost) * 100
@@ -665,10 +1047,9 @@ def _process_monthly_trend(items: list, months_back: int) -> dict:
             "cost": cost,
             "change_percent": change
         })
-
-        total += cost
         prev_cost = cost
 
+    total = sum(m["cost"] for m in monthly_costs)
     return {
         "summary": {
             "months_analyzed": len(monthly_costs),
@@ -679,113 +1060,267 @@ def _process_monthly_trend(items: list, months_back: int) -> dict:
     }
 
 
-def _generate_forecast(monthly_costs: list) -> dict:
-    """Generate simple linear forecast based on recent months."""
-    if len(monthly_costs) < 2:
-        return {"estimate": 0, "trend": "insufficient_data"}
+def _compartment_label(
+    cube: CostCube,
+    index: int,
+    compartments: dict[str, str] | None = None,
+) -> str:
+    """Best available display name for a cube compartment."""
+    comp_id = cube.compartments[index]
+    if compartments and comp_id in compartments:
+        return compartments[comp_id]
+    return cube.compartment_names[index] or comp_id[:20] + "..."
 
-    costs = [m["cost"] for m in monthly_costs]
 
-    # Simple average of last 3 months
-    recent = costs[-3:] if len(costs) >= 3 else costs
-    avg = sum(recent) / len(recent)
+# Days of daily history the forecasts are fitted on
+FORECAST_HISTORY_DAYS = 56
 
-    # Calculate trend
-    if len(costs) >= 2:
-        recent_avg = sum(costs[-2:]) / 2
-        older_avg = sum(costs[:-2]) / max(len(costs) - 2, 1) if len(costs) > 2 else costs[0]
 
-        if recent_avg > older_avg * 1.1:
-            trend = "increasing"
-        elif recent_avg < older_avg * 0.9:
-            trend = "decreasing"
-        else:
-            trend = "stable"
-    else:
-        trend = "stable"
+def _fit_rows(cube: CostCube, as_of: date, history_days: int) -> tuple[int, int]:
+    """Row range of the cube with complete days to fit on."""
+    rows = max(min((as_of - cube.start).days + 1, cube.n_days), 0)
+    return max(rows - history_days, 0), rows
+
+
+def _trend_forecast(
+    cube: CostCube,
+    as_of: date,
+    mask: np.ndarray | None = None,
+    history_days: int = FORECAST_HISTORY_DAYS,
+    top_n: int = 5,
+) -> dict:
+    """Month-end and next-month projection from the cube's daily cost."""
+    lo, hi = _fit_rows(cube, as_of, history_days)
+    if hi - lo < 2:
+        return {"estimate": 0, "trend": "insufficient_data"}
+
+    by_service = cube.rollup("day", "service", mask=mask)[:hi]
+    values = np.column_stack([by_service, by_service.sum(axis=1)])
+    forecast = fit_forecast(values[lo:], cube.start + timedelta(days=lo))
+
+    month_start, month_end = month_bounds(as_of)
+    current = project_period(values, cube.start, forecast, month_start, month_end, as_of)
+    next_start, next_end = month_bounds(month_end + timedelta(days=1))
+    next_month = forecast.predict(next_start, (next_end - next_start).days + 1).sum(axis=0)
 
     return {
-        "estimate": avg,
-        "trend": trend
+        "estimate": float(next_month[-1]),
+        "month": f"{next_start:%Y-%m}",
+        "trend": trend_direction(forecast),
+        "current_month": {
+            "month": f"{month_start:%Y-%m}",
+            "actual": float(current["actual"][-1]),
+            "projected": float(current["projected"][-1]),
+            "low": float(current["low"][-1]),
+            "high": float(current["high"][-1]),
+        },
+        "top_services": [
+            {"service": cube.services[i], "estimate": float(next_month[i])}
+            for i in top_k(next_month[:-1], top_n).tolist()
+            if next_month[i] > 0
+        ],
+        "model": {"history_days": hi - lo, "seasonal": forecast.seasonal},
     }
 
 
-def _detect_cost_anomalies(items: list, threshold: float, top_n: int) -> list[dict]:
-    """Statistical anomaly detection using z-score."""
-    # Group by date
-    daily_costs = {}
-    daily_services = {}
-
-    for item in items:
-        cost = float(item.computed_amount or 0)
-        service = item.service or "Unknown"
-
-        if item.time_usage_started:
-            date = item.time_usage_started.strftime("%Y-%m-%d")
-
-            if date in daily_costs:
-                daily_costs[date] += cost
-            else:
-                daily_costs[date] = cost
-                daily_services[date] = {}
-
-            if service in daily_services[date]:
-                daily_services[date][service] += cost
-            else:
-                daily_services[date][service] = cost
-
-    if len(daily_costs) < 3:
-        return []
-
-    # Calculate statistics
-    costs = list(daily_costs.values())
-    mean = statistics.mean(costs)
-    stdev = statistics.stdev(costs) if len(costs) > 1 else 0
-
-    if stdev == 0:
-        return []
-
-    anomalies = []
-    for date, cost in daily_costs.items():
-        z_score = (cost - mean) / stdev
-
-        if z_score > threshold:
-            deviation_pct = ((cost - mean) / mean) * 100 if mean > 0 else 0
-
-            # Determine severity
-            if z_score > 4:
-                severity = "critical"
-            elif z_score > 3:
-                severity = "high"
-            elif z_score > 2.5:
-                severity = "medium"
-            else:
-                severity = "low"
-
-            # Get top contributing services
-            services = daily_services.get(date, {})
-            contributors = sorted(
-                services.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:3]
-
-            anomalies.append({
-                "date": date,
-                "cost": cost,
-                "expected_cost": mean,
-                "deviation_percent": deviation_pct,
-                "severity": severity,
-                "root_cause": {
-                    "contributors": [
-                        {"service": s, "increase": c}
-                        for s, c in contributors
-                    ]
-                }
-            })
+async def _none() -> None:
+    return None
+
+
+async def _alert_rules(budget_client: Any, budget_id: str) -> list[Any]:
+    response = await call_oci(
+        oci.pagination.list_call_get_all_results,
+        budget_client.list_alert_rules,
+        budget_id,
+    )
+    return response.data
+
+
+async def _fetch_budget(budget_client: Any, budget_id: str) -> tuple[Any, list[Any]]:
+    """Fetch one budget with its alert rules."""
+    budget, rules = await asyncio.gather(
+        call_oci(budget_client.get_budget, budget_id),
+        _alert_rules(budget_client, budget_id),
+    )
+    return budget.data, rules
+
+
+async def _fetch_budgets(budget_client: Any, tenancy_id: str) -> list[tuple[Any, list[Any]]]:
+    """Fetch every active budget, then all alert rules concurrently.
+
+    A budget whose alert rules cannot be read is still assessed against
+    its amount.
+    """
+    response = await call_oci(
+        oci.pagination.list_call_get_all_results,
+        budget_client.list_budgets,
+        tenancy_id,
+        target_type="ALL",
+        lifecycle_state="ACTIVE",
+    )
+    budgets = response.data
+    rules = await gather_bounded(
+        (
+            _alert_rules(budget_client, b.id) if getattr(b, "alert_rule_count", 1) else _none()
+            for b in budgets
+        ),
+        return_exceptions=True,
+    )
+    return [
+        (budget, r if isinstance(r, list) else [])
+        for budget, r in zip(budgets, rules, strict=True)
+    ]
+
+
+def _budget_window(budget: Any, as_of: date) -> tuple[date, date]:
+    """Spend period of a budget that contains ``as_of``."""
+    if getattr(budget, "processing_period_type", None) == "SINGLE_USE":
+        start, end = getattr(budget, "start_date", None), getattr(budget, "end_date", None)
+        if start and end:
+            return _utc_date(start), _utc_date(end)
+    return budget_period(as_of, getattr(budget, "budget_processing_period_start_offset", 1))
+
+
+def _budget_compartments(budget: Any, tree: CompartmentTree | None) -> list[str] | None:
+    """Compartments a compartment budget covers; None for tag budgets."""
+    if getattr(budget, "target_type", "COMPARTMENT") != "COMPARTMENT":
+        return None
+    targets = list(getattr(budget, "targets", None) or [])
+    if not targets and getattr(budget, "target_compartment_id", None):
+        targets = [budget.target_compartment_id]
+    if not targets:
+        return None
+    if tree is None:
+        return targets
+    covered: list[str] = []
+    for target in targets:
+        covered.extend(tree.subtree(target) if target in tree else [target])
+    return covered
+
+
+def _project_budgets(
+    cube: CostCube,
+    tree: CompartmentTree | None,
+    budgets: list[tuple[Any, list[Any]]],
+    as_of: date,
+    history_days: int = FORECAST_HISTORY_DAYS,
+    seasonal: bool = True,
+) -> list[dict]:
+    """Project each budget's period spend and judge it against its thresholds.
+
+    Compartment budgets are projected from the cube, all in one fit. Tag
+    budgets, and periods the cube does not cover, use the spend and
+    forecast OCI reports for the budget.
+    """
+    lo, hi = _fit_rows(cube, as_of, history_days)
+    columns: list[np.ndarray] = []
+    plans = []
+    for budget, rules in budgets:
+        period = _budget_window(budget, as_of)
+        compartments = _budget_compartments(budget, tree)
+        column = None
+        if compartments is not None and period[0] >= cube.start and hi - lo >= 2:
+            columns.append(cube.rollup("day", mask=cube.mask(compartments=compartments))[:hi])
+            column = len(columns) - 1
+        plans.append((budget, rules, period, column))
+
+    projections: dict[tuple[date, date], dict[str, np.ndarray]] = {}
+    if columns:
+        values = np.column_stack(columns)
+        forecast = fit_forecast(values[lo:], cube.start + timedelta(days=lo), seasonal)
+        for period in {p[2] for p in plans if p[3] is not None}:
+            projections[period] = project_period(values, cube.start, forecast, *period, as_of)
+
+    results = []
+    for budget, rules, period, column in plans:
+        amount = float(getattr(budget, "amount", 0) or 0)
+        if column is None:
+            actual = float(getattr(budget, "actual_spend", 0) or 0)
+            projected = float(getattr(budget, "forecasted_spend", None) or actual)
+            high = projected
+            source = "oci"
+        else:
+            projection = projections[period]
+            actual = float(projection["actual"][column])
+            projected = float(projection["projected"][column])
+            high = float(projection["high"][column])
+            source = "usage"
+        thresholds = alert_thresholds(amount, rules)
+        results.append({
+            "id": budget.id,
+            "name": getattr(budget, "display_name", None) or budget.id,
+            "target_type": getattr(budget, "target_type", None),
+            "targets": list(getattr(budget, "targets", None) or []),
+            "period_start": period[0].isoformat(),
+            "period_end": period[1].isoformat(),
+            "amount": amount,
+            "actual_spend": actual,
+            "projected_spend": projected,
+            "projected_high": high,
+            "projected_percent": projected / amount * 100 if amount else None,
+            "alert_thresholds": thresholds,
+            "status": budget_status(amount, projected, high, thresholds),
+            "source": source,
+        })
+    return rank_budgets(results)
+
+
+def _process_budget_forecast(
+    cube: CostCube,
+    tree: CompartmentTree | None,
+    budgets: list[tuple[Any, list[Any]]],
+    as_of: date,
+    history_days: int = FORECAST_HISTORY_DAYS,
+    seasonal: bool = True,
+    top_n: int = 10,
+) -> dict:
+    """Month-end projection for the tenancy and its services, plus budgets."""
+    lo, hi = _fit_rows(cube, as_of, history_days)
+    by_service = cube.rollup("day", "service")[:hi]
+    values = np.column_stack([by_service, by_service.sum(axis=1)])
+    forecast = fit_forecast(values[lo:], cube.start + timedelta(days=lo), seasonal)
+
+    month_start, month_end = month_bounds(as_of)
+    month = project_period(values, cube.start, forecast, month_start, month_end, as_of)
+    projected = month["projected"]
 
-    # Sort by severity and return top N
-    severity_order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
-    anomalies.sort(key=lambda x: (severity_order.get(x["severity"], 4), -x["cost"]))
+    assessed = _project_budgets(cube, tree, budgets, as_of, history_days, seasonal)
+    at_risk = [b for b in assessed if b["status"] != "on_track"]
 
-    return anomalies[:top_n]
+    return {
+        "as_of": as_of.isoformat(),
+        "month": f"{month_start:%Y-%m}",
+        "days_elapsed": (as_of - month_start).days + 1,
+        "days_remaining": (month_end - as_of).days,
+        "currency": cube.currency,
+        "model": {
+            "method": "least squares: linear trend + weekday",
+            "history_days": hi - lo,
+            "seasonal": forecast.seasonal,
+        },
+        "total": {
+            "actual": float(month["actual"][-1]),
+            "projected": float(projected[-1]),
+            "low": float(month["low"][-1]),
+            "high": float(month["high"][-1]),
+            "trend": trend_direction(forecast),
+        },
+        "services": [
+            {
+                "service": cube.services[i],
+                "actual": float(month["actual"][i]),
+                "projected": float(projected[i]),
+                "daily_trend": float(forecast.daily_slope[i]),
+            }
+            for i in top_k(projected[:-1], top_n).tolist()
+            if projected[i] > 0
+        ],
+        "budgets": assessed,
+        "budgets_at_risk": at_risk,
+        "summary": {
+            "budgets": len(assessed),
+            "over_budget": sum(b["status"] == "over_budget" for b in assessed),
+            "at_risk": sum(b["status"] == "at_risk" for b in assessed),
+            "on_track": sum(b["status"] == "on_track" for b in assessed),
+        },
+    }
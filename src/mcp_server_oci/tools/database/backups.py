@@ -0,0 +1,355 @@
+"""
+Fleet backup and recoverability scan.
+
+Every compartment in scope is listed concurrently: the Autonomous
+Databases and their backups, and the DB Systems with their databases and
+backups, each call following pagination. All listings share one
+``CallBudget``, so the nested fan-out never exceeds its cap. Backups are reduced to compact
+columns (database index, end time, size, state) as they arrive, and the
+per-database roll-up is computed with NumPy in one pass:
+
+- last successful backup and its age
+- backup count, failed count and size: the total size of its backups for
+  an Autonomous Database, and the database size recorded by its latest
+  backup for a DB System database (DB System backup summaries carry no
+  backup size)
+- gaps between consecutive successful backups in the lookback window
+
+The compact scan is cached in the operational tier (see
+``SCAN_TTL_SECONDS``), so repeated recoverability checks with different
+thresholds reuse one listing.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+import numpy as np
+
+from ...core.cache import get_cache
+from ...core.concurrency import CallBudget
+from ...core.observability import get_logger
+from ...core.timestamps import epoch_seconds
+
+logger = get_logger("oci-mcp.database.backups")
+
+# Cached scans live longer than the tier default; backups land hourly at most
+SCAN_TTL_SECONDS = 900
+
+# Backup state codes
+OK, FAILED, PENDING = 0, 1, 2
+_STATE_CODES = {"ACTIVE": OK, "FAILED": FAILED, "CANCELED": FAILED}
+
+# Databases in these states are no longer expected to be backed up
+_GONE_STATES = frozenset({"TERMINATED", "TERMINATING", "DELETED", "DELETING"})
+
+STATUS_ORDER = {"never_backed_up": 0, "stale": 1, "gaps": 2, "ok": 3}
+
+
+@dataclass
+class BackupRecords:
+    """Compact backup columns for a set of databases."""
+    databases: list[dict[str, Any]]  # id, display_name, type, compartment_id, lifecycle_state
+    db: np.ndarray                   # int32 index into databases
+    ended: np.ndarray                # float64 epoch seconds (NaN if unfinished)
+    size_gb: np.ndarray              # float64
+    state: np.ndarray                # int8 OK/FAILED/PENDING
+    orphaned: np.ndarray             # bool per database: seen only through backups
+
+    @classmethod
+    def build(
+        cls,
+        databases: Iterable[dict[str, Any]],
+        backups: Iterable[tuple[str, str, Any, float]],
+    ) -> BackupRecords:
+        """Encode ``(database_id, lifecycle_state, time_ended, size_gb)`` rows."""
+        known = [d for d in databases if d.get("lifecycle_state") not in _GONE_STATES]
+        index = {d["id"]: i for i, d in enumerate(known)}
+        orphans: list[dict[str, Any]] = []
+        db: list[int] = []
+        ended: list[float] = []
+        size: list[float] = []
+        state: list[int] = []
+        for database_id, lifecycle_state, time_ended, size_gb in backups:
+            i = index.get(database_id)
+            if i is None:
+                i = index[database_id] = len(known) + len(orphans)
+                orphans.append({"id": database_id, "type": _database_type(database_id)})
+            db.append(i)
+            epoch = epoch_seconds(time_ended)
+            ended.append(np.nan if epoch is None else epoch)
+            size.append(float(size_gb or 0))
+            state.append(_STATE_CODES.get(lifecycle_state or "", PENDING))
+        return cls(
+            databases=known + orphans,
+            db=np.asarray(db, dtype=np.int32),
+            ended=np.asarray(ended, dtype=np.float64),
+            size_gb=np.asarray(size, dtype=np.float64),
+            state=np.asarray(state, dtype=np.int8),
+            orphaned=np.arange(len(known) + len(orphans)) >= len(known),
+        )
+
+    def __len__(self) -> int:
+        return int(self.db.size)
+
+    def to_payload(self) -> dict[str, Any]:
+        """JSON-safe form for the cache."""
+        return {
+            "databases": self.databases,
+            "db": self.db.tolist(),
+            "ended": [None if np.isnan(e) else e for e in self.ended.tolist()],
+            "size_gb": self.size_gb.tolist(),
+            "state": self.state.tolist(),
+            "orphaned": int(self.orphaned.sum()),
+        }
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> BackupRecords:
+        n = len(payload["databases"])
+        return cls(
+            databases=payload["databases"],
+            db=np.asarray(payload["db"], dtype=np.int32),
+            ended=np.asarray(
+                [np.nan if e is None else e for e in payload["ended"]], dtype=np.float64
+            ),
+            size_gb=np.asarray(payload["size_gb"], dtype=np.float64),
+            state=np.asarray(payload["state"], dtype=np.int8),
+            orphaned=np.arange(n) >= n - payload["orphaned"],
+        )
+
+
+def rollup(
+    records: BackupRecords,
+    now: datetime,
+    max_age_hours: float,
+    gap_hours: float,
+    lookback_days: int,
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """Per-database recoverability and a fleet summary.
+
+    A database is 'never_backed_up' without a successful backup, 'stale'
+    when its last one is older than ``max_age_hours``, and 'gaps' when two
+    consecutive successful backups within the lookback window are more
+    than ``gap_hours`` apart.
+
+    Returns:
+        Tuple of (per-database rows, worst first; summary)
+    """
+    n = len(records.databases)
+    now_ts = now.timestamp()
+    db, ended, state = records.db, records.ended, records.state
+    ok = (state == OK) & ~np.isnan(ended)
+    autonomous = np.array([d["type"] == "autonomous" for d in records.databases], dtype=bool)
+    # Autonomous backups carry their own size, DB System backups the database's
+    backup_sized = ok & autonomous[db]
+
+    last = np.full(n, -np.inf)
+    np.maximum.at(last, db[ok], ended[ok])
+    count = np.bincount(db, minlength=n)
+    failed = np.bincount(db[state == FAILED], minlength=n)
+    size = np.bincount(db[backup_sized], weights=records.size_gb[backup_sized], minlength=n)
+
+    # DB System databases: the size recorded by their latest successful backup
+    latest = np.flatnonzero(ok & ~backup_sized)
+    latest = latest[np.lexsort((ended[latest], db[latest]))]
+    newest = np.append(db[latest][1:] != db[latest][:-1], True) if latest.size else latest
+    size[db[latest[newest]]] = records.size_gb[latest[newest]]
+
+    # Consecutive successful backups per database inside the window
+    window = ok & (ended >= now_ts - lookback_days * 86400)
+    wdb, wend = db[window], ended[window]
+    order = np.lexsort((wend, wdb))
+    wdb, wend = wdb[order], wend[order]
+    same = wdb[1:] == wdb[:-1]
+    spans = np.diff(wend)[same]
+    span_db = wdb[1:][same]
+    max_gap = np.zeros(n)
+    np.maximum.at(max_gap, span_db, spans)
+    gaps = np.bincount(span_db[spans > gap_hours * 3600], minlength=n)
+
+    age_hours = (now_ts - last) / 3600
+    status = np.where(
+        np.isinf(last), "never_backed_up",
+        np.where(age_hours > max_age_hours, "stale", np.where(gaps > 0, "gaps", "ok")),
+    )
+
+    rows = []
+    for i in np.flatnonzero(~records.orphaned).tolist():
+        info = records.databases[i]
+        rows.append({
+            **info,
+            "status": str(status[i]),
+            "last_backup": (
+                datetime.fromtimestamp(last[i], tz=UTC).isoformat()
+                if np.isfinite(last[i]) else None
+            ),
+            "age_hours": round(float(age_hours[i]), 1) if np.isfinite(last[i]) else None,
+            "backups": int(count[i]),
+            "failed": int(failed[i]),
+            "size_gb": round(float(size[i]), 2),
+            "size_basis": "backups" if autonomous[i] else "database",
+            "max_gap_hours": round(float(max_gap[i]) / 3600, 1),
+            "gaps": int(gaps[i]),
+        })
+    rows.sort(key=lambda r: (
+        STATUS_ORDER[r["status"]],
+        -r["age_hours"] if r["age_hours"] is not None else -np.inf,
+    ))
+
+    by_status = dict.fromkeys(STATUS_ORDER, 0)
+    for row in rows:
+        by_status[row["status"]] += 1
+    orphan_backups = records.orphaned[db] if len(records) else np.zeros(0, dtype=bool)
+    live = ~records.orphaned
+    summary = {
+        "databases": len(rows),
+        **by_status,
+        "backups": len(records),
+        "failed_backups": int((state == FAILED).sum()),
+        "backup_size_gb": round(float(records.size_gb[backup_sized].sum()), 2),
+        "database_size_gb": round(float(size[live & ~autonomous].sum()), 2),
+        "orphaned_backups": int(orphan_backups.sum()),
+        "orphaned_size_gb": round(
+            float(records.size_gb[backup_sized & orphan_backups].sum()), 2
+        ),
+    }
+    return rows, summary
+
+
+async def scan_backups(
+    db_client: Any,
+    compartment_ids: list[str],
+    include_autonomous: bool = True,
+    include_db_systems: bool = True,
+    budget: CallBudget | None = None,
+) -> tuple[BackupRecords, list[dict[str, str]]]:
+    """List databases and backups in every compartment concurrently.
+
+    Args:
+        db_client: OCI DatabaseClient
+        compartment_ids: Compartments to scan
+        include_autonomous: List Autonomous Databases and their backups
+        include_db_systems: List DB Systems, their databases and backups
+        budget: Call budget shared with the caller (default: OCI_MAX_CONCURRENCY)
+
+    Returns:
+        Tuple of (compact records, per-call listing errors)
+    """
+    budget = budget or CallBudget()
+    databases: list[dict[str, Any]] = []
+    backups: list[tuple[str, str, Any, float]] = []
+    errors: list[dict[str, str]] = []
+
+    async def _list(what: str, func: Any, compartment_id: str, **kwargs: Any) -> list[Any]:
+        try:
+            return await budget.list_all(func, compartment_id=compartment_id, **kwargs)
+        except Exception as e:
+            logger.warning("Backup scan listing failed", compartment_id=compartment_id,
+                           what=what, error=str(e))
+            errors.append({"compartment_id": compartment_id, "listing": what, "error": str(e)})
+            return []
+
+    async def _autonomous(compartment_id: str) -> None:
+        dbs, items = await asyncio.gather(
+            _list("autonomous_databases", db_client.list_autonomous_databases, compartment_id),
+            _list("autonomous_database_backups",
+                  db_client.list_autonomous_database_backups, compartment_id),
+        )
+        databases.extend(
+            _database_dict(d, "autonomous", d.display_name) for d in dbs
+        )
+        backups.extend(
+            (
+                b.autonomous_database_id,
+                b.lifecycle_state,
+                b.time_ended,
+                (getattr(b, "size_in_tbs", 0) or 0) * 1024,
+            )
+            for b in items
+        )
+
+    async def _db_systems(compartment_id: str) -> None:
+        systems, items = await asyncio.gather(
+            _list("db_systems", db_client.list_db_systems, compartment_id),
+            _list("backups", db_client.list_backups, compartment_id),
+        )
+        live = [s for s in systems if s.lifecycle_state not in _GONE_STATES]
+        per_system = await asyncio.gather(*(
+            _list("databases", db_client.list_databases, compartment_id, system_id=s.id)
+            for s in live
+        ))
+        for system, dbs in zip(live, per_system, strict=True):
+            databases.extend(
+                _database_dict(d, "db_system", f"{system.display_name}/{d.db_name}")
+                for d in dbs
+            )
+        backups.extend(
+            (
+                b.database_id,
+                b.lifecycle_state,
+                b.time_ended,
+                getattr(b, "database_size_in_gbs", 0) or 0,
+            )
+            for b in items
+        )
+
+    tasks = []
+    for compartment_id in compartment_ids:
+        if include_autonomous:
+            tasks.append(_autonomous(compartment_id))
+        if include_db_systems:
+            tasks.append(_db_systems(compartment_id))
+    await asyncio.gather(*tasks)
+    return BackupRecords.build(databases, backups), errors
+
+
+async def get_backup_records(
+    db_client: Any,
+    compartment_ids: list[str],
+    include_autonomous: bool = True,
+    include_db_systems: bool = True,
+    refresh: bool = False,
+) -> tuple[BackupRecords, list[dict[str, str]], dict[str, Any]]:
+    """Cached ``scan_backups``.
+
+    Returns:
+        Tuple of (records, listing errors, cache info with scanned_at and cached)
+    """
+    cache = get_cache("operational")
+    key = "backup_scan:" + ":".join([
+        str(include_autonomous), str(include_db_systems), *sorted(compartment_ids)
+    ])
+    payload = None if refresh else await cache.get(key)
+    if payload is not None:
+        info = {"scanned_at": payload["scanned_at"], "cached": True}
+        return BackupRecords.from_payload(payload["records"]), payload["errors"], info
+
+    records, errors = await scan_backups(
+        db_client, compartment_ids, include_autonomous, include_db_systems
+    )
+    scanned_at = datetime.now(UTC).isoformat()
+    # Partial scans are not cached so the next call retries the failed listings
+    if not errors:
+        await cache.set(
+            key,
+            {"records": records.to_payload(), "errors": errors, "scanned_at": scanned_at},
+            ttl=SCAN_TTL_SECONDS,
+        )
+    return records, errors, {"scanned_at": scanned_at, "cached": False}
+
+
+def _database_dict(db: Any, kind: str, name: str) -> dict[str, Any]:
+    return {
+        "id": db.id,
+        "display_name": name,
+        "type": kind,
+        "compartment_id": db.compartment_id,
+        "lifecycle_state": db.lifecycle_state,
+    }
+
+
+def _database_type(database_id: str) -> str:
+    return "autonomous" if "autonomousdatabase" in database_id else "db_system"
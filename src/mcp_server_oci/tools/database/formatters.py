@@ -144,6 +144,76 @@ class DatabaseFormatter:
 
         return md
 
+    @staticmethod
+    def backup_report_markdown(data: dict) -> str:
+        """Format a fleet backup report as markdown."""
+        md = MarkdownFormatter.header("Backup Recoverability Report", 1)
+
+        scope = data.get("scope", {})
+        thresholds = data.get("thresholds", {})
+        summary = data.get("summary", {})
+        md += f"**Scope:** {scope.get('path') or scope.get('compartment_id', 'N/A')} "
+        md += f"({scope.get('compartments', 1)} compartments)\n"
+        md += f"**Thresholds:** last backup within {thresholds.get('max_age_hours')}h, "
+        md += f"gaps over {thresholds.get('gap_hours')}h in the last "
+        md += f"{thresholds.get('lookback_days')} days\n\n"
+
+        md += f"- **Databases:** {summary.get('databases', 0)}\n"
+        md += f"- **Never backed up:** {summary.get('never_backed_up', 0)}\n"
+        md += f"- **Stale:** {summary.get('stale', 0)}\n"
+        md += f"- **Gaps:** {summary.get('gaps', 0)}\n"
+        md += f"- **OK:** {summary.get('ok', 0)}\n"
+        md += f"- **Backups:** {summary.get('backups', 0)} "
+        md += f"({summary.get('failed_backups', 0)} failed, "
+        md += f"{summary.get('backup_size_gb', 0):,.2f} GB of Autonomous backups)\n"
+        if summary.get("database_size_gb"):
+            md += "- **DB System database size:** "
+            md += f"{summary['database_size_gb']:,.2f} GB (backup sizes not reported)\n"
+        if summary.get("orphaned_backups"):
+            md += f"- **Backups of deleted databases:** {summary['orphaned_backups']} "
+            md += f"({summary.get('orphaned_size_gb', 0):,.2f} GB)\n"
+        md += "\n"
+
+        databases = data.get("databases", [])
+        if databases:
+            headers = [
+                "Database", "Type", "Status", "Last Backup", "Age (h)",
+                "Backups", "Failed", "Size (GB)", "Max Gap (h)",
+            ]
+            rows = []
+            for db in databases:
+                age = db.get("age_hours")
+                rows.append([
+                    db.get("display_name", "N/A"),
+                    db.get("type", "N/A"),
+                    db.get("status", "N/A"),
+                    Formatter.format_datetime(db.get("last_backup") or "", human_readable=True)
+                    if db.get("last_backup") else "never",
+                    f"{age:,.1f}" if age is not None else "-",
+                    str(db.get("backups", 0)),
+                    str(db.get("failed", 0)),
+                    f"{db.get('size_gb', 0):,.2f}"
+                    + (" (database)" if db.get("size_basis") == "database" else ""),
+                    f"{db.get('max_gap_hours', 0):,.1f}",
+                ])
+            md += MarkdownFormatter.table(headers, rows)
+            if summary.get("databases", 0) > len(databases):
+                md += f"\n*Showing {len(databases)} of {summary['databases']} databases.*\n"
+        else:
+            md += "*No databases found in scope.*\n"
+
+        errors = data.get("errors", [])
+        if errors:
+            md += "\n" + MarkdownFormatter.header("Listing Errors", 2)
+            for err in errors:
+                md += f"- `{err.get('compartment_id')}` {err.get('listing')}: {err.get('error')}\n"
+
+        if data.get("scanned_at"):
+            cached = " (cached)" if data.get("cached") else ""
+            md += f"\n*Scanned at {data['scanned_at']}{cached}.*\n"
+
+        return md
+
     @staticmethod
     def metrics_markdown(data: dict) -> str:
         """Format database metrics as markdown."""
@@ -154,8 +224,10 @@ class DatabaseFormatter:
         md += f"**Period:** Last {data.get('hours_back', 24)} hours\n\n"
 
         metrics = data.get("metrics", {})
+        errors = data.get("errors", {})
         if not metrics:
             md += "*No metrics data available.*\n"
+            md += _metric_error_lines(errors)
             return md
 
         for metric_name, metric_data in metrics.items():
@@ -171,6 +243,49 @@ class DatabaseFormatter:
                 md += f"- **Minimum:** {metric_data['min']:.2f}%\n"
             md += "\n"
 
+        md += _metric_error_lines(errors)
+        return md
+
+    @staticmethod
+    def fleet_metrics_markdown(data: dict) -> str:
+        """Format metrics for several databases as one table."""
+        md = MarkdownFormatter.header("Database Metrics", 1)
+        summary = data.get("summary", {})
+        md += f"**Databases:** {summary.get('requested', 0)} requested, "
+        md += f"{summary.get('complete', 0)} complete, {summary.get('partial', 0)} partial, "
+        md += f"{summary.get('failed', 0)} failed\n"
+        md += f"**Period:** Last {data.get('hours_back', 24)} hours (average / peak)\n\n"
+
+        metric_names = data.get("metric_names", [])
+        databases = data.get("databases", [])
+        if databases:
+            md += "| Database | State | " + " | ".join(metric_names) + " |\n"
+            md += "|" + "---|" * (len(metric_names) + 2) + "\n"
+            for entry in databases:
+                db = entry.get("database", {})
+                cells = []
+                for name in metric_names:
+                    stats = entry.get("metrics", {}).get(name)
+                    if stats:
+                        cells.append(f"{stats['average']:.2f} / {stats['max']:.2f}")
+                    elif name in entry.get("errors", {}):
+                        cells.append("error")
+                    else:
+                        cells.append("—")
+                state = _state_badge(db.get("lifecycle_state", ""))
+                md += f"| {db.get('display_name', 'N/A')} | {state} | {' | '.join(cells)} |\n"
+            md += "\n"
+
+        errors: dict[str, str] = {}
+        for entry in databases:
+            errors.update(entry.get("errors", {}))
+        md += _metric_error_lines(errors)
+
+        if data.get("failures"):
+            md += MarkdownFormatter.header("Lookup Failures", 2)
+            for failure in data["failures"]:
+                md += f"- `{failure['database_id']}`: {failure['error']}\n"
+
         return md
 
     @staticmethod
@@ -194,6 +309,16 @@ class DatabaseFormatter:
         return md
 
 
+def _metric_error_lines(errors: dict[str, str]) -> str:
+    """Markdown list of metrics whose queries failed."""
+    if not errors:
+        return ""
+    md = MarkdownFormatter.header("Failed Metrics", 2)
+    for name, error in errors.items():
+        md += f"- **{name}:** {error}\n"
+    return md
+
+
 def _state_badge(state: str) -> str:
     """Convert lifecycle state to emoji badge."""
     state_badges = {
@@ -5,7 +5,7 @@ from __future__ import annotations
 
 from enum import Enum
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, field_validator
 
 from ...core.models import ResponseFormat
 
@@ -56,6 +56,10 @@ class ListAutonomousDatabasesInput(BaseModel):
         description="Compartment OCID to list databases from",
         min_length=20
     )
+    include_subcompartments: bool = Field(
+        default=False,
+        description="Also list databases in every compartment below compartment_id"
+    )
     workload_type: ADBWorkloadType | None = Field(
         default=None,
         description="Filter by workload type: OLTP, DW, AJD, or APEX"
@@ -136,6 +140,12 @@ class StartAutonomousDatabaseInput(BaseModel):
         default=False,
         description="Wait for the database to reach AVAILABLE state"
     )
+    timeout_seconds: int = Field(
+        default=900,
+        description="Maximum time to wait when wait_for_state is set",
+        ge=30,
+        le=3600
+    )
     response_format: ResponseFormat = Field(
         default=ResponseFormat.MARKDOWN,
         description="Output format"
@@ -166,6 +176,12 @@ class StopAutonomousDatabaseInput(BaseModel):
         default=False,
         description="Wait for the database to reach STOPPED state"
     )
+    timeout_seconds: int = Field(
+        default=900,
+        description="Maximum time to wait when wait_for_state is set",
+        ge=30,
+        le=3600
+    )
     response_format: ResponseFormat = Field(
         default=ResponseFormat.MARKDOWN,
         description="Output format"
@@ -187,11 +203,17 @@ class GetDatabaseMetricsInput(BaseModel):
         extra='forbid'
     )
 
-    database_id: str = Field(
-        ...,
+    database_id: str | None = Field(
+        default=None,
         description="Database OCID (Autonomous or DB System)",
         min_length=20
     )
+    database_ids: list[str] | None = Field(
+        default=None,
+        description="Several database OCIDs to fetch the same metrics for in one call",
+        min_length=1,
+        max_length=100
+    )
     metric_names: list[str] | None = Field(
         default=None,
         description="Specific metrics to retrieve (e.g., ['CpuUtilization', 'StorageUtilization'])"
@@ -221,6 +243,10 @@ class ListDBSystemsInput(BaseModel):
         description="Compartment OCID to list DB Systems from",
         min_length=20
     )
+    include_subcompartments: bool = Field(
+        default=False,
+        description="Also list DB Systems in every compartment below compartment_id"
+    )
     lifecycle_state: LifecycleState | None = Field(
         default=None,
         description="Filter by lifecycle state"
@@ -269,6 +295,10 @@ class ListBackupsInput(BaseModel):
         default=None,
         description="Compartment OCID (required if database_id not provided)"
     )
+    include_subcompartments: bool = Field(
+        default=False,
+        description="With compartment_id, also list backups in every compartment below it"
+    )
     database_type: DatabaseType = Field(
         default=DatabaseType.AUTONOMOUS,
         description="Type of database: autonomous, db_system, or mysql"
@@ -285,6 +315,69 @@ class ListBackupsInput(BaseModel):
     )
 
 
+class BackupReportInput(BaseModel):
+    """Input for the fleet backup and recoverability report."""
+    model_config = ConfigDict(
+        str_strip_whitespace=True,
+        validate_assignment=True,
+        extra='forbid'
+    )
+
+    compartment_id: str | None = Field(
+        default=None,
+        description="Compartment OCID, name, or path to scan "
+                    "(defaults to COMPARTMENT_OCID env var, then the tenancy)"
+    )
+    include_subcompartments: bool = Field(
+        default=True,
+        validation_alias=AliasChoices("include_subcompartments", "include_children"),
+        description="Scan the whole compartment subtree"
+    )
+    database_type: DatabaseType = Field(
+        default=DatabaseType.ALL,
+        description="Database type: 'autonomous', 'db_system', or 'all'"
+    )
+    max_age_hours: int = Field(
+        default=24,
+        description="A database whose last successful backup is older than this is stale",
+        ge=1,
+        le=720
+    )
+    gap_hours: int = Field(
+        default=36,
+        description="Flag consecutive successful backups further apart than this",
+        ge=1,
+        le=720
+    )
+    lookback_days: int = Field(
+        default=30,
+        description="Window in which backup gaps are detected",
+        ge=1,
+        le=365
+    )
+    top_n: int = Field(
+        default=25,
+        description="Number of databases to list, worst first",
+        ge=1,
+        le=500
+    )
+    refresh: bool = Field(
+        default=False,
+        description="Bypass the cached scan and re-list backups"
+    )
+    response_format: ResponseFormat = Field(
+        default=ResponseFormat.MARKDOWN,
+        description="Output format"
+    )
+
+    @field_validator('database_type')
+    @classmethod
+    def validate_database_type(cls, v: DatabaseType) -> DatabaseType:
+        if v == DatabaseType.MYSQL:
+            raise ValueError("Backup report covers 'autonomous' and 'db_system' databases")
+        return v
+
+
 # Output models for structured responses
 class AutonomousDatabaseSummary(BaseModel):
     """Summary of an Autonomous Database."""
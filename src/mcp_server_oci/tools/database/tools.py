@@ -5,17 +5,25 @@ from __future__ import annotations
 
 import asyncio
 import os
+from contextlib import suppress
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
 from mcp.server.fastmcp import Context, FastMCP
 
 from ...core.client import get_oci_client
+from ...core.compartments import compartment_scope, get_compartment_tree
+from ...core.concurrency import call_oci, gather_bounded
 from ...core.errors import format_error_response, handle_oci_error
+from ...core.metrics import fetch_metrics
 from ...core.models import ResponseFormat
 from ...core.observability import observe_tool
+from ...core.waiters import WaitOutcome, report_transitions, wait_for_state
+from .backups import get_backup_records, rollup
 from .formatters import DatabaseFormatter
 from .models import (
+    BackupReportInput,
+    DatabaseType,
     GetAutonomousDatabaseInput,
     GetDatabaseMetricsInput,
     ListAutonomousDatabasesInput,
@@ -25,6 +33,11 @@ from .models import (
     StopAutonomousDatabaseInput,
 )
 
+# Autonomous Database states that end a start/stop wait as failed
+ADB_FAILED_STATES = frozenset({"TERMINATING", "TERMINATED"})
+
+DEFAULT_DB_METRICS = ["CpuUtilization", "StorageUtilization", "Sessions", "ExecuteCount"]
+
 
 def register_database_tools(mcp: FastMCP) -> None:
     """Register all database domain tools with the MCP server."""
@@ -44,6 +57,8 @@ def register_database_tools(mcp: FastMCP) -> None:
 
         Retrieves all Autonomous Databases (ATP, ADW, AJD, APEX) in the specified
         compartment with optional filtering by workload type and lifecycle state.
+        With include_subcompartments, every compartment of the subtree is
+        listed concurrently.
 
         Args:
             params: ListAutonomousDatabasesInput with compartment_id and filters
@@ -64,10 +79,7 @@ def register_database_tools(mcp: FastMCP) -> None:
                     await ctx.report_progress(0.3, "Fetching Autonomous Databases...")
 
                     # Build request kwargs
-                    kwargs: dict[str, Any] = {
-                        "compartment_id": params.compartment_id,
-                        "limit": params.limit,
-                    }
+                    kwargs: dict[str, Any] = {"limit": params.limit}
 
                     if params.workload_type:
                         kwargs["db_workload"] = params.workload_type.value
@@ -76,15 +88,13 @@ def register_database_tools(mcp: FastMCP) -> None:
                     if params.display_name:
                         kwargs["display_name"] = params.display_name
 
-                    response = await asyncio.to_thread(
-                        db_client.list_autonomous_databases,
-                        **kwargs
+                    items = await _list_in_scope(
+                        client, db_client.list_autonomous_databases,
+                        params.compartment_id, params.include_subcompartments, **kwargs
                     )
 
                     await ctx.report_progress(0.7, "Processing results...")
 
-                    items = response.data if response.data else []
-
                     # Apply offset manually (OCI API doesn't support offset)
                     all_items = items
                     items = items[params.offset:params.offset + params.limit]
@@ -230,18 +240,26 @@ def register_database_tools(mcp: FastMCP) -> None:
                     )
 
                     db_data = _adb_to_dict(response.data)
+                    success, message = True, "Start operation initiated successfully."
+                    wait = None
 
                     if params.wait_for_state:
                         await ctx.report_progress(0.5, "Waiting for database to start...")
-                        # Note: In production, use OCI waiter
-                        # For now, just return the current state
+                        wait = await _wait_for_adb(db_client, params, "AVAILABLE", ctx)
+                        if wait.data is not None:
+                            db_data = _adb_to_dict(wait.data)
+                        success, message = _wait_result("start", wait)
 
                     await ctx.report_progress(0.9, "Formatting result...")
 
                     if params.response_format == ResponseFormat.JSON:
-                        return DatabaseFormatter.to_json({"success": True, "database": db_data})
+                        return DatabaseFormatter.to_json({
+                            "success": success,
+                            "database": db_data,
+                            "wait": wait.to_dict() if wait else None,
+                        })
                     return DatabaseFormatter.action_result_markdown(
-                        "start", db_data, True, "Start operation initiated successfully."
+                        "start", db_data, success, message
                     )
 
             except Exception as e:
@@ -313,13 +331,26 @@ def register_database_tools(mcp: FastMCP) -> None:
                     )
 
                     db_data = _adb_to_dict(response.data)
+                    success, message = True, "Stop operation initiated successfully."
+                    wait = None
+
+                    if params.wait_for_state:
+                        await ctx.report_progress(0.5, "Waiting for database to stop...")
+                        wait = await _wait_for_adb(db_client, params, "STOPPED", ctx)
+                        if wait.data is not None:
+                            db_data = _adb_to_dict(wait.data)
+                        success, message = _wait_result("stop", wait)
 
                     await ctx.report_progress(0.9, "Formatting result...")
 
                     if params.response_format == ResponseFormat.JSON:
-                        return DatabaseFormatter.to_json({"success": True, "database": db_data})
+                        return DatabaseFormatter.to_json({
+                            "success": success,
+                            "database": db_data,
+                            "wait": wait.to_dict() if wait else None,
+                        })
                     return DatabaseFormatter.action_result_markdown(
-                        "stop", db_data, True, "Stop operation initiated successfully."
+                        "stop", db_data, success, message
                     )
 
             except Exception as e:
@@ -341,7 +372,9 @@ def register_database_tools(mcp: FastMCP) -> None:
         """List DB Systems (BaseDB, Exadata) in a compartment.
 
         Retrieves all DB Systems in the specified compartment with optional
-        filtering by lifecycle state and display name.
+        filtering by lifecycle state and display name. With
+        include_subcompartments, every compartment of the subtree is listed
+        concurrently.
 
         Args:
             params: ListDBSystemsInput with compartment_id and filters
@@ -361,24 +394,20 @@ def register_database_tools(mcp: FastMCP) -> None:
 
                     await ctx.report_progress(0.3, "Fetching DB Systems...")
 
-                    kwargs: dict[str, Any] = {
-                        "compartment_id": params.compartment_id,
-                        "limit": params.limit,
-                    }
+                    kwargs: dict[str, Any] = {"limit": params.limit}
 
                     if params.lifecycle_state:
                         kwargs["lifecycle_state"] = params.lifecycle_state.value
                     if params.display_name:
                         kwargs["display_name"] = params.display_name
 
-                    response = await asyncio.to_thread(
-                        db_client.list_db_systems,
-                        **kwargs
+                    items = await _list_in_scope(
+                        client, db_client.list_db_systems,
+                        params.compartment_id, params.include_subcompartments, **kwargs
                     )
 
                     await ctx.report_progress(0.7, "Processing results...")
 
-                    items = response.data if response.data else []
                     all_items = items
                     items = items[params.offset:params.offset + params.limit]
 
@@ -417,109 +446,82 @@ def register_database_tools(mcp: FastMCP) -> None:
         }
     )
     async def get_database_metrics(params: GetDatabaseMetricsInput, ctx: Context) -> str:
-        """Get performance metrics for a database.
+        """Get performance metrics for one or more databases.
 
-        Retrieves CPU, storage, and other performance metrics for an
-        Autonomous Database or DB System over a specified time period.
+        Retrieves CPU, storage, and other performance metrics for Autonomous
+        Databases or DB Systems over a specified time period. Databases are
+        looked up concurrently and every metric is fetched concurrently, with
+        databases sharing a namespace and compartment combined into one query
+        per metric. Lookups or metrics that fail are reported alongside the
+        results instead of failing the call.
 
         Args:
-            params: GetDatabaseMetricsInput with database_id and time range
+            params: GetDatabaseMetricsInput with database_id or database_ids
+                and time range
 
         Returns:
-            Database performance metrics
+            Database performance metrics, with per-database and per-metric errors
 
         Example:
             {"database_id": "ocid1.autonomousdatabase.oc1...", "hours_back": 24}
+            {"database_ids": ["ocid1.autonomousdatabase.oc1...a", "...b"]}
         """
         async with observe_tool("oci_database_get_metrics", "database", params.model_dump()):
             await ctx.report_progress(0.1, "Fetching database metrics...")
 
+            database_ids = list(dict.fromkeys(
+                ([params.database_id] if params.database_id else [])
+                + (params.database_ids or [])
+            ))
+            if not database_ids:
+                return format_error_response(
+                    "Either database_id or database_ids is required.",
+                    params.response_format.value
+                )
+
             try:
                 async with get_oci_client() as client:
-                    monitoring_client = client.monitoring
-                    db_client = client.database
-
-                    # Determine database type and get info
                     await ctx.report_progress(0.2, "Getting database information...")
 
-                    db_info = {}
-                    namespace = "oci_autonomous_database"
-
-                    if "autonomousdatabase" in params.database_id:
-                        response = await asyncio.to_thread(
-                            db_client.get_autonomous_database,
-                            autonomous_database_id=params.database_id
-                        )
-                        db_info = _adb_to_dict(response.data)
-                    else:
-                        namespace = "oci_database"
-                        # DB System metrics
-                        response = await asyncio.to_thread(
-                            db_client.get_db_system,
-                            db_system_id=params.database_id
-                        )
-                        db_info = _dbsystem_to_dict(response.data)
+                    databases, failures = await _describe_databases(client.database, database_ids)
 
                     await ctx.report_progress(0.4, "Querying metrics...")
 
-                    # Default metrics for ADB
-                    metric_names = params.metric_names or [
-                        "CpuUtilization",
-                        "StorageUtilization",
-                        "Sessions",
-                        "ExecuteCount"
-                    ]
-
+                    metric_names = params.metric_names or DEFAULT_DB_METRICS
                     end_time = datetime.now(UTC)
                     start_time = end_time - timedelta(hours=params.hours_back)
-
-                    metrics_data = {}
-
-                    for metric_name in metric_names:
-                        try:
-                            query = f"{metric_name}[1h].mean()"
-
-                            response = await asyncio.to_thread(
-                                monitoring_client.summarize_metrics_data,
-                                compartment_id=db_info.get("compartment_id", ""),
-                                summarize_metrics_data_details={
-                                    "namespace": namespace,
-                                    "query": query,
-                                    "start_time": start_time.isoformat(),
-                                    "end_time": end_time.isoformat(),
-                                    "resolution": "1h"
-                                }
-                            )
-
-                            if response.data:
-                                values = [
-                                    dp.value
-                                    for item in response.data
-                                    for dp in (item.aggregated_datapoints or [])
-                                    if dp.value is not None
-                                ]
-                                if values:
-                                    metrics_data[metric_name] = {
-                                        "current": values[-1] if values else None,
-                                        "average": sum(values) / len(values) if values else None,
-                                        "max": max(values) if values else None,
-                                        "min": min(values) if values else None,
-                                    }
-                        except Exception:
-                            # Skip metrics that fail
-                            pass
+                    results = await _collect_database_metrics(
+                        client.monitoring, databases, metric_names, start_time, end_time
+                    )
 
                     await ctx.report_progress(0.9, "Formatting output...")
 
+                    if params.database_ids is None and len(database_ids) == 1:
+                        if failures:
+                            raise failures[0]["exception"]
+                        result = {"hours_back": params.hours_back, **results[0]}
+                        if params.response_format == ResponseFormat.JSON:
+                            return DatabaseFormatter.to_json(result)
+                        return DatabaseFormatter.metrics_markdown(result)
+
                     result = {
-                        "database": db_info,
                         "hours_back": params.hours_back,
-                        "metrics": metrics_data
+                        "metric_names": metric_names,
+                        "databases": results,
+                        "failures": [
+                            {"database_id": f["database_id"], "error": f["error"]}
+                            for f in failures
+                        ],
+                        "summary": {
+                            "requested": len(database_ids),
+                            "complete": sum(1 for r in results if not r["errors"]),
+                            "partial": sum(1 for r in results if r["errors"]),
+                            "failed": len(failures),
+                        },
                     }
-
                     if params.response_format == ResponseFormat.JSON:
                         return DatabaseFormatter.to_json(result)
-                    return DatabaseFormatter.metrics_markdown(result)
+                    return DatabaseFormatter.fleet_metrics_markdown(result)
 
             except Exception as e:
                 error = handle_oci_error(e, "getting database metrics")
@@ -540,7 +542,8 @@ def register_database_tools(mcp: FastMCP) -> None:
         """List backups for a database or compartment.
 
         Retrieves backup history for an Autonomous Database or DB System,
-        or all backups in a compartment.
+        or all backups in a compartment (and, with include_subcompartments,
+        every compartment below it, listed concurrently).
 
         Args:
             params: ListBackupsInput with database_id or compartment_id
@@ -573,16 +576,17 @@ def register_database_tools(mcp: FastMCP) -> None:
                                 autonomous_database_id=params.database_id,
                                 limit=params.limit
                             )
+                            backups = response.data or []
                         elif params.compartment_id:
-                            response = await asyncio.to_thread(
-                                db_client.list_autonomous_database_backups,
-                                compartment_id=params.compartment_id,
-                                limit=params.limit
+                            backups = await _list_in_scope(
+                                client, db_client.list_autonomous_database_backups,
+                                params.compartment_id, params.include_subcompartments,
+                                limit=params.limit,
                             )
                         else:
                             return "Error: Either database_id or compartment_id is required."
 
-                        items = [_adb_backup_to_dict(b) for b in (response.data or [])]
+                        items = [_adb_backup_to_dict(b) for b in backups[:params.limit]]
 
                     else:
                         await ctx.report_progress(0.3, "Listing DB System backups...")
@@ -594,16 +598,17 @@ def register_database_tools(mcp: FastMCP) -> None:
                                 database_id=params.database_id,
                                 limit=params.limit
                             )
+                            backups = response.data or []
                         elif params.compartment_id:
-                            response = await asyncio.to_thread(
-                                db_client.list_backups,
-                                compartment_id=params.compartment_id,
-                                limit=params.limit
+                            backups = await _list_in_scope(
+                                client, db_client.list_backups,
+                                params.compartment_id, params.include_subcompartments,
+                                limit=params.limit,
                             )
                         else:
                             return "Error: Either database_id or compartment_id is required."
 
-                        items = [_dbsystem_backup_to_dict(b) for b in (response.data or [])]
+                        items = [_dbsystem_backup_to_dict(b) for b in backups[:params.limit]]
 
                     await ctx.report_progress(0.9, "Formatting output...")
 
@@ -621,6 +626,272 @@ def register_database_tools(mcp: FastMCP) -> None:
                 return format_error_response(error, params.response_format.value)
 
 
+    @mcp.tool(
+        name="oci_database_backup_report",
+        annotations={
+            "title": "Fleet Backup Recoverability Report",
+            "readOnlyHint": True,
+            "destructiveHint": False,
+            "idempotentHint": True,
+            "openWorldHint": True
+        }
+    )
+    async def backup_report(params: BackupReportInput, ctx: Context) -> str:
+        """Check backup recoverability across a compartment subtree.
+
+        Lists every Autonomous Database and DB System database and all of
+        their backups in the compartment subtree concurrently (following
+        pagination), then reports per database the age of the last
+        successful backup, backup count, failures, gaps between
+        consecutive backups and size (of the backups for an Autonomous
+        Database, of the database for a DB System). The scan is cached briefly, so
+        repeated checks with different thresholds do not re-list backups.
+
+        Args:
+            params: BackupReportInput with scope and thresholds
+
+        Returns:
+            Fleet summary and databases ranked worst first
+            (never backed up, stale, gaps, ok)
+
+        Example:
+            {"compartment_id": "prod", "max_age_hours": 24, "gap_hours": 36}
+        """
+        async with observe_tool("oci_database_backup_report", "database", params.model_dump()):
+            await ctx.report_progress(0.1, total=1.0, message="Resolving compartments...")
+
+            try:
+                async with get_oci_client() as client:
+                    compartment_ids, scope = await _backup_scope(client, params)
+
+                    with suppress(Exception):
+                        await ctx.report_progress(
+                            0.3, total=1.0,
+                            message=f"Scanning backups in {len(compartment_ids)} compartments..."
+                        )
+
+                    db_type = params.database_type
+                    records, errors, scan = await get_backup_records(
+                        client.database,
+                        compartment_ids,
+                        include_autonomous=db_type in (DatabaseType.ALL, DatabaseType.AUTONOMOUS),
+                        include_db_systems=db_type in (DatabaseType.ALL, DatabaseType.DB_SYSTEM),
+                        refresh=params.refresh,
+                    )
+
+                    with suppress(Exception):
+                        await ctx.report_progress(0.8, total=1.0, message="Rolling up backups...")
+
+                    rows, summary = rollup(
+                        records,
+                        datetime.now(UTC),
+                        params.max_age_hours,
+                        params.gap_hours,
+                        params.lookback_days,
+                    )
+                    result = {
+                        "scope": scope,
+                        "thresholds": {
+                            "max_age_hours": params.max_age_hours,
+                            "gap_hours": params.gap_hours,
+                            "lookback_days": params.lookback_days,
+                        },
+                        "summary": summary,
+                        "databases": rows[:params.top_n],
+                        "errors": errors,
+                        **scan,
+                    }
+
+                    if params.response_format == ResponseFormat.JSON:
+                        return DatabaseFormatter.to_json(result)
+                    return DatabaseFormatter.backup_report_markdown(result)
+
+            except ValueError as e:
+                return format_error_response(str(e), params.response_format.value)
+            except Exception as e:
+                error = handle_oci_error(e, "building backup report")
+                return format_error_response(error, params.response_format.value)
+
+
+def _metric_namespace(database_id: str) -> str:
+    """Monitoring namespace for an Autonomous Database or DB System OCID."""
+    if "autonomousdatabase" in database_id:
+        return "oci_autonomous_database"
+    return "oci_database"
+
+
+async def _describe_databases(
+    db_client: Any,
+    database_ids: list[str],
+) -> tuple[dict[str, dict[str, Any]], list[dict[str, Any]]]:
+    """Look up databases concurrently.
+
+    Returns:
+        Tuple of (database dicts by OCID in request order, lookup failures)
+    """
+    def _get(database_id: str) -> Any:
+        if "autonomousdatabase" in database_id:
+            return db_client.get_autonomous_database(autonomous_database_id=database_id)
+        return db_client.get_db_system(db_system_id=database_id)
+
+    responses = await gather_bounded(
+        (call_oci(_get, database_id) for database_id in database_ids),
+        return_exceptions=True,
+    )
+    databases: dict[str, dict[str, Any]] = {}
+    failures: list[dict[str, Any]] = []
+    for database_id, response in zip(database_ids, responses, strict=True):
+        if isinstance(response, BaseException):
+            if not isinstance(response, Exception):
+                # Cancellation and the like are not lookup failures
+                raise response
+            failures.append({
+                "database_id": database_id,
+                "error": handle_oci_error(response, "getting database").message,
+                "exception": response,
+            })
+        elif "autonomousdatabase" in database_id:
+            databases[database_id] = _adb_to_dict(response.data)
+        else:
+            databases[database_id] = _dbsystem_to_dict(response.data)
+    return databases, failures
+
+
+async def _collect_database_metrics(
+    monitoring_client: Any,
+    databases: dict[str, dict[str, Any]],
+    metric_names: list[str],
+    start_time: datetime,
+    end_time: datetime,
+) -> list[dict[str, Any]]:
+    """Fetch the same metrics for many databases.
+
+    Databases are grouped by (namespace, compartment) so each group costs
+    one query per metric; all groups and metrics run concurrently. A
+    failed metric query is reported on every database of its group.
+
+    Returns:
+        Per-database dicts with metrics, errors and missing metric names
+    """
+    groups: dict[tuple[str, str], list[str]] = {}
+    for database_id, info in databases.items():
+        key = (_metric_namespace(database_id), info.get("compartment_id") or "")
+        groups.setdefault(key, []).append(database_id)
+
+    batches = await asyncio.gather(*(
+        fetch_metrics(
+            monitoring_client,
+            compartment_id,
+            namespace=namespace,
+            metric_names=metric_names,
+            resource_ids=ids,
+            start_time=start_time,
+            end_time=end_time,
+            interval="1h",
+            resolution="1h",
+        )
+        for (namespace, compartment_id), ids in groups.items()
+    ))
+
+    batch_of = {
+        database_id: batch
+        for ids, batch in zip(groups.values(), batches, strict=True)
+        for database_id in ids
+    }
+    results = []
+    for database_id, info in databases.items():
+        batch = batch_of[database_id]
+        metrics: dict[str, dict[str, float]] = {}
+        missing = []
+        errors: dict[str, str] = {}
+        for metric_name in metric_names:
+            error = batch.error(database_id, metric_name)
+            if error is not None:
+                errors[metric_name] = error
+                continue
+            stats = batch.get(database_id, metric_name).stats(digits=None)
+            if stats:
+                metrics[metric_name] = stats
+            else:
+                missing.append(metric_name)
+        results.append({
+            "database": info,
+            "metrics": metrics,
+            "errors": errors,
+            "missing_metrics": missing,
+        })
+    return results
+
+
+async def _list_in_scope(
+    client: Any,
+    func: Any,
+    compartment_id: str,
+    include_subcompartments: bool,
+    **kwargs: Any,
+) -> list[Any]:
+    """First page of a listing in a compartment, or in each of its subtree's."""
+    compartment_ids = await compartment_scope(client, compartment_id, include_subcompartments)
+    responses = await gather_bounded(
+        call_oci(func, compartment_id=cid, **kwargs) for cid in compartment_ids
+    )
+    return [item for response in responses for item in (response.data or [])]
+
+
+async def _backup_scope(
+    client: Any,
+    params: BackupReportInput,
+) -> tuple[list[str], dict[str, Any]]:
+    """Resolve the compartments a backup report covers.
+
+    Raises:
+        ValueError: If a compartment name or path cannot be resolved
+    """
+    ref = params.compartment_id or os.getenv("COMPARTMENT_OCID") or client.tenancy_id
+    try:
+        tree = await get_compartment_tree(client.identity, client.tenancy_id)
+    except Exception as e:
+        if not ref.startswith("ocid1."):
+            raise ValueError(
+                f"Cannot resolve compartment '{ref}' without the compartment tree: {e}"
+            ) from e
+        return [ref], {"compartment_id": ref, "path": None, "compartments": 1}
+
+    compartment_id = tree.resolve(ref)
+    ids = tree.scope(compartment_id, params.include_subcompartments)
+    return ids, {
+        "compartment_id": compartment_id,
+        "path": tree.path(compartment_id) or "root",
+        "compartments": len(ids),
+    }
+
+
+async def _wait_for_adb(
+    db_client: Any,
+    params: StartAutonomousDatabaseInput | StopAutonomousDatabaseInput,
+    target_state: str,
+    ctx: Context,
+) -> WaitOutcome:
+    """Wait for an Autonomous Database to reach ``target_state``."""
+    return await wait_for_state(
+        lambda: db_client.get_autonomous_database(autonomous_database_id=params.database_id),
+        params.database_id,
+        targets={target_state},
+        failures=ADB_FAILED_STATES,
+        timeout_seconds=params.timeout_seconds,
+        on_transition=report_transitions(ctx, "Database", params.timeout_seconds),
+    )
+
+
+def _wait_result(action: str, wait: WaitOutcome) -> tuple[bool, str]:
+    """Success flag and message for a finished wait."""
+    if wait.succeeded:
+        return True, f"{action.title()} completed in {int(wait.elapsed)}s ({wait.state})."
+    if wait.status == "timeout":
+        return True, f"{action.title()} initiated; {wait.message.lower()}."
+    return False, f"{action.title()} did not complete: {wait.message}"
+
+
 # Helper functions for converting OCI objects to dicts
 def _adb_to_dict(db: Any, include_connection: bool = False) -> dict:
     """Convert Autonomous Database object to dict."""
@@ -223,10 +223,31 @@ class NetworkFormatter:
         md = MarkdownFormatter.header("Security Rule Analysis", 1)
 
         risky_rules = analysis.get("risky_rules", [])
+        redundant_rules = analysis.get("redundant_rules", [])
         total_rules = analysis.get("total_rules", 0)
 
-        md += f"**Total Rules Analyzed:** {total_rules}\n"
-        md += f"**Risky Rules Found:** {len(risky_rules)}\n\n"
+        md += f"**Total Rules Analyzed:** {total_rules}"
+        if "security_lists" in analysis:
+            md += (f" ({analysis['security_lists']} security lists, "
+                   f"{analysis.get('nsgs', 0)} NSGs)")
+        md += "\n"
+        md += f"**Risky Rules Found:** {len(risky_rules)}\n"
+        md += f"**Redundant Rules Found:** {len(redundant_rules)}\n\n"
+
+        reachability = analysis.get("reachability")
+        if reachability:
+            md += MarkdownFormatter.header("Reachability", 2)
+            target = (f"{reachability['protocol']} port {reachability['port']} "
+                      f"from {reachability['source_cidr']}")
+            if reachability["reachable"]:
+                md += f"✅ {target} is allowed.\n"
+            elif reachability["partially_reachable"]:
+                md += f"🟠 {target} is allowed for part of the source range only.\n"
+            else:
+                md += f"⛔ {target} is not allowed by any rule.\n"
+            for rule in reachability.get("rules", []):
+                md += f"- {_rule_line(rule)} ({rule.get('coverage')})\n"
+            md += "\n"
 
         if risky_rules:
             md += MarkdownFormatter.header("⚠️ Risky Rules", 2)
@@ -234,15 +255,90 @@ class NetworkFormatter:
             for rule in risky_rules:
                 risk_icons = {"HIGH": "🔴", "MEDIUM": "🟠", "LOW": "🟡"}
                 risk_icon = risk_icons.get(rule.get("risk_level", ""), "⚪")
-                md += f"\n### {risk_icon} {rule.get('security_list_name', 'Unknown')}\n"
+                name = rule.get("owner_name") or rule.get("security_list_name", "Unknown")
+                md += f"\n### {risk_icon} {name}\n"
                 md += f"**Risk Level:** {rule.get('risk_level', 'N/A')}\n"
                 md += f"**Reason:** {rule.get('reason', 'N/A')}\n"
                 md += f"**Recommendation:** {rule.get('recommendation', 'N/A')}\n"
-
-                rule_detail = rule.get("rule", {})
-                md += f"**Rule Detail:** {rule_detail.get('protocol', 'N/A')} "
-                md += f"from/to {rule_detail.get('source_or_destination', 'N/A')}\n"
+                md += f"**Rule Detail:** {_rule_line(rule)}\n"
         else:
             md += "✅ No risky rules detected.\n"
 
+        if redundant_rules:
+            md += "\n" + MarkdownFormatter.header("Redundant Rules", 2)
+            md += "*Each rule below is fully covered by another rule and can be removed.*\n\n"
+            for rule in redundant_rules:
+                md += f"- {_rule_line(rule)}, covered by {_rule_line(rule['covered_by'])}\n"
+
         return md
+
+    @staticmethod
+    def path_markdown(result: dict) -> str:
+        """Format a path and reachability check as markdown."""
+        md = MarkdownFormatter.header("Network Path Check", 1)
+
+        src, dst = result["source"], result["destination"]
+        target = f"{result['protocol']}" + (
+            f" port {result['port']}" if result.get("port") is not None else ""
+        )
+        md += f"**VCN:** {result['vcn'].get('display_name') or result['vcn']['id']}\n"
+        md += f"**Source:** {_endpoint_line(src)}\n"
+        md += f"**Destination:** {_endpoint_line(dst)}\n"
+        md += f"**Traffic:** {target}\n\n"
+
+        if result["reachable"]:
+            md += "✅ **Reachable**"
+            if result.get("leaves_vcn"):
+                md += " as far as this VCN is concerned (traffic continues beyond it)"
+            md += "\n\n"
+        else:
+            md += f"⛔ **Blocked** at the {result['blocked_by']} check\n\n"
+
+        md += MarkdownFormatter.header("Path", 2)
+        md += " → ".join(
+            f"{hop['display_name'] or hop['id']} ({hop['type']})" for hop in result["hops"]
+        ) + "\n\n"
+
+        md += MarkdownFormatter.header("Checks", 2)
+        for check in result["checks"]:
+            icon = "✅" if check["passed"] else "⛔"
+            md += f"- {icon} **{check['check']}**: {check['detail']}\n"
+            for rule in check.get("rules", []):
+                md += f"  - {_rule_line(rule)} ({rule.get('coverage')})\n"
+
+        topology = result.get("topology")
+        if topology:
+            gateways = ", ".join(
+                f"{n} {kind}" for kind, n in sorted(topology["gateways"].items())
+            ) or "none"
+            md += (f"\n*Topology: {topology['subnets']} subnets, "
+                   f"{topology['route_rules']} route rules, gateways: {gateways}; "
+                   f"built {topology['built_at']}"
+                   f"{' (cached)' if topology.get('cached') else ''}.*\n")
+        for error in result.get("errors", []):
+            md += f"\n⚠️ Could not list {error['listing']}: {error['error']}\n"
+
+        return md
+
+
+def _endpoint_line(endpoint: dict) -> str:
+    """One-line description of a path endpoint."""
+    line = endpoint["cidr"]
+    if endpoint.get("subnet_name"):
+        line += f" in subnet {endpoint['subnet_name']}"
+    else:
+        line += " (outside the VCN)"
+    if endpoint.get("nsg_ids"):
+        line += f", NSGs {', '.join(endpoint['nsg_ids'])}"
+    return line
+
+def _rule_line(finding: dict) -> str:
+    """One-line description of a rule finding."""
+    rule = finding.get("rule", {})
+    ports = f" port {rule['port_range']}" if rule.get("port_range") else ""
+    owner = finding.get("owner_name") or finding.get("security_list_name", "Unknown")
+    return (
+        f"{owner} #{finding.get('index', '?')}: {rule.get('direction', '')} "
+        f"{rule.get('protocol', 'N/A')}{ports} "
+        f"from/to {rule.get('source_or_destination', 'N/A')}"
+    )
@@ -3,9 +3,10 @@ Pydantic models for OCI Network domain tools.
 """
 from __future__ import annotations
 
+import ipaddress
 from enum import Enum
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class ResponseFormat(str, Enum):
@@ -46,6 +47,10 @@ class ListVcnsInput(BaseModel):
         default=None,
         description="Compartment OCID. Uses default if not specified."
     )
+    include_subcompartments: bool = Field(
+        default=False,
+        description="Also list VCNs in every compartment below compartment_id"
+    )
     lifecycle_state: VcnLifecycleState | None = Field(
         default=None,
         description="Filter by lifecycle state"
@@ -60,6 +65,10 @@ class ListVcnsInput(BaseModel):
         ge=1,
         le=100
     )
+    include_subnet_counts: bool = Field(
+        default=True,
+        description="Count subnets per VCN (one compartment-wide subnet listing)"
+    )
     response_format: ResponseFormat = Field(
         default=ResponseFormat.MARKDOWN,
         description="Output format: 'markdown' or 'json'"
@@ -108,6 +117,10 @@ class ListSubnetsInput(BaseModel):
         default=None,
         description="Compartment OCID. Uses default if not specified."
     )
+    include_subcompartments: bool = Field(
+        default=False,
+        description="Also list subnets in every compartment below compartment_id"
+    )
     vcn_id: str | None = Field(
         default=None,
         description="Filter by VCN OCID"
@@ -166,6 +179,10 @@ class ListSecurityListsInput(BaseModel):
         default=None,
         description="Compartment OCID. Uses default if not specified."
     )
+    include_subcompartments: bool = Field(
+        default=False,
+        description="Also list security lists in every compartment below compartment_id"
+    )
     vcn_id: str | None = Field(
         default=None,
         description="Filter by VCN OCID"
@@ -206,6 +223,88 @@ class AnalyzeSecurityRulesInput(BaseModel):
         default=True,
         description="Check for potentially risky rules (e.g., 0.0.0.0/0)"
     )
+    include_nsgs: bool = Field(
+        default=True,
+        description="Also analyze the VCN's network security groups (with vcn_id)"
+    )
+    check_redundant_rules: bool = Field(
+        default=True,
+        description="Report rules fully covered by another rule of the same list or NSG"
+    )
+    port: int | None = Field(
+        default=None,
+        description="Reachability check: destination port (use with source_cidr)",
+        ge=0,
+        le=65535
+    )
+    source_cidr: str | None = Field(
+        default=None,
+        description="Reachability check: source CIDR, e.g. '203.0.113.0/24' (use with port)"
+    )
+    protocol: str = Field(
+        default="TCP",
+        description="Reachability check protocol: TCP, UDP, ICMP, ALL or a protocol number"
+    )
+    response_format: ResponseFormat = Field(
+        default=ResponseFormat.MARKDOWN,
+        description="Output format: 'markdown' or 'json'"
+    )
+
+    @field_validator('source_cidr')
+    @classmethod
+    def validate_source_cidr(cls, v: str | None) -> str | None:
+        if v is not None:
+            try:
+                ipaddress.ip_network(v, strict=False)
+            except ValueError as e:
+                raise ValueError(f"Invalid source_cidr: {e}") from e
+        return v
+
+
+class CheckNetworkPathInput(BaseModel):
+    """Input for a path and reachability query on a VCN's topology."""
+    model_config = ConfigDict(
+        str_strip_whitespace=True,
+        validate_assignment=True,
+        extra='forbid'
+    )
+
+    vcn_id: str = Field(
+        ...,
+        description="VCN OCID whose topology answers the query"
+    )
+    source: str = Field(
+        ...,
+        description="Source IP, CIDR block, subnet OCID or subnet name",
+        min_length=1
+    )
+    destination: str = Field(
+        ...,
+        description="Destination IP, CIDR block, subnet OCID or subnet name",
+        min_length=1
+    )
+    port: int | None = Field(
+        default=None,
+        description="Destination port (required for TCP and UDP)",
+        ge=0,
+        le=65535
+    )
+    protocol: str = Field(
+        default="TCP",
+        description="Protocol: TCP, UDP, ICMP, ALL or a protocol number"
+    )
+    source_nsg_ids: list[str] = Field(
+        default_factory=list,
+        description="NSGs attached to the source VNIC (NSGs are only evaluated when given)"
+    )
+    destination_nsg_ids: list[str] = Field(
+        default_factory=list,
+        description="NSGs attached to the destination VNIC"
+    )
+    refresh: bool = Field(
+        default=False,
+        description="Rebuild the cached topology from the API before answering"
+    )
     response_format: ResponseFormat = Field(
         default=ResponseFormat.MARKDOWN,
         description="Output format: 'markdown' or 'json'"
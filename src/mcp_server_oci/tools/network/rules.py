@@ -0,0 +1,546 @@
+"""
+Indexed security rule engine.
+
+Security list and NSG rules are parsed once into integer columns:
+
+- source/destination CIDRs as closed address intervals ``[lo, hi]``
+  (IPv4 as 32-bit integers; IPv6 by its top 64 bits, which is exact for
+  prefixes up to /64 and widens longer prefixes to their /64; widened
+  rules are flagged so they are never taken to cover another rule)
+- destination and source port ranges, protocol number (-1 for all),
+  ICMP type/code (-1 for any), direction and statefulness
+
+Queries run against those columns instead of walking rule dicts:
+
+- ``exposed``: ingress rules open to 0.0.0.0/0 or ::/0, stabbed against
+  an interval index of their destination ports for each sensitive port
+- ``redundant``: rules fully covered by another rule of the same security
+  list or NSG. CIDR blocks are laminar (two blocks are nested or
+  disjoint), so the blocks that contain a rule's block are exactly its
+  ancestors in a prefix forest. Candidate pairs are found by joining each
+  rule with the rules on its ancestor blocks, one level at a time, and
+  the port, protocol and ICMP checks run vectorized over all pairs.
+- ``reachable``: ingress (or egress) rules whose address interval overlaps
+  a CIDR and whose port interval contains a port
+
+OCI rules only allow traffic, so a rule covered by another rule in the
+same list adds nothing and can be removed.
+"""
+from __future__ import annotations
+
+import ipaddress
+from collections.abc import Iterable
+from contextlib import suppress
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from typing import Any
+
+import numpy as np
+
+# Protocol numbers as OCI reports them
+PROTOCOL_ALL = -1
+ICMP, TCP, UDP, ICMPV6 = 1, 6, 17, 58
+PROTOCOL_NAMES = {PROTOCOL_ALL: "ALL", ICMP: "ICMP", TCP: "TCP", UDP: "UDP", ICMPV6: "ICMPv6"}
+
+INGRESS, EGRESS = 0, 1
+
+# Address kinds; only CIDR blocks take part in interval queries
+CIDR, SERVICE, NSG = 0, 1, 2
+_KINDS = {"CIDR_BLOCK": CIDR, "SERVICE_CIDR_BLOCK": SERVICE, "NETWORK_SECURITY_GROUP": NSG}
+
+PORT_MIN, PORT_MAX = 0, 65535
+_FAMILY_MAX = {4: (1 << 32) - 1, 6: (1 << 64) - 1}
+
+SENSITIVE_PORTS: dict[tuple[int, int], str] = {
+    (TCP, 22): "SSH",
+    (TCP, 23): "Telnet",
+    (TCP, 445): "SMB",
+    (TCP, 1521): "Oracle DB",
+    (TCP, 1522): "Oracle DB (TCPS)",
+    (TCP, 3306): "MySQL",
+    (TCP, 3389): "RDP",
+    (TCP, 5432): "PostgreSQL",
+    (TCP, 6379): "Redis",
+    (TCP, 9200): "Elasticsearch",
+    (TCP, 27017): "MongoDB",
+    (UDP, 161): "SNMP",
+    (UDP, 2049): "NFS",
+}
+
+# Internet-facing ports that are usually intentional
+_WEB_PORTS = frozenset({80, 443})
+
+
+_PROTOCOL_NUMBERS = {name.upper(): number for number, name in PROTOCOL_NAMES.items()}
+
+
+@lru_cache(maxsize=256)
+def parse_protocol(value: Any) -> int:
+    """OCI protocol string ('all', '6', 'TCP') to a protocol number."""
+    text = str(value if value is not None else "all").strip().upper()
+    if text in _PROTOCOL_NUMBERS:
+        return _PROTOCOL_NUMBERS[text]
+    try:
+        return int(text)
+    except ValueError:
+        raise ValueError(f"Unknown protocol: {value}") from None
+
+
+@lru_cache(maxsize=65536)
+def parse_cidr(value: str) -> tuple[int, int, int]:
+    """CIDR block to ``(family, lo, hi)`` on the engine's address scale.
+
+    Memoized: the same blocks recur across lists, NSGs and queries.
+
+    Raises:
+        ValueError: If ``value`` is not a CIDR block or address
+    """
+    network = ipaddress.ip_network(value.strip(), strict=False)
+    lo, hi = int(network.network_address), int(network.broadcast_address)
+    if network.version == 6:
+        return 6, lo >> 64, hi >> 64
+    return 4, lo, hi
+
+
+@lru_cache(maxsize=65536)
+def _is_exact(value: str) -> bool:
+    """Whether ``parse_cidr`` keeps ``value`` as is (IPv4, or IPv6 up to /64)."""
+    network = ipaddress.ip_network(value.strip(), strict=False)
+    return network.version == 4 or network.prefixlen <= 64
+
+
+class IntervalIndex:
+    """Static index over closed integer intervals.
+
+    Intervals are sorted by their low end with a running maximum of their
+    high ends. Both arrays are monotonic, so the intervals that can overlap
+    a query form one contiguous slice found by two binary searches; only
+    that slice is filtered.
+    """
+
+    def __init__(self, lo: np.ndarray, hi: np.ndarray) -> None:
+        self.order = np.argsort(lo, kind="stable")
+        self.lo = lo[self.order]
+        self.hi = hi[self.order]
+        self.reach = np.maximum.accumulate(self.hi) if len(self.hi) else self.hi
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def overlapping(self, lo: int, hi: int) -> np.ndarray:
+        """Positions (in the indexed arrays) of intervals overlapping [lo, hi]."""
+        start = int(np.searchsorted(self.reach, lo, side="left"))
+        stop = int(np.searchsorted(self.lo, hi, side="right"))
+        window = slice(start, stop)
+        return self.order[window][self.hi[window] >= lo]
+
+    def stab(self, point: int) -> np.ndarray:
+        """Positions of intervals containing ``point``."""
+        return self.overlapping(point, point)
+
+
+@dataclass
+class RuleTable:
+    """Security rules of one or more security lists/NSGs as integer columns."""
+    owners: list[dict[str, Any]]  # id, display_name, type per group
+    rules: list[dict[str, Any]]   # serialized rules, described on demand
+    position: np.ndarray     # int32 index of each rule within its owner
+    group: np.ndarray        # int32 owner index (security list or NSG)
+    direction: np.ndarray    # int8 INGRESS/EGRESS
+    protocol: np.ndarray     # int16, -1 for all
+    kind: np.ndarray         # int8 CIDR/SERVICE/NSG
+    family: np.ndarray       # int8 4 or 6 (0 for non-CIDR kinds)
+    addr_lo: np.ndarray      # uint64
+    addr_hi: np.ndarray      # uint64
+    exact: np.ndarray        # bool, False for IPv6 prefixes widened to their /64
+    block: np.ndarray        # int32 id of the distinct address block
+    parent: np.ndarray       # int32 enclosing block per block id (-1 at a root)
+    port_lo: np.ndarray      # int32 destination ports
+    port_hi: np.ndarray
+    src_lo: np.ndarray       # int32 source ports
+    src_hi: np.ndarray
+    icmp_type: np.ndarray    # int16, -1 for any
+    icmp_code: np.ndarray
+    stateless: np.ndarray    # bool
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def build(cls, owners: Iterable[dict[str, Any]]) -> RuleTable:
+        """Parse serialized security lists and NSGs.
+
+        Args:
+            owners: Dicts with id, display_name, type ('security_list' or
+                'nsg') and 'rules', serialized rules carrying a direction
+
+        Rules that cannot be parsed (for example a malformed CIDR) are
+        skipped and listed in ``errors``.
+        """
+        owner_info: list[dict[str, Any]] = []
+        kept: list[dict[str, Any]] = []
+        columns: dict[str, list[int]] = {name: [] for name in (
+            "position", "group", "direction", "protocol", "kind", "family", "addr_lo", "addr_hi",
+            "exact", "port_lo", "port_hi", "src_lo", "src_hi", "icmp_type", "icmp_code",
+            "stateless",
+        )}
+        tokens: dict[str, int] = {}
+        errors: list[dict[str, Any]] = []
+
+        for group, owner in enumerate(owners):
+            owner_info.append({
+                "owner_id": owner.get("id"),
+                "owner_name": owner.get("display_name"),
+                "owner_type": owner.get("type", "security_list"),
+            })
+            for position, rule in enumerate(owner.get("rules", [])):
+                try:
+                    parsed = _parse_rule(rule, tokens)
+                except (ValueError, TypeError) as e:
+                    errors.append({"owner_id": owner.get("id"), "index": position,
+                                   "error": str(e)})
+                    continue
+                for name, value in parsed.items():
+                    columns[name].append(value)
+                columns["position"].append(position)
+                columns["group"].append(group)
+                kept.append(rule)
+
+        dtypes = {
+            "position": np.int32, "group": np.int32, "direction": np.int8,
+            "protocol": np.int16, "kind": np.int8, "family": np.int8,
+            "addr_lo": np.uint64, "addr_hi": np.uint64, "exact": bool,
+            "port_lo": np.int32, "port_hi": np.int32, "src_lo": np.int32, "src_hi": np.int32,
+            "icmp_type": np.int16, "icmp_code": np.int16, "stateless": bool,
+        }
+        arrays = {name: np.asarray(values, dtype=dtypes[name])
+                  for name, values in columns.items()}
+        block, parent = _block_forest(arrays["kind"], arrays["family"],
+                                      arrays["addr_lo"], arrays["addr_hi"])
+        return cls(owners=owner_info, rules=kept, block=block, parent=parent,
+                   errors=errors, **arrays)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def describe(self, rule: int) -> dict[str, Any]:
+        """Owner, position and summary of one rule."""
+        return {
+            **self.owners[int(self.group[rule])],
+            "index": int(self.position[rule]),
+            "rule": _describe(self.rules[rule]),
+        }
+
+    @cached_property
+    def _open(self) -> np.ndarray:
+        """Ingress rules open to the whole IPv4 or IPv6 internet."""
+        is_v4 = (self.family == 4) & (self.addr_hi == _FAMILY_MAX[4])
+        is_v6 = (self.family == 6) & (self.addr_hi == np.uint64(_FAMILY_MAX[6]))
+        return np.flatnonzero(
+            (self.direction == INGRESS) & (self.kind == CIDR) & (self.addr_lo == 0)
+            & (is_v4 | is_v6)
+        )
+
+    @cached_property
+    def _open_ports(self) -> IntervalIndex:
+        return IntervalIndex(self.port_lo[self._open], self.port_hi[self._open])
+
+    @cached_property
+    def _addresses(self) -> dict[tuple[int, int], tuple[np.ndarray, IntervalIndex]]:
+        """Per direction and address family: CIDR rule ids and their address index."""
+        result = {}
+        for direction in (INGRESS, EGRESS):
+            for family in (4, 6):
+                ids = np.flatnonzero(
+                    (self.direction == direction) & (self.kind == CIDR)
+                    & (self.family == family)
+                )
+                result[direction, family] = (
+                    ids, IntervalIndex(self.addr_lo[ids], self.addr_hi[ids])
+                )
+        return result
+
+    def exposed(
+        self,
+        sensitive: dict[tuple[int, int], str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Ingress rules open to the internet, with the sensitive ports they expose.
+
+        Returns:
+            One finding per open rule, HIGH risk first
+        """
+        sensitive = SENSITIVE_PORTS if sensitive is None else sensitive
+        hits: dict[int, list[str]] = {}
+        for (protocol, port), service in sensitive.items():
+            for position in self._open_ports.stab(port).tolist():
+                rule = int(self._open[position])
+                if self.protocol[rule] in (PROTOCOL_ALL, protocol):
+                    hits.setdefault(rule, []).append(f"{port}/{PROTOCOL_NAMES[protocol]} "
+                                                     f"({service})")
+
+        findings = []
+        for rule in self._open.tolist():
+            services = hits.get(rule, [])
+            all_traffic = self.protocol[rule] == PROTOCOL_ALL
+            web_only = (
+                self.protocol[rule] == TCP
+                and self.port_lo[rule] == self.port_hi[rule]
+                and int(self.port_lo[rule]) in _WEB_PORTS
+            )
+            if services or all_traffic:
+                level = "HIGH"
+                reason = (
+                    "Rule allows all traffic from anywhere" if all_traffic and not services
+                    else f"Rule exposes {', '.join(services)} to the internet"
+                )
+                recommendation = "Restrict the source to specific CIDR blocks or use a bastion"
+            elif web_only:
+                level = "LOW"
+                reason = "Web port open to the internet"
+                recommendation = "Confirm this endpoint is meant to be public"
+            else:
+                level = "MEDIUM"
+                reason = "Rule allows traffic from anywhere"
+                recommendation = "Restrict source to specific IP ranges or CIDR blocks"
+            findings.append({
+                **self.describe(rule),
+                "risk_level": level,
+                "reason": reason,
+                "recommendation": recommendation,
+                "exposed_services": services,
+            })
+        order = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
+        findings.sort(key=lambda f: order[f["risk_level"]])
+        return findings
+
+    def redundant(self) -> list[dict[str, Any]]:
+        """Rules fully covered by another rule of the same security list or NSG.
+
+        Of two identical rules, the later one is reported.
+        """
+        n = len(self)
+        if n == 0:
+            return []
+        n_blocks = len(self.parent)
+        # Rules sorted by (group, direction, block) for the ancestor join
+        keys = (self.group.astype(np.int64) * 2 + self.direction) * n_blocks + self.block
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+
+        covered_by = np.full(n, -1, dtype=np.int64)
+        rules = np.arange(n)
+        current = self.block.astype(np.int64)
+        same_block = True
+        while rules.size:
+            query = (self.group[rules].astype(np.int64) * 2 + self.direction[rules]) \
+                * n_blocks + current
+            start = np.searchsorted(sorted_keys, query, side="left")
+            stop = np.searchsorted(sorted_keys, query, side="right")
+            counts = stop - start
+            a = np.repeat(rules, counts)
+            offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            b = order[np.repeat(start, counts) + offsets]
+
+            # A widened IPv6 rule may allow less than its /64, so it covers nothing
+            keep = (a != b) & self.exact[b] & self._covers(b, a)
+            if same_block:
+                # Identical rules cover each other; only the later one is redundant
+                keep &= ~self._covers(a, b) | (b < a)
+            a, b = a[keep], b[keep]
+            unset = covered_by[a] < 0
+            covered_by[a[unset]] = b[unset]
+
+            # Step every rule to its enclosing block
+            current = self.parent[current]
+            same_block = False
+            alive = current >= 0
+            rules, current = rules[alive], current[alive]
+
+        return [
+            {**self.describe(rule), "covered_by": self.describe(int(covered_by[rule]))}
+            for rule in np.flatnonzero(covered_by >= 0).tolist()
+        ]
+
+    def _covers(self, b: np.ndarray, a: np.ndarray) -> np.ndarray:
+        """Whether rule ``b`` allows everything rule ``a`` allows (same block chain)."""
+        return (
+            ((self.protocol[b] == PROTOCOL_ALL) | (self.protocol[b] == self.protocol[a]))
+            & (self.port_lo[b] <= self.port_lo[a]) & (self.port_hi[b] >= self.port_hi[a])
+            & (self.src_lo[b] <= self.src_lo[a]) & (self.src_hi[b] >= self.src_hi[a])
+            & ((self.icmp_type[b] < 0) | (self.icmp_type[b] == self.icmp_type[a]))
+            & ((self.icmp_code[b] < 0) | (self.icmp_code[b] == self.icmp_code[a]))
+            & (self.stateless[b] == self.stateless[a])
+        )
+
+    def reachable(
+        self,
+        port: int,
+        cidr: str,
+        protocol: Any = TCP,
+        limit: int | None = 50,
+        direction: str = "INGRESS",
+    ) -> dict[str, Any]:
+        """Which ingress rules let ``cidr`` reach ``port``.
+
+        A rule matches fully when its source block contains all of ``cidr``
+        and partially when the blocks only overlap. Full matches are listed
+        first, up to ``limit`` rules. With ``direction="EGRESS"``, ``cidr``
+        is the destination and egress rules are matched instead.
+
+        Raises:
+            ValueError: If ``cidr`` or ``protocol`` cannot be parsed
+        """
+        family, lo, hi = parse_cidr(cidr)
+        proto = parse_protocol(protocol)
+        egress = direction.upper() == "EGRESS"
+        ids, index = self._addresses[EGRESS if egress else INGRESS, family]
+        candidates = ids[index.overlapping(lo, hi)]
+        match = (
+            ((self.protocol[candidates] == PROTOCOL_ALL)
+             | (self.protocol[candidates] == proto) | (proto == PROTOCOL_ALL))
+            & (self.port_lo[candidates] <= port) & (self.port_hi[candidates] >= port)
+        )
+        matched = np.sort(candidates[match])
+        full = (self.addr_lo[matched] <= lo) & (self.addr_hi[matched] >= hi)
+        n_full = int(full.sum())
+        ranked = np.concatenate([matched[full], matched[~full]])[:limit]
+        return {
+            "port": port,
+            "protocol": PROTOCOL_NAMES.get(proto, str(proto)),
+            "destination_cidr" if egress else "source_cidr": cidr,
+            "reachable": n_full > 0,
+            "partially_reachable": bool(matched.size) and n_full == 0,
+            "matching_rules": int(matched.size),
+            "rules": [
+                {**self.describe(rule), "coverage": "full" if i < n_full else "partial"}
+                for i, rule in enumerate(ranked.tolist())
+            ],
+        }
+
+
+def rule_owners(
+    security_lists: list[dict[str, Any]],
+    nsgs: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Security lists and NSGs in the shape ``RuleTable.build`` expects."""
+    owners = [
+        {
+            "id": sl["id"],
+            "display_name": sl["display_name"],
+            "type": "security_list",
+            "rules": sl["ingress_security_rules"] + sl["egress_security_rules"],
+        }
+        for sl in security_lists
+    ]
+    owners.extend(
+        {
+            "id": nsg["id"],
+            "display_name": nsg["display_name"],
+            "type": "nsg",
+            "rules": nsg["security_rules"],
+        }
+        for nsg in nsgs
+    )
+    return owners
+
+
+def _parse_rule(rule: dict[str, Any], tokens: dict[str, int]) -> dict[str, int]:
+    direction = str(rule.get("direction", "INGRESS")).upper()
+    address = rule.get("source") if direction == "INGRESS" else rule.get("destination")
+    address_type = (
+        rule.get("source_type") if direction == "INGRESS" else rule.get("destination_type")
+    ) or "CIDR_BLOCK"
+    kind = _KINDS.get(address_type, SERVICE)
+    if kind == CIDR:
+        family, lo, hi = parse_cidr(str(address))
+        exact = _is_exact(str(address))
+    else:
+        # Services and NSGs are opaque: a rule only covers the same target
+        family, lo = 0, tokens.setdefault(f"{address_type}:{address}", len(tokens))
+        hi, exact = lo, True
+
+    protocol = parse_protocol(rule.get("protocol"))
+    options = rule.get("tcp_options") if protocol == TCP else (
+        rule.get("udp_options") if protocol == UDP else None
+    )
+    port_lo, port_hi = _port_range((options or {}).get("destination_port_range"))
+    src_lo, src_hi = _port_range((options or {}).get("source_port_range"))
+    icmp = rule.get("icmp_options") or {}
+    icmp_type = icmp.get("type") if protocol in (ICMP, ICMPV6) else None
+    icmp_code = icmp.get("code") if protocol in (ICMP, ICMPV6) else None
+    return {
+        "direction": INGRESS if direction == "INGRESS" else EGRESS,
+        "protocol": protocol,
+        "kind": kind,
+        "family": family,
+        "addr_lo": lo,
+        "addr_hi": hi,
+        "exact": exact,
+        "port_lo": port_lo,
+        "port_hi": port_hi,
+        "src_lo": src_lo,
+        "src_hi": src_hi,
+        "icmp_type": -1 if icmp_type is None else int(icmp_type),
+        "icmp_code": -1 if icmp_code is None else int(icmp_code),
+        "stateless": bool(rule.get("is_stateless")),
+    }
+
+
+def _port_range(value: dict[str, Any] | None) -> tuple[int, int]:
+    if not value:
+        return PORT_MIN, PORT_MAX
+    return int(value.get("min", PORT_MIN)), int(value.get("max", PORT_MAX))
+
+
+def _describe(rule: dict[str, Any]) -> dict[str, Any]:
+    """Compact rule summary for findings."""
+    direction = str(rule.get("direction", "INGRESS")).upper()
+    options = rule.get("tcp_options") or rule.get("udp_options") or {}
+    ports = options.get("destination_port_range")
+    protocol = rule.get("protocol")
+    with suppress(ValueError):
+        protocol = PROTOCOL_NAMES.get(parse_protocol(protocol), protocol)
+    return {
+        "direction": direction,
+        "protocol": protocol,
+        "source_or_destination": (
+            rule.get("source") if direction == "INGRESS" else rule.get("destination")
+        ),
+        "port_range": (
+            (str(ports["min"]) if ports["min"] == ports["max"]
+             else f"{ports['min']}-{ports['max']}") if ports else None
+        ),
+        "is_stateless": bool(rule.get("is_stateless")),
+        "description": rule.get("description"),
+    }
+
+
+def _block_forest(
+    kind: np.ndarray,
+    family: np.ndarray,
+    lo: np.ndarray,
+    hi: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Distinct address blocks per rule and each block's enclosing block.
+
+    CIDR blocks of one family are laminar, so a single sweep in
+    (lo ascending, hi descending) order with a stack of open blocks finds
+    every block's parent. Non-CIDR targets are roots of their own.
+    """
+    if not len(kind):
+        return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32)
+    table = np.stack([kind.astype(np.uint64), family.astype(np.uint64), lo, hi], axis=1)
+    blocks, block = np.unique(table, axis=0, return_inverse=True)
+    b_kind, b_family, b_lo, b_hi = blocks.T
+    parent = np.full(len(blocks), -1, dtype=np.int32)
+
+    cidr = np.flatnonzero(b_kind == CIDR)
+    # np.unique sorts rows by (kind, family, lo, hi); the sweep needs hi descending
+    sweep = cidr[np.lexsort((np.invert(b_hi[cidr]), b_lo[cidr], b_family[cidr]))]
+    fam, lows, highs = b_family.tolist(), b_lo.tolist(), b_hi.tolist()
+    stack: list[int] = []
+    for b in sweep.tolist():
+        while stack and (fam[stack[-1]] != fam[b] or highs[stack[-1]] < lows[b]):
+            stack.pop()
+        if stack:
+            parent[b] = stack[-1]
+        stack.append(b)
+    return block.astype(np.int32).ravel(), parent
@@ -1,25 +1,39 @@
 """
 OCI Network domain tool implementations.
+
+Every VirtualNetwork call goes through ``call_oci`` so a slow API call runs
+in a worker thread instead of blocking the event loop, and independent
+calls (VCNs and subnets, subnets and security lists) run concurrently.
 """
 from __future__ import annotations
 
 import os
+from collections import Counter
+from collections.abc import Awaitable
+from datetime import UTC, datetime
 from typing import Any
 
+import oci
 from mcp.server.fastmcp import FastMCP
 
+from mcp_server_oci.core.cache import get_cache
 from mcp_server_oci.core.client import get_oci_client
+from mcp_server_oci.core.compartments import get_compartment_tree
+from mcp_server_oci.core.concurrency import call_oci, gather_bounded
 from mcp_server_oci.core.errors import format_error_response, handle_oci_error
 from mcp_server_oci.core.formatters import ResponseFormat
 
 from .formatters import NetworkFormatter
 from .models import (
     AnalyzeSecurityRulesInput,
+    CheckNetworkPathInput,
     GetVcnInput,
     ListSecurityListsInput,
     ListSubnetsInput,
     ListVcnsInput,
 )
+from .rules import RuleTable, rule_owners
+from .topology import VcnTopology
 
 
 def _serialize_vcn(vcn: Any) -> dict:
@@ -60,61 +74,63 @@ def _serialize_subnet(subnet: Any) -> dict:
     }
 
 
-def _serialize_security_list(sl: Any) -> dict:
-    """Serialize Security List object to dictionary."""
-    def serialize_rule(rule: Any, direction: str) -> dict:
-        result = {
-            "direction": direction,
-            "protocol": rule.protocol,
-            "is_stateless": rule.is_stateless if hasattr(rule, 'is_stateless') else False,
-        }
-
-        if direction == "INGRESS":
-            result["source"] = rule.source
-            src_type = getattr(rule, 'source_type', "CIDR_BLOCK")
-            result["source_type"] = src_type
-        else:
-            result["destination"] = rule.destination
-            dst_type = getattr(rule, 'destination_type', "CIDR_BLOCK")
-            result["destination_type"] = dst_type
-
-        # TCP options
-        if hasattr(rule, 'tcp_options') and rule.tcp_options:
-            tcp = rule.tcp_options
-            result["tcp_options"] = {}
-            if hasattr(tcp, 'destination_port_range') and tcp.destination_port_range:
-                result["tcp_options"]["destination_port_range"] = {
-                    "min": tcp.destination_port_range.min,
-                    "max": tcp.destination_port_range.max
-                }
-            if hasattr(tcp, 'source_port_range') and tcp.source_port_range:
-                result["tcp_options"]["source_port_range"] = {
-                    "min": tcp.source_port_range.min,
-                    "max": tcp.source_port_range.max
-                }
+def _serialize_rule(rule: Any, direction: str) -> dict:
+    """Serialize a security list or NSG rule to dictionary."""
+    result = {
+        "direction": direction,
+        "protocol": rule.protocol,
+        "is_stateless": rule.is_stateless if hasattr(rule, 'is_stateless') else False,
+    }
 
-        # UDP options
-        if hasattr(rule, 'udp_options') and rule.udp_options:
-            udp = rule.udp_options
-            result["udp_options"] = {}
-            if hasattr(udp, 'destination_port_range') and udp.destination_port_range:
-                result["udp_options"]["destination_port_range"] = {
-                    "min": udp.destination_port_range.min,
-                    "max": udp.destination_port_range.max
-                }
+    if direction == "INGRESS":
+        result["source"] = rule.source
+        src_type = getattr(rule, 'source_type', "CIDR_BLOCK")
+        result["source_type"] = src_type
+    else:
+        result["destination"] = rule.destination
+        dst_type = getattr(rule, 'destination_type', "CIDR_BLOCK")
+        result["destination_type"] = dst_type
+
+    # TCP options
+    if hasattr(rule, 'tcp_options') and rule.tcp_options:
+        tcp = rule.tcp_options
+        result["tcp_options"] = {}
+        if hasattr(tcp, 'destination_port_range') and tcp.destination_port_range:
+            result["tcp_options"]["destination_port_range"] = {
+                "min": tcp.destination_port_range.min,
+                "max": tcp.destination_port_range.max
+            }
+        if hasattr(tcp, 'source_port_range') and tcp.source_port_range:
+            result["tcp_options"]["source_port_range"] = {
+                "min": tcp.source_port_range.min,
+                "max": tcp.source_port_range.max
+            }
 
-        # ICMP options
-        if hasattr(rule, 'icmp_options') and rule.icmp_options:
-            icmp = rule.icmp_options
-            result["icmp_options"] = {
-                "type": icmp.type if hasattr(icmp, 'type') else None,
-                "code": icmp.code if hasattr(icmp, 'code') else None
+    # UDP options
+    if hasattr(rule, 'udp_options') and rule.udp_options:
+        udp = rule.udp_options
+        result["udp_options"] = {}
+        if hasattr(udp, 'destination_port_range') and udp.destination_port_range:
+            result["udp_options"]["destination_port_range"] = {
+                "min": udp.destination_port_range.min,
+                "max": udp.destination_port_range.max
             }
 
-        return result
+    # ICMP options
+    if hasattr(rule, 'icmp_options') and rule.icmp_options:
+        icmp = rule.icmp_options
+        result["icmp_options"] = {
+            "type": icmp.type if hasattr(icmp, 'type') else None,
+            "code": icmp.code if hasattr(icmp, 'code') else None
+        }
+
+    return result
+
 
-    ingress_rules = [serialize_rule(r, "INGRESS") for r in (sl.ingress_security_rules or [])]
-    egress_rules = [serialize_rule(r, "EGRESS") for r in (sl.egress_security_rules or [])]
+def _serialize_security_list(sl: Any) -> dict:
+    """Serialize Security List object to dictionary."""
+    ingress_rules = [_serialize_rule(r, "INGRESS") for r in (sl.ingress_security_rules or [])]
+    egress_rules = [_serialize_rule(r, "EGRESS") for r in (sl.egress_security_rules or [])]
 
     return {
         "id": sl.id,
@@ -128,83 +144,249 @@ def _serialize_security_list(sl: Any) -> dict:
     }
 
 
-def _analyze_risky_rules(security_lists: list[dict]) -> dict:
-    """Analyze security rules for potential risks."""
-    risky_rules = []
-    total_rules = 0
-
-    risky_sources = ["0.0.0.0/0", "::/0"]
-    # SSH, RDP, Oracle DB, MySQL, PostgreSQL, MongoDB
-    risky_ports = [22, 3389, 1521, 3306, 5432, 27017]
-
-    for sl in security_lists:
-        for rule in sl.get("ingress_security_rules", []):
-            total_rules += 1
-            source = rule.get("source", "")
-            protocol = rule.get("protocol", "")
-
-            # Check for open to world
-            if source in risky_sources:
-                risk_level = "HIGH"
-                reason = f"Rule allows traffic from anywhere ({source})"
-                recommendation = "Restrict source to specific IP ranges or CIDR blocks"
-
-                # Check if it's a sensitive port
-                tcp_options = rule.get("tcp_options", {})
-                if tcp_options:
-                    port_range = tcp_options.get("destination_port_range", {})
-                    min_port = port_range.get("min")
-                    max_port = port_range.get("max")
-
-                    if min_port and max_port:
-                        for risky_port in risky_ports:
-                            if min_port <= risky_port <= max_port:
-                                risk_level = "HIGH"
-                                reason = (
-                                    f"Rule exposes sensitive port {risky_port} "
-                                    "to the internet"
-                                )
-                                recommendation = (
-                                    f"Restrict access to port {risky_port} "
-                                    "to specific IP addresses"
-                                )
-                                break
-
-                risky_rules.append({
-                    "security_list_id": sl.get("id"),
-                    "security_list_name": sl.get("display_name"),
-                    "rule": {
-                        "direction": "INGRESS",
-                        "protocol": protocol,
-                        "source_or_destination": source,
-                        "port_range": (
-                            str(tcp_options.get("destination_port_range"))
-                            if tcp_options else None
-                        ),
-                    },
-                    "risk_level": risk_level,
-                    "reason": reason,
-                    "recommendation": recommendation,
-                })
+def _serialize_nsg(nsg: Any, rules: list[Any]) -> dict:
+    """Serialize a Network Security Group and its rules to dictionary."""
+    return {
+        "id": nsg.id,
+        "display_name": nsg.display_name,
+        "lifecycle_state": nsg.lifecycle_state,
+        "vcn_id": nsg.vcn_id,
+        "compartment_id": nsg.compartment_id,
+        "security_rules": [_serialize_rule(r, r.direction) for r in rules],
+    }
 
-        for _rule in sl.get("egress_security_rules", []):
-            total_rules += 1
 
+def _serialize_route_table(rt: Any) -> dict:
+    """Serialize a Route Table and its rules to dictionary."""
     return {
-        "total_rules": total_rules,
+        "id": rt.id,
+        "display_name": rt.display_name,
+        "rules": [
+            {
+                "destination": r.destination or r.cidr_block,
+                "destination_type": r.destination_type or "CIDR_BLOCK",
+                "network_entity_id": r.network_entity_id,
+                "description": r.description,
+            }
+            for r in (rt.route_rules or [])
+        ],
+    }
+
+
+def _serialize_gateway(gateway: Any, kind: str) -> dict:
+    """Serialize an internet, NAT, service or local peering gateway to dictionary."""
+    result = {
+        "id": gateway.id,
+        "display_name": gateway.display_name,
+        "type": kind,
+        "lifecycle_state": gateway.lifecycle_state,
+        "enabled": (
+            getattr(gateway, "is_enabled", True) is not False
+            and not getattr(gateway, "block_traffic", False)
+        ),
+    }
+    if kind == "local_peering_gateway":
+        result["peering_status"] = gateway.peering_status
+        result["peer_advertised_cidr"] = gateway.peer_advertised_cidr
+    return result
+
+
+def _serialize_drg_attachment(attachment: Any) -> dict:
+    """Serialize a DRG attachment as a gateway keyed by its DRG (the route target)."""
+    return {
+        "id": attachment.drg_id,
+        "display_name": attachment.display_name,
+        "type": "drg",
+        "lifecycle_state": attachment.lifecycle_state,
+        "enabled": True,
+        "attachment_id": attachment.id,
+    }
+
+
+def _analyze_rules(
+    security_lists: list[dict],
+    nsgs: list[dict],
+    params: AnalyzeSecurityRulesInput,
+) -> dict:
+    """Analyze security list and NSG rules with the indexed rule engine."""
+    table = RuleTable.build(rule_owners(security_lists, nsgs))
+    risky_rules = []
+    if params.check_risky_rules:
+        risky_rules = [
+            {"security_list_id": f["owner_id"], "security_list_name": f["owner_name"], **f}
+            for f in table.exposed()
+        ]
+    redundant_rules = table.redundant() if params.check_redundant_rules else []
+
+    analysis = {
+        "total_rules": len(table),
+        "security_lists": len(security_lists),
+        "nsgs": len(nsgs),
         "risky_rules": risky_rules,
+        "redundant_rules": redundant_rules,
         "summary": {
-            "high_risk": len(
-                [r for r in risky_rules if r["risk_level"] == "HIGH"]
-            ),
-            "medium_risk": len(
-                [r for r in risky_rules if r["risk_level"] == "MEDIUM"]
-            ),
-            "low_risk": len(
-                [r for r in risky_rules if r["risk_level"] == "LOW"]
-            ),
-        }
+            "high_risk": len([r for r in risky_rules if r["risk_level"] == "HIGH"]),
+            "medium_risk": len([r for r in risky_rules if r["risk_level"] == "MEDIUM"]),
+            "low_risk": len([r for r in risky_rules if r["risk_level"] == "LOW"]),
+            "redundant": len(redundant_rules),
+        },
     }
+    if table.errors:
+        analysis["unparsed_rules"] = table.errors
+    if params.port is not None and params.source_cidr:
+        analysis["reachability"] = table.reachable(
+            params.port, params.source_cidr, params.protocol
+        )
+    return analysis
+
+
+async def _list_all(func: Any, **kwargs: Any) -> list[Any]:
+    """Every page of a list call, fetched off the event loop."""
+    response = await call_oci(oci.pagination.list_call_get_all_results, func, **kwargs)
+    return response.data or []
+
+
+async def _load_vcns(
+    client: Any,
+    compartment_id: str,
+    with_subnet_counts: bool = True,
+) -> dict[str, Any]:
+    """VCNs in a compartment, with subnet counts per VCN when requested.
+
+    Subnet counts come from one compartment-wide ``list_subnets`` grouped
+    by ``vcn_id``, not one call per VCN. Both are cached together in the
+    operational tier; counts are only fetched the first time a caller
+    needs them.
+
+    Returns:
+        Dict with 'vcns' (serialized) and 'subnet_counts' (None if not loaded)
+    """
+    cache = get_cache("operational")
+    key = f"network:vcns:{compartment_id}"
+    inventory = await cache.get(key)
+    if inventory is not None and (inventory["subnet_counts"] is not None
+                                  or not with_subnet_counts):
+        return inventory
+
+    vcn_task: Awaitable[list[Any] | None] = (
+        _list_all(client.list_vcns, compartment_id=compartment_id)
+        if inventory is None else _none()
+    )
+    subnet_task: Awaitable[list[Any] | None] = (
+        _list_all(client.list_subnets, compartment_id=compartment_id)
+        if with_subnet_counts else _none()
+    )
+    vcns, subnets = await gather_bounded([vcn_task, subnet_task])
+
+    if inventory is None:
+        inventory = {"vcns": [_serialize_vcn(v) for v in vcns or []], "subnet_counts": None}
+    if subnets is not None:
+        inventory["subnet_counts"] = dict(Counter(s.vcn_id for s in subnets))
+    await cache.set(key, inventory)
+    return inventory
+
+
+async def _load_topology(
+    client: Any,
+    vcn_id: str,
+    refresh: bool = False,
+) -> tuple[VcnTopology, list[dict[str, str]], dict[str, Any]]:
+    """A VCN's topology graph, built from concurrent listings and cached.
+
+    Subnets, route tables, security lists, NSGs, gateways and DRG
+    attachments are listed side by side (every page), then the rules of
+    every NSG. The graph is cached in the config tier and tagged with the
+    VCN and its compartment, so either can be invalidated as a unit.
+    Gateway listings that fail are reported and leave the graph uncached.
+
+    Returns:
+        Tuple of (topology, listing errors, cache info with built_at and cached)
+    """
+    cache = get_cache("config")
+    key = f"network:topology:{vcn_id}"
+    if refresh:
+        await cache.invalidate_tag(f"vcn:{vcn_id}")
+    payload = None if refresh else await cache.get(key)
+    if payload is not None:
+        info = {"built_at": payload["built_at"], "cached": True}
+        return VcnTopology.from_payload(payload["topology"]), [], info
+
+    vcn = (await call_oci(client.get_vcn, vcn_id=vcn_id)).data
+    scope = {"compartment_id": vcn.compartment_id, "vcn_id": vcn_id}
+    errors: list[dict[str, str]] = []
+
+    async def _gateways(what: str, func: Any) -> list[Any]:
+        try:
+            return await _list_all(func, **scope)
+        except Exception as e:
+            errors.append({"listing": what, "error": str(e)})
+            return []
+
+    (subnets, route_tables, security_lists, nsgs,
+     igws, nats, sgws, lpgs, drg_attachments) = await gather_bounded([
+        _list_all(client.list_subnets, **scope),
+        _list_all(client.list_route_tables, **scope),
+        _list_all(client.list_security_lists, **scope),
+        _list_all(client.list_network_security_groups, vcn_id=vcn_id),
+        _gateways("internet_gateways", client.list_internet_gateways),
+        _gateways("nat_gateways", client.list_nat_gateways),
+        _gateways("service_gateways", client.list_service_gateways),
+        _gateways("local_peering_gateways", client.list_local_peering_gateways),
+        _gateways("drg_attachments", client.list_drg_attachments),
+    ])
+    nsg_rules = await gather_bounded(
+        _list_all(client.list_network_security_group_security_rules,
+                  network_security_group_id=nsg.id)
+        for nsg in nsgs
+    )
+
+    gateways = [
+        *(_serialize_gateway(g, "internet_gateway") for g in igws),
+        *(_serialize_gateway(g, "nat_gateway") for g in nats),
+        *(_serialize_gateway(g, "service_gateway") for g in sgws),
+        *(_serialize_gateway(g, "local_peering_gateway") for g in lpgs),
+        *(_serialize_drg_attachment(a) for a in drg_attachments),
+    ]
+    topology = VcnTopology(
+        vcn={**_serialize_vcn(vcn),
+             "ipv6_cidr_blocks": getattr(vcn, "ipv6_cidr_blocks", None) or []},
+        subnets=[
+            {**_serialize_subnet(s),
+             "ipv6_cidr_blocks": getattr(s, "ipv6_cidr_blocks", None) or []}
+            for s in subnets
+        ],
+        route_tables={rt.id: _serialize_route_table(rt) for rt in route_tables},
+        gateways={g["id"]: g for g in gateways},
+        security_lists={sl.id: _serialize_security_list(sl) for sl in security_lists},
+        nsgs={
+            nsg.id: _serialize_nsg(nsg, rules)
+            for nsg, rules in zip(nsgs, nsg_rules, strict=True)
+        },
+    )
+    built_at = datetime.now(UTC).isoformat()
+    if not errors:
+        await cache.set(
+            key,
+            {"topology": topology.to_payload(), "built_at": built_at},
+            tags=[f"vcn:{vcn_id}", f"compartment:{vcn.compartment_id}"],
+        )
+    return topology, errors, {"built_at": built_at, "cached": False}
+
+
+async def _compartments(
+    client_mgr: Any, compartment_id: str, include_subcompartments: bool
+) -> list[str]:
+    """The compartment, or its subtree from the cached compartment tree."""
+    if include_subcompartments:
+        tree = await get_compartment_tree(client_mgr.identity, client_mgr.tenancy_id)
+        if compartment_id in tree:
+            return tree.subtree(compartment_id)
+    return [compartment_id]
+
+
+async def _none() -> None:
+    """Placeholder for an optional call that was not requested."""
+    return None
 
 
 def register_network_tools(mcp: FastMCP) -> None:
@@ -224,33 +406,43 @@ def register_network_tools(mcp: FastMCP) -> None:
         """List Virtual Cloud Networks (VCNs) in a compartment.
 
         Returns VCNs with their CIDR blocks, states, and subnet counts.
+        Subnets are counted from a single compartment-wide listing, and
+        the VCN inventory is cached briefly. With include_subcompartments,
+        every compartment of the subtree is listed concurrently.
         """
         compartment_id = params.compartment_id or os.environ.get("COMPARTMENT_OCID")
         if not compartment_id:
             return "Error: No compartment_id provided and COMPARTMENT_OCID not set."
 
         try:
-            client = get_oci_client("virtual_network")
-
-            # List VCNs
-            response = client.list_vcns(compartment_id=compartment_id, limit=params.limit)
+            async with get_oci_client() as client_mgr:
+                compartment_ids = await _compartments(
+                    client_mgr, compartment_id, params.include_subcompartments
+                )
+                inventories = await gather_bounded(
+                    _load_vcns(client_mgr.virtual_network, cid, params.include_subnet_counts)
+                    for cid in compartment_ids
+                )
 
+            counts: dict[str, int] | None = None
+            if params.include_subnet_counts:
+                counts = {}
+                for inventory in inventories:
+                    counts.update(inventory["subnet_counts"] or {})
             vcns = []
-            for vcn in response.data:
+            for vcn in (v for inventory in inventories for v in inventory["vcns"]):
                 # Apply filters
-                if params.lifecycle_state and vcn.lifecycle_state != params.lifecycle_state.value:
-                    continue
+                if params.lifecycle_state:
+                    if vcn["lifecycle_state"] != params.lifecycle_state.value:
+                        continue
                 if params.display_name:
-                    if params.display_name.lower() not in vcn.display_name.lower():
+                    if params.display_name.lower() not in vcn["display_name"].lower():
                         continue
-
-                vcn_data = _serialize_vcn(vcn)
-
-                # Count subnets
-                subnet_response = client.list_subnets(compartment_id=compartment_id, vcn_id=vcn.id)
-                vcn_data["subnet_count"] = len(subnet_response.data)
-
-                vcns.append(vcn_data)
+                if counts is not None:
+                    vcn = {**vcn, "subnet_count": counts.get(vcn["id"], 0)}
+                vcns.append(vcn)
+                if len(vcns) >= params.limit:
+                    break
 
             if params.response_format == ResponseFormat.JSON:
                 return NetworkFormatter.to_json({
@@ -280,29 +472,30 @@ def register_network_tools(mcp: FastMCP) -> None:
         Includes subnets and security lists if requested.
         """
         try:
-            client = get_oci_client("virtual_network")
+            async with get_oci_client() as client_mgr:
+                client = client_mgr.virtual_network
+
+                # Get VCN
+                response = await call_oci(client.get_vcn, vcn_id=params.vcn_id)
+                vcn_data = _serialize_vcn(response.data)
+                scope = {
+                    "compartment_id": response.data.compartment_id,
+                    "vcn_id": params.vcn_id,
+                }
 
-            # Get VCN
-            response = client.get_vcn(vcn_id=params.vcn_id)
-            vcn_data = _serialize_vcn(response.data)
+                # Fetch subnets and security lists concurrently, as requested
+                subnet_response, sl_response = await gather_bounded([
+                    call_oci(client.list_subnets, **scope) if params.include_subnets
+                    else _none(),
+                    call_oci(client.list_security_lists, **scope)
+                    if params.include_security_lists else _none(),
+                ])
 
             subnets = None
             security_lists = None
-
-            # Get subnets if requested
-            if params.include_subnets:
-                subnet_response = client.list_subnets(
-                    compartment_id=response.data.compartment_id,
-                    vcn_id=params.vcn_id
-                )
+            if subnet_response is not None:
                 subnets = [_serialize_subnet(s) for s in subnet_response.data]
-
-            # Get security lists if requested
-            if params.include_security_lists:
-                sl_response = client.list_security_lists(
-                    compartment_id=response.data.compartment_id,
-                    vcn_id=params.vcn_id
-                )
+            if sl_response is not None:
                 security_lists = [_serialize_security_list(sl) for sl in sl_response.data]
 
             if params.response_format == ResponseFormat.JSON:
@@ -331,22 +524,30 @@ def register_network_tools(mcp: FastMCP) -> None:
         """List subnets in a compartment or VCN.
 
         Returns subnet CIDR blocks, availability domains, and public/private status.
+        With include_subcompartments, every compartment of the subtree is
+        listed concurrently.
         """
         compartment_id = params.compartment_id or os.environ.get("COMPARTMENT_OCID")
         if not compartment_id:
             return "Error: No compartment_id provided and COMPARTMENT_OCID not set."
 
         try:
-            client = get_oci_client("virtual_network")
-
-            kwargs = {"compartment_id": compartment_id, "limit": params.limit}
+            kwargs: dict[str, Any] = {"limit": params.limit}
             if params.vcn_id:
                 kwargs["vcn_id"] = params.vcn_id
 
-            response = client.list_subnets(**kwargs)
+            async with get_oci_client() as client_mgr:
+                compartment_ids = await _compartments(
+                    client_mgr, compartment_id, params.include_subcompartments
+                )
+                responses = await gather_bounded(
+                    call_oci(client_mgr.virtual_network.list_subnets,
+                             compartment_id=cid, **kwargs)
+                    for cid in compartment_ids
+                )
 
             subnets = []
-            for subnet in response.data:
+            for subnet in (s for response in responses for s in response.data):
                 if params.lifecycle_state:
                     if subnet.lifecycle_state != params.lifecycle_state.value:
                         continue
@@ -355,6 +556,8 @@ def register_network_tools(mcp: FastMCP) -> None:
                         continue
 
                 subnets.append(_serialize_subnet(subnet))
+                if len(subnets) >= params.limit:
+                    break
 
             if params.response_format == ResponseFormat.JSON:
                 return NetworkFormatter.to_json({
@@ -381,28 +584,38 @@ def register_network_tools(mcp: FastMCP) -> None:
     async def list_security_lists(params: ListSecurityListsInput) -> str:
         """List security lists with their ingress and egress rules.
 
-        Shows rule counts and basic rule information.
+        Shows rule counts and basic rule information. With
+        include_subcompartments, every compartment of the subtree is listed
+        concurrently.
         """
         compartment_id = params.compartment_id or os.environ.get("COMPARTMENT_OCID")
         if not compartment_id:
             return "Error: No compartment_id provided and COMPARTMENT_OCID not set."
 
         try:
-            client = get_oci_client("virtual_network")
-
-            kwargs = {"compartment_id": compartment_id, "limit": params.limit}
+            kwargs: dict[str, Any] = {"limit": params.limit}
             if params.vcn_id:
                 kwargs["vcn_id"] = params.vcn_id
 
-            response = client.list_security_lists(**kwargs)
+            async with get_oci_client() as client_mgr:
+                compartment_ids = await _compartments(
+                    client_mgr, compartment_id, params.include_subcompartments
+                )
+                responses = await gather_bounded(
+                    call_oci(client_mgr.virtual_network.list_security_lists,
+                             compartment_id=cid, **kwargs)
+                    for cid in compartment_ids
+                )
 
             security_lists = []
-            for sl in response.data:
+            for sl in (sl for response in responses for sl in response.data):
                 if params.display_name:
                     if params.display_name.lower() not in sl.display_name.lower():
                         continue
 
                 security_lists.append(_serialize_security_list(sl))
+                if len(security_lists) >= params.limit:
+                    break
 
             if params.response_format == ResponseFormat.JSON:
                 return NetworkFormatter.to_json({
@@ -427,42 +640,109 @@ def register_network_tools(mcp: FastMCP) -> None:
         }
     )
     async def analyze_security_rules(params: AnalyzeSecurityRulesInput) -> str:
-        """Analyze security rules for potential risks.
+        """Analyze security list and NSG rules.
 
-        Identifies overly permissive rules (e.g., 0.0.0.0/0) and
-        exposed sensitive ports.
+        Rules are parsed into CIDR and port intervals and indexed, then
+        checked for sensitive ports open to 0.0.0.0/0 or ::/0 (TCP and
+        UDP) and for rules fully covered by another rule of the same list
+        or NSG. With port and source_cidr, also reports whether that
+        source can reach the port and through which rules.
         """
         if not params.vcn_id and not params.security_list_id:
             return "Error: Either vcn_id or security_list_id must be provided."
 
         try:
-            client = get_oci_client("virtual_network")
+            async with get_oci_client() as client_mgr:
+                client = client_mgr.virtual_network
+                raw_nsgs: list[Any] = []
+                nsg_rules: list[list[Any]] = []
+
+                if params.security_list_id:
+                    # Get specific security list
+                    response = await call_oci(
+                        client.get_security_list, security_list_id=params.security_list_id
+                    )
+                    raw_lists = [response.data]
+                else:
+                    # Get VCN to find compartment
+                    vcn_response = await call_oci(client.get_vcn, vcn_id=params.vcn_id)
+                    compartment_id = vcn_response.data.compartment_id
+
+                    # Security lists and NSGs of the VCN, every page, concurrently
+                    listed, listed_nsgs = await gather_bounded([
+                        _list_all(client.list_security_lists,
+                                  compartment_id=compartment_id, vcn_id=params.vcn_id),
+                        _list_all(client.list_network_security_groups, vcn_id=params.vcn_id)
+                        if params.include_nsgs else _none(),
+                    ])
+                    raw_lists = listed or []
+                    raw_nsgs = listed_nsgs or []
+                    nsg_rules = await gather_bounded(
+                        _list_all(client.list_network_security_group_security_rules,
+                                  network_security_group_id=nsg.id)
+                        for nsg in raw_nsgs
+                    )
+
+            security_lists = [_serialize_security_list(sl) for sl in raw_lists]
+            nsgs = [
+                _serialize_nsg(nsg, rules)
+                for nsg, rules in zip(raw_nsgs, nsg_rules, strict=True)
+            ]
+
+            analysis = _analyze_rules(security_lists, nsgs, params)
 
-            security_lists = []
+            if params.response_format == ResponseFormat.JSON:
+                return NetworkFormatter.to_json(analysis)
+            return NetworkFormatter.security_analysis_markdown(analysis)
 
-            if params.security_list_id:
-                # Get specific security list
-                response = client.get_security_list(security_list_id=params.security_list_id)
-                security_lists.append(_serialize_security_list(response.data))
-            else:
-                # Get VCN to find compartment
-                vcn_response = client.get_vcn(vcn_id=params.vcn_id)
-                compartment_id = vcn_response.data.compartment_id
-
-                # Get all security lists in the VCN
-                sl_response = client.list_security_lists(
-                    compartment_id=compartment_id,
-                    vcn_id=params.vcn_id
+        except Exception as e:
+            error = handle_oci_error(e, "analyzing security rules")
+            return format_error_response(error, params.response_format.value)
+
+    @mcp.tool(
+        name="oci_network_check_path",
+        annotations={
+            "title": "Check Network Path",
+            "readOnlyHint": True,
+            "destructiveHint": False,
+            "idempotentHint": True,
+            "openWorldHint": True
+        }
+    )
+    async def check_path(params: CheckNetworkPathInput) -> str:
+        """Check whether traffic can flow between two endpoints of a VCN.
+
+        Endpoints are IPs, CIDR blocks, subnet OCIDs or subnet names. The
+        answer comes from the VCN's topology graph (subnets, route rules,
+        gateways, DRG attachments, security lists and NSGs), which is
+        fetched concurrently once and cached, so repeated queries make no
+        API calls. Reports each hop and every route, gateway and security
+        check with the rules that matched.
+        """
+        try:
+            async with get_oci_client() as client_mgr:
+                topology, errors, info = await _load_topology(
+                    client_mgr.virtual_network, params.vcn_id, params.refresh
                 )
-                security_lists = [_serialize_security_list(sl) for sl in sl_response.data]
 
-            # Analyze for risks
-            analysis = _analyze_risky_rules(security_lists)
+            result = topology.path(
+                params.source,
+                params.destination,
+                port=params.port,
+                protocol=params.protocol,
+                source_nsg_ids=params.source_nsg_ids,
+                destination_nsg_ids=params.destination_nsg_ids,
+            )
+            result["topology"] = {**topology.summary(), **info}
+            if errors:
+                result["errors"] = errors
 
             if params.response_format == ResponseFormat.JSON:
-                return NetworkFormatter.to_json(analysis)
-            return NetworkFormatter.security_analysis_markdown(analysis)
+                return NetworkFormatter.to_json(result)
+            return NetworkFormatter.path_markdown(result)
 
+        except ValueError as e:
+            return format_error_response(str(e), params.response_format.value)
         except Exception as e:
-            error = handle_oci_error(e, "analyzing security rules")
+            error = handle_oci_error(e, "checking network path")
             return format_error_response(error, params.response_format.value)
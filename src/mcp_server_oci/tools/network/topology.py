@@ -0,0 +1,415 @@
+"""
+VCN topology graph.
+
+A VCN's networking objects are fetched once (concurrently, by
+``tools._load_topology``) into a graph:
+
+- subnets, indexed by address interval so an IP or CIDR resolves to its
+  subnet with a binary search
+- route tables, whose CIDR rules are kept longest prefix first and point
+  at gateways (internet, NAT, service, local peering, DRG, private IP)
+- security lists per subnet and NSGs, evaluated with ``RuleTable``
+
+Path queries walk that graph without further API calls: traffic between
+two subnets uses the VCN's implicit local route and needs an egress rule
+at the source and an ingress rule at the destination; traffic leaving or
+entering the VCN also needs a matching route rule and a gateway that
+carries it in that direction.
+
+The graph is plain JSON so it can live in the cache; the indexes are
+rebuilt lazily from it.
+"""
+from __future__ import annotations
+
+import ipaddress
+from collections import Counter
+from dataclasses import asdict, dataclass
+from functools import cached_property
+from typing import Any
+
+import numpy as np
+
+from .rules import (
+    PORT_MIN,
+    PROTOCOL_NAMES,
+    TCP,
+    UDP,
+    IntervalIndex,
+    RuleTable,
+    parse_cidr,
+    parse_protocol,
+    rule_owners,
+)
+
+# Gateway kinds by the resource type segment of a route target OCID
+_ENTITY_TYPES = {
+    "internetgateway": "internet_gateway",
+    "natgateway": "nat_gateway",
+    "servicegateway": "service_gateway",
+    "localpeeringgateway": "local_peering_gateway",
+    "drg": "drg",
+    "privateip": "private_ip",
+}
+
+# Targets that hand traffic to another network the graph does not cover
+_LEAVES_VCN = {"local_peering_gateway", "drg", "private_ip"}
+
+# Matching rules listed per security check
+_RULES_PER_CHECK = 10
+
+
+def entity_type(ocid: str) -> str:
+    """Gateway kind of a route target OCID (``unknown`` if unrecognized)."""
+    parts = ocid.split(".")
+    return _ENTITY_TYPES.get(parts[1] if len(parts) > 1 else "", "unknown")
+
+
+@dataclass
+class VcnTopology:
+    """One VCN's subnets, routes, gateways and security rules."""
+    vcn: dict[str, Any]                     # serialized VCN
+    subnets: list[dict[str, Any]]           # serialized subnets (+ ipv6_cidr_blocks)
+    route_tables: dict[str, dict[str, Any]]  # id -> id, display_name, rules
+    gateways: dict[str, dict[str, Any]]     # route target id -> id, display_name, type, ...
+    security_lists: dict[str, dict[str, Any]]
+    nsgs: dict[str, dict[str, Any]]
+
+    def to_payload(self) -> dict[str, Any]:
+        """JSON-safe form for the cache."""
+        return asdict(self)
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> VcnTopology:
+        return cls(**payload)
+
+    def summary(self) -> dict[str, Any]:
+        """Node and edge counts of the graph."""
+        return {
+            "subnets": len(self.subnets),
+            "route_tables": len(self.route_tables),
+            "route_rules": sum(len(rt["rules"]) for rt in self.route_tables.values()),
+            "gateways": dict(Counter(g["type"] for g in self.gateways.values())),
+            "security_lists": len(self.security_lists),
+            "nsgs": len(self.nsgs),
+        }
+
+    # -------------------------------------------------------------------------
+    # Indexes
+    # -------------------------------------------------------------------------
+
+    @cached_property
+    def _subnet_blocks(self) -> dict[int, tuple[np.ndarray, np.ndarray, np.ndarray,
+                                                IntervalIndex]]:
+        """Per address family: subnet positions, block bounds and their index."""
+        rows: dict[int, list[tuple[int, int, int]]] = {4: [], 6: []}
+        for i, subnet in enumerate(self.subnets):
+            for cidr in [subnet.get("cidr_block"), *(subnet.get("ipv6_cidr_blocks") or [])]:
+                if cidr:
+                    family, lo, hi = parse_cidr(cidr)
+                    rows[family].append((i, lo, hi))
+        result: dict[int, tuple[np.ndarray, np.ndarray, np.ndarray, IntervalIndex]] = {}
+        for family, items in rows.items():
+            ids = np.array([r[0] for r in items], dtype=np.int32)
+            block_lo = np.array([r[1] for r in items], dtype=np.uint64)
+            block_hi = np.array([r[2] for r in items], dtype=np.uint64)
+            result[family] = (ids, block_lo, block_hi, IntervalIndex(block_lo, block_hi))
+        return result
+
+    @cached_property
+    def _vcn_blocks(self) -> list[tuple[int, int, int]]:
+        cidrs = self.vcn.get("cidr_blocks") or [self.vcn.get("cidr_block")]
+        cidrs = [*cidrs, *(self.vcn.get("ipv6_cidr_blocks") or [])]
+        return [parse_cidr(c) for c in cidrs if c]
+
+    @cached_property
+    def _routes(self) -> dict[str, list[tuple[int, int, int, dict[str, Any]]]]:
+        """Per route table: CIDR rules as ``(family, lo, hi, rule)``, longest prefix first."""
+        result = {}
+        for rt_id, table in self.route_tables.items():
+            rows = []
+            for rule in table["rules"]:
+                if rule.get("destination_type", "CIDR_BLOCK") != "CIDR_BLOCK":
+                    continue
+                try:
+                    rows.append((*parse_cidr(rule["destination"]), rule))
+                except (ValueError, TypeError):
+                    continue
+            result[rt_id] = sorted(rows, key=lambda r: r[2] - r[1])
+        return result
+
+    @cached_property
+    def _subnet_refs(self) -> dict[str, list[dict[str, Any]]]:
+        refs: dict[str, list[dict[str, Any]]] = {}
+        for subnet in self.subnets:
+            refs.setdefault(subnet["id"], []).append(subnet)
+            if subnet.get("display_name"):
+                refs.setdefault(subnet["display_name"].lower(), []).append(subnet)
+        return refs
+
+    @cached_property
+    def _tables(self) -> dict[tuple[str, tuple[str, ...]], RuleTable]:
+        """Rule tables built so far, per subnet and NSG set."""
+        return {}
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+
+    def resolve(self, endpoint: str) -> dict[str, Any]:
+        """An IP, CIDR block, subnet OCID or subnet name as a path endpoint.
+
+        Raises:
+            ValueError: If the endpoint is ambiguous, unparseable, or inside
+                the VCN's address space but in no subnet
+        """
+        subnets = self._subnet_refs.get(endpoint) or self._subnet_refs.get(endpoint.lower())
+        if subnets:
+            if len(subnets) > 1:
+                raise ValueError(
+                    f"Subnet name '{endpoint}' is ambiguous; use the subnet OCID"
+                )
+            subnet = subnets[0]
+            return {"input": endpoint, "cidr": subnet["cidr_block"], "subnet": subnet}
+
+        try:
+            family, lo, hi = parse_cidr(endpoint)
+        except ValueError as e:
+            raise ValueError(
+                f"'{endpoint}' is not an IP address, CIDR block or subnet of VCN "
+                f"'{self.vcn.get('display_name')}'"
+            ) from e
+        cidr = str(ipaddress.ip_network(endpoint, strict=False))
+
+        ids, block_lo, block_hi, index = self._subnet_blocks[family]
+        hits = index.overlapping(lo, hi)
+        inside = hits[(block_lo[hits] <= lo) & (block_hi[hits] >= hi)]
+        if inside.size:
+            return {"input": endpoint, "cidr": cidr, "subnet": self.subnets[int(ids[inside[0]])]}
+        if any(f == family and b_lo <= hi and b_hi >= lo for f, b_lo, b_hi in self._vcn_blocks):
+            raise ValueError(
+                f"{cidr} is inside VCN '{self.vcn.get('display_name')}' but not within "
+                "a single subnet"
+            )
+        return {"input": endpoint, "cidr": cidr, "subnet": None}
+
+    def route(self, subnet: dict[str, Any], cidr: str) -> dict[str, Any] | None:
+        """Longest-prefix route rule of ``subnet``'s route table for ``cidr``.
+
+        Returns:
+            The route rule with its resolved ``gateway``, or None if no rule matches
+        """
+        family, lo, hi = parse_cidr(cidr)
+        for r_family, r_lo, r_hi, rule in self._routes.get(subnet.get("route_table_id") or "", []):
+            if r_family == family and r_lo <= lo and r_hi >= hi:
+                target = rule["network_entity_id"]
+                gateway = self.gateways.get(target) or {
+                    "id": target, "display_name": None, "type": entity_type(target),
+                }
+                return {**rule, "gateway": gateway}
+        return None
+
+    def allowed(
+        self,
+        subnet: dict[str, Any],
+        nsg_ids: list[str],
+        direction: str,
+        cidr: str,
+        port: int,
+        protocol: Any,
+    ) -> dict[str, Any]:
+        """Security list (and NSG) rules that allow ``cidr`` at ``subnet``."""
+        key = (subnet["id"], tuple(nsg_ids))
+        table = self._tables.get(key)
+        if table is None:
+            table = self._tables[key] = RuleTable.build(rule_owners(
+                [self.security_lists[i] for i in subnet.get("security_list_ids") or []
+                 if i in self.security_lists],
+                [self.nsgs[i] for i in nsg_ids],
+            ))
+        return table.reachable(port, cidr, protocol, limit=_RULES_PER_CHECK,
+                               direction=direction)
+
+    # -------------------------------------------------------------------------
+    # Path queries
+    # -------------------------------------------------------------------------
+
+    def path(
+        self,
+        source: str,
+        destination: str,
+        port: int | None = None,
+        protocol: Any = TCP,
+        source_nsg_ids: list[str] | None = None,
+        destination_nsg_ids: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Whether ``source`` can open a connection to ``destination``.
+
+        Each endpoint is an IP, CIDR block, subnet OCID or subnet name; at
+        least one must be inside the VCN. NSGs only apply to the VNICs they
+        are attached to, so they are evaluated only when given.
+
+        Returns:
+            Dict with the endpoints, the hops taken, every check with its
+            matching rules, 'reachable' and 'blocked_by' (first failed check)
+
+        Raises:
+            ValueError: On unknown endpoints or NSGs, or a missing port
+        """
+        proto = parse_protocol(protocol)
+        if port is None and proto in (TCP, UDP):
+            raise ValueError(f"A port is required for {PROTOCOL_NAMES[proto]}")
+        query_port = PORT_MIN if port is None else port
+        source_nsg_ids = list(source_nsg_ids or [])
+        destination_nsg_ids = list(destination_nsg_ids or [])
+        unknown = [i for i in source_nsg_ids + destination_nsg_ids if i not in self.nsgs]
+        if unknown:
+            raise ValueError(f"NSGs not in this VCN: {', '.join(unknown)}")
+
+        src = self.resolve(source)
+        dst = self.resolve(destination)
+        if src["subnet"] is None and dst["subnet"] is None:
+            raise ValueError(
+                f"Neither {src['cidr']} nor {dst['cidr']} is inside VCN "
+                f"'{self.vcn.get('display_name')}'"
+            )
+
+        hops: list[dict[str, Any]] = []
+        checks: list[dict[str, Any]] = []
+        leaves_vcn = False
+
+        def security(subnet: dict[str, Any], nsg_ids: list[str], direction: str,
+                     cidr: str) -> None:
+            result = self.allowed(subnet, nsg_ids, direction, cidr, query_port, proto)
+            peer = "to" if direction == "EGRESS" else "from"
+            if result["reachable"]:
+                detail = f"{direction.lower()} {peer} {cidr} allowed"
+            elif result["partially_reachable"]:
+                detail = f"{direction.lower()} allowed for only part of {cidr}"
+            else:
+                detail = f"no {direction.lower()} rule allows {cidr}"
+            checks.append({
+                "check": direction.lower(),
+                "at": subnet["display_name"],
+                "passed": result["reachable"],
+                "detail": f"{detail} at subnet '{subnet['display_name']}'",
+                "rules": result["rules"],
+            })
+
+        if src["subnet"] and dst["subnet"]:
+            hops += [_node("subnet", src["subnet"]),
+                     {"type": "local_route", "id": self.vcn["id"],
+                      "display_name": "VCN local routing"},
+                     _node("subnet", dst["subnet"])]
+            security(src["subnet"], source_nsg_ids, "EGRESS", dst["cidr"])
+            security(dst["subnet"], destination_nsg_ids, "INGRESS", src["cidr"])
+
+        elif src["subnet"]:
+            subnet = src["subnet"]
+            hops.append(_node("subnet", subnet))
+            route = self._route_check(subnet, dst["cidr"], checks, outbound=True)
+            if route is not None:
+                gateway = route["gateway"]
+                hops += [_node("route_table", self.route_tables.get(
+                             subnet["route_table_id"], {"id": subnet["route_table_id"]})),
+                         _node(gateway["type"], gateway)]
+                leaves_vcn = gateway["type"] in _LEAVES_VCN
+            hops.append({"type": "external", "id": None, "display_name": dst["cidr"]})
+            security(subnet, source_nsg_ids, "EGRESS", dst["cidr"])
+
+        else:
+            subnet = dst["subnet"]
+            hops.append({"type": "external", "id": None, "display_name": src["cidr"]})
+            route = self._route_check(subnet, src["cidr"], checks, outbound=False)
+            if route is not None:
+                hops.append(_node(route["gateway"]["type"], route["gateway"]))
+                leaves_vcn = route["gateway"]["type"] in _LEAVES_VCN
+            hops.append(_node("subnet", subnet))
+            security(subnet, destination_nsg_ids, "INGRESS", src["cidr"])
+
+        failed = next((c for c in checks if not c["passed"]), None)
+        return {
+            "vcn": {"id": self.vcn["id"], "display_name": self.vcn.get("display_name")},
+            "source": _endpoint(src, source_nsg_ids),
+            "destination": _endpoint(dst, destination_nsg_ids),
+            "protocol": PROTOCOL_NAMES.get(proto, str(proto)),
+            "port": port,
+            "reachable": failed is None,
+            "blocked_by": failed["check"] if failed else None,
+            "leaves_vcn": leaves_vcn,
+            "hops": hops,
+            "checks": checks,
+        }
+
+    def _route_check(
+        self,
+        subnet: dict[str, Any],
+        cidr: str,
+        checks: list[dict[str, Any]],
+        outbound: bool,
+    ) -> dict[str, Any] | None:
+        """Append the route and gateway checks for traffic between ``subnet`` and ``cidr``.
+
+        Inbound connections need a route back to the source (the return
+        path), through a gateway that accepts connections from outside.
+        """
+        table = self.route_tables.get(subnet.get("route_table_id") or "", {})
+        table_name = table.get("display_name") or subnet.get("route_table_id")
+        route = self.route(subnet, cidr)
+        if route is None:
+            checks.append({
+                "check": "route",
+                "at": table_name,
+                "passed": False,
+                "detail": f"no rule in route table '{table_name}' matches {cidr}"
+                          + ("" if outbound else " (no return path)"),
+            })
+            return None
+
+        gateway = route["gateway"]
+        kind = gateway["type"]
+        checks.append({
+            "check": "route",
+            "at": table_name,
+            "passed": True,
+            "detail": f"{route['destination']} -> {kind} "
+                      f"'{gateway.get('display_name') or gateway['id']}'",
+        })
+
+        passed, detail = True, None
+        if not gateway.get("enabled", True):
+            passed, detail = False, f"{kind} is disabled or blocking traffic"
+        elif kind == "internet_gateway" and not subnet.get("is_public"):
+            passed, detail = False, "subnet prohibits public IPs, so the internet gateway " \
+                                    "cannot carry its traffic"
+        elif kind == "internet_gateway":
+            detail = "the VNIC also needs a public IP"
+        elif not outbound and kind in ("nat_gateway", "service_gateway"):
+            passed, detail = False, f"a {kind} does not accept connections from outside"
+        elif kind in _LEAVES_VCN:
+            detail = "traffic continues beyond this VCN; that side is not evaluated"
+        elif kind == "unknown":
+            detail = "route target is not a known gateway of this VCN"
+        checks.append({
+            "check": "gateway",
+            "at": gateway.get("display_name") or gateway["id"],
+            "passed": passed,
+            "detail": detail or f"{kind} carries the traffic",
+        })
+        return route
+
+
+def _node(kind: str, item: dict[str, Any]) -> dict[str, Any]:
+    return {"type": kind, "id": item.get("id"), "display_name": item.get("display_name")}
+
+
+def _endpoint(endpoint: dict[str, Any], nsg_ids: list[str]) -> dict[str, Any]:
+    subnet = endpoint["subnet"]
+    result = {
+        "input": endpoint["input"],
+        "cidr": endpoint["cidr"],
+        "subnet_id": subnet["id"] if subnet else None,
+        "subnet_name": subnet["display_name"] if subnet else None,
+    }
+    if nsg_ids:
+        result["nsg_ids"] = nsg_ids
+    return result
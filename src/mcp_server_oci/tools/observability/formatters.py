@@ -60,6 +60,42 @@ class ObservabilityFormatter:
 
         return md
 
+    @staticmethod
+    def top_utilization_markdown(data: dict) -> str:
+        """Format fleet top-N utilization ranking as markdown."""
+        order = data.get("order", "highest").title()
+        md = MarkdownFormatter.header(f"{order} {data.get('metric_name', 'Utilization')}", 1)
+
+        fleet = data.get("fleet", {})
+        md += f"**Window:** {data.get('window', 'N/A')} | "
+        md += f"**Ranked by:** {data.get('rank_by', 'mean')} | "
+        md += f"**Resources:** {fleet.get('resource_count', 0)}\n\n"
+
+        resources = data.get("resources", [])
+        if not resources:
+            md += "*No metric data found for the specified scope and window.*\n"
+            return md
+
+        md += (
+            f"**Fleet:** mean {fleet.get('mean', 'N/A')} | "
+            f"p95 {fleet.get('p95', 'N/A')} | max {fleet.get('max', 'N/A')}\n\n"
+        )
+
+        headers = ["#", "Resource", "Mean", "P95", "Max"]
+        rows = []
+        for i, res in enumerate(resources, 1):
+            name = res.get("display_name") or Formatter.format_ocid(res.get("resource_id", ""))
+            rows.append([
+                str(i),
+                name,
+                f"{res.get('mean', 0):.1f}",
+                f"{res.get('p95', 0):.1f}",
+                f"{res.get('max', 0):.1f}",
+            ])
+        md += MarkdownFormatter.table(headers, rows)
+
+        return md
+
     @staticmethod
     def log_results_markdown(data: dict) -> str:
         """Format Log Analytics query results as markdown."""
@@ -67,15 +103,29 @@ class ObservabilityFormatter:
 
         md += f"**Query:** `{data.get('query', 'N/A')}`\n"
         md += f"**Time Range:** {data.get('time_range', 'N/A')}\n"
-        md += f"**Results:** {data.get('total', 0)} rows\n\n"
+        md += f"**Results:** {data.get('total', 0)} rows"
+        if data.get("total_count") is not None:
+            md += f" of {data['total_count']}"
+        md += "\n"
+        if data.get("mode") == "async":
+            md += (
+                f"**Work Request:** `{data.get('work_request_id')}` "
+                f"({data.get('status')}, {data.get('pages', 0)} pages)\n"
+            )
+        if data.get("partial"):
+            reason = data.get("partial_reason") or "incomplete"
+            md += f"\n> **Partial results:** {reason}."
+            if data.get("status") == "TIMEOUT":
+                md += " Run again with this `work_request_id` to resume."
+            md += "\n"
+        md += "\n"
 
         results = data.get("results", [])
         if not results:
             md += "*No results found.*\n"
             return md
 
-        # Extract headers from first row
-        headers = list(results[0].keys())
+        headers = data.get("columns") or list(results[0].keys())
 
         # Build table
         rows = []
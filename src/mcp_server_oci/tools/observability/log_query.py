@@ -0,0 +1,341 @@
+"""
+Log Analytics query engine: async work requests and paged results.
+
+Short queries run synchronously, one ``query`` page at a time. Queries over
+a long time range, or asking for more rows than fit a page, are submitted
+with ``should_run_async``: the returned work request is polled from the
+event loop (every read is a worker-thread call and every pause an
+``asyncio.sleep``, honouring the service's ``retry-after`` hint), and its
+results are streamed page by page through ``get_query_result``.
+
+Rows are decoded straight into a columnar ``ResultBuffer`` (one list per
+column) instead of one dict per row; dicts are only built for the rows a
+caller returns. Progress is reported while the work request runs and as
+each page arrives. When the wait times out, or a page fails, the rows
+already read are returned, marked partial, with the work request OCID so a
+later call can pick the query up again.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import suppress
+from datetime import datetime, timedelta
+from typing import Any
+
+from ...core.concurrency import call_oci
+from ...core.observability import get_logger
+from ...core.waiters import backoff_delays
+
+logger = get_logger("oci-mcp.observability.log_query")
+
+# Rows per result page, and the time range from which queries run async
+PAGE_SIZE = 500
+ASYNC_WINDOW = timedelta(hours=6)
+
+# Seconds to wait for an async query before returning partial results
+DEFAULT_TIMEOUT_SECONDS = 120.0
+POLL_INITIAL_DELAY = 1.0
+POLL_MAX_DELAY = 10.0
+
+WORK_REQUEST_FAILURES = frozenset({"FAILED", "CANCELED"})
+
+# Namespaces per tenancy, resolved once per process
+_namespaces: dict[str, str] = {}
+
+ProgressCallback = Callable[[float, str], Awaitable[None]]
+
+
+class ResultBuffer:
+    """Query results stored column by column."""
+
+    def __init__(self) -> None:
+        self.columns: list[str] = []
+        self.data: dict[str, list[Any]] = {}
+        self._keys: list[tuple[str, ...]] = []
+
+    def __len__(self) -> int:
+        return len(self.data[self.columns[0]]) if self.columns else 0
+
+    def set_columns(self, columns: list[Any]) -> None:
+        """Declare the columns from SDK column metadata (first page only).
+
+        Rows are matched on a column's internal name, then its display name.
+        """
+        if self.columns or not columns:
+            return
+        for column in columns:
+            display = getattr(column, "display_name", None)
+            internal = getattr(column, "internal_name", None)
+            self._add(display or internal or f"column_{len(self.columns) + 1}",
+                      tuple(k for k in (internal, display) if k))
+
+    def _add(self, name: str, keys: tuple[str, ...]) -> None:
+        self.columns.append(name)
+        self.data[name] = []
+        self._keys.append(keys)
+
+    def append(self, items: list[Any], limit: int | None = None) -> int:
+        """Decode rows (dicts keyed by column, or value lists) into the columns.
+
+        Returns:
+            Number of rows appended
+        """
+        if limit is not None:
+            items = items[:max(limit - len(self), 0)]
+        if not items:
+            return 0
+        if not self.columns:
+            # No column metadata: take the keys of the first row
+            first = items[0]
+            for i, key in enumerate(first if isinstance(first, dict) else range(len(first))):
+                name = key if isinstance(first, dict) else f"column_{i + 1}"
+                self._add(name, (name,))
+        for i, name in enumerate(self.columns):
+            keys = self._keys[i]
+            self.data[name].extend(
+                _value(item, keys) if isinstance(item, dict)
+                else (item[i] if i < len(item) else None)
+                for item in items
+            )
+        return len(items)
+
+    def rows(self, limit: int | None = None) -> Iterator[dict[str, Any]]:
+        """Row dicts, built on demand."""
+        count = len(self) if limit is None else min(limit, len(self))
+        for i in range(count):
+            yield {name: self.data[name][i] for name in self.columns}
+
+
+def _value(item: dict[str, Any], keys: tuple[str, ...]) -> Any:
+    for key in keys:
+        if key in item:
+            return item[key]
+    return None
+
+
+def should_run_async(window: timedelta, limit: int) -> bool:
+    """Whether a query should run as an async work request.
+
+    Long time ranges can outlast a synchronous call, and results larger
+    than one page are read back through the work request either way.
+    """
+    return window > ASYNC_WINDOW or limit > PAGE_SIZE
+
+
+async def resolve_namespace(client: Any, tenancy_id: str) -> str:
+    """Log Analytics namespace of a tenancy (looked up once)."""
+    namespace = _namespaces.get(tenancy_id)
+    if namespace is None:
+        response = await call_oci(client.get_namespace, namespace_name=tenancy_id)
+        namespace = response.data.namespace_name
+        _namespaces[tenancy_id] = namespace
+    return namespace
+
+
+def query_details(
+    query: str,
+    compartment_id: str,
+    start: datetime,
+    end: datetime,
+    limit: int,
+    run_async: bool,
+    timeout_seconds: float,
+) -> dict[str, Any]:
+    """QueryDetails body for ``query``."""
+    details: dict[str, Any] = {
+        "compartmentId": compartment_id,
+        "queryString": query,
+        "subSystem": "LOG",
+        "maxTotalCount": limit,
+        "timeFilter": {"timeStart": start.isoformat(), "timeEnd": end.isoformat()},
+        "shouldIncludeColumns": True,
+        "shouldIncludeTotalCount": True,
+    }
+    if run_async:
+        details["shouldRunAsync"] = True
+    else:
+        details["queryTimeoutInSeconds"] = int(timeout_seconds)
+    return details
+
+
+def _header(response: Any, name: str) -> str | None:
+    headers = getattr(response, "headers", None) or {}
+    return headers.get(name) or headers.get(name.lower())
+
+
+def _fold(
+    buffer: ResultBuffer, info: dict[str, Any], response: Any, limit: int
+) -> str | None:
+    """Append one result page; returns the next page token, if any."""
+    data = response.data
+    if data is None:
+        return None
+    buffer.set_columns(getattr(data, "columns", None) or [])
+    buffer.append(list(getattr(data, "items", None) or []), limit)
+    info["pages"] += 1
+    for field in ("total_count", "query_execution_time_in_ms"):
+        if getattr(data, field, None) is not None:
+            info[field] = getattr(data, field)
+    if getattr(data, "are_partial_results", False):
+        info["partial"] = True
+        info["partial_reason"] = getattr(data, "partial_result_reason", None)
+    if len(buffer) >= limit or not getattr(response, "has_next_page", False):
+        return None
+    return response.next_page
+
+
+async def _stream(
+    fetch: Callable[[str | None], Any],
+    buffer: ResultBuffer,
+    info: dict[str, Any],
+    limit: int,
+    on_progress: ProgressCallback | None,
+    start: float,
+    first: Any = None,
+) -> None:
+    """Read result pages into the buffer until the limit or the last page.
+
+    A failed page ends the stream with the rows read so far, marked partial.
+    """
+    response = first
+    page: str | None = None
+    while True:
+        if response is None:
+            try:
+                response = await call_oci(fetch, page)
+            except Exception as e:
+                if not info["pages"]:
+                    raise
+                logger.warning("Result page failed", pages=info["pages"], error=str(e))
+                info.update(partial=True, partial_reason=f"Page {info['pages'] + 1} failed: {e}")
+                return
+        page = _fold(buffer, info, response, limit)
+        if on_progress is not None:
+            await on_progress(
+                start + (1 - start) * min(len(buffer) / limit, 1.0),
+                f"Fetched page {info['pages']} ({len(buffer)} rows so far)...",
+            )
+        if page is None:
+            return
+        response = None
+
+
+async def _poll(
+    client: Any,
+    namespace: str,
+    work_request_id: str,
+    info: dict[str, Any],
+    timeout_seconds: float,
+    on_progress: ProgressCallback | None,
+) -> str:
+    """Poll a query work request until it ends or the timeout passes.
+
+    Returns:
+        Last observed status (TIMEOUT if the wait ran out)
+    """
+    deadline = time.monotonic() + timeout_seconds
+    delays = iter(backoff_delays(POLL_INITIAL_DELAY, POLL_MAX_DELAY))
+    while True:
+        response = await call_oci(
+            client.get_query_work_request,
+            namespace_name=namespace,
+            work_request_id=work_request_id,
+        )
+        status = response.data.status
+        info["percent_complete"] = response.data.percent_complete or 0
+        if on_progress is not None:
+            await on_progress(
+                0.6 * info["percent_complete"] / 100,
+                f"Query is {status} ({info['percent_complete']}%)",
+            )
+        if status == "SUCCEEDED" or status in WORK_REQUEST_FAILURES:
+            return status
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return "TIMEOUT"
+        delay = next(delays)
+        retry_after = _header(response, "retry-after")
+        if retry_after:
+            with suppress(ValueError):
+                delay = float(retry_after)
+        await asyncio.sleep(min(delay, remaining))
+
+
+async def run_query(
+    client: Any,
+    namespace: str,
+    details: dict[str, Any],
+    limit: int,
+    work_request_id: str | None = None,
+    timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+    on_progress: ProgressCallback | None = None,
+) -> tuple[ResultBuffer, dict[str, Any]]:
+    """Run a query and read up to ``limit`` rows into a columnar buffer.
+
+    Args:
+        client: OCI LogAnalyticsClient
+        namespace: Log Analytics namespace
+        details: QueryDetails body (``shouldRunAsync`` selects the async path)
+        limit: Maximum rows to read
+        work_request_id: Resume an async query instead of submitting one
+        timeout_seconds: Maximum wait for an async query to finish
+        on_progress: Awaited with (fraction done, message) while polling and
+            per result page
+
+    Returns:
+        Tuple of (buffer, info with mode, status, pages, partial and the
+        work request OCID of async queries)
+    """
+    buffer = ResultBuffer()
+    run_async = work_request_id is not None or bool(details.get("shouldRunAsync"))
+    info: dict[str, Any] = {"mode": "async" if run_async else "sync", "pages": 0,
+                            "partial": False}
+    page_size = min(limit, PAGE_SIZE)
+
+    def _page(page: str | None) -> Any:
+        return client.query(namespace_name=namespace, query_details=details,
+                            limit=page_size, page=page)
+
+    first = None
+    if work_request_id is None and run_async:
+        first = await call_oci(client.query, namespace_name=namespace, query_details=details)
+        work_request_id = _header(first, "opc-work-request-id")
+    if work_request_id is None:
+        # Synchronous, or the service answered an async submission directly
+        info["mode"] = "sync"
+        await _stream(_page, buffer, info, limit, on_progress, 0.0, first=first)
+        info["status"] = "SUCCEEDED"
+        return buffer, info
+    info["work_request_id"] = work_request_id
+
+    status = await _poll(client, namespace, work_request_id, info, timeout_seconds, on_progress)
+    info["status"] = status
+    if status in WORK_REQUEST_FAILURES:
+        raise RuntimeError(f"Log Analytics query {status.lower()} ({work_request_id})")
+
+    def _result(page: str | None) -> Any:
+        return client.get_query_result(
+            namespace_name=namespace, work_request_id=work_request_id, page=page,
+            limit=page_size, should_include_columns=True, output_mode="JSON_ROWS",
+        )
+
+    if status == "TIMEOUT":
+        # Intermediate results of the running query; the caller can resume
+        # with the work request OCID for the rest
+        info.update(partial=True,
+                    partial_reason=f"Still running after {int(timeout_seconds)}s")
+        try:
+            await _stream(_result, buffer, info, limit, on_progress, 0.6)
+        except Exception as e:
+            logger.debug("No intermediate results", work_request_id=work_request_id,
+                         error=str(e))
+        info["partial"] = True
+        return buffer, info
+
+    await _stream(_result, buffer, info, limit, on_progress, 0.6)
+    logger.debug("Read query results", work_request_id=work_request_id,
+                 rows=len(buffer), pages=info["pages"])
+    return buffer, info
@@ -5,6 +5,8 @@ import oci
 
 from mcp_server_oci.auth import get_client, get_compartment_id, get_oci_config
 
+from .log_query import ResultBuffer
+
 # Global cache for the resolved namespace to avoid repeated API calls
 _CACHED_NAMESPACE: str | None = None
 
@@ -149,20 +151,11 @@ def get_logs(
             compartment_id=comp_id
         )
 
-        # Process results
-        data = response.data
-        results = []
-
-        # Extract column names
-        cols = [c.display_name or c.name for c in (data.columns or [])]
-
-        for row in (data.rows or []):
-            item = {}
-            # row.values is the list of values matching columns
-            for i, val in enumerate(row.values or []):
-                if i < len(cols):
-                    item[cols[i]] = val
-            results.append(item)
+        # Decode into columns, then build dicts for the returned rows only
+        buffer = ResultBuffer()
+        buffer.set_columns(response.data.columns or [])
+        buffer.append(list(response.data.items or []), limit)
+        results = list(buffer.rows())
 
         if format == "markdown":
             return _format_logs_markdown(results)
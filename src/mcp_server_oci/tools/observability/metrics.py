@@ -4,6 +4,7 @@ from typing import Any
 import oci
 
 from mcp_server_oci.auth import get_client, get_compartment_id, get_oci_config
+from mcp_server_oci.core.timeseries import TimeSeries
 
 
 def _format_metrics_markdown(metrics_data: dict[str, Any], window: str) -> str:
@@ -70,15 +71,15 @@ def get_instance_metrics(
             )
         )
 
-        metrics = []
+        series = TimeSeries.empty()
         if response.data:
-            metrics = response.data[0].aggregated_datapoints
+            series = TimeSeries.from_datapoints(response.data[0].aggregated_datapoints)
 
         cpu_metrics = {
-            'average': sum(dp.value for dp in metrics) / len(metrics) if metrics else 0,
-            'max': max(dp.value for dp in metrics) if metrics else 0,
-            'min': min(dp.value for dp in metrics) if metrics else 0,
-            'datapoints_count': len(metrics)
+            'average': series.mean() or 0,
+            'max': series.max() or 0,
+            'min': series.min() or 0,
+            'datapoints_count': len(series)
         }
 
         result = {'cpu_metrics': cpu_metrics, 'instance_id': instance_id}
@@ -9,6 +9,8 @@ from enum import Enum
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from mcp_server_oci.core.metrics import RankStatistic
+
 
 class ResponseFormat(str, Enum):
     """Output format for responses."""
@@ -120,6 +122,55 @@ class GetMetricsInput(BaseModel):
     )
 
 
+class GetTopUtilizationInput(BaseModel):
+    """Input for fleet-wide top-N utilization ranking."""
+
+    model_config = ConfigDict(
+        str_strip_whitespace=True,
+        validate_assignment=True,
+        extra="forbid",
+    )
+
+    compartment_id: str | None = Field(
+        default=None,
+        description="Compartment OCID to scan (defaults to tenancy)",
+    )
+    include_subcompartments: bool = Field(
+        default=True,
+        description="Include resources in all subcompartments",
+    )
+    namespace: MetricNamespace = Field(
+        default=MetricNamespace.COMPUTE,
+        description="OCI metric namespace (e.g., 'oci_computeagent')",
+    )
+    metric_name: str = Field(
+        default="CpuUtilization",
+        description="Metric to rank by (e.g., 'CpuUtilization', 'MemoryUtilization')",
+    )
+    window: TimeWindow = Field(
+        default=TimeWindow.HOURS_24,
+        description="Time window for metrics",
+    )
+    rank_by: RankStatistic = Field(
+        default=RankStatistic.MEAN,
+        description="Statistic to rank by: 'mean', 'p95', or 'max'",
+    )
+    top_n: int = Field(
+        default=10,
+        description="Number of resources to return",
+        ge=1,
+        le=100,
+    )
+    ascending: bool = Field(
+        default=False,
+        description="Return the lowest-utilized resources instead (e.g., idle detection)",
+    )
+    response_format: ResponseFormat = Field(
+        default=ResponseFormat.MARKDOWN,
+        description="Output format: 'markdown' or 'json'",
+    )
+
+
 class ExecuteLogQueryInput(BaseModel):
     """Input for executing Log Analytics queries."""
 
@@ -148,6 +199,23 @@ class ExecuteLogQueryInput(BaseModel):
         ge=1,
         le=1000,
     )
+    run_async: bool | None = Field(
+        default=None,
+        description=(
+            "Run as an async work request (default: only for time ranges over 6h "
+            "or more than 500 rows)"
+        ),
+    )
+    timeout_seconds: int = Field(
+        default=120,
+        description="Maximum wait for an async query before returning partial results",
+        ge=5,
+        le=900,
+    )
+    work_request_id: str | None = Field(
+        default=None,
+        description="Work request OCID of an earlier async query to resume",
+    )
     response_format: ResponseFormat = Field(
         default=ResponseFormat.MARKDOWN,
         description="Output format: 'markdown' or 'json'",
@@ -167,6 +235,10 @@ class ListAlarmsInput(BaseModel):
         default=None,
         description="Compartment OCID (defaults to tenancy root)",
     )
+    include_subcompartments: bool = Field(
+        default=False,
+        description="Also list alarms in every compartment below compartment_id",
+    )
     lifecycle_state: str | None = Field(
         default=None,
         description="Filter by lifecycle state (e.g., 'ACTIVE', 'INACTIVE')",
@@ -231,6 +303,10 @@ class ListLogSourcesInput(BaseModel):
         default=None,
         description="Compartment OCID (defaults to tenancy)",
     )
+    include_subcompartments: bool = Field(
+        default=False,
+        description="Also list sources in every compartment below compartment_id",
+    )
     source_type: str | None = Field(
         default=None,
         description="Filter by source type (e.g., 'LOG', 'FILE')",
@@ -16,14 +16,23 @@ from typing import Any
 from mcp.server.fastmcp import Context, FastMCP
 
 from mcp_server_oci.core.client import oci_client_manager
+from mcp_server_oci.core.compartments import compartment_scope
+from mcp_server_oci.core.concurrency import call_oci, gather_bounded
 from mcp_server_oci.core.errors import format_error_response, handle_oci_error
+from mcp_server_oci.core.metrics import (
+    fetch_grouped_metric,
+    fetch_metrics,
+    rank_resources,
+)
 from mcp_server_oci.skills.discovery import auto_register_tool
 
 from .formatters import ObservabilityFormatter
+from .log_query import query_details, resolve_namespace, run_query, should_run_async
 from .models import (
     ExecuteLogQueryInput,
     GetAlarmHistoryInput,
     GetInstanceMetricsInput,
+    GetTopUtilizationInput,
     ListAlarmsInput,
     ListLogSourcesInput,
     ObservabilityOverviewInput,
@@ -53,6 +62,19 @@ def _parse_time_window(window: TimeWindow) -> tuple[datetime, datetime]:
     return start_time, end_time
 
 
+# MQL interval per window, keeping each series at a few hundred points
+_WINDOW_INTERVALS = {
+    TimeWindow.MINUTES_15: "1m",
+    TimeWindow.MINUTES_30: "1m",
+    TimeWindow.HOUR_1: "1m",
+    TimeWindow.HOURS_3: "1m",
+    TimeWindow.HOURS_6: "5m",
+    TimeWindow.HOURS_12: "5m",
+    TimeWindow.HOURS_24: "5m",
+    TimeWindow.DAYS_7: "1h",
+}
+
+
 def _parse_time_range(time_range: str) -> timedelta:
     """Parse time range string (e.g., '60m', '24h', '7d') to timedelta."""
     match = re.match(r"(\d+)([mhdw])", time_range.lower())
@@ -117,33 +139,25 @@ def register_observability_tools(mcp: FastMCP) -> None:
 
             start_time, end_time = _parse_time_window(params.window)
 
-            await ctx.report_progress(0.4, "Fetching CPU metrics...")
-
-            # CPU metrics query
-            cpu_query = f"""CpuUtilization[1m]{{resourceId = "{params.instance_id}"}}.mean()"""
-            cpu_response = await asyncio.to_thread(
-                monitoring.summarize_metrics_data,
-                compartment_id=compartment_id,
-                summarize_metrics_data_details={
-                    "namespace": "oci_computeagent",
-                    "query": cpu_query,
-                    "startTime": start_time.isoformat(),
-                    "endTime": end_time.isoformat(),
-                },
+            await ctx.report_progress(0.4, "Fetching metrics...")
+
+            # CPU and memory are fetched concurrently in one batch
+            metric_names = ["CpuUtilization"]
+            if params.include_memory:
+                metric_names.append("MemoryUtilization")
+            batch = await fetch_metrics(
+                monitoring,
+                compartment_id,
+                namespace="oci_computeagent",
+                metric_names=metric_names,
+                resource_ids=[params.instance_id],
+                start_time=start_time,
+                end_time=end_time,
+                raise_on_error=True,
             )
 
-            # Process CPU metrics
-            cpu_data = {"current": 0, "average": 0, "max": 0, "min": 100}
-            if cpu_response.data:
-                for item in cpu_response.data:
-                    if item.aggregated_datapoints:
-                        datapoints = item.aggregated_datapoints
-                        values = [dp.value for dp in datapoints if dp.value is not None]
-                        if values:
-                            cpu_data["current"] = round(values[-1], 2)
-                            cpu_data["average"] = round(sum(values) / len(values), 2)
-                            cpu_data["max"] = round(max(values), 2)
-                            cpu_data["min"] = round(min(values), 2)
+            cpu_data: dict[str, float] = {"current": 0, "average": 0, "max": 0, "min": 100}
+            cpu_data.update(batch.get(params.instance_id, "CpuUtilization").stats())
 
             data: dict[str, Any] = {
                 "instance_id": params.instance_id,
@@ -154,30 +168,11 @@ def register_observability_tools(mcp: FastMCP) -> None:
 
             # Memory metrics
             if params.include_memory:
-                await ctx.report_progress(0.6, "Fetching memory metrics...")
-                inst_id = params.instance_id
-                memory_query = f'MemoryUtilization[1m]{{resourceId = "{inst_id}"}}.mean()'
-                memory_response = await asyncio.to_thread(
-                    monitoring.summarize_metrics_data,
-                    compartment_id=compartment_id,
-                    summarize_metrics_data_details={
-                        "namespace": "oci_computeagent",
-                        "query": memory_query,
-                        "startTime": start_time.isoformat(),
-                        "endTime": end_time.isoformat(),
-                    },
+                memory_data: dict[str, float] = {"current": 0, "average": 0, "max": 0}
+                memory_stats = batch.get(params.instance_id, "MemoryUtilization").stats()
+                memory_data.update(
+                    {k: v for k, v in memory_stats.items() if k in memory_data}
                 )
-
-                memory_data = {"current": 0, "average": 0, "max": 0}
-                if memory_response.data:
-                    for item in memory_response.data:
-                        if item.aggregated_datapoints:
-                            datapoints = item.aggregated_datapoints
-                            values = [dp.value for dp in datapoints if dp.value is not None]
-                            if values:
-                                memory_data["current"] = round(values[-1], 2)
-                                memory_data["average"] = round(sum(values) / len(values), 2)
-                                memory_data["max"] = round(max(values), 2)
                 data["memory"] = memory_data
 
             # Disk metrics
@@ -216,6 +211,85 @@ def register_observability_tools(mcp: FastMCP) -> None:
         tier=2,
     )
 
+    @mcp.tool(
+        name="oci_observability_top_utilization",
+        annotations={
+            "title": "Fleet Top-N Utilization",
+            "readOnlyHint": True,
+            "destructiveHint": False,
+            "idempotentHint": True,
+            "openWorldHint": True,
+        },
+    )
+    async def top_utilization(params: GetTopUtilizationInput, ctx: Context) -> str:
+        """Rank resources in a compartment or tenancy by metric utilization.
+
+        Runs one grouped MQL query (groupBy resourceId) across the compartment
+        tree, reduces every series to mean/p95/max server-side, and returns only
+        the top N resources with a fleet summary.
+
+        Args:
+            params: GetTopUtilizationInput with scope, metric, window, and ranking
+
+        Returns:
+            Top N resources in requested format (markdown or json)
+
+        Example:
+            {"metric_name": "CpuUtilization", "window": "24h", "rank_by": "p95", "top_n": 5}
+        """
+        await ctx.report_progress(0.1, "Querying fleet metrics...")
+
+        try:
+            monitoring = oci_client_manager.monitoring
+            compartment_id = params.compartment_id or oci_client_manager.tenancy_id
+            start_time, end_time = _parse_time_window(params.window)
+
+            batch = await fetch_grouped_metric(
+                monitoring,
+                compartment_id,
+                namespace=params.namespace.value,
+                metric_name=params.metric_name,
+                start_time=start_time,
+                end_time=end_time,
+                interval=_WINDOW_INTERVALS.get(params.window, "5m"),
+                compartment_id_in_subtree=params.include_subcompartments,
+            )
+
+            await ctx.report_progress(0.7, "Ranking resources...")
+            ranked, fleet = rank_resources(
+                batch,
+                params.metric_name,
+                by=params.rank_by,
+                top_n=params.top_n,
+                ascending=params.ascending,
+            )
+
+            data: dict[str, Any] = {
+                "metric_name": params.metric_name,
+                "namespace": params.namespace.value,
+                "window": params.window.value,
+                "rank_by": params.rank_by.value,
+                "order": "lowest" if params.ascending else "highest",
+                "compartment_id": compartment_id,
+                "fleet": fleet,
+                "resources": ranked,
+            }
+
+            if params.response_format == ResponseFormat.JSON:
+                return ObservabilityFormatter.to_json(data)
+            return ObservabilityFormatter.top_utilization_markdown(data)
+
+        except Exception as e:
+            error = handle_oci_error(e, "ranking resource utilization")
+            return format_error_response(error, params.response_format.value)
+
+    auto_register_tool(
+        name="oci_observability_top_utilization",
+        domain="observability",
+        func=top_utilization,
+        tier=3,
+    )
+
     @mcp.tool(
         name="oci_observability_execute_log_query",
         annotations={
@@ -229,7 +303,11 @@ def register_observability_tools(mcp: FastMCP) -> None:
     async def execute_log_query(params: ExecuteLogQueryInput, ctx: Context) -> str:
         """Execute a Log Analytics query.
 
-        Runs a query against OCI Log Analytics and returns results.
+        Runs a query against OCI Log Analytics and returns results. Long
+        time ranges and large result sets run as an async work request whose
+        result pages are streamed with progress; if it outlasts
+        timeout_seconds, the rows so far are returned as partial results with
+        a work_request_id to resume from.
 
         Args:
             params: ExecuteLogQueryInput with query, time_range, and limit
@@ -243,19 +321,10 @@ def register_observability_tools(mcp: FastMCP) -> None:
         await ctx.report_progress(0.1, "Connecting to Log Analytics...")
 
         try:
-            from oci.log_analytics import LogAnalyticsClient
-
-            config = oci_client_manager._config
-            log_analytics = LogAnalyticsClient(config, signer=oci_client_manager._signer)
-
-            # Get namespace
-            namespace = os.getenv("LA_NAMESPACE")
-            if not namespace:
-                namespace_resp = await asyncio.to_thread(
-                    log_analytics.get_namespace,
-                    namespace_name=oci_client_manager.tenancy_id,
-                )
-                namespace = namespace_resp.data.namespace_name
+            log_analytics = oci_client_manager.log_analytics
+            namespace = os.getenv("LA_NAMESPACE") or await resolve_namespace(
+                log_analytics, oci_client_manager.tenancy_id
+            )
 
             compartment_id = (
                 params.compartment_id
@@ -267,39 +336,41 @@ def register_observability_tools(mcp: FastMCP) -> None:
             time_delta = _parse_time_range(params.time_range)
             end_time = datetime.now(UTC)
             start_time = end_time - time_delta
-
-            await ctx.report_progress(0.3, "Executing query...")
-
-            query_response = await asyncio.to_thread(
-                log_analytics.query,
-                namespace_name=namespace,
-                query_details={
-                    "compartmentId": compartment_id,
-                    "queryString": params.query,
-                    "subSystem": "LOG",
-                    "maxTotalCount": params.limit,
-                    "timeFilter": {
-                        "timeStart": start_time.isoformat(),
-                        "timeEnd": end_time.isoformat(),
-                    },
-                },
+            run_async = (
+                params.run_async if params.run_async is not None
+                else should_run_async(time_delta, params.limit)
             )
 
-            await ctx.report_progress(0.7, "Processing results...")
+            await ctx.report_progress(
+                0.2, "Submitting async query..." if run_async else "Executing query..."
+            )
 
-            results = []
-            if query_response.data and query_response.data.results:
-                for row in query_response.data.results[:params.limit]:
-                    results.append(row)
+            async def on_progress(fraction: float, message: str) -> None:
+                await ctx.report_progress(0.2 + 0.7 * fraction, message)
+
+            buffer, info = await run_query(
+                log_analytics,
+                namespace,
+                query_details(
+                    params.query, compartment_id, start_time, end_time, params.limit,
+                    run_async, params.timeout_seconds,
+                ),
+                params.limit,
+                work_request_id=params.work_request_id,
+                timeout_seconds=params.timeout_seconds,
+                on_progress=on_progress,
+            )
 
             data = {
                 "query": params.query,
                 "time_range": params.time_range,
-                "total": len(results),
-                "results": results,
+                "total": len(buffer),
+                "columns": buffer.columns,
+                "results": list(buffer.rows()),
+                **info,
             }
 
-            await ctx.report_progress(0.9, "Formatting response...")
+            await ctx.report_progress(0.95, "Formatting response...")
 
             if params.response_format == ResponseFormat.JSON:
                 return ObservabilityFormatter.to_json(data)
@@ -329,6 +400,9 @@ def register_observability_tools(mcp: FastMCP) -> None:
     async def list_alarms(params: ListAlarmsInput, ctx: Context) -> str:
         """List monitoring alarms in a compartment.
 
+        With include_subcompartments, every compartment of the subtree is
+        listed concurrently.
+
         Args:
             params: ListAlarmsInput with filters for state and severity
 
@@ -341,14 +415,20 @@ def register_observability_tools(mcp: FastMCP) -> None:
             monitoring = oci_client_manager.monitoring
             compartment_id = params.compartment_id or oci_client_manager.tenancy_id
 
-            response = await asyncio.to_thread(
-                monitoring.list_alarms,
-                compartment_id=compartment_id,
-                lifecycle_state=params.lifecycle_state,
-                limit=params.limit,
+            compartment_ids = await compartment_scope(
+                oci_client_manager, compartment_id, params.include_subcompartments
+            )
+            responses = await gather_bounded(
+                call_oci(
+                    monitoring.list_alarms,
+                    compartment_id=cid,
+                    lifecycle_state=params.lifecycle_state,
+                    limit=params.limit,
+                )
+                for cid in compartment_ids
             )
 
-            alarms = response.data
+            alarms = [a for response in responses for a in response.data]
 
             # Filter by severity if specified
             if params.severity:
@@ -478,6 +558,9 @@ def register_observability_tools(mcp: FastMCP) -> None:
     async def list_log_sources(params: ListLogSourcesInput, ctx: Context) -> str:
         """List Log Analytics log sources.
 
+        With include_subcompartments, every compartment of the subtree is
+        listed concurrently.
+
         Args:
             params: ListLogSourcesInput with filters
 
@@ -505,15 +588,21 @@ def register_observability_tools(mcp: FastMCP) -> None:
 
             await ctx.report_progress(0.4, "Fetching log sources...")
 
-            response = await asyncio.to_thread(
-                log_analytics.list_sources,
-                namespace_name=namespace,
-                compartment_id=compartment_id,
-                source_type=params.source_type,
-                limit=params.limit,
+            compartment_ids = await compartment_scope(
+                oci_client_manager, compartment_id, params.include_subcompartments
+            )
+            responses = await gather_bounded(
+                call_oci(
+                    log_analytics.list_sources,
+                    namespace_name=namespace,
+                    compartment_id=cid,
+                    source_type=params.source_type,
+                    limit=params.limit,
+                )
+                for cid in compartment_ids
             )
 
-            sources = response.data.items
+            sources = [s for response in responses for s in response.data.items]
 
             # Filter by name if specified
             if params.name_contains:
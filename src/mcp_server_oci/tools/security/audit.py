@@ -0,0 +1,229 @@
+"""
+Security audit sections.
+
+The IAM, Cloud Guard and network sections run concurrently, and so do the
+listings inside each: the identity graph (users, groups and memberships,
+cached between audits) and the policies of every compartment in scope; the
+VCNs and subnets of every compartment. Subnets come from one
+compartment-wide listing, not one per VCN, so every VCN is covered without
+adding calls. Every listing follows pagination and takes a slot from one
+``CallBudget``, so the whole audit never has more calls in flight than the
+budget allows.
+
+A section that fails is reported in its summary (with a neutral score)
+instead of failing the audit; a compartment whose network listing fails
+is reported without dropping the others.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from ...core.concurrency import CallBudget
+from ...core.observability import get_logger
+from .cloud_guard import get_problem_snapshot
+from .identity import get_identity_graph
+from .policies import PolicyIndex
+
+logger = get_logger("oci-mcp.security.audit")
+
+# Score of a section that could not be analyzed
+UNKNOWN_SCORE = 50
+
+
+async def audit_iam(
+    identity: Any,
+    tenancy_id: str,
+    compartment_ids: list[str],
+    budget: CallBudget,
+) -> tuple[dict[str, Any], int]:
+    """Users and groups of the tenancy (from the identity graph), policies of
+    every compartment in scope.
+
+    Returns:
+        Tuple of (IAM summary, section score)
+    """
+    (graph, _), *policy_lists = await asyncio.gather(
+        get_identity_graph(identity, tenancy_id, budget=budget),
+        *(budget.list_all(identity.list_policies, compartment_id=c) for c in compartment_ids),
+    )
+    policies = [p for items in policy_lists for p in items]
+    users, groups = graph.users, graph.groups
+    active_users = graph.find_users(lifecycle_state="ACTIVE")
+
+    findings = []
+
+    # Check for users without MFA (simplified check)
+    if active_users:
+        findings.append(f"Review MFA status for {len(active_users)} active users")
+
+    # Check for overly permissive policies: parsed grants of manage all-resources,
+    # not the phrase anywhere in a statement (a 'Define' or a condition)
+    index = PolicyIndex.build([
+        {"id": p.id, "name": p.name, "compartment_id": p.compartment_id,
+         "statements": list(p.statements or [])}
+        for p in policies
+    ])
+    broad_policies = {g["policy_id"] for g in index.broad_grants()}
+    if broad_policies:
+        findings.append(f"{len(broad_policies)} policies with 'manage all-resources' detected")
+
+    summary = {
+        "total_users": len(users),
+        "active_users": len(active_users),
+        "total_groups": len(groups),
+        "total_policies": len(policies),
+        "findings": findings,
+    }
+    return summary, 80 if not findings else 60
+
+
+async def audit_cloud_guard(
+    cloud_guard: Any,
+    compartment_id: str,
+    include_subcompartments: bool,
+    budget: CallBudget,
+) -> tuple[dict[str, Any], int, list[str]]:
+    """Active Cloud Guard problems from the cached snapshot (every page);
+    Cloud Guard walks the subtree itself.
+
+    Returns:
+        Tuple of (Cloud Guard summary, section score, recommendations)
+    """
+    snapshot, _ = await get_problem_snapshot(
+        cloud_guard, compartment_id, include_subcompartments, budget=budget
+    )
+    by_risk = snapshot.counts["risk_level"]
+    critical, high, medium = by_risk["CRITICAL"], by_risk["HIGH"], by_risk["MEDIUM"]
+
+    recommendations = []
+    if critical > 0:
+        recommendations.append(f"Address {critical} critical Cloud Guard problems immediately")
+
+    if critical == 0 and high == 0:
+        score = 90
+    elif critical == 0:
+        score = 70
+    else:
+        score = 40
+    summary = {"total": len(snapshot), "critical": critical, "high": high, "medium": medium}
+    return summary, score, recommendations
+
+
+async def audit_network(
+    network: Any,
+    compartment_ids: list[str],
+    budget: CallBudget,
+) -> tuple[dict[str, Any], int]:
+    """VCNs and public subnets of every compartment in scope.
+
+    Raises:
+        RuntimeError: If no compartment could be listed
+
+    Returns:
+        Tuple of (network summary, section score)
+    """
+    errors: list[dict[str, str]] = []
+
+    async def _compartment(compartment_id: str) -> tuple[list[Any], list[Any]]:
+        try:
+            vcns, subnets = await asyncio.gather(
+                budget.list_all(network.list_vcns, compartment_id=compartment_id),
+                budget.list_all(network.list_subnets, compartment_id=compartment_id),
+            )
+        except Exception as e:
+            logger.warning("Network audit listing failed", compartment_id=compartment_id,
+                           error=str(e))
+            errors.append({"compartment_id": compartment_id, "error": str(e)})
+            return [], []
+        return vcns, subnets
+
+    results = await asyncio.gather(*(_compartment(c) for c in compartment_ids))
+    if len(errors) == len(compartment_ids):
+        raise RuntimeError(errors[0]["error"])
+
+    total_vcns = sum(len(vcns) for vcns, _ in results)
+    public_subnets = sum(
+        1 for _, subnets in results for s in subnets if not s.prohibit_public_ip_on_vnic
+    )
+
+    findings = []
+    if public_subnets > 5:
+        findings.append(f"{public_subnets} public subnets detected - review necessity")
+
+    summary: dict[str, Any] = {
+        "total_vcns": total_vcns,
+        "public_subnets": public_subnets,
+        "open_rules": 0,
+        "findings": findings,
+    }
+    if errors:
+        summary["errors"] = errors
+    return summary, 85 if not findings else 65
+
+
+async def run_audit(
+    client_mgr: Any,
+    compartment_ids: list[str],
+    include_iam: bool = True,
+    include_cloud_guard: bool = True,
+    include_network_security: bool = True,
+    include_subcompartments: bool = False,
+    budget: CallBudget | None = None,
+    on_section: Callable[[str], Awaitable[None]] | None = None,
+) -> dict[str, Any]:
+    """Run the requested sections concurrently within one call budget.
+
+    Args:
+        client_mgr: Client manager with identity, cloud_guard, virtual_network
+            and tenancy_id
+        compartment_ids: Compartments in scope; the first is the audited root
+        budget: Shared call budget (default: OCI_MAX_CONCURRENCY)
+        on_section: Awaited with each section's name as it completes
+
+    Returns:
+        Dict with the section summaries, 'scores' per section and 'recommendations'
+    """
+    budget = budget or CallBudget()
+    data: dict[str, Any] = {"scores": {}, "recommendations": []}
+
+    async def _section(name: str, key: str, run: Callable[[], Awaitable[Any]],
+                       error: str) -> None:
+        try:
+            result = await run()
+        except Exception as e:
+            logger.warning("Security audit section failed", section=name, error=str(e))
+            data[key] = {"error": error}
+            data["scores"][name] = UNKNOWN_SCORE
+        else:
+            data[key], data["scores"][name] = result[0], result[1]
+            if len(result) > 2:
+                data["recommendations"].extend(result[2])
+        if on_section is not None:
+            await on_section(name)
+
+    sections = []
+    if include_iam:
+        sections.append(_section(
+            "iam", "iam_summary",
+            lambda: audit_iam(client_mgr.identity, client_mgr.tenancy_id,
+                              compartment_ids, budget),
+            "IAM analysis failed",
+        ))
+    if include_cloud_guard:
+        sections.append(_section(
+            "cloud_guard", "cloud_guard_summary",
+            lambda: audit_cloud_guard(client_mgr.cloud_guard, compartment_ids[0],
+                                      include_subcompartments, budget),
+            "Cloud Guard not enabled or accessible",
+        ))
+    if include_network_security:
+        sections.append(_section(
+            "network", "network_summary",
+            lambda: audit_network(client_mgr.virtual_network, compartment_ids, budget),
+            "Network analysis failed",
+        ))
+    await asyncio.gather(*sections)
+    data["api_calls"] = budget.calls
+    return data
@@ -0,0 +1,233 @@
+"""
+Cloud Guard problem snapshots with streaming aggregation.
+
+Problems are listed page by page on the shared Cloud Guard client (every
+page, not the first 100) and folded into a snapshot as each page arrives:
+a table of compact rows keyed by problem OCID plus running counts by risk
+level, resource type, region and detector. Counts are updated per row, so
+they are right at every point of the listing and progress can be reported
+while it runs.
+
+Snapshots are cached per (compartment, subtree, lifecycle state) in the
+config tier and are fresh for ``FRESH_FOR`` seconds. After that, a read
+refreshes the snapshot with the problems detected since the last scan
+(``time_last_detected`` at or after it, less ``OVERLAP``), listed for each
+of ``LIFECYCLE_STATES`` since Cloud Guard only lists active problems unless
+told otherwise: rows are upserted, and rows that left the requested
+lifecycle state are dropped. A
+problem resolved without being detected again is not in that listing, so
+each snapshot is also rescanned in full every ``FULL_INTERVAL`` seconds.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from time import time
+from typing import Any
+
+from ...core.cache import PayloadMemo, get_cache
+from ...core.concurrency import CallBudget
+from ...core.observability import get_logger
+from ...core.timestamps import timestamp_str
+
+logger = get_logger("oci-mcp.security.cloud_guard")
+
+# Seconds a snapshot is served as is, between full scans, and the slack on
+# the delta window
+FRESH_FOR = 60.0
+FULL_INTERVAL = 300.0
+OVERLAP = 60.0
+
+# Problem states Cloud Guard lists; a listing without a state returns ACTIVE only
+LIFECYCLE_STATES = ("ACTIVE", "INACTIVE")
+
+RISK_ORDER = {"CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3, "MINOR": 4}
+
+# Row field aggregated and the summary key it is reported under
+DIMENSIONS = {
+    "risk_level": "by_risk",
+    "resource_type": "by_resource_type",
+    "region": "by_region",
+    "detector_id": "by_detector",
+}
+
+# Snapshots per cache key, keyed by scan stamp, so a cache hit does not
+# re-aggregate every row
+_built: PayloadMemo[ProblemSnapshot] = PayloadMemo()
+
+
+def problem_row(problem: Any) -> dict[str, Any]:
+    """Compact row for an SDK ProblemSummary."""
+    return {
+        "id": problem.id,
+        "detector_rule_id": problem.detector_rule_id,
+        "detector_id": getattr(problem, "detector_id", None),
+        "risk_level": problem.risk_level,
+        "resource_name": problem.resource_name,
+        "resource_type": problem.resource_type,
+        "region": problem.region,
+        "compartment_id": getattr(problem, "compartment_id", None),
+        "lifecycle_state": problem.lifecycle_state,
+        "lifecycle_detail": getattr(problem, "lifecycle_detail", None),
+        "time_first_detected": timestamp_str(problem.time_first_detected),
+        "time_last_detected": timestamp_str(getattr(problem, "time_last_detected", None)),
+        "recommendation": getattr(problem, "recommendation", None),
+    }
+
+
+class ProblemSnapshot:
+    """Problems keyed by OCID with counts kept current on every change."""
+
+    def __init__(self, rows: list[dict[str, Any]] | None = None) -> None:
+        self.problems: dict[str, dict[str, Any]] = {}
+        self.counts: dict[str, Counter[str]] = {key: Counter() for key in DIMENSIONS}
+        for row in rows or []:
+            self.upsert(row)
+
+    def __len__(self) -> int:
+        return len(self.problems)
+
+    def _count(self, row: dict[str, Any], delta: int) -> None:
+        for key, counter in self.counts.items():
+            value = row.get(key) or "UNKNOWN"
+            counter[value] += delta
+            if counter[value] <= 0:
+                del counter[value]
+
+    def upsert(self, row: dict[str, Any]) -> None:
+        old = self.problems.get(row["id"])
+        if old is not None:
+            self._count(old, -1)
+        self.problems[row["id"]] = row
+        self._count(row, 1)
+
+    def discard(self, problem_id: str) -> None:
+        old = self.problems.pop(problem_id, None)
+        if old is not None:
+            self._count(old, -1)
+
+    def summary(self, top: int = 10) -> dict[str, Any]:
+        """Total and counts per dimension (the ``top`` largest beyond risk)."""
+        data: dict[str, Any] = {"total": len(self.problems)}
+        for key, name in DIMENSIONS.items():
+            counter = self.counts[key]
+            data[name] = dict(counter if key == "risk_level" else counter.most_common(top))
+        return data
+
+    def select(self, risk_level: str | None = None) -> list[dict[str, Any]]:
+        """Problems of a risk level (or all), most severe and most recent first."""
+        rows = [
+            r for r in self.problems.values()
+            if risk_level is None or r["risk_level"] == risk_level
+        ]
+        rows.sort(key=lambda r: r["time_last_detected"] or r["time_first_detected"] or "",
+                  reverse=True)
+        rows.sort(key=lambda r: RISK_ORDER.get(r["risk_level"], len(RISK_ORDER)))
+        return rows
+
+
+async def _scan(
+    cloud_guard: Any,
+    snapshot: ProblemSnapshot,
+    keep_state: str | None,
+    states: tuple[str, ...],
+    budget: CallBudget,
+    on_page: Callable[[int, int], Awaitable[None]] | None,
+    **kwargs: Any,
+) -> int:
+    """Fold every page of the problem listing of each of ``states`` into the
+    snapshot, keeping problems in ``keep_state`` (every state if None) and
+    dropping others.
+
+    Returns:
+        Number of problems listed
+    """
+    listed = pages = 0
+    for state in states:
+        async for items in budget.pages(
+            cloud_guard.list_problems, lifecycle_state=state, **kwargs
+        ):
+            for problem in items:
+                if keep_state is None or problem.lifecycle_state == keep_state:
+                    snapshot.upsert(problem_row(problem))
+                else:
+                    snapshot.discard(problem.id)
+            listed += len(items)
+            pages += 1
+            if on_page is not None:
+                await on_page(pages, len(snapshot))
+    return listed
+
+
+async def get_problem_snapshot(
+    cloud_guard: Any,
+    compartment_id: str,
+    include_subcompartments: bool = False,
+    lifecycle_state: str | None = "ACTIVE",
+    refresh: bool = False,
+    budget: CallBudget | None = None,
+    on_page: Callable[[int, int], Awaitable[None]] | None = None,
+) -> tuple[ProblemSnapshot, dict[str, Any]]:
+    """Cloud Guard problems of a compartment (or its subtree), cached.
+
+    Args:
+        cloud_guard: OCI CloudGuardClient (the shared one)
+        compartment_id: Compartment to list problems for
+        include_subcompartments: Let Cloud Guard walk the compartment subtree
+        lifecycle_state: Problem state to keep (None for every state)
+        refresh: Rescan in full instead of using the cached snapshot
+        budget: Call budget shared with the caller (default: OCI_MAX_CONCURRENCY)
+        on_page: Awaited with (pages read, problems in snapshot) per page
+
+    Returns:
+        Tuple of (snapshot, info with scanned_at, full_scan_at, cached and
+        any delta counts)
+    """
+    cache = get_cache("config")
+    key = (
+        f"security:cloud_guard:{compartment_id}:"
+        f"{'subtree' if include_subcompartments else 'own'}:{lifecycle_state or 'all'}"
+    )
+    payload = None if refresh else await cache.get(key)
+    budget = budget or CallBudget()
+    now = time()
+
+    kwargs: dict[str, Any] = {"compartment_id": compartment_id}
+    if include_subcompartments:
+        kwargs.update(compartment_id_in_subtree=True, access_level="ACCESSIBLE")
+
+    if payload is not None and now - payload["full_scan_at"] < FULL_INTERVAL:
+        snapshot = _built.load(
+            key, payload["scanned_at"], lambda: ProblemSnapshot(payload["problems"])
+        )
+        info: dict[str, Any] = {"scanned_at": payload["scanned_at"],
+                                "full_scan_at": payload["full_scan_at"], "cached": True}
+        if now - payload["scanned_at"] < FRESH_FOR:
+            return snapshot, info
+        # Problems detected since the last scan, active and inactive alike,
+        # so that rows which left the requested state are dropped
+        since = datetime.fromtimestamp(payload["scanned_at"] - OVERLAP, UTC)
+        before = len(snapshot)
+        listed = await _scan(
+            cloud_guard, snapshot, lifecycle_state, LIFECYCLE_STATES, budget, on_page,
+            time_last_detected_greater_than_or_equal_to=since, **kwargs,
+        )
+        info["delta"] = {"listed": listed, "net_change": len(snapshot) - before}
+        logger.debug("Refreshed Cloud Guard snapshot", key=key, **info["delta"])
+    else:
+        snapshot = ProblemSnapshot()
+        states = LIFECYCLE_STATES if lifecycle_state is None else (lifecycle_state,)
+        await _scan(cloud_guard, snapshot, lifecycle_state, states, budget, on_page, **kwargs)
+        info = {"full_scan_at": now, "cached": False}
+        logger.debug("Scanned Cloud Guard problems", key=key, problems=len(snapshot))
+
+    info["scanned_at"] = now
+    await cache.set(
+        key,
+        {"problems": list(snapshot.problems.values()), "scanned_at": now,
+         "full_scan_at": info["full_scan_at"]},
+        tags=["security:cloud_guard", f"compartment:{compartment_id}"],
+    )
+    _built.store(key, now, snapshot)
+    return snapshot, info
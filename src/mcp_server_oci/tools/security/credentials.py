@@ -0,0 +1,212 @@
+"""
+User credential listings and the tenancy-wide credential age scan.
+
+API keys, auth tokens and customer secret keys have no tenancy-wide
+listing: each is listed per user. Every (user, credential type) listing
+of a scan runs concurrently under one ``CallBudget``, and each result is
+cached per user in the config tier, so a repeated scan only lists the
+users whose entries are missing or expired (new users, or a ``refresh``).
+
+Ages are computed with NumPy over one column of creation times for every
+credential in scope, and only active credentials older than the maximum
+age are reported.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from time import time
+from typing import Any
+
+import numpy as np
+
+from ...core.cache import get_cache
+from ...core.concurrency import CallBudget
+from ...core.observability import get_logger
+from ...core.timestamps import epoch_seconds, timestamp_str
+from .identity import get_identity_graph
+
+logger = get_logger("oci-mcp.security.credentials")
+
+# Credential type, its SDK list call and the field naming each credential
+CREDENTIAL_TYPES = {
+    "api_keys": ("list_api_keys", "fingerprint"),
+    "auth_tokens": ("list_auth_tokens", "description"),
+    "customer_secret_keys": ("list_customer_secret_keys", "display_name"),
+}
+
+
+def credential_row(kind: str, credential: Any) -> dict[str, Any]:
+    """Compact row for an SDK ApiKey, AuthToken or CustomerSecretKeySummary."""
+    if kind == "api_keys":
+        row = {
+            "key_id": credential.key_id,
+            "fingerprint": credential.fingerprint,
+        }
+    else:
+        name_field = CREDENTIAL_TYPES[kind][1]
+        row = {
+            "id": credential.id,
+            name_field: getattr(credential, name_field, None),
+            "time_expires": timestamp_str(getattr(credential, "time_expires", None)),
+        }
+    row.update(
+        lifecycle_state=credential.lifecycle_state,
+        time_created=timestamp_str(credential.time_created),
+        created=epoch_seconds(credential.time_created),
+    )
+    return row
+
+
+async def get_credentials(
+    identity: Any,
+    user_ids: list[str],
+    kinds: tuple[str, ...] = tuple(CREDENTIAL_TYPES),
+    refresh: bool = False,
+    budget: CallBudget | None = None,
+    on_user: Callable[[int, int], Awaitable[None]] | None = None,
+) -> tuple[dict[str, dict[str, list[dict[str, Any]]]], dict[str, Any]]:
+    """Credentials of each kind per user, listed concurrently where not cached.
+
+    Args:
+        identity: OCI IdentityClient
+        user_ids: Users to list credentials for
+        kinds: Credential types (keys of ``CREDENTIAL_TYPES``)
+        refresh: List every user again instead of using cached results
+        budget: Call budget shared with the caller (default: OCI_MAX_CONCURRENCY)
+        on_user: Awaited with (users done, users to list) as each user completes
+
+    Returns:
+        Tuple of ({kind: {user OCID: rows}}, info with cached/listed user
+        counts and errors). Failed listings are reported, not cached.
+    """
+    cache = get_cache("config")
+    budget = budget or CallBudget()
+    result: dict[str, dict[str, list[dict[str, Any]]]] = {kind: {} for kind in kinds}
+
+    pairs = [(kind, user_id) for kind in kinds for user_id in user_ids]
+    if not refresh:
+        cached = await asyncio.gather(*(cache.get(f"iam:{k}:{u}") for k, u in pairs))
+        for (kind, user_id), rows in zip(pairs, cached, strict=True):
+            if rows is not None:
+                result[kind][user_id] = rows
+    missing = [(k, u) for k, u in pairs if u not in result[k]]
+    pending = {u: sum(1 for _, m in missing if m == u) for _, u in missing}
+    errors: list[dict[str, str]] = []
+    done = 0
+
+    async def _list(kind: str, user_id: str) -> None:
+        nonlocal done
+        method = getattr(identity, CREDENTIAL_TYPES[kind][0])
+        try:
+            response = await budget.call(method, user_id=user_id)
+        except Exception as e:
+            logger.warning("Credential listing failed", kind=kind, user_id=user_id,
+                           error=str(e))
+            errors.append({"user_id": user_id, "kind": kind, "error": str(e)})
+        else:
+            rows = [credential_row(kind, c) for c in response.data or []]
+            result[kind][user_id] = rows
+            await cache.set(f"iam:{kind}:{user_id}", rows,
+                            tags=["iam:credentials", f"user:{user_id}"])
+        pending[user_id] -= 1
+        if pending[user_id] == 0:
+            done += 1
+            if on_user is not None:
+                await on_user(done, len(pending))
+
+    await asyncio.gather(*(_list(k, u) for k, u in missing))
+    info = {
+        "users": len(user_ids),
+        "listed_users": len(pending),
+        "cached_users": len(user_ids) - len(pending),
+        "errors": errors,
+    }
+    return result, info
+
+
+def credential_ages(
+    credentials: dict[str, dict[str, list[dict[str, Any]]]],
+    now: float | None = None,
+) -> tuple[list[tuple[str, str, dict[str, Any]]], np.ndarray, np.ndarray]:
+    """Flatten credentials and compute their ages in days.
+
+    Returns:
+        Tuple of ((kind, user OCID, row) per credential, age in days
+        (NaN if unknown), whether the credential is active)
+    """
+    flat = [
+        (kind, user_id, row)
+        for kind, users in credentials.items()
+        for user_id, rows in users.items()
+        for row in rows
+    ]
+    created = np.array(
+        [np.nan if row["created"] is None else row["created"] for _, _, row in flat],
+        dtype=np.float64,
+    )
+    active = np.array([row["lifecycle_state"] == "ACTIVE" for _, _, row in flat], dtype=bool)
+    ages = ((now or time()) - created) / 86400.0
+    return flat, ages, active
+
+
+async def scan_credentials(
+    identity: Any,
+    tenancy_id: str,
+    max_age_days: int,
+    kinds: tuple[str, ...] = tuple(CREDENTIAL_TYPES),
+    refresh: bool = False,
+    budget: CallBudget | None = None,
+    on_user: Callable[[int, int], Awaitable[None]] | None = None,
+) -> dict[str, Any]:
+    """Active credentials of active users older than ``max_age_days``.
+
+    Returns:
+        Dict with totals per kind, the violations (oldest first) and the
+        listing info from ``get_credentials``
+    """
+    budget = budget or CallBudget()
+    graph, _ = await get_identity_graph(identity, tenancy_id, budget=budget)
+    users = graph.find_users(lifecycle_state="ACTIVE")
+    credentials, info = await get_credentials(
+        identity, [u["id"] for u in users], kinds, refresh=refresh, budget=budget,
+        on_user=on_user,
+    )
+
+    flat, ages, active = credential_ages(credentials)
+    stale = active & (ages > max_age_days)
+    order = np.flatnonzero(stale)
+    order = order[np.argsort(-ages[order], kind="stable")]
+
+    violations = []
+    for i in order.tolist():
+        kind, user_id, row = flat[i]
+        user = graph.user(user_id) or {}
+        violations.append({
+            "user_id": user_id,
+            "user_name": user.get("name"),
+            "kind": kind,
+            "credential_id": row.get("key_id") or row.get("id"),
+            "name": row.get(CREDENTIAL_TYPES[kind][1]),
+            "time_created": row["time_created"],
+            "age_days": int(ages[i]),
+        })
+
+    kind_of = np.array([kind for kind, _, _ in flat], dtype=object)
+    totals = {
+        kind: {
+            "total": int((kind_of == kind).sum()),
+            "active": int((active & (kind_of == kind)).sum()),
+            "stale": int((stale & (kind_of == kind)).sum()),
+        }
+        for kind in kinds
+    }
+    known = active & ~np.isnan(ages)
+    return {
+        "max_age_days": max_age_days,
+        "users_scanned": len(users),
+        "credentials": totals,
+        "oldest_days": int(ages[known].max()) if known.any() else None,
+        "violations": violations,
+        **info,
+    }
@@ -153,12 +153,132 @@ class SecurityFormatter:
 
         return md
 
+    @staticmethod
+    def who_can_markdown(data: dict) -> str:
+        """Format a who-can query as markdown."""
+        query = data.get("query", {})
+        md = MarkdownFormatter.header("Policy Access", 1)
+
+        scope = query.get("compartment") or "anywhere in the tenancy"
+        md += (
+            f"**Who can {query.get('verb')} `{query.get('resource_type')}`** in {scope}\n"
+        )
+        md += f"**Subjects:** {', '.join(data.get('subjects', [])) or 'none'}\n"
+        md += SecurityFormatter._index_line(data.get("index", {}))
+
+        grants = data.get("grants", [])
+        if not grants:
+            md += "_No policy statement grants this access._\n"
+            return md
+        md += SecurityFormatter._grants_table(grants)
+        return md
+
+    @staticmethod
+    def what_can_markdown(data: dict) -> str:
+        """Format a subject's grants as markdown."""
+        md = MarkdownFormatter.header(f"Permissions of {data.get('subject', 'N/A')}", 1)
+
+        md += f"**Grants:** {data.get('total', 0)}\n"
+        md += SecurityFormatter._index_line(data.get("index", {}))
+
+        grants = data.get("grants", [])
+        if not grants:
+            md += "_No policy statement names this subject._\n"
+            return md
+        md += SecurityFormatter._grants_table(grants)
+        return md
+
+    @staticmethod
+    def _index_line(index: dict) -> str:
+        """Policy index provenance and any statements that could not be parsed."""
+        md = (
+            f"**Index:** {index.get('policies', 0)} policies, {index.get('grants', 0)} grants, "
+            f"built {index.get('built_at', 'N/A')}"
+            f"{' (cached)' if index.get('cached') else ''}\n"
+        )
+        if index.get("unparsed"):
+            md += f"**Unparsed Statements:** {index['unparsed']}\n"
+        for error in index.get("errors", []):
+            md += f"- ⚠️ Could not list {error['compartment_id']}: {error['error']}\n"
+        return md + "\n"
+
+    @staticmethod
+    def _grants_table(grants: list[dict]) -> str:
+        headers = ["Subject", "Access", "Location", "Policy", "Condition"]
+        rows = []
+        for grant in grants:
+            access = (
+                f"{grant['verb']} {grant['resource']}" if grant.get("verb")
+                else "{" + ", ".join(grant.get("permissions", [])) + "}"
+            )
+            who = grant["subject"] + (f" (via {grant['via']})" if grant.get("via") else "")
+            rows.append([
+                who,
+                access,
+                grant.get("location", "N/A"),
+                grant.get("policy_name", "N/A"),
+                (grant.get("condition") or "-")[:60],
+            ])
+        return MarkdownFormatter.table(headers, rows)
+
+    @staticmethod
+    def credential_scan_markdown(data: dict) -> str:
+        """Format a credential age scan as markdown."""
+        md = MarkdownFormatter.header("Credential Age Scan", 1)
+
+        md += f"**Maximum Age:** {data.get('max_age_days')} days\n"
+        md += (
+            f"**Active Users Scanned:** {data.get('users_scanned', 0)} "
+            f"({data.get('listed_users', 0)} listed, {data.get('cached_users', 0)} cached)\n"
+        )
+        if data.get("oldest_days") is not None:
+            md += f"**Oldest Active Credential:** {data['oldest_days']} days\n"
+        md += "\n"
+
+        rows = [
+            [kind.replace("_", " ").title(), c["total"], c["active"], c["stale"]]
+            for kind, c in data.get("credentials", {}).items()
+        ]
+        md += MarkdownFormatter.table(["Type", "Total", "Active", "Too Old"], rows)
+
+        for error in data.get("errors", []):
+            md += f"- ⚠️ Could not list {error['kind']} of {error['user_id']}: {error['error']}\n"
+
+        violations = data.get("violations", [])
+        if not violations:
+            md += "\n_No active credentials older than the maximum age._\n"
+            return md
+
+        md += f"\n## Violations ({data.get('total_violations', len(violations))})\n"
+        md += MarkdownFormatter.table(
+            ["User", "Type", "Credential", "Age (days)", "Created"],
+            [
+                [
+                    v.get("user_name") or v["user_id"],
+                    v["kind"].replace("_", " "),
+                    (v.get("name") or v.get("credential_id") or "N/A")[:40],
+                    v["age_days"],
+                    Formatter.format_datetime(v["time_created"]) if v.get("time_created")
+                    else "N/A",
+                ]
+                for v in violations
+            ],
+        )
+        return md
+
     @staticmethod
     def cloud_guard_problems_markdown(data: dict) -> str:
         """Format Cloud Guard problems as markdown."""
         md = MarkdownFormatter.header("Cloud Guard Problems", 1)
 
         md += f"**Total Problems:** {data.get('total', 0)}\n"
+        snapshot = data.get("snapshot")
+        if snapshot:
+            md += (
+                f"**Snapshot:** {snapshot.get('problems', 0)} problems, scanned "
+                f"{snapshot.get('scanned_at', 'N/A')}"
+                f"{' (cached)' if snapshot.get('cached') else ''}\n"
+            )
 
         # Risk level summary
         summary = data.get("summary", {})
@@ -170,12 +290,26 @@ class SecurityFormatter:
             md += f"- 🟢 **Low:** {summary.get('LOW', 0)}\n"
             md += f"- ⚪ **Minor:** {summary.get('MINOR', 0)}\n"
 
+        for key, title in (
+            ("by_resource_type", "Resource Type"),
+            ("by_region", "Region"),
+            ("by_detector", "Detector"),
+        ):
+            counts = data.get(key)
+            if counts:
+                md += f"\n## By {title}\n"
+                md += MarkdownFormatter.table(
+                    [title, "Problems"], [[name, count] for name, count in counts.items()]
+                )
+
         problems = data.get("problems", [])
         if not problems:
             md += "\n_No problems found._\n"
             return md
 
         md += "\n## Problems\n"
+        if len(problems) < data.get("total", 0):
+            md += f"_Showing {len(problems)} of {data['total']}, most severe first._\n\n"
 
         # Group by risk level
         risk_icons = {
@@ -215,7 +349,10 @@ class SecurityFormatter:
         md = MarkdownFormatter.header("Security Audit Report", 1)
 
         md += f"**Audit Time:** {data.get('audit_time', 'N/A')}\n"
-        md += f"**Compartment:** {data.get('compartment_name', 'Tenancy Root')}\n\n"
+        md += f"**Compartment:** {data.get('compartment_name', 'Tenancy Root')}\n"
+        if data.get("compartments", 1) > 1:
+            md += f"**Compartments Audited:** {data['compartments']}\n"
+        md += "\n"
 
         # Overall score
         score = data.get("security_score", {})
@@ -232,7 +369,9 @@ class SecurityFormatter:
 
         # IAM Summary
         iam = data.get("iam_summary", {})
-        if iam:
+        if iam.get("error"):
+            md += f"## IAM Summary\n- ⚠️ {iam['error']}\n\n"
+        elif iam:
             md += "## IAM Summary\n"
             total = iam.get('total_users', 0)
             active = iam.get('active_users', 0)
@@ -249,7 +388,9 @@ class SecurityFormatter:
 
         # Cloud Guard Summary
         cloud_guard = data.get("cloud_guard_summary", {})
-        if cloud_guard:
+        if cloud_guard.get("error"):
+            md += f"## Cloud Guard Summary\n- ⚠️ {cloud_guard['error']}\n\n"
+        elif cloud_guard:
             md += "## Cloud Guard Summary\n"
             md += f"- **Critical Problems:** {cloud_guard.get('critical', 0)}\n"
             md += f"- **High Problems:** {cloud_guard.get('high', 0)}\n"
@@ -258,7 +399,9 @@ class SecurityFormatter:
 
         # Network Security Summary
         network = data.get("network_summary", {})
-        if network:
+        if network.get("error"):
+            md += f"## Network Security Summary\n- ⚠️ {network['error']}\n\n"
+        elif network:
             md += "## Network Security Summary\n"
             md += f"- **VCNs:** {network.get('total_vcns', 0)}\n"
             md += f"- **Public Subnets:** {network.get('public_subnets', 0)}\n"
@@ -269,6 +412,8 @@ class SecurityFormatter:
                 md += "\n**Findings:**\n"
                 for finding in findings:
                     md += f"- ⚠️ {finding}\n"
+            for error in network.get("errors", []):
+                md += f"- ⚠️ Could not list {error['compartment_id']}: {error['error']}\n"
             md += "\n"
 
         # Recommendations
@@ -0,0 +1,352 @@
+"""
+Identity graph: the users, groups and group memberships of a tenancy.
+
+Tenancy-wide user and group listings, then the memberships of every group
+(OCI lists memberships only per user or per group), load the graph into
+tables keyed by OCID, with memberships indexed both ways. Every listing
+reads every page and runs concurrently under one call budget. Resolving a
+user's groups is then a lookup instead of one ``get_group`` call per
+membership, and listing or auditing users makes no calls at all.
+
+The graph is kept in the static tier and synced incrementally: once it is
+older than ``DELTA_INTERVAL``, the next read brings it up to date with
+
+- the users and groups created since the newest one known (listed newest
+  first by ``time_created`` and stopped at the first older one),
+- the users currently ``INACTIVE``, to update lifecycle states,
+- the membership listings of every known group, where additions and
+  removals show up.
+
+Users and groups deleted since the last full build drop out at the next
+one, every ``FULL_INTERVAL`` (their memberships go with the sync).
+
+User credentials (API keys, auth tokens, customer secret keys) have no
+tenancy-wide listing; see ``credentials``.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from time import time
+from typing import Any
+
+from ...core.cache import PayloadMemo, get_cache
+from ...core.concurrency import CallBudget
+from ...core.observability import get_logger
+from ...core.timestamps import timestamp_str
+
+logger = get_logger("oci-mcp.security.identity")
+
+# Seconds before a cached graph is synced, and before it is rebuilt from scratch
+DELTA_INTERVAL = 60.0
+FULL_INTERVAL = 3600.0
+
+# Graphs per tenancy, keyed by the cached payload's sync stamp, so a cache
+# hit does not re-index the tables
+_built: PayloadMemo[IdentityGraph] = PayloadMemo()
+
+
+def user_row(user: Any) -> dict[str, Any]:
+    """Compact table row for an SDK User."""
+    return {
+        "id": user.id,
+        "name": user.name,
+        "email": user.email,
+        "lifecycle_state": user.lifecycle_state,
+        "time_created": timestamp_str(user.time_created),
+        "description": user.description,
+        "compartment_id": user.compartment_id,
+    }
+
+
+def group_row(group: Any) -> dict[str, Any]:
+    """Compact table row for an SDK Group."""
+    return {
+        "id": group.id,
+        "name": group.name,
+        "description": group.description,
+        "lifecycle_state": group.lifecycle_state,
+        "time_created": timestamp_str(group.time_created),
+        "compartment_id": group.compartment_id,
+    }
+
+
+class IdentityGraph:
+    """Users, groups and active memberships of a tenancy, indexed by OCID."""
+
+    def __init__(
+        self,
+        users: dict[str, dict[str, Any]],
+        groups: dict[str, dict[str, Any]],
+        memberships: dict[str, tuple[str, str]],
+    ) -> None:
+        self.users = users
+        self.groups = groups
+        self.memberships = memberships
+        self._index()
+
+    def _index(self) -> None:
+        self._groups_of: dict[str, list[str]] = {}
+        self._members_of: dict[str, list[str]] = {}
+        for user_id, group_id in self.memberships.values():
+            self._groups_of.setdefault(user_id, []).append(group_id)
+            self._members_of.setdefault(group_id, []).append(user_id)
+
+    @classmethod
+    def from_listings(cls, users: list[Any], groups: list[Any],
+                      memberships: list[Any]) -> IdentityGraph:
+        """Build from SDK User, Group and UserGroupMembership lists."""
+        return cls(
+            {u.id: user_row(u) for u in users},
+            {g.id: group_row(g) for g in groups},
+            _active_memberships(memberships),
+        )
+
+    def to_payload(self) -> dict[str, Any]:
+        """JSON-safe form for the cache."""
+        return {
+            "users": list(self.users.values()),
+            "groups": list(self.groups.values()),
+            "memberships": [[m, u, g] for m, (u, g) in self.memberships.items()],
+        }
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> IdentityGraph:
+        return cls(
+            {u["id"]: u for u in payload["users"]},
+            {g["id"]: g for g in payload["groups"]},
+            {m: (u, g) for m, u, g in payload["memberships"]},
+        )
+
+    def user(self, user_id: str) -> dict[str, Any] | None:
+        return self.users.get(user_id)
+
+    def groups_of(self, user_id: str) -> list[dict[str, Any]]:
+        """Groups a user is an active member of, by name."""
+        groups = (self.groups.get(g) for g in self._groups_of.get(user_id, ()))
+        return sorted((g for g in groups if g is not None), key=lambda g: g["name"].lower())
+
+    def members_of(self, group_id: str) -> list[dict[str, Any]]:
+        """Users who are active members of a group, by name."""
+        users = (self.users.get(u) for u in self._members_of.get(group_id, ()))
+        return sorted((u for u in users if u is not None), key=lambda u: u["name"].lower())
+
+    def find_users(
+        self,
+        compartment_id: str | None = None,
+        lifecycle_state: str | None = None,
+        name_contains: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Users matching every given filter, by name."""
+        return _find(self.users, compartment_id, lifecycle_state, name_contains)
+
+    def find_groups(
+        self,
+        compartment_id: str | None = None,
+        name_contains: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Groups matching every given filter, by name."""
+        return _find(self.groups, compartment_id, None, name_contains)
+
+    def watermark(self, table: str) -> datetime | None:
+        """Creation time of the newest user or group known."""
+        stamps = [r["time_created"] for r in getattr(self, table).values() if r["time_created"]]
+        return max(map(datetime.fromisoformat, stamps), default=None)
+
+    def sync(
+        self,
+        new_users: list[Any],
+        new_groups: list[Any],
+        inactive_users: list[Any],
+        reactivated: dict[str, Any | None],
+        memberships: list[Any],
+    ) -> None:
+        """Merge a delta listing into the tables.
+
+        Args:
+            new_users: Users created since the watermark
+            new_groups: Groups created since the watermark
+            inactive_users: Every user currently INACTIVE
+            reactivated: Users no longer INACTIVE, re-read (None if gone)
+            memberships: The memberships of every known group
+        """
+        for user in [*new_users, *inactive_users]:
+            self.users[user.id] = user_row(user)
+        for user_id, user in reactivated.items():
+            if user is None:
+                self.users.pop(user_id, None)
+            else:
+                self.users[user_id] = user_row(user)
+        for group in new_groups:
+            self.groups[group.id] = group_row(group)
+        self.memberships = _active_memberships(memberships)
+        self._index()
+
+
+def _active_memberships(memberships: list[Any]) -> dict[str, tuple[str, str]]:
+    return {
+        m.id: (m.user_id, m.group_id) for m in memberships
+        if m.lifecycle_state in (None, "ACTIVE")
+    }
+
+
+def _find(
+    table: dict[str, dict[str, Any]],
+    compartment_id: str | None,
+    lifecycle_state: str | None,
+    name_contains: str | None,
+) -> list[dict[str, Any]]:
+    needle = name_contains.lower() if name_contains else None
+    rows = [
+        r for r in table.values()
+        if (compartment_id is None or r["compartment_id"] == compartment_id)
+        and (lifecycle_state is None or r["lifecycle_state"] == lifecycle_state)
+        and (needle is None or needle in r["name"].lower())
+    ]
+    return sorted(rows, key=lambda r: r["name"].lower())
+
+
+async def _list_newer(
+    budget: CallBudget,
+    func: Any,
+    after: datetime | None,
+    known: dict[str, Any],
+    **kwargs: Any,
+) -> list[Any]:
+    """Items created at or after ``after`` and not yet known, newest first.
+
+    Pages are read only until the first older item.
+    """
+    items: list[Any] = []
+    page = None
+    while True:
+        response = await budget.call(
+            func, sort_by="TIMECREATED", sort_order="DESC", page=page, **kwargs
+        )
+        for item in response.data or []:
+            if after is not None and item.time_created and item.time_created < after:
+                return items
+            if item.id not in known:
+                items.append(item)
+        if not response.has_next_page:
+            return items
+        page = response.next_page
+
+
+async def _memberships(
+    identity: Any, tenancy_id: str, group_ids: list[str], budget: CallBudget
+) -> list[Any]:
+    """Memberships of every group in ``group_ids``, one listing per group.
+
+    A group whose listing fails (for example, deleted since the last full
+    build) contributes no memberships.
+    """
+    async def _of(group_id: str) -> list[Any]:
+        try:
+            return await budget.list_all(
+                identity.list_user_group_memberships,
+                compartment_id=tenancy_id, group_id=group_id,
+            )
+        except Exception as e:
+            logger.warning("Membership listing failed", group_id=group_id, error=str(e))
+            return []
+
+    listed = await asyncio.gather(*(_of(g) for g in group_ids))
+    return [m for items in listed for m in items]
+
+
+async def _build(identity: Any, tenancy_id: str, budget: CallBudget) -> IdentityGraph:
+    users, groups = await asyncio.gather(
+        budget.list_all(identity.list_users, compartment_id=tenancy_id),
+        budget.list_all(identity.list_groups, compartment_id=tenancy_id),
+    )
+    memberships = await _memberships(identity, tenancy_id, [g.id for g in groups], budget)
+    return IdentityGraph.from_listings(users, groups, memberships)
+
+
+async def _sync(
+    identity: Any, tenancy_id: str, graph: IdentityGraph, budget: CallBudget
+) -> dict[str, int]:
+    new_users, new_groups, inactive = await asyncio.gather(
+        _list_newer(budget, identity.list_users, graph.watermark("users"), graph.users,
+                    compartment_id=tenancy_id),
+        _list_newer(budget, identity.list_groups, graph.watermark("groups"), graph.groups,
+                    compartment_id=tenancy_id),
+        budget.list_all(identity.list_users, compartment_id=tenancy_id,
+                        lifecycle_state="INACTIVE"),
+    )
+    group_ids = [*graph.groups, *(g.id for g in new_groups if g.id not in graph.groups)]
+    memberships = await _memberships(identity, tenancy_id, group_ids, budget)
+
+    # Users that were INACTIVE and no longer are: unblocked, or deleted
+    inactive_ids = {u.id for u in inactive}
+    stale = [
+        user_id for user_id, row in graph.users.items()
+        if row["lifecycle_state"] == "INACTIVE" and user_id not in inactive_ids
+    ]
+
+    async def _reread(user_id: str) -> Any | None:
+        try:
+            user = (await budget.call(identity.get_user, user_id=user_id)).data
+        except Exception as e:
+            logger.debug("User no longer readable", user_id=user_id, error=str(e))
+            return None
+        return None if user.lifecycle_state == "DELETED" else user
+
+    reread = await asyncio.gather(*(_reread(u) for u in stale))
+    graph.sync(new_users, new_groups, inactive, dict(zip(stale, reread, strict=True)),
+               memberships)
+    return {"new_users": len(new_users), "new_groups": len(new_groups),
+            "lifecycle_changes": len(stale)}
+
+
+async def get_identity_graph(
+    identity: Any,
+    tenancy_id: str,
+    refresh: bool = False,
+    max_age: float = DELTA_INTERVAL,
+    budget: CallBudget | None = None,
+) -> tuple[IdentityGraph, dict[str, Any]]:
+    """The tenancy's identity graph, synced if older than ``max_age`` seconds.
+
+    Args:
+        identity: OCI IdentityClient
+        tenancy_id: Tenancy OCID
+        refresh: Rebuild from full listings instead of syncing
+        max_age: Age in seconds after which the cached graph is synced
+        budget: Call budget shared with the caller (default: OCI_MAX_CONCURRENCY)
+
+    Returns:
+        Tuple of (graph, info with built_at, synced_at, cached and any delta counts)
+    """
+    cache = get_cache("static")
+    key = f"iam:identity_graph:{tenancy_id}"
+    payload = None if refresh else await cache.get(key)
+    budget = budget or CallBudget()
+    now = time()
+
+    if payload is not None and now - payload["built_at"] < FULL_INTERVAL:
+        graph = _built.load(
+            tenancy_id, payload["synced_at"], lambda: IdentityGraph.from_payload(payload["graph"])
+        )
+        info: dict[str, Any] = {"built_at": payload["built_at"],
+                                "synced_at": payload["synced_at"], "cached": True}
+        if now - payload["synced_at"] < max_age:
+            return graph, info
+        info["delta"] = await _sync(identity, tenancy_id, graph, budget)
+        info["synced_at"] = now
+        logger.debug("Synced identity graph", tenancy_id=tenancy_id, **info["delta"])
+    else:
+        graph = await _build(identity, tenancy_id, budget)
+        info = {"built_at": now, "synced_at": now, "cached": False}
+        logger.debug("Built identity graph", tenancy_id=tenancy_id, users=len(graph.users),
+                     groups=len(graph.groups), memberships=len(graph.memberships))
+
+    await cache.set(
+        key,
+        {"graph": graph.to_payload(), "built_at": info["built_at"], "synced_at": now},
+        tags=["iam:identity"],
+    )
+    _built.store(tenancy_id, now, graph)
+    return graph, info
+
@@ -34,6 +34,23 @@ class ProblemLifecycleState(str, Enum):
     INACTIVE = "INACTIVE"
 
 
+class PolicyVerb(str, Enum):
+    """IAM policy verbs, each including the ones before it."""
+
+    INSPECT = "inspect"
+    READ = "read"
+    USE = "use"
+    MANAGE = "manage"
+
+
+class CredentialType(str, Enum):
+    """User credential types."""
+
+    API_KEYS = "api_keys"
+    AUTH_TOKENS = "auth_tokens"
+    CUSTOMER_SECRET_KEYS = "customer_secret_keys"
+
+
 class RiskLevel(str, Enum):
     """Cloud Guard risk levels."""
 
@@ -147,6 +164,10 @@ class ListPoliciesInput(BaseModel):
         default=None,
         description="Compartment OCID to list policies from",
     )
+    include_subcompartments: bool = Field(
+        default=False,
+        description="Also list policies in every compartment below compartment_id",
+    )
     name_contains: str | None = Field(
         default=None,
         description="Filter policies whose name contains this string",
@@ -163,6 +184,72 @@ class ListPoliciesInput(BaseModel):
     )
 
 
+class WhoCanInput(BaseModel):
+    """Input for finding who holds a permission."""
+
+    model_config = ConfigDict(
+        str_strip_whitespace=True,
+        validate_assignment=True,
+        extra="forbid",
+    )
+
+    verb: PolicyVerb = Field(
+        ...,
+        description="Access level: inspect, read, use or manage (stronger verbs also match)",
+    )
+    resource_type: str = Field(
+        ...,
+        description="Resource type or family (e.g., 'instances', 'buckets', 'instance-family')",
+        min_length=1,
+    )
+    compartment: str | None = Field(
+        default=None,
+        description=(
+            "Compartment OCID, name or path (e.g., 'prod/apps'); "
+            "omit to match grants anywhere in the tenancy"
+        ),
+    )
+    include_conditional: bool = Field(
+        default=True,
+        description="Include grants restricted by a 'where' condition",
+    )
+    refresh: bool = Field(
+        default=False,
+        description="Rebuild the policy index instead of using the cached one",
+    )
+    response_format: ResponseFormat = Field(
+        default=ResponseFormat.MARKDOWN,
+        description="Output format",
+    )
+
+
+class WhatCanInput(BaseModel):
+    """Input for listing a subject's permissions."""
+
+    model_config = ConfigDict(
+        str_strip_whitespace=True,
+        validate_assignment=True,
+        extra="forbid",
+    )
+
+    subject: str = Field(
+        ...,
+        description=(
+            "Group or dynamic group as written in policies "
+            "(e.g., 'Admins', 'group Admins', 'dynamic-group ci-runners')"
+        ),
+        min_length=1,
+    )
+    refresh: bool = Field(
+        default=False,
+        description="Rebuild the policy index instead of using the cached one",
+    )
+    response_format: ResponseFormat = Field(
+        default=ResponseFormat.MARKDOWN,
+        description="Output format",
+    )
+
+
 class ListCloudGuardProblemsInput(BaseModel):
     """Input for listing Cloud Guard problems."""
 
@@ -184,12 +271,20 @@ class ListCloudGuardProblemsInput(BaseModel):
         default=ProblemLifecycleState.ACTIVE,
         description="Filter by lifecycle state (ACTIVE, INACTIVE)",
     )
+    include_subcompartments: bool = Field(
+        default=False,
+        description="Include problems from every compartment below compartment_id",
+    )
     limit: int = Field(
         default=20,
         description="Maximum results to return",
         ge=1,
         le=100,
     )
+    refresh: bool = Field(
+        default=False,
+        description="Rescan every problem instead of using the cached snapshot",
+    )
     response_format: ResponseFormat = Field(
         default=ResponseFormat.MARKDOWN,
         description="Output format",
@@ -221,6 +316,46 @@ class SecurityAuditInput(BaseModel):
         default=True,
         description="Include network security analysis",
     )
+    include_subcompartments: bool = Field(
+        default=False,
+        description="Audit the whole compartment subtree, not just the compartment",
+    )
+    response_format: ResponseFormat = Field(
+        default=ResponseFormat.MARKDOWN,
+        description="Output format",
+    )
+
+
+class ScanCredentialsInput(BaseModel):
+    """Input for the credential age scan."""
+
+    model_config = ConfigDict(
+        str_strip_whitespace=True,
+        validate_assignment=True,
+        extra="forbid",
+    )
+
+    max_age_days: int = Field(
+        default=90,
+        description="Report active credentials older than this many days",
+        ge=1,
+        le=3650,
+    )
+    credential_types: list[CredentialType] = Field(
+        default_factory=lambda: list(CredentialType),
+        description="Credential types to scan (api_keys, auth_tokens, customer_secret_keys)",
+        min_length=1,
+    )
+    refresh: bool = Field(
+        default=False,
+        description="List every user's credentials again instead of using cached results",
+    )
+    limit: int = Field(
+        default=50,
+        description="Maximum violations to return",
+        ge=1,
+        le=1000,
+    )
     response_format: ResponseFormat = Field(
         default=ResponseFormat.MARKDOWN,
         description="Output format",
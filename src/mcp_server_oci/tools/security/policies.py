@@ -0,0 +1,472 @@
+"""
+IAM policy statement parser and permission index.
+
+Policy statements follow the OCI grammar::
+
+    Allow <subject> to <verb> <resource-type> in <location> [where <conditions>]
+    Allow <subject> to {<PERMISSION>, ...} in <location> [where <conditions>]
+
+- subject: ``group <name>``, ``group id <ocid>``, ``group '<domain>'/'<name>'``,
+  ``dynamic-group <name>``, ``any-user``, ``any-group``, ``service <name>``,
+  or a comma-separated list of them
+- verb: ``inspect`` < ``read`` < ``use`` < ``manage``, each including the ones before
+- resource-type: an individual type (``instances``), a family
+  (``instance-family``) or ``all-resources``
+- location: ``tenancy``, ``compartment <name or a:b:c path>`` (relative to
+  the compartment the policy is attached to) or ``compartment id <ocid>``
+
+Every statement of every policy in the tenancy is compiled into grants
+indexed by subject and by (resource, verb), with locations resolved to
+compartment paths. "Who can manage instances in prod/apps" then reads the
+grants on ``instances``, its families and ``all-resources`` at ``manage``
+and keeps those whose location is ``prod/apps`` or one of its ancestors;
+"what can group Admins do" reads the subject's grants. Both are dictionary
+lookups. The compiled index is cached in the config tier.
+
+Grants only add access, so a statement's conditions (``where ...``) are
+kept with the grant and reported; they are not evaluated.
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from ...core.cache import PayloadMemo, get_cache
+from ...core.compartments import CompartmentTree, get_compartment_tree
+from ...core.concurrency import CallBudget
+from ...core.observability import get_logger
+
+logger = get_logger("oci-mcp.security.policies")
+
+# Indexes per tenancy, keyed by the cached payload's build stamp, so a cache
+# hit does not re-index every grant
+_built: PayloadMemo[PolicyIndex] = PayloadMemo()
+
+VERBS = {"inspect": 0, "read": 1, "use": 2, "manage": 3}
+VERB_NAMES = {level: verb for verb, level in VERBS.items()}
+
+ALL_RESOURCES = "all-resources"
+
+# Aggregate resource types and the individual types they cover
+FAMILIES: dict[str, frozenset[str]] = {
+    "instance-family": frozenset({
+        "instances", "instance-images", "instance-console-connection", "console-histories",
+        "volume-attachments", "vnic-attachments", "instance-configurations",
+        "instance-pools", "cluster-networks", "compute-capacity-reservations",
+        "app-catalog-listing", "instance-agent-plugins",
+    }),
+    "virtual-network-family": frozenset({
+        "vcns", "subnets", "route-tables", "network-security-groups", "security-lists",
+        "dhcp-options", "private-ips", "public-ips", "ipv6s", "internet-gateways",
+        "nat-gateways", "service-gateways", "local-peering-gateways",
+        "remote-peering-connections", "drgs", "drg-attachments", "drg-route-tables",
+        "cpes", "ipsec-connections", "cross-connects", "virtual-circuits", "vnics",
+        "vnic-attachments", "vlans", "byoip-ranges",
+    }),
+    "volume-family": frozenset({
+        "volumes", "volume-attachments", "volume-backups", "boot-volume-backups",
+        "backup-policies", "backup-policy-assignments", "volume-groups",
+        "volume-group-backups",
+    }),
+    "object-family": frozenset({"buckets", "objects"}),
+    "file-family": frozenset({"file-systems", "mount-targets", "export-sets"}),
+    "database-family": frozenset({
+        "db-systems", "db-nodes", "db-homes", "databases", "pluggable-databases",
+        "db-backups",
+    }),
+    "autonomous-database-family": frozenset({
+        "autonomous-databases", "autonomous-backups", "autonomous-container-databases",
+        "autonomous-exadata-infrastructures",
+    }),
+    "cluster-family": frozenset({"clusters", "cluster-node-pools", "cluster-work-requests"}),
+    "dns": frozenset({
+        "dns-zones", "dns-records", "dns-traffic", "dns-steering-policies",
+        "dns-resolvers", "dns-views",
+    }),
+    "cloud-guard-family": frozenset({
+        "cloud-guard-config", "cloud-guard-detector-recipes",
+        "cloud-guard-responder-recipes", "cloud-guard-targets", "cloud-guard-problems",
+    }),
+    "logging-family": frozenset({"log-groups", "log-content", "unified-configuration"}),
+    "functions-family": frozenset({"fn-app", "fn-function", "fn-invocation"}),
+}
+
+# Families containing each individual type
+_FAMILIES_OF: dict[str, frozenset[str]] = {}
+for _family, _members in FAMILIES.items():
+    for _member in _members:
+        _FAMILIES_OF[_member] = _FAMILIES_OF.get(_member, frozenset()) | {_family}
+
+_SUBJECT_KINDS = ("dynamic-group", "group", "service", "any-user", "any-group")
+
+_ALLOW = re.compile(
+    r"^\s*allow\s+(?P<subject>.+?)\s+to\s+(?P<what>.+?)\s+in\s+"
+    r"(?P<location>tenancy|compartment\s+id\s+\S+|compartment\s+\S+)"
+    r"(?:\s+where\s+(?P<where>.+?))?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+@dataclass(frozen=True)
+class PolicyStatement:
+    """One parsed ``Allow`` statement."""
+    subjects: tuple[tuple[str, str], ...]   # (kind, normalized name), name '' for any-*
+    verb: str | None                        # None for permission lists
+    resource: str | None                    # resource type or family, lowercased
+    permissions: tuple[str, ...]            # for ``{PERM, ...}`` statements
+    location: tuple[str, str]               # ("tenancy", ""), ("compartment", path)
+                                            # or ("compartment_id", ocid)
+    condition: str | None
+
+
+def parse_statement(text: str) -> PolicyStatement | None:
+    """Parse one policy statement.
+
+    Returns:
+        The statement, or None for statements that grant nothing in this
+        tenancy (``Define``, ``Endorse``, ``Admit``)
+
+    Raises:
+        ValueError: If an ``Allow`` statement does not follow the grammar
+    """
+    head = text.strip().split(None, 1)[0].lower() if text.strip() else ""
+    if head in ("define", "endorse", "admit"):
+        return None
+    match = _ALLOW.match(text)
+    if match is None:
+        raise ValueError("not an 'Allow <subject> to <verb> <resource> in <location>' statement")
+
+    what = match["what"].strip()
+    verb = resource = None
+    permissions: tuple[str, ...] = ()
+    if what.startswith("{"):
+        if not what.endswith("}"):
+            raise ValueError(f"unterminated permission list: {what}")
+        permissions = tuple(p.strip().upper() for p in what[1:-1].split(",") if p.strip())
+    else:
+        parts = what.split()
+        if len(parts) != 2 or parts[0].lower() not in VERBS:
+            raise ValueError(f"expected '<verb> <resource-type>', got '{what}'")
+        verb, resource = parts[0].lower(), parts[1].lower()
+
+    location = match["location"].split()
+    if location[0].lower() == "tenancy":
+        where = ("tenancy", "")
+    elif location[1].lower() == "id":
+        where = ("compartment_id", location[2])
+    else:
+        where = ("compartment", location[1].strip("'\""))
+
+    return PolicyStatement(
+        subjects=parse_subjects(match["subject"]),
+        verb=verb,
+        resource=resource,
+        permissions=permissions,
+        location=where,
+        condition=match["where"].strip() if match["where"] else None,
+    )
+
+
+def parse_subjects(text: str) -> tuple[tuple[str, str], ...]:
+    """``group A, dynamic-group B`` to ``(("group", "a"), ("dynamic-group", "b"))``.
+
+    A name without a kind keyword takes the kind before it; a bare name
+    is a group.
+
+    Raises:
+        ValueError: If a subject is empty
+    """
+    subjects = []
+    kind = "group"
+    for part in text.split(","):
+        words = part.strip().split(None, 1)
+        if not words:
+            raise ValueError(f"empty subject in '{text}'")
+        if words[0].lower() in _SUBJECT_KINDS:
+            kind = words[0].lower()
+            rest = words[1] if len(words) > 1 else ""
+        else:
+            rest = part.strip()
+        if kind in ("any-user", "any-group"):
+            subjects.append((kind, ""))
+            continue
+        rest = rest.strip()
+        if rest.lower().startswith("id "):
+            subjects.append((kind, rest[3:].strip()))
+            continue
+        subjects.append((kind, normalize_name(rest)))
+    return tuple(subjects)
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, unquote and drop the ``Default`` identity domain."""
+    name = "/".join(p.strip().strip("'\"") for p in name.split("/")).lower()
+    return name.removeprefix("default/")
+
+
+def subject_key(kind: str, name: str) -> str:
+    return f"{kind}:{name}" if name else kind
+
+
+class PolicyIndex:
+    """Compiled grants of a tenancy's policies, indexed for access queries."""
+
+    def __init__(
+        self,
+        policies: list[dict[str, Any]],
+        grants: list[dict[str, Any]],
+        errors: list[dict[str, Any]],
+    ) -> None:
+        self.policies = policies
+        self.grants = grants
+        self.errors = errors
+        self._by_subject: dict[str, list[int]] = {}
+        self._by_resource: dict[tuple[str, int], list[int]] = {}
+        for i, grant in enumerate(grants):
+            self._by_subject.setdefault(grant["subject"], []).append(i)
+            if grant["resource"] is not None:
+                self._by_resource.setdefault(
+                    (grant["resource"], grant["verb"]), []
+                ).append(i)
+
+    @classmethod
+    def build(
+        cls,
+        policies: list[dict[str, Any]],
+        tree: CompartmentTree | None = None,
+    ) -> PolicyIndex:
+        """Compile ``{id, name, compartment_id, statements}`` policies.
+
+        With a compartment tree, locations are resolved to compartment
+        paths ('' for the tenancy); without one, or when a compartment is
+        not found, a grant's path is None and it only matches queries
+        without a compartment.
+        """
+        grants: list[dict[str, Any]] = []
+        errors: list[dict[str, Any]] = []
+        for p, policy in enumerate(policies):
+            for s, text in enumerate(policy.get("statements") or []):
+                try:
+                    statement = parse_statement(text)
+                except ValueError as e:
+                    errors.append({"policy": policy.get("name"), "statement": s,
+                                   "text": text, "error": str(e)})
+                    continue
+                if statement is None:
+                    continue
+                path = _location_path(statement.location, policy.get("compartment_id"), tree)
+                for kind, name in statement.subjects:
+                    grants.append({
+                        "subject": subject_key(kind, name),
+                        "verb": VERBS.get(statement.verb or "", -1),
+                        "resource": statement.resource,
+                        "permissions": list(statement.permissions),
+                        "location": _location_text(statement.location),
+                        "path": path,
+                        "condition": statement.condition,
+                        "policy": p,
+                        "statement": s,
+                    })
+        return cls(policies, grants, errors)
+
+    def to_payload(self) -> dict[str, Any]:
+        """JSON-safe form for the cache."""
+        return {"policies": self.policies, "grants": self.grants, "errors": self.errors}
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> PolicyIndex:
+        return cls(payload["policies"], payload["grants"], payload["errors"])
+
+    def __len__(self) -> int:
+        return len(self.grants)
+
+    def describe(self, i: int) -> dict[str, Any]:
+        """A grant with its policy and statement text."""
+        grant = self.grants[i]
+        policy = self.policies[grant["policy"]]
+        return {
+            "subject": grant["subject"],
+            "verb": VERB_NAMES.get(grant["verb"]),
+            "resource": grant["resource"],
+            "permissions": grant["permissions"],
+            "location": grant["location"],
+            "path": grant["path"],
+            "condition": grant["condition"],
+            "policy_id": policy.get("id"),
+            "policy_name": policy.get("name"),
+            "statement": policy["statements"][grant["statement"]],
+        }
+
+    def who_can(
+        self,
+        verb: str,
+        resource: str,
+        path: str | None = None,
+        include_conditional: bool = True,
+    ) -> list[dict[str, Any]]:
+        """Grants that allow ``verb`` on ``resource`` in compartment ``path``.
+
+        A grant matches when it names ``resource``, a family containing it
+        or ``all-resources``, with ``verb`` or a stronger one, at ``path``
+        or one of its ancestors. With ``path`` None, grants anywhere match.
+        Permission-list statements are not matched.
+
+        Raises:
+            ValueError: If ``verb`` is not inspect, read, use or manage
+        """
+        level = VERBS.get(verb.lower())
+        if level is None:
+            raise ValueError(f"Unknown verb '{verb}'; use one of {', '.join(VERBS)}")
+        resource = resource.lower()
+        resources = {resource, ALL_RESOURCES, *_FAMILIES_OF.get(resource, ())}
+        matched = sorted(
+            i
+            for r in resources
+            for v in range(level, len(VERBS))
+            for i in self._by_resource.get((r, v), ())
+        )
+        return [
+            self.describe(i) for i in matched
+            if _covers(self.grants[i]["path"], path)
+            and (include_conditional or self.grants[i]["condition"] is None)
+        ]
+
+    def what_can(self, subject: str) -> list[dict[str, Any]]:
+        """Grants of a subject ('Admins', 'group Admins', 'dynamic-group ci').
+
+        Grants to ``any-user`` apply to every subject and grants to
+        ``any-group`` to every group; they are included with ``via``.
+        """
+        subjects = parse_subjects(subject)
+        if len(subjects) != 1:
+            raise ValueError(f"Expected one group or dynamic group, got '{subject}'")
+        ((kind, name),) = subjects
+        explicit = subject.strip().split(None, 1)[0].lower() in _SUBJECT_KINDS
+        key = subject_key(kind, name)
+        if not explicit and key not in self._by_subject:
+            key = subject_key("dynamic-group", name)
+            kind = "dynamic-group"
+        if key not in self._by_subject:
+            key = subject_key(kind, name)
+
+        result = [self.describe(i) for i in self._by_subject.get(key, ())]
+        inherited = ["any-user"] + (["any-group"] if kind == "group" else [])
+        for via in inherited:
+            if via == key:
+                continue
+            result.extend(
+                {**self.describe(i), "via": via} for i in self._by_subject.get(via, ())
+            )
+        return result
+
+    def subjects(self) -> list[str]:
+        """Every subject with at least one grant."""
+        return sorted(self._by_subject)
+
+    def broad_grants(self) -> list[dict[str, Any]]:
+        """Grants of ``manage all-resources``."""
+        return [self.describe(i) for i in self._by_resource.get((ALL_RESOURCES, 3), ())]
+
+
+def _location_text(location: tuple[str, str]) -> str:
+    kind, value = location
+    if kind == "tenancy":
+        return "tenancy"
+    if kind == "compartment_id":
+        return f"compartment id {value}"
+    return f"compartment {value}"
+
+
+def _location_path(
+    location: tuple[str, str],
+    policy_compartment_id: str | None,
+    tree: CompartmentTree | None,
+) -> str | None:
+    """Compartment path a location refers to ('' for the tenancy), None if unknown."""
+    kind, value = location
+    if kind == "tenancy":
+        return ""
+    if tree is None:
+        return None
+    try:
+        if kind == "compartment_id":
+            return tree.path(value)
+        base = tree.path(policy_compartment_id) if policy_compartment_id else ""
+        relative = value.replace(":", "/")
+        expected = f"{base}/{relative}" if base else relative
+        path = tree.path(tree.resolve(expected))
+    except ValueError:
+        return None
+    # resolve() also accepts a unique name anywhere; locations are relative paths
+    return path if path.lower() == expected.lower() else None
+
+
+def _covers(grant_path: str | None, path: str | None) -> bool:
+    """Whether a grant at ``grant_path`` applies in compartment ``path``."""
+    if path is None:
+        return True
+    if grant_path is None:
+        return False
+    grant_path, path = grant_path.lower(), path.lower()
+    return grant_path == "" or path == grant_path or path.startswith(grant_path + "/")
+
+
+async def get_policy_index(
+    identity: Any,
+    tenancy_id: str,
+    refresh: bool = False,
+    budget: CallBudget | None = None,
+) -> tuple[PolicyIndex, CompartmentTree, dict[str, Any]]:
+    """The tenancy's compiled policy index, cached in the config tier.
+
+    Policies are listed in every compartment concurrently (every page).
+    Compartments whose listing fails are reported in the info and leave
+    the index uncached.
+
+    Returns:
+        Tuple of (index, compartment tree, info with built_at, cached and errors)
+    """
+    tree = await get_compartment_tree(identity, tenancy_id)
+    cache = get_cache("config")
+    key = f"iam:policy_index:{tenancy_id}"
+    payload = None if refresh else await cache.get(key)
+    if payload is not None:
+        info = {"built_at": payload["built_at"], "cached": True, "errors": []}
+        index = _built.load(
+            tenancy_id, payload["built_at"], lambda: PolicyIndex.from_payload(payload["index"])
+        )
+        return index, tree, info
+
+    budget = budget or CallBudget()
+    compartment_ids = tree.subtree(tenancy_id)
+    errors: list[dict[str, str]] = []
+
+    async def _policies(compartment_id: str) -> list[Any]:
+        try:
+            return await budget.list_all(identity.list_policies, compartment_id=compartment_id)
+        except Exception as e:
+            logger.warning("Policy listing failed", compartment_id=compartment_id, error=str(e))
+            errors.append({"compartment_id": compartment_id, "error": str(e)})
+            return []
+
+    listed = await asyncio.gather(*(_policies(c) for c in compartment_ids))
+    policies = [
+        {
+            "id": p.id,
+            "name": p.name,
+            "compartment_id": p.compartment_id,
+            "statements": list(p.statements or []),
+        }
+        for items in listed for p in items
+    ]
+    index = PolicyIndex.build(policies, tree)
+    built_at = datetime.now(UTC).isoformat()
+    if not errors:
+        await cache.set(
+            key, {"index": index.to_payload(), "built_at": built_at}, tags=["iam:policies"]
+        )
+        _built.store(tenancy_id, built_at, index)
+    return index, tree, {"built_at": built_at, "cached": False, "errors": errors}
@@ -7,17 +7,22 @@ Follows OCI MCP Server Standard v2.1 with FastMCP patterns.
 from __future__ import annotations
 
 import asyncio
-from collections import Counter
 from datetime import UTC, datetime
 from typing import Any
 
 from mcp.server.fastmcp import Context, FastMCP
 
 from mcp_server_oci.core.client import oci_client_manager
+from mcp_server_oci.core.compartments import compartment_scope, get_compartment_tree
+from mcp_server_oci.core.concurrency import call_oci, gather_bounded
 from mcp_server_oci.core.errors import format_error_response, handle_oci_error
 from mcp_server_oci.skills.discovery import auto_register_tool
 
+from .audit import run_audit
+from .cloud_guard import get_problem_snapshot
+from .credentials import get_credentials, scan_credentials
 from .formatters import SecurityFormatter
+from .identity import get_identity_graph, user_row
 from .models import (
     GetUserInput,
     ListCloudGuardProblemsInput,
@@ -25,8 +30,15 @@ from .models import (
     ListPoliciesInput,
     ListUsersInput,
     ResponseFormat,
+    ScanCredentialsInput,
     SecurityAuditInput,
+    WhatCanInput,
+    WhoCanInput,
 )
+from .policies import PolicyIndex, get_policy_index
+
+# User fields returned by the list and detail tools
+_USER_FIELDS = ("id", "name", "email", "lifecycle_state", "time_created", "description")
 
 
 def register_security_tools(mcp: FastMCP) -> None:
@@ -45,7 +57,8 @@ def register_security_tools(mcp: FastMCP) -> None:
     async def list_users(params: ListUsersInput, ctx: Context) -> str:
         """List IAM users in the tenancy or compartment.
 
-        Retrieves users with optional filtering by lifecycle state or name.
+        Retrieves users with optional filtering by lifecycle state or name from
+        the cached identity graph, which is synced incrementally once a minute.
 
         Args:
             params: ListUsersInput with compartment_id, lifecycle_state, name_contains, limit
@@ -56,28 +69,20 @@ def register_security_tools(mcp: FastMCP) -> None:
         Example:
             {"lifecycle_state": "ACTIVE", "limit": 20}
         """
-        await ctx.report_progress(0.1, "Connecting to OCI Identity service...")
+        await ctx.report_progress(0.1, "Loading identity graph...")
 
         try:
-            client = oci_client_manager.identity
-
             compartment_id = params.compartment_id or oci_client_manager.tenancy_id
 
-            await ctx.report_progress(0.3, "Fetching users...")
-
-            response = await asyncio.to_thread(
-                client.list_users,
+            graph, _ = await get_identity_graph(
+                oci_client_manager.identity, oci_client_manager.tenancy_id
+            )
+            users = graph.find_users(
                 compartment_id=compartment_id,
                 lifecycle_state=params.lifecycle_state.value if params.lifecycle_state else None,
-                limit=params.limit,
+                name_contains=params.name_contains,
             )
 
-            users = response.data
-
-            # Filter by name if specified
-            if params.name_contains:
-                users = [u for u in users if params.name_contains.lower() in u.name.lower()]
-
             await ctx.report_progress(0.8, "Formatting response...")
 
             is_root = compartment_id == oci_client_manager.tenancy_id
@@ -86,15 +91,7 @@ def register_security_tools(mcp: FastMCP) -> None:
                 "total": len(users),
                 "compartment_name": comp_name,
                 "users": [
-                    {
-                        "id": u.id,
-                        "name": u.name,
-                        "email": u.email,
-                        "lifecycle_state": u.lifecycle_state,
-                        "time_created": str(u.time_created) if u.time_created else None,
-                        "description": u.description,
-                    }
-                    for u in users[:params.limit]
+                    {key: u[key] for key in _USER_FIELDS} for u in users[:params.limit]
                 ],
             }
 
@@ -127,6 +124,8 @@ def register_security_tools(mcp: FastMCP) -> None:
         """Get detailed information about a specific IAM user.
 
         Retrieves user details including optional group memberships and API keys.
+        The user and their groups are resolved from the cached identity graph
+        (no per-group calls); API keys are cached per user.
 
         Args:
             params: GetUserInput with user_id, include_groups, include_api_keys
@@ -142,54 +141,38 @@ def register_security_tools(mcp: FastMCP) -> None:
         try:
             client = oci_client_manager.identity
 
-            response = await asyncio.to_thread(client.get_user, user_id=params.user_id)
-            user = response.data
+            graph, _ = await get_identity_graph(client, oci_client_manager.tenancy_id)
+            user = graph.user(params.user_id)
+            if user is None:
+                # Created since the last sync: sync now rather than wait for it
+                graph, _ = await get_identity_graph(
+                    client, oci_client_manager.tenancy_id, max_age=0
+                )
+                user = graph.user(params.user_id)
+            if user is None:
+                response = await asyncio.to_thread(client.get_user, user_id=params.user_id)
+                user = user_row(response.data)
 
             await ctx.report_progress(0.4, "Processing user data...")
 
             data: dict[str, Any] = {
-                "user": {
-                    "id": user.id,
-                    "name": user.name,
-                    "email": user.email,
-                    "lifecycle_state": user.lifecycle_state,
-                    "time_created": str(user.time_created) if user.time_created else None,
-                    "description": user.description,
-                    "compartment_id": user.compartment_id,
-                },
+                "user": {key: user[key] for key in (*_USER_FIELDS, "compartment_id")},
             }
 
-            # Fetch group memberships
+            # Group memberships come from the graph's membership index
             if params.include_groups:
-                await ctx.report_progress(0.6, "Fetching group memberships...")
-                groups_response = await asyncio.to_thread(
-                    client.list_user_group_memberships,
-                    compartment_id=user.compartment_id,
-                    user_id=user.id,
-                )
-
-                group_ids = [m.group_id for m in groups_response.data]
-                groups = []
-                for group_id in group_ids:
-                    group_response = await asyncio.to_thread(client.get_group, group_id=group_id)
-                    groups.append({"id": group_response.data.id, "name": group_response.data.name})
-                data["groups"] = groups
+                data["groups"] = [
+                    {"id": g["id"], "name": g["name"]} for g in graph.groups_of(user["id"])
+                ]
 
             # Fetch API keys
             if params.include_api_keys:
                 await ctx.report_progress(0.8, "Fetching API keys...")
-                keys_response = await asyncio.to_thread(
-                    client.list_api_keys,
-                    user_id=user.id,
-                )
+                credentials, _ = await get_credentials(client, [user["id"]], ("api_keys",))
                 data["api_keys"] = [
-                    {
-                        "key_id": k.key_id,
-                        "fingerprint": k.fingerprint,
-                        "lifecycle_state": k.lifecycle_state,
-                        "time_created": str(k.time_created) if k.time_created else None,
-                    }
-                    for k in keys_response.data
+                    {key: k[key] for key in ("key_id", "fingerprint", "lifecycle_state",
+                                             "time_created")}
+                    for k in credentials["api_keys"].get(user["id"], [])
                 ]
 
             if params.response_format == ResponseFormat.JSON:
@@ -220,6 +203,8 @@ def register_security_tools(mcp: FastMCP) -> None:
     async def list_groups(params: ListGroupsInput, ctx: Context) -> str:
         """List IAM groups in the tenancy.
 
+        Served from the cached identity graph.
+
         Args:
             params: ListGroupsInput with name_contains, limit
 
@@ -229,28 +214,23 @@ def register_security_tools(mcp: FastMCP) -> None:
         await ctx.report_progress(0.1, "Fetching IAM groups...")
 
         try:
-            client = oci_client_manager.identity
             compartment_id = params.compartment_id or oci_client_manager.tenancy_id
 
-            response = await asyncio.to_thread(
-                client.list_groups,
-                compartment_id=compartment_id,
-                limit=params.limit,
+            graph, _ = await get_identity_graph(
+                oci_client_manager.identity, oci_client_manager.tenancy_id
+            )
+            groups = graph.find_groups(
+                compartment_id=compartment_id, name_contains=params.name_contains
             )
-
-            groups = response.data
-
-            if params.name_contains:
-                groups = [g for g in groups if params.name_contains.lower() in g.name.lower()]
 
             data = {
                 "total": len(groups),
                 "groups": [
                     {
-                        "id": g.id,
-                        "name": g.name,
-                        "description": g.description,
-                        "time_created": str(g.time_created) if g.time_created else None,
+                        "id": g["id"],
+                        "name": g["name"],
+                        "description": g["description"],
+                        "time_created": g["time_created"],
                     }
                     for g in groups[:params.limit]
                 ],
@@ -284,8 +264,13 @@ def register_security_tools(mcp: FastMCP) -> None:
     async def list_policies(params: ListPoliciesInput, ctx: Context) -> str:
         """List IAM policies in a compartment.
 
+        With include_subcompartments, the policies attached anywhere in the
+        compartment's subtree are listed, one compartment per call,
+        concurrently.
+
         Args:
-            params: ListPoliciesInput with compartment_id, name_contains, limit
+            params: ListPoliciesInput with compartment_id, include_subcompartments,
+                name_contains, limit
 
         Returns:
             Policies list with statements in requested format
@@ -296,13 +281,15 @@ def register_security_tools(mcp: FastMCP) -> None:
             client = oci_client_manager.identity
             compartment_id = params.compartment_id or oci_client_manager.tenancy_id
 
-            response = await asyncio.to_thread(
-                client.list_policies,
-                compartment_id=compartment_id,
-                limit=params.limit,
+            compartment_ids = await compartment_scope(
+                oci_client_manager, compartment_id, params.include_subcompartments
+            )
+            responses = await gather_bounded(
+                call_oci(client.list_policies, compartment_id=cid, limit=params.limit)
+                for cid in compartment_ids
             )
 
-            policies = response.data
+            policies = [p for response in responses for p in response.data]
 
             if params.name_contains:
                 policies = [p for p in policies if params.name_contains.lower() in p.name.lower()]
@@ -314,6 +301,7 @@ def register_security_tools(mcp: FastMCP) -> None:
                     {
                         "id": p.id,
                         "name": p.name,
+                        "compartment_id": p.compartment_id,
                         "description": p.description,
                         "statements": p.statements,
                         "time_created": str(p.time_created) if p.time_created else None,
@@ -337,6 +325,137 @@ def register_security_tools(mcp: FastMCP) -> None:
         tier=2,
     )
 
+    @mcp.tool(
+        name="oci_security_who_can",
+        annotations={
+            "title": "Who Can Access a Resource",
+            "readOnlyHint": True,
+            "destructiveHint": False,
+            "idempotentHint": True,
+            "openWorldHint": True,
+        },
+    )
+    async def who_can(params: WhoCanInput, ctx: Context) -> str:
+        """Find the groups and dynamic groups that hold an access level.
+
+        Answers questions like "who can manage instances in prod/apps" from
+        a compiled index of every policy statement in the tenancy. A grant
+        matches through the resource type, a family containing it
+        (instance-family) or all-resources, with the verb or a stronger one,
+        in the compartment or any of its ancestors. The index is built once
+        and cached, so later queries make no API calls.
+
+        Args:
+            params: WhoCanInput with verb, resource_type and optional compartment
+
+        Returns:
+            Matching grants with their policy statements in requested format
+
+        Example:
+            {"verb": "manage", "resource_type": "instances", "compartment": "prod/apps"}
+        """
+        await ctx.report_progress(0.1, "Loading policy index...")
+
+        try:
+            index, tree, info = await get_policy_index(
+                oci_client_manager.identity, oci_client_manager.tenancy_id,
+                refresh=params.refresh,
+            )
+            path = None
+            if params.compartment:
+                path = tree.path(tree.resolve(params.compartment))
+
+            await ctx.report_progress(0.8, "Matching grants...")
+            grants = index.who_can(
+                params.verb.value, params.resource_type, path,
+                include_conditional=params.include_conditional,
+            )
+            data = {
+                "query": {
+                    "verb": params.verb.value,
+                    "resource_type": params.resource_type.lower(),
+                    "compartment": (path or "tenancy root") if path is not None else None,
+                },
+                "total": len(grants),
+                "subjects": sorted({g["subject"] for g in grants}),
+                "grants": grants,
+                "index": _index_info(index, info),
+            }
+
+            if params.response_format == ResponseFormat.JSON:
+                return SecurityFormatter.to_json(data)
+            return SecurityFormatter.who_can_markdown(data)
+
+        except ValueError as e:
+            return format_error_response(str(e), params.response_format.value)
+        except Exception as e:
+            error = handle_oci_error(e, "querying policy access")
+            return format_error_response(error, params.response_format.value)
+
+    auto_register_tool(
+        name="oci_security_who_can",
+        domain="security",
+        func=who_can,
+        tier=2,
+    )
+
+    @mcp.tool(
+        name="oci_security_what_can",
+        annotations={
+            "title": "What Can a Group Do",
+            "readOnlyHint": True,
+            "destructiveHint": False,
+            "idempotentHint": True,
+            "openWorldHint": True,
+        },
+    )
+    async def what_can(params: WhatCanInput, ctx: Context) -> str:
+        """List everything a group or dynamic group is allowed to do.
+
+        Reads the subject's grants from the cached policy index, together
+        with grants to any-user (and any-group for groups) that also apply.
+
+        Args:
+            params: WhatCanInput with subject
+
+        Returns:
+            The subject's grants with their policy statements in requested format
+
+        Example:
+            {"subject": "NetworkAdmins"}
+        """
+        await ctx.report_progress(0.1, "Loading policy index...")
+
+        try:
+            index, _, info = await get_policy_index(
+                oci_client_manager.identity, oci_client_manager.tenancy_id,
+                refresh=params.refresh,
+            )
+            grants = index.what_can(params.subject)
+            data = {
+                "subject": params.subject,
+                "total": len(grants),
+                "grants": grants,
+                "index": _index_info(index, info),
+            }
+
+            if params.response_format == ResponseFormat.JSON:
+                return SecurityFormatter.to_json(data)
+            return SecurityFormatter.what_can_markdown(data)
+
+        except ValueError as e:
+            return format_error_response(str(e), params.response_format.value)
+        except Exception as e:
+            error = handle_oci_error(e, "querying policy access")
+            return format_error_response(error, params.response_format.value)
+
+    auto_register_tool(
+        name="oci_security_what_can",
+        domain="security",
+        func=what_can,
+        tier=2,
+    )
+
     @mcp.tool(
         name="oci_security_list_cloud_guard_problems",
         annotations={
@@ -351,6 +470,10 @@ def register_security_tools(mcp: FastMCP) -> None:
         """List Cloud Guard security problems.
 
         Retrieves detected security problems with optional filtering by risk level.
+        Every page is read on the shared client and aggregated as it arrives
+        (by risk, resource type, region and detector), so totals cover the
+        whole tenancy; the snapshot is cached and refreshed with problems
+        detected since the last scan.
 
         Args:
             params: ListCloudGuardProblemsInput with risk_level, lifecycle_state, limit
@@ -361,45 +484,52 @@ def register_security_tools(mcp: FastMCP) -> None:
         await ctx.report_progress(0.1, "Connecting to Cloud Guard...")
 
         try:
-            from oci.cloud_guard import CloudGuardClient
-
-            config = oci_client_manager._config
-            cloud_guard = CloudGuardClient(config, signer=oci_client_manager._signer)
-
             compartment_id = params.compartment_id or oci_client_manager.tenancy_id
 
-            await ctx.report_progress(0.3, "Fetching Cloud Guard problems...")
+            async def page_done(pages: int, problems: int) -> None:
+                await ctx.report_progress(
+                    min(0.2 + 0.05 * pages, 0.7),
+                    f"Fetched page {pages} ({problems} problems so far)...",
+                )
 
-            response = await asyncio.to_thread(
-                cloud_guard.list_problems,
-                compartment_id=compartment_id,
+            await ctx.report_progress(0.2, "Fetching Cloud Guard problems...")
+            snapshot, info = await get_problem_snapshot(
+                oci_client_manager.cloud_guard,
+                compartment_id,
+                include_subcompartments=params.include_subcompartments,
                 lifecycle_state=params.lifecycle_state.value if params.lifecycle_state else None,
-                risk_level=params.risk_level.value if params.risk_level else None,
-                limit=params.limit,
+                refresh=params.refresh,
+                on_page=page_done,
             )
 
-            problems = response.data.items
-
-            await ctx.report_progress(0.7, "Processing problems...")
-
-            # Calculate risk summary
-            risk_counts = Counter(p.risk_level for p in problems)
+            await ctx.report_progress(0.8, "Processing problems...")
 
+            risk_level = params.risk_level.value if params.risk_level else None
+            problems = snapshot.select(risk_level)
+            summary = snapshot.summary()
             data = {
                 "total": len(problems),
-                "summary": dict(risk_counts),
+                "summary": summary["by_risk"],
+                "by_resource_type": summary["by_resource_type"],
+                "by_region": summary["by_region"],
+                "by_detector": summary["by_detector"],
+                "snapshot": {
+                    "problems": summary["total"],
+                    "scanned_at": datetime.fromtimestamp(info["scanned_at"], UTC).isoformat(),
+                    "cached": info["cached"],
+                    **({"delta": info["delta"]} if "delta" in info else {}),
+                },
                 "problems": [
                     {
-                        "id": p.id,
-                        "problem_name": p.detector_rule_id,
-                        "risk_level": p.risk_level,
-                        "resource_name": p.resource_name,
-                        "resource_type": p.resource_type,
-                        "region": p.region,
-                        "time_first_detected": (
-                            str(p.time_first_detected) if p.time_first_detected else None
-                        ),
-                        "recommendation": getattr(p, "recommendation", None),
+                        "id": p["id"],
+                        "problem_name": p["detector_rule_id"],
+                        "risk_level": p["risk_level"],
+                        "resource_name": p["resource_name"],
+                        "resource_type": p["resource_type"],
+                        "region": p["region"],
+                        "time_first_detected": p["time_first_detected"],
+                        "time_last_detected": p["time_last_detected"],
+                        "recommendation": p["recommendation"],
                     }
                     for p in problems[:params.limit]
                 ],
@@ -420,6 +550,69 @@ def register_security_tools(mcp: FastMCP) -> None:
         tier=2,
     )
 
+    @mcp.tool(
+        name="oci_security_scan_credentials",
+        annotations={
+            "title": "Scan Credential Ages",
+            "readOnlyHint": True,
+            "destructiveHint": False,
+            "idempotentHint": True,
+            "openWorldHint": True,
+        },
+    )
+    async def credential_scan(params: ScanCredentialsInput, ctx: Context) -> str:
+        """Find stale API keys, auth tokens and customer secret keys tenancy-wide.
+
+        Lists the credentials of every active user concurrently (capped by
+        OCI_MAX_CONCURRENCY), caches each user's results so repeated scans
+        only list users not seen recently, and reports only the active
+        credentials older than max_age_days, oldest first.
+
+        Args:
+            params: ScanCredentialsInput with max_age_days and credential_types
+
+        Returns:
+            Credential totals and violations in requested format
+
+        Example:
+            {"max_age_days": 90, "credential_types": ["api_keys"]}
+        """
+        await ctx.report_progress(0.1, "Loading active users...")
+
+        try:
+            async def user_done(done: int, total: int) -> None:
+                await ctx.report_progress(
+                    0.2 + 0.7 * done / total, f"Listed credentials of {done}/{total} users"
+                )
+
+            result = await scan_credentials(
+                oci_client_manager.identity,
+                oci_client_manager.tenancy_id,
+                params.max_age_days,
+                tuple(kind.value for kind in params.credential_types),
+                refresh=params.refresh,
+                on_user=user_done,
+            )
+            result["total_violations"] = len(result["violations"])
+            result["violations"] = result["violations"][:params.limit]
+
+            await ctx.report_progress(0.9, "Formatting response...")
+
+            if params.response_format == ResponseFormat.JSON:
+                return SecurityFormatter.to_json(result)
+            return SecurityFormatter.credential_scan_markdown(result)
+
+        except Exception as e:
+            error = handle_oci_error(e, "scanning credentials")
+            return format_error_response(error, params.response_format.value)
+
+    auto_register_tool(
+        name="oci_security_scan_credentials",
+        domain="security",
+        func=credential_scan,
+        tier=3,
+    )
+
     @mcp.tool(
         name="oci_security_audit",
         annotations={
@@ -434,7 +627,10 @@ def register_security_tools(mcp: FastMCP) -> None:
         """Perform a comprehensive security audit.
 
         Analyzes IAM configuration, Cloud Guard problems, and network security
-        to provide a security posture assessment.
+        to provide a security posture assessment. The three sections and the
+        listings inside them run concurrently under one shared call budget,
+        follow pagination, and cover every VCN; with include_subcompartments
+        the whole compartment subtree is audited.
 
         Args:
             params: SecurityAuditInput with scope options
@@ -446,158 +642,54 @@ def register_security_tools(mcp: FastMCP) -> None:
 
         try:
             compartment_id = params.compartment_id or oci_client_manager.tenancy_id
+            compartment_ids = [compartment_id]
+            compartment_name = (
+                "Tenancy Root" if compartment_id == oci_client_manager.tenancy_id
+                else compartment_id
+            )
+            if params.include_subcompartments:
+                tree = await get_compartment_tree(
+                    oci_client_manager.identity, oci_client_manager.tenancy_id
+                )
+                compartment_ids = tree.subtree(compartment_id)
+                compartment_name = f"{tree.path(compartment_id) or 'Tenancy Root'} (subtree)"
+
+            sections = sum([
+                params.include_iam, params.include_cloud_guard,
+                params.include_network_security,
+            ])
+            done: list[str] = []
+
+            async def section_done(name: str) -> None:
+                done.append(name)
+                await ctx.report_progress(
+                    0.2 + 0.7 * len(done) / sections,
+                    f"Finished {name} analysis ({len(done)}/{sections})",
+                )
 
-            is_root = compartment_id == oci_client_manager.tenancy_id
+            await ctx.report_progress(0.2, "Running IAM, Cloud Guard and network analysis...")
+            result = await run_audit(
+                oci_client_manager,
+                compartment_ids,
+                include_iam=params.include_iam,
+                include_cloud_guard=params.include_cloud_guard,
+                include_network_security=params.include_network_security,
+                include_subcompartments=params.include_subcompartments,
+                on_section=section_done,
+            )
+
+            scores = result.pop("scores")
             data: dict[str, Any] = {
                 "audit_time": datetime.now(UTC).isoformat(),
-                "compartment_name": "Tenancy Root" if is_root else compartment_id,
+                "compartment_name": compartment_name,
+                "compartments": len(compartment_ids),
                 "security_score": {"overall": 0},
-                "recommendations": [],
+                **result,
             }
 
-            score_components = []
-
-            # IAM Analysis
-            if params.include_iam:
-                await ctx.report_progress(0.2, "Analyzing IAM configuration...")
-
-                identity = oci_client_manager.identity
-
-                users_resp = await asyncio.to_thread(
-                    identity.list_users,
-                    compartment_id=compartment_id,
-                )
-                groups_resp = await asyncio.to_thread(
-                    identity.list_groups,
-                    compartment_id=compartment_id,
-                )
-                policies_resp = await asyncio.to_thread(
-                    identity.list_policies,
-                    compartment_id=compartment_id,
-                )
-
-                users = users_resp.data
-                active_users = [u for u in users if u.lifecycle_state == "ACTIVE"]
-
-                iam_findings = []
-
-                # Check for users without MFA (simplified check)
-                if len(active_users) > 0:
-                    iam_findings.append(f"Review MFA status for {len(active_users)} active users")
-
-                # Check for overly permissive policies
-                broad_policies = [
-                    p for p in policies_resp.data
-                    if any("manage all-resources" in s.lower() for s in p.statements)
-                ]
-                if broad_policies:
-                    msg = f"{len(broad_policies)} policies with 'manage all-resources'"
-                    iam_findings.append(f"{msg} detected")
-
-                data["iam_summary"] = {
-                    "total_users": len(users),
-                    "active_users": len(active_users),
-                    "total_groups": len(groups_resp.data),
-                    "total_policies": len(policies_resp.data),
-                    "findings": iam_findings,
-                }
-
-                iam_score = 80 if not iam_findings else 60
-                score_components.append(iam_score)
-
-            # Cloud Guard Analysis
-            if params.include_cloud_guard:
-                await ctx.report_progress(0.5, "Analyzing Cloud Guard findings...")
-
-                try:
-                    from oci.cloud_guard import CloudGuardClient
-
-                    config = oci_client_manager._config
-                    cloud_guard = CloudGuardClient(config, signer=oci_client_manager._signer)
-
-                    problems_resp = await asyncio.to_thread(
-                        cloud_guard.list_problems,
-                        compartment_id=compartment_id,
-                        lifecycle_state="ACTIVE",
-                        limit=100,
-                    )
-
-                    problems = problems_resp.data.items
-                    critical = sum(1 for p in problems if p.risk_level == "CRITICAL")
-                    high = sum(1 for p in problems if p.risk_level == "HIGH")
-                    medium = sum(1 for p in problems if p.risk_level == "MEDIUM")
-
-                    data["cloud_guard_summary"] = {
-                        "total": len(problems),
-                        "critical": critical,
-                        "high": high,
-                        "medium": medium,
-                    }
-
-                    if critical > 0:
-                        msg = f"Address {critical} critical Cloud Guard problems"
-                        data["recommendations"].append(f"{msg} immediately")
-
-                    if critical == 0 and high == 0:
-                        cg_score = 90
-                    elif critical == 0:
-                        cg_score = 70
-                    else:
-                        cg_score = 40
-                    score_components.append(cg_score)
-
-                except Exception:
-                    data["cloud_guard_summary"] = {"error": "Cloud Guard not enabled or accessible"}
-                    score_components.append(50)
-
-            # Network Security Analysis
-            if params.include_network_security:
-                await ctx.report_progress(0.7, "Analyzing network security...")
-
-                try:
-                    network = oci_client_manager.virtual_network
-
-                    vcns_resp = await asyncio.to_thread(
-                        network.list_vcns,
-                        compartment_id=compartment_id,
-                    )
-
-                    network_findings = []
-                    public_subnets = 0
-                    open_rules = 0
-
-                    for vcn in vcns_resp.data[:10]:  # Limit analysis
-                        subnets_resp = await asyncio.to_thread(
-                            network.list_subnets,
-                            compartment_id=compartment_id,
-                            vcn_id=vcn.id,
-                        )
-
-                        for subnet in subnets_resp.data:
-                            if not subnet.prohibit_public_ip_on_vnic:
-                                public_subnets += 1
-
-                    if public_subnets > 5:
-                        msg = f"{public_subnets} public subnets detected"
-                        network_findings.append(f"{msg} - review necessity")
-
-                    data["network_summary"] = {
-                        "total_vcns": len(vcns_resp.data),
-                        "public_subnets": public_subnets,
-                        "open_rules": open_rules,
-                        "findings": network_findings,
-                    }
-
-                    net_score = 85 if not network_findings else 65
-                    score_components.append(net_score)
-
-                except Exception:
-                    data["network_summary"] = {"error": "Network analysis failed"}
-                    score_components.append(50)
-
             # Calculate overall score
-            if score_components:
-                avg = sum(score_components) / len(score_components)
+            if scores:
+                avg = sum(scores.values()) / len(scores)
                 data["security_score"]["overall"] = int(avg)
 
             # Add general recommendations
@@ -621,3 +713,15 @@ def register_security_tools(mcp: FastMCP) -> None:
         func=security_audit,
         tier=3,
     )
+
+
+def _index_info(index: PolicyIndex, info: dict[str, Any]) -> dict[str, Any]:
+    """Size and provenance of a policy index for responses."""
+    return {
+        "policies": len(index.policies),
+        "grants": len(index),
+        "unparsed": len(index.errors),
+        "built_at": info["built_at"],
+        "cached": info["cached"],
+        "errors": info["errors"],
+    }
@@ -0,0 +1,41 @@
+"""
+Tests for the TTL cache.
+"""
+from __future__ import annotations
+
+import pytest
+
+from mcp_server_oci.core.cache import TTLCache
+
+
+class TestCacheTags:
+    """Tests for tag-based invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tag_drops_tagged_entries(self):
+        cache = TTLCache(max_size=10, default_ttl=60)
+        await cache.set("topology:a", 1, tags=["vcn:a", "compartment:c"])
+        await cache.set("topology:b", 2, tags=["vcn:b", "compartment:c"])
+        await cache.set("other", 3)
+
+        assert await cache.invalidate_tag("vcn:a") == 1
+        assert await cache.get("topology:a") is None
+        assert await cache.get("topology:b") == 2
+
+        assert await cache.invalidate_tag("compartment:c") == 1
+        assert await cache.invalidate_tag("compartment:c") == 0
+        assert await cache.get("other") == 3
+        assert len(cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_overwrite_and_eviction_forget_old_tags(self):
+        cache = TTLCache(max_size=2, default_ttl=60)
+        await cache.set("a", 1, tags=["t"])
+        await cache.set("a", 2, tags=["u"])
+        assert await cache.invalidate_tag("t") == 0
+        assert await cache.get("a") == 2
+
+        await cache.set("b", 1, tags=["u"])
+        await cache.set("c", 1)  # evicts "a"
+        assert await cache.invalidate_tag("u") == 1
+        assert await cache.get("c") == 1
@@ -0,0 +1,157 @@
+"""
+Tests for the compartment tree index.
+"""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from mcp_server_oci.core.cache import get_cache
+from mcp_server_oci.core.compartments import (
+    CompartmentTree,
+    compartment_scope,
+    get_compartment_tree,
+)
+
+TENANCY = "ocid1.tenancy.oc1..aaaaaaaexample"
+
+NODES = [
+    ("ocid1.compartment.prod", "prod", TENANCY),
+    ("ocid1.compartment.prod-apps", "apps", "ocid1.compartment.prod"),
+    ("ocid1.compartment.prod-apps-web", "web", "ocid1.compartment.prod-apps"),
+    ("ocid1.compartment.prod-data", "data", "ocid1.compartment.prod"),
+    ("ocid1.compartment.dev", "dev", TENANCY),
+    ("ocid1.compartment.dev-apps", "apps", "ocid1.compartment.dev"),
+    ("ocid1.compartment.orphan", "orphan", "ocid1.compartment.hidden"),
+]
+
+
+class FakeIdentity:
+    """IdentityClient stand-in serving compartments in pages."""
+
+    def __init__(self, nodes, page_size=3):
+        self.nodes = nodes
+        self.page_size = page_size
+        self.calls = []
+
+    def list_compartments(self, compartment_id, page=None, **kwargs):
+        self.calls.append({"compartment_id": compartment_id, "page": page, **kwargs})
+        start = int(page or 0)
+        chunk = self.nodes[start:start + self.page_size]
+        end = start + len(chunk)
+        has_more = end < len(self.nodes)
+        return SimpleNamespace(
+            data=[SimpleNamespace(id=i, name=n, compartment_id=p) for i, n, p in chunk],
+            has_next_page=has_more,
+            next_page=str(end) if has_more else None,
+            status=200,
+            headers={},
+            request=None,
+        )
+
+
+class TestCompartmentTree:
+    """Tests for hierarchy lookups."""
+
+    def test_parent_children_path(self):
+        tree = CompartmentTree(TENANCY, NODES)
+        assert len(tree) == 8
+        assert tree.parent("ocid1.compartment.prod-apps") == "ocid1.compartment.prod"
+        assert tree.parent(TENANCY) is None
+        assert tree.children("ocid1.compartment.prod") == [
+            "ocid1.compartment.prod-apps",
+            "ocid1.compartment.prod-data",
+        ]
+        assert tree.path("ocid1.compartment.prod-apps-web") == "prod/apps/web"
+        assert tree.depth("ocid1.compartment.prod-apps-web") == 3
+        assert tree.ancestors("ocid1.compartment.prod-apps-web") == [
+            "ocid1.compartment.prod-apps",
+            "ocid1.compartment.prod",
+            TENANCY,
+        ]
+
+    def test_orphans_attach_to_root(self):
+        tree = CompartmentTree(TENANCY, NODES)
+        assert tree.parent("ocid1.compartment.orphan") == TENANCY
+        assert tree.path("ocid1.compartment.orphan") == "orphan"
+
+    def test_subtree_and_is_within(self):
+        tree = CompartmentTree(TENANCY, NODES)
+        assert tree.subtree("ocid1.compartment.prod") == [
+            "ocid1.compartment.prod",
+            "ocid1.compartment.prod-apps",
+            "ocid1.compartment.prod-apps-web",
+            "ocid1.compartment.prod-data",
+        ]
+        assert tree.subtree("ocid1.compartment.prod-apps", include_self=False) == [
+            "ocid1.compartment.prod-apps-web",
+        ]
+        assert len(tree.subtree(TENANCY)) == len(tree)
+        assert tree.is_within("ocid1.compartment.prod-apps-web", "ocid1.compartment.prod")
+        assert not tree.is_within("ocid1.compartment.dev-apps", "ocid1.compartment.prod")
+        assert not tree.is_within("ocid1.compartment.unknown", TENANCY)
+
+    def test_resolve(self):
+        tree = CompartmentTree(TENANCY, NODES)
+        assert tree.resolve("ocid1.compartment.dev") == "ocid1.compartment.dev"
+        assert tree.resolve("Prod/Apps") == "ocid1.compartment.prod-apps"
+        assert tree.resolve("web") == "ocid1.compartment.prod-apps-web"
+        assert tree.resolve("root") == TENANCY
+        with pytest.raises(ValueError, match="ambiguous"):
+            tree.resolve("apps")
+        with pytest.raises(ValueError, match="not found"):
+            tree.resolve("staging")
+
+    def test_scope(self):
+        tree = CompartmentTree(TENANCY, NODES)
+        assert tree.scope("prod/apps") == ["ocid1.compartment.prod-apps"]
+        assert tree.scope("prod/apps", include_subcompartments=True) == [
+            "ocid1.compartment.prod-apps",
+            "ocid1.compartment.prod-apps-web",
+        ]
+
+    def test_payload_round_trip(self):
+        tree = CompartmentTree(TENANCY, NODES)
+        restored = CompartmentTree.from_payload(tree.to_payload())
+        assert restored.subtree(TENANCY) == tree.subtree(TENANCY)
+        assert restored.path("ocid1.compartment.prod-apps-web") == "prod/apps/web"
+
+
+class TestGetCompartmentTree:
+    """Tests for fetching and caching the tree."""
+
+    @pytest.mark.asyncio
+    async def test_single_paginated_listing_is_cached(self):
+        await get_cache("static").clear()
+        identity = FakeIdentity(NODES, page_size=3)
+
+        tree = await get_compartment_tree(identity, TENANCY)
+        assert len(tree) == 8
+        assert [c["page"] for c in identity.calls] == [None, "3", "6"]
+        assert all(c["compartment_id_in_subtree"] for c in identity.calls)
+
+        again = await get_compartment_tree(identity, TENANCY)
+        assert again is tree
+        assert len(identity.calls) == 3
+
+        await get_compartment_tree(identity, TENANCY, refresh=True)
+        assert len(identity.calls) == 6
+        await get_cache("static").clear()
+
+    @pytest.mark.asyncio
+    async def test_compartment_scope(self):
+        await get_cache("static").clear()
+        identity = FakeIdentity(NODES)
+        client_mgr = SimpleNamespace(identity=identity, tenancy_id=TENANCY)
+
+        assert await compartment_scope(client_mgr, "ocid1.compartment.prod") == [
+            "ocid1.compartment.prod"
+        ]
+        assert identity.calls == []
+        assert await compartment_scope(client_mgr, "ocid1.compartment.dev", True) == [
+            "ocid1.compartment.dev", "ocid1.compartment.dev-apps",
+        ]
+        with pytest.raises(ValueError):
+            await compartment_scope(client_mgr, "ocid1.compartment.gone", True)
+        await get_cache("static").clear()
@@ -0,0 +1,234 @@
+"""
+Tests for core metrics query planner.
+"""
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from mcp_server_oci.core import metrics
+from mcp_server_oci.core.metrics import build_query, fetch_metrics
+from mcp_server_oci.core.timeseries import TimeSeries
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(monkeypatch):
+    """Isolate the metrics history cache per test."""
+    from mcp_server_oci.core.cache import TTLCache
+    cache = TTLCache(max_size=1000, default_ttl=3600)
+    monkeypatch.setattr(metrics, "get_cache", lambda tier: cache)
+
+
+def _stream(resource_id: str, values: list[float], end: datetime) -> SimpleNamespace:
+    return SimpleNamespace(
+        dimensions={"resourceId": resource_id},
+        aggregated_datapoints=[
+            SimpleNamespace(timestamp=end - timedelta(minutes=len(values) - i), value=v)
+            for i, v in enumerate(values)
+        ],
+    )
+
+
+class FakeMonitoring:
+    """Monitoring client returning one stream per selected resource."""
+
+    def __init__(self, fail_metric: str | None = None, fail_id: str | None = None):
+        self.queries: list[str] = []
+        self.fail_metric = fail_metric
+        self.fail_id = fail_id
+
+    def summarize_metrics_data(self, compartment_id, details, **kwargs):
+        self.queries.append(details.query)
+        metric = details.query.split("[", 1)[0]
+        selector = details.query.split('"')[1]
+        if metric == self.fail_metric or self.fail_id in selector.split("|"):
+            raise RuntimeError("boom")
+        return SimpleNamespace(
+            data=[
+                _stream(rid, [1.0, 3.0], details.end_time)
+                for rid in selector.split("|")
+            ]
+        )
+
+
+class TestBuildQuery:
+    """Tests for MQL query construction."""
+
+    def test_single_resource_uses_equality(self):
+        query = build_query("CpuUtilization", ["ocid1.instance.a"])
+        assert query == 'CpuUtilization[1m]{resourceId = "ocid1.instance.a"}.mean()'
+
+    def test_multiple_resources_use_regex(self):
+        query = build_query("CpuUtilization", ["a", "b", "c"], interval="1h", statistic="max")
+        assert query == 'CpuUtilization[1h]{resourceId =~ "a|b|c"}.max()'
+
+    def test_no_resources_selects_all(self):
+        assert build_query("CpuUtilization") == "CpuUtilization[1m].mean()"
+
+
+class TestFetchMetrics:
+    """Tests for batched metric fetching."""
+
+    @pytest.mark.asyncio
+    async def test_batches_resources_per_metric(self, monkeypatch):
+        monkeypatch.setattr(metrics, "MAX_IDS_PER_QUERY", 50)
+        ids = [f"ocid1.instance.{i}" for i in range(100)]
+        client = FakeMonitoring()
+        now = datetime.now(UTC)
+
+        batch = await fetch_metrics(
+            client, "ocid1.compartment.x", "oci_computeagent",
+            ["CpuUtilization", "MemoryUtilization"], ids,
+            now - timedelta(hours=1), now,
+        )
+
+        assert batch.calls == 4
+        assert len(client.queries) == 4
+        assert batch.get(ids[42], "CpuUtilization").values.tolist() == [1.0, 3.0]
+        assert batch.get(ids[99], "MemoryUtilization").values.tolist() == [1.0, 3.0]
+
+    @pytest.mark.asyncio
+    async def test_failed_metric_is_recorded(self):
+        client = FakeMonitoring(fail_metric="MemoryUtilization")
+        now = datetime.now(UTC)
+
+        batch = await fetch_metrics(
+            client, "ocid1.compartment.x", "oci_computeagent",
+            ["CpuUtilization", "MemoryUtilization"], ["a", "b"],
+            now - timedelta(hours=1), now,
+        )
+
+        assert batch.errors == {"MemoryUtilization": {"a": "boom", "b": "boom"}}
+        assert batch.error("a", "CpuUtilization") is None
+        assert batch.get("a", "CpuUtilization").values.tolist() == [1.0, 3.0]
+        assert len(batch.get("a", "MemoryUtilization")) == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_only_marks_its_resources(self, monkeypatch):
+        monkeypatch.setattr(metrics, "MAX_IDS_PER_QUERY", 2)
+        client = FakeMonitoring(fail_id="c")
+        now = datetime.now(UTC)
+
+        batch = await fetch_metrics(
+            client, "ocid1.compartment.x", "oci_computeagent",
+            ["CpuUtilization"], ["a", "b", "c", "d"], now - timedelta(hours=1), now,
+        )
+
+        assert batch.errors == {"CpuUtilization": {"c": "boom", "d": "boom"}}
+        assert batch.error("a", "CpuUtilization") is None
+        assert batch.get("b", "CpuUtilization").values.tolist() == [1.0, 3.0]
+
+    @pytest.mark.asyncio
+    async def test_raise_on_error(self):
+        client = FakeMonitoring(fail_metric="CpuUtilization")
+        now = datetime.now(UTC)
+
+        with pytest.raises(RuntimeError):
+            await fetch_metrics(
+                client, "ocid1.compartment.x", "oci_computeagent",
+                ["CpuUtilization"], ["a"], now - timedelta(hours=1), now,
+                raise_on_error=True,
+            )
+
+
+class TestRankResources:
+    """Tests for vectorized fleet ranking."""
+
+    def _batch(self) -> metrics.MetricBatch:
+        start = datetime(2025, 1, 1, tzinfo=UTC)
+        series = {
+            "a": [10.0, 20.0, 30.0],
+            "b": [90.0, 95.0],
+            "c": [50.0, 50.0, 50.0, 50.0],
+        }
+        return metrics.MetricBatch(
+            series={
+                rid: {"CpuUtilization": TimeSeries.from_points(
+                    (start + timedelta(minutes=i), v) for i, v in enumerate(vals)
+                )}
+                for rid, vals in series.items()
+            },
+            dimensions={"b": {"resourceDisplayName": "busy"}},
+        )
+
+    def test_top_by_mean(self):
+        ranked, fleet = metrics.rank_resources(self._batch(), "CpuUtilization", top_n=2)
+        assert [r["resource_id"] for r in ranked] == ["b", "c"]
+        assert ranked[0]["display_name"] == "busy"
+        assert ranked[0]["mean"] == 92.5
+        assert fleet["resource_count"] == 3
+        assert fleet["max"] == 95.0
+
+    def test_ascending_by_max(self):
+        ranked, _ = metrics.rank_resources(
+            self._batch(), "CpuUtilization", by="max", top_n=1, ascending=True
+        )
+        assert ranked[0]["resource_id"] == "a"
+        assert ranked[0]["max"] == 30.0
+
+    def test_empty_batch(self):
+        ranked, fleet = metrics.rank_resources(metrics.MetricBatch(), "CpuUtilization")
+        assert ranked == []
+        assert fleet == {"resource_count": 0}
+
+    def test_grouped_query(self):
+        query = build_query("CpuUtilization", group_by=("resourceId",), interval="5m")
+        assert query == "CpuUtilization[5m].groupBy(resourceId).mean()"
+
+
+class TestBucketCache:
+    """Tests for the time-bucket-aligned query cache."""
+
+    class RangeMonitoring:
+        """Returns one 1-minute datapoint per interval in the requested range."""
+
+        def __init__(self):
+            self.ranges: list[tuple[datetime, datetime]] = []
+
+        def summarize_metrics_data(self, compartment_id, details, **kwargs):
+            self.ranges.append((details.start_time, details.end_time))
+            n = int((details.end_time - details.start_time).total_seconds() // 60)
+            return SimpleNamespace(data=[SimpleNamespace(
+                dimensions={"resourceId": "a"},
+                aggregated_datapoints=[
+                    SimpleNamespace(
+                        timestamp=details.start_time + timedelta(minutes=i), value=float(i)
+                    )
+                    for i in range(n)
+                ],
+            )])
+
+    @pytest.mark.asyncio
+    async def test_repeat_query_fetches_only_tail(self):
+        client = self.RangeMonitoring()
+        end = datetime.now(UTC)
+        start = end - timedelta(hours=24)
+
+        first = await metrics.query_series(
+            client, "c", "oci_computeagent", "CpuUtilization[1m].mean()", start, end
+        )
+        second = await metrics.query_series(
+            client, "c", "oci_computeagent", "CpuUtilization[1m].mean()",
+            start + timedelta(minutes=1), end + timedelta(minutes=1),
+        )
+
+        assert first.calls == 1
+        assert second.calls == 1
+        tail_start, tail_end = client.ranges[-1]
+        # Only the open tail (at most a couple of 1h buckets) is re-fetched
+        assert tail_end - tail_start <= timedelta(hours=2, minutes=2)
+        assert len(second.series["a"]) >= 24 * 60 - 1
+        ts = second.series["a"].timestamps
+        assert (ts[1:] > ts[:-1]).all()
+
+    @pytest.mark.asyncio
+    async def test_cache_disabled(self):
+        client = self.RangeMonitoring()
+        end = datetime.now(UTC)
+        for _ in range(2):
+            await metrics.query_series(
+                client, "c", "ns", "q", end - timedelta(hours=3), end, use_cache=False
+            )
+        assert all(e - s >= timedelta(hours=3) for s, e in client.ranges)
@@ -0,0 +1,84 @@
+"""
+Tests for core time series module.
+"""
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from mcp_server_oci.core.timeseries import TimeSeries
+
+START = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _series(values: list[float], step_minutes: int = 1) -> TimeSeries:
+    return TimeSeries.from_points(
+        (START + timedelta(minutes=i * step_minutes), v) for i, v in enumerate(values)
+    )
+
+
+class TestConstruction:
+    """Tests for building time series."""
+
+    def test_from_datapoints_drops_nulls(self):
+        datapoints = [
+            SimpleNamespace(timestamp=START + timedelta(minutes=i), value=v)
+            for i, v in enumerate([1.0, None, 3.0])
+        ]
+        series = TimeSeries.from_datapoints(datapoints)
+        assert len(series) == 2
+        assert series.values.tolist() == [1.0, 3.0]
+
+    def test_from_datapoints_empty(self):
+        assert len(TimeSeries.from_datapoints(None)) == 0
+        assert not TimeSeries.from_datapoints([])
+
+    def test_unsorted_input_is_sorted(self):
+        series = TimeSeries.from_points([
+            (START + timedelta(minutes=2), 3.0),
+            (START, 1.0),
+        ])
+        assert series.values.tolist() == [1.0, 3.0]
+        assert series.start == START
+
+    def test_concat_merges_in_time_order(self):
+        a = TimeSeries.from_points([(START, 1.0), (START + timedelta(minutes=2), 3.0)])
+        b = TimeSeries.from_points([(START + timedelta(minutes=1), 2.0)])
+        assert TimeSeries.concat([a, b]).values.tolist() == [1.0, 2.0, 3.0]
+
+    def test_between(self):
+        series = _series([1.0, 2.0, 3.0, 4.0])
+        sliced = series.between(START + timedelta(minutes=1), START + timedelta(minutes=3))
+        assert sliced.values.tolist() == [2.0, 3.0]
+
+
+class TestStatistics:
+    """Tests for vectorized statistics."""
+
+    def test_basic_stats(self):
+        series = _series([1.0, 2.0, 6.0])
+        assert series.stats() == {"current": 6.0, "average": 3.0, "max": 6.0, "min": 1.0}
+
+    def test_empty_stats(self):
+        series = TimeSeries.empty()
+        assert series.stats() == {}
+        assert series.mean() is None
+        assert series.slope() is None
+        assert series.time_above(10) == 0.0
+
+    def test_percentiles(self):
+        series = _series([float(v) for v in range(101)])
+        assert series.percentile(95) == pytest.approx(95.0)
+        assert series.percentiles([50, 90]) == {50: 50.0, 90: 90.0}
+
+    def test_slope_per_hour(self):
+        # +1 per minute == +60 per hour
+        series = _series([float(v) for v in range(10)])
+        assert series.slope() == pytest.approx(60.0)
+
+    def test_time_above(self):
+        series = _series([10.0, 90.0, 95.0, 20.0], step_minutes=5)
+        assert series.time_above(80.0) == 600.0
+        assert series.fraction_above(80.0) == pytest.approx(0.5)
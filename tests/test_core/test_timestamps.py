@@ -0,0 +1,23 @@
+"""
+Tests for SDK timestamp conversions.
+"""
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from mcp_server_oci.core.timestamps import epoch_seconds, timestamp_str
+
+
+def test_epoch_seconds_treats_naive_and_iso_values_as_utc():
+    aware = datetime(2024, 1, 1, tzinfo=UTC)
+    expected = aware.timestamp()
+    assert epoch_seconds(aware) == expected
+    assert epoch_seconds(datetime(2024, 1, 1)) == expected
+    assert epoch_seconds("2024-01-01T00:00:00Z") == expected
+    assert epoch_seconds(str(aware)) == expected
+    assert epoch_seconds(None) is None
+
+
+def test_timestamp_str():
+    assert timestamp_str(datetime(2024, 1, 1, tzinfo=UTC)) == "2024-01-01 00:00:00+00:00"
+    assert timestamp_str(None) is None
@@ -0,0 +1,163 @@
+"""
+Tests for the shared async lifecycle waiters.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+from mcp_server_oci.core.waiters import backoff_delays, report_transitions, wait_for_state
+from mcp_server_oci.tools.compute.bulk import wait_for_work_request
+
+FAST = {"initial_delay": 0.01, "max_delay": 0.02}
+
+
+class FakeResource:
+    """GET endpoint that walks through a fixed sequence of states."""
+
+    def __init__(self, states, attr="lifecycle_state"):
+        self.states = list(states)
+        self.attr = attr
+        self.calls = 0
+
+    def get(self, *args, **kwargs):
+        state = self.states[min(self.calls, len(self.states) - 1)]
+        self.calls += 1
+        if isinstance(state, Exception):
+            raise state
+        return SimpleNamespace(data=SimpleNamespace(**{self.attr: state}))
+
+
+class TestBackoff:
+    """Tests for the poll delay schedule."""
+
+    def test_exponential_with_jitter_and_cap(self):
+        delays = list(itertools.islice(backoff_delays(1.0, 8.0, jitter=0.2), 6))
+        for delay, base in zip(delays, [1, 2, 4, 8, 8, 8], strict=True):
+            assert 0.8 * base <= delay <= 1.2 * base
+
+
+class TestWaitForState:
+    """Tests for polling, transitions and deduplication."""
+
+    @pytest.mark.asyncio
+    async def test_reaches_target_and_reports_transitions(self):
+        resource = FakeResource(["STOPPED", "STARTING", "STARTING", "RUNNING"])
+        seen = []
+
+        async def on_transition(state, elapsed):
+            seen.append(state)
+
+        outcome = await wait_for_state(
+            resource.get, "ocid1.instance.a", {"RUNNING"},
+            timeout_seconds=5, on_transition=on_transition, **FAST,
+        )
+        assert outcome.succeeded
+        assert outcome.state == "RUNNING"
+        assert seen == ["STOPPED", "STARTING", "RUNNING"]
+        assert [s for s, _ in outcome.transitions] == seen
+        assert resource.calls == 4
+
+    @pytest.mark.asyncio
+    async def test_failure_state_and_poll_errors(self):
+        terminated = FakeResource(["STOPPING", "TERMINATED"])
+        outcome = await wait_for_state(
+            terminated.get, "ocid1.instance.b", {"STOPPED"}, failures={"TERMINATED"},
+            timeout_seconds=5, **FAST,
+        )
+        assert outcome.status == "failed"
+        assert outcome.state == "TERMINATED"
+
+        broken = FakeResource(["STARTING", RuntimeError("404")])
+        outcome = await wait_for_state(
+            broken.get, "ocid1.instance.c", {"RUNNING"}, timeout_seconds=5, **FAST
+        )
+        assert outcome.status == "failed"
+        assert isinstance(outcome.error, RuntimeError)
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        resource = FakeResource(["STARTING"])
+        outcome = await wait_for_state(
+            resource.get, "ocid1.instance.d", {"RUNNING"}, timeout_seconds=0.05, **FAST
+        )
+        assert outcome.status == "timeout"
+        assert outcome.state == "STARTING"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_waiters_share_one_poll_loop(self):
+        resource = FakeResource(["STARTING"] * 5 + ["RUNNING"])
+        late_seen = []
+
+        async def late(state, elapsed):
+            late_seen.append(state)
+
+        first = asyncio.create_task(wait_for_state(
+            resource.get, "ocid1.instance.e", {"RUNNING"}, timeout_seconds=5, **FAST
+        ))
+        await asyncio.sleep(0.02)
+        second = await wait_for_state(
+            resource.get, "ocid1.instance.e", {"RUNNING"},
+            timeout_seconds=5, on_transition=late, **FAST,
+        )
+        assert (await first).succeeded
+        assert second.succeeded
+        # One stream of GETs, and the late subscriber got the replayed state
+        assert resource.calls == 6
+        assert late_seen == ["STARTING", "RUNNING"]
+
+    @pytest.mark.asyncio
+    async def test_short_timeout_caller_does_not_stop_shared_loop(self):
+        resource = FakeResource(["STARTING"] * 8 + ["RUNNING"])
+        impatient = asyncio.create_task(wait_for_state(
+            resource.get, "ocid1.instance.f", {"RUNNING"}, timeout_seconds=0.03, **FAST
+        ))
+        await asyncio.sleep(0)
+        patient = await wait_for_state(
+            resource.get, "ocid1.instance.f", {"RUNNING"}, timeout_seconds=5, **FAST
+        )
+        assert (await impatient).status == "timeout"
+        assert patient.succeeded
+
+    @pytest.mark.asyncio
+    async def test_report_transitions_streams_progress(self):
+        updates = []
+
+        class Ctx:
+            async def report_progress(self, progress, total=None, message=None):
+                updates.append((progress, message))
+
+        callback = report_transitions(Ctx(), "Database", timeout_seconds=100)
+        await callback("STARTING", 50)
+        assert updates == [(pytest.approx(0.7), "Database is STARTING (50s)")]
+
+
+class TestWorkRequestWaiter:
+    """Tests for compute work request tracking on the shared waiter."""
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_instance_state(self):
+        work_requests = SimpleNamespace(
+            get_work_request=FakeResource([RuntimeError("not authorized")], "status").get
+        )
+        instance = FakeResource(["RUNNING"])
+        compute = SimpleNamespace(get_instance=instance.get)
+
+        status, message = await wait_for_work_request(
+            work_requests, "ocid1.workrequest.a", 5,
+            compute_client=compute, instance_id="ocid1.instance.g", target_state="RUNNING",
+        )
+        assert status == "succeeded"
+        assert "RUNNING" in message
+
+    @pytest.mark.asyncio
+    async def test_reports_failed_work_request(self):
+        work_requests = SimpleNamespace(
+            get_work_request=FakeResource(["CANCELED"], "status").get
+        )
+        status, message = await wait_for_work_request(work_requests, "ocid1.workrequest.b", 5)
+        assert status == "failed"
+        assert message == "Work request canceled"
@@ -0,0 +1,3 @@
+"""
+Domain tool unit tests.
+"""
@@ -0,0 +1,226 @@
+"""
+Tests for bulk instance power actions.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastmcp import FastMCP
+
+from mcp_server_oci.tools.compute import tools
+from mcp_server_oci.tools.compute.bulk import (
+    plan_bulk_action,
+    resolve_action,
+    resolve_targets,
+    run_bulk_action,
+)
+from mcp_server_oci.tools.compute.models import BulkAction, BulkInstanceActionInput
+
+COMPARTMENT = "ocid1.compartment.oc1..compute"
+
+STATES = {
+    "ocid1.instance.oc1..web1": "RUNNING",
+    "ocid1.instance.oc1..web2": "RUNNING",
+    "ocid1.instance.oc1..web3": "STOPPED",
+    "ocid1.instance.oc1..db1": "RUNNING",
+    "ocid1.instance.oc1..old": "TERMINATED",
+    "ocid1.instance.oc1..bad": "RUNNING",
+}
+
+
+def _instance(instance_id, state):
+    return SimpleNamespace(
+        id=instance_id, display_name=instance_id.rsplit(".", 1)[-1],
+        lifecycle_state=state, compartment_id=COMPARTMENT,
+    )
+
+
+class FakeCompute:
+    """Compute client recording instance actions and their concurrency."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.actions = []
+        self.in_flight = self.peak = 0
+
+    def get_instance(self, instance_id):
+        if instance_id not in STATES:
+            raise RuntimeError("NotAuthorizedOrNotFound")
+        return SimpleNamespace(data=_instance(instance_id, STATES[instance_id]))
+
+    def list_instances(self, compartment_id, lifecycle_state=None, **kwargs):
+        items = [
+            _instance(i, s) for i, s in STATES.items()
+            if lifecycle_state is None or s == lifecycle_state
+        ]
+        return SimpleNamespace(
+            data=items, has_next_page=False, next_page=None, status=200, headers={},
+            request=None,
+        )
+
+    def instance_action(self, instance_id, action):
+        with self.lock:
+            self.actions.append((instance_id, action))
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if instance_id.endswith("bad"):
+                raise RuntimeError("InternalError")
+            return SimpleNamespace(headers={"opc-work-request-id": f"wr-{instance_id}"})
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class TestActionMap:
+    """Tests for the OCI action each bulk action sends."""
+
+    @pytest.mark.parametrize(("action", "force", "expected"), [
+        (BulkAction.START, False, ("START", "RUNNING")),
+        (BulkAction.STOP, False, ("SOFTSTOP", "STOPPED")),
+        (BulkAction.STOP, True, ("STOP", "STOPPED")),
+        (BulkAction.RESTART, False, ("SOFTRESET", "RUNNING")),
+        (BulkAction.RESTART, True, ("RESET", "RUNNING")),
+    ])
+    def test_resolve_action(self, action, force, expected):
+        assert resolve_action(action, force) == expected
+
+
+class TestResolveTargets:
+    """Tests for target resolution."""
+
+    @pytest.mark.asyncio
+    async def test_explicit_ids_report_lookup_failures(self):
+        targets, failures = await resolve_targets(
+            FakeCompute(), instance_ids=["ocid1.instance.oc1..web1", "ocid1.instance.oc1..gone"],
+        )
+        assert [t["id"] for t in targets] == ["ocid1.instance.oc1..web1"]
+        assert failures == [{
+            "instance_id": "ocid1.instance.oc1..gone", "status": "failed",
+            "message": "Lookup failed: NotAuthorizedOrNotFound",
+        }]
+
+    @pytest.mark.asyncio
+    async def test_filters_by_state_and_name(self):
+        targets, failures = await resolve_targets(
+            FakeCompute(), compartment_id=COMPARTMENT, display_name="WEB",
+            lifecycle_state="RUNNING",
+        )
+        assert [t["display_name"] for t in targets] == ["web1", "web2"]
+        assert failures == []
+
+
+class TestRunBulkAction:
+    """Tests for the concurrent fan-out."""
+
+    @pytest.mark.asyncio
+    async def test_skips_and_failures(self):
+        client = FakeCompute()
+        targets, _ = await resolve_targets(client, compartment_id=COMPARTMENT)
+        results = await run_bulk_action(client, None, targets, BulkAction.STOP)
+        by_id = {r["instance_id"].rsplit(".", 1)[-1]: r for r in results}
+        assert by_id["web1"]["status"] == "initiated"
+        assert by_id["web1"]["work_request_id"] == "wr-ocid1.instance.oc1..web1"
+        assert (by_id["web3"]["status"], by_id["web3"]["message"]) == ("skipped", "Already STOPPED")
+        assert by_id["old"]["message"] == "Instance is TERMINATED"
+        assert (by_id["bad"]["status"], by_id["bad"]["message"]) == ("failed", "InternalError")
+        assert sorted(a for _, a in client.actions) == ["SOFTSTOP"] * 4
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap_and_progress(self):
+        client = FakeCompute(delay=0.05)
+        targets = [
+            {"id": f"ocid1.instance.oc1..i{i}", "lifecycle_state": "STOPPED"} for i in range(8)
+        ]
+        progress = []
+
+        async def on_progress(done, total, message):
+            progress.append((done, total))
+
+        started = time.monotonic()
+        results = await run_bulk_action(client, None, targets, BulkAction.START, limit=3,
+                                        progress=on_progress)
+        assert time.monotonic() - started < 0.35
+        assert client.peak == 3
+        assert [r["status"] for r in results] == ["initiated"] * 8
+        assert progress == [(i, 8) for i in range(1, 9)]
+
+    @pytest.mark.asyncio
+    async def test_wait_reports_each_instance_transition(self):
+        class WorkRequests:
+            def get_work_request(self, work_request_id):
+                return SimpleNamespace(data=SimpleNamespace(status="SUCCEEDED"))
+
+        targets = [{"id": "ocid1.instance.oc1..web1", "display_name": "web1",
+                    "lifecycle_state": "RUNNING"}]
+        messages = []
+
+        async def on_progress(done, total, message):
+            messages.append(message)
+
+        results = await run_bulk_action(FakeCompute(), WorkRequests(), targets, BulkAction.STOP,
+                                        wait_for_completion=True, progress=on_progress)
+        assert results[0]["status"] == "succeeded"
+        assert messages == ["web1 is SUCCEEDED (0s)", "web1: succeeded"]
+
+    def test_plan_matches_skip_logic(self):
+        targets = [
+            {"id": i, "display_name": i, "lifecycle_state": s} for i, s in STATES.items()
+        ]
+        plan = {r["instance_id"]: r for r in plan_bulk_action(targets, BulkAction.STOP, True)}
+        assert plan["ocid1.instance.oc1..web1"]["message"] == "Would send STOP"
+        assert plan["ocid1.instance.oc1..web3"]["status"] == "skipped"
+        assert plan["ocid1.instance.oc1..old"]["message"] == "Instance is TERMINATED"
+
+
+class TestBulkInstanceActionTool:
+    """Tests for the registered tool."""
+
+    @pytest.fixture
+    def bulk_tool(self, monkeypatch):
+        client = FakeCompute()
+        monkeypatch.setattr(tools, "get_client_manager",
+                            lambda: SimpleNamespace(compute=client, work_requests=None))
+        mcp = FastMCP("compute-test")
+        tools.register_compute_tools(mcp)
+
+        async def report_progress(value, total=None, message=None):
+            pass
+
+        async def run(**kwargs):
+            fn = (await mcp.get_tool("oci_compute_bulk_instance_action")).fn
+            return await fn(BulkInstanceActionInput(response_format="json", **kwargs),
+                            SimpleNamespace(report_progress=report_progress))
+
+        return client, run
+
+    @pytest.mark.asyncio
+    async def test_mutations_gate(self, monkeypatch, bulk_tool):
+        client, run = bulk_tool
+        monkeypatch.delenv("ALLOW_MUTATIONS", raising=False)
+        result = await run(action="stop", compartment_id=COMPARTMENT)
+        assert "Mutations not allowed" in result
+        assert client.actions == []
+
+        monkeypatch.setenv("ALLOW_MUTATIONS", "true")
+        data = json.loads(await run(action="stop", compartment_id=COMPARTMENT))
+        assert data["summary"] == {"initiated": 3, "skipped": 2, "failed": 1}
+
+    @pytest.mark.asyncio
+    async def test_dry_run_plans_without_acting(self, monkeypatch, bulk_tool):
+        client, run = bulk_tool
+        monkeypatch.delenv("ALLOW_MUTATIONS", raising=False)
+        data = json.loads(await run(
+            action="stop", dry_run=True,
+            instance_ids=["ocid1.instance.oc1..web1", "ocid1.instance.oc1..web3"],
+        ))
+        assert client.actions == []
+        assert [(r["status"], r["message"]) for r in data["results"]] == [
+            ("planned", "Would send SOFTSTOP"), ("skipped", "Already STOPPED"),
+        ]
@@ -0,0 +1,115 @@
+"""
+Tests for the vectorized cost anomaly engine.
+"""
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+
+from mcp_server_oci.tools.cost.anomaly import CostMatrix, baseline, detect_cost_anomalies
+
+START = date(2024, 1, 1)
+
+
+def _items(costs: dict[str, list[float]]) -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(
+            time_usage_started=datetime(START.year, START.month, START.day, tzinfo=UTC)
+            + timedelta(days=d),
+            service=service,
+            computed_amount=cost,
+        )
+        for service, series in costs.items()
+        for d, cost in enumerate(series)
+    ]
+
+
+class TestCostMatrix:
+    """Tests for dense matrix construction."""
+
+    def test_fills_missing_days(self):
+        items = _items({"Compute": [1.0, 2.0]})
+        items[1].time_usage_started += timedelta(days=2)
+        matrix = CostMatrix.from_items(items)
+        assert matrix.values[:, 0].tolist() == [1.0, 0.0, 0.0, 2.0]
+        assert matrix.days[-1] == START + timedelta(days=3)
+
+    def test_empty(self):
+        result = detect_cost_anomalies(CostMatrix.from_items([]))
+        assert result == {"total": [], "services": []}
+
+
+class TestBaseline:
+    """Tests for trailing baselines."""
+
+    def test_median_uses_only_prior_days(self):
+        values = np.arange(10, dtype=float)[:, None]
+        center, spread = baseline(values, window=3)
+        assert np.isnan(center[:3]).all()
+        assert center[3:, 0].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0]
+        assert (spread[3:] > 0).all()
+
+    def test_weekday_baseline_ignores_weekly_cycle(self):
+        weekly = np.tile([10, 10, 10, 10, 10, 30, 30], 8).astype(float)[:, None]
+        center, _ = baseline(weekly, window=21, by_weekday=True)
+        assert np.allclose(center[21:, 0], weekly[21:, 0])
+
+    def test_weekday_baseline_ignores_later_days(self):
+        rng = np.random.default_rng(2)
+        values = (100 + rng.normal(0, 5, (56, 2))) * (1 + 0.5 * (np.arange(56) % 7 >= 5))[:, None]
+        changed = values.copy()
+        changed[42:] *= [4.0, 0.1]  # a later regime change on weekdays and weekends alike
+        for method in ("median", "ewma"):
+            before = baseline(values, window=21, method=method, by_weekday=True)
+            after = baseline(changed, window=21, method=method, by_weekday=True)
+            for old, new in zip(before, after, strict=True):
+                np.testing.assert_array_equal(old[:43], new[:43])
+
+
+class TestDetectCostAnomalies:
+    """Tests for service and total level detection."""
+
+    def _matrix(self) -> CostMatrix:
+        rng = np.random.default_rng(0)
+        compute = (100 + rng.normal(0, 2, 60)).tolist()
+        storage = (20 + rng.normal(0, 0.5, 60)).tolist()
+        compute[50] = 300.0
+        storage[55] = 60.0
+        return CostMatrix.from_items(_items({"Compute": compute, "Storage": storage}))
+
+    def test_service_and_total_anomalies(self):
+        result = detect_cost_anomalies(self._matrix(), threshold=3.0, window=28)
+
+        flagged = {(a["date"], a["service"]) for a in result["services"]}
+        assert (str(START + timedelta(days=50)), "Compute") in flagged
+        assert (str(START + timedelta(days=55)), "Storage") in flagged
+
+        spike = next(a for a in result["total"] if a["date"] == str(START + timedelta(days=50)))
+        assert spike["root_cause"]["contributors"][0]["service"] == "Compute"
+        assert spike["severity"] == "critical"
+
+    def test_ewma_and_report_from(self):
+        result = detect_cost_anomalies(
+            self._matrix(), method="ewma", window=14, report_from=START + timedelta(days=52)
+        )
+        dates = {a["date"] for a in result["services"]}
+        assert str(START + timedelta(days=50)) not in dates
+        assert str(START + timedelta(days=55)) in dates
+
+    def test_weekend_uplift_is_not_flagged_by_default(self):
+        rng = np.random.default_rng(1)
+        weekend = 1.0 + 0.3 * (np.arange(70) % 7 >= 5)
+        compute = 100 * weekend * rng.normal(1.0, 0.02, 70)
+        compute[60] *= 3
+        matrix = CostMatrix.from_items(_items({"Compute": compute.tolist()}))
+
+        result = detect_cost_anomalies(matrix)
+        assert [a["date"] for a in result["services"]] == [str(START + timedelta(days=60))]
+        unadjusted = detect_cost_anomalies(matrix, by_weekday=False)
+        assert len(unadjusted["services"]) > 1
+
+    def test_min_increase_filters_small_spikes(self):
+        result = detect_cost_anomalies(self._matrix(), min_increase=100.0)
+        assert {a["service"] for a in result["services"]} == {"Compute"}
@@ -0,0 +1,111 @@
+"""
+Tests for the shared cost cube.
+"""
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from mcp_server_oci.core.compartments import CompartmentTree
+from mcp_server_oci.tools.cost.cube import CostCube, clear_cube_cache, get_cube, top_k
+from mcp_server_oci.tools.cost.store import CostStore
+from mcp_server_oci.tools.cost.tools import (
+    _process_compartment_costs,
+    _process_monthly_trend,
+    _process_service_costs,
+)
+from tests.test_tools.test_cost_store import _item
+
+TENANCY = "ocid1.tenancy.oc1..aaaaaaaexample"
+DAYS = [date(2024, 1, 30) + timedelta(days=i) for i in range(4)]
+
+
+def _cube() -> CostCube:
+    store = CostStore()
+    items = []
+    for d in DAYS:
+        items.append(_item(d, "Compute", 10.0, compartment="ocid1.compartment.a"))
+        items.append(_item(d, "Compute", 5.0, compartment="ocid1.compartment.b"))
+        items.append(_item(d, "Storage", 1.0, compartment="ocid1.compartment.b"))
+    store.replace_days(TENANCY, DAYS, items)
+    records = store.query(TENANCY, DAYS, group_by=("service", "compartment_id", "compartment_name"))
+    return CostCube.from_records(DAYS, records)
+
+
+class TestCostCube:
+    """Tests for cube roll-ups and slicing."""
+
+    def test_rollups(self):
+        cube = _cube()
+        assert cube.rollup("service").tolist() == [60.0, 4.0]
+        assert cube.rollup("day", "service").shape == (4, 2)
+        assert cube.rollup("month").tolist() == [32.0, 32.0]
+        assert cube.months == ["2024-01", "2024-02"]
+        assert float(cube.rollup()) == 64.0
+
+    def test_mask_slices(self):
+        cube = _cube()
+        mask = cube.mask(compartments=["ocid1.compartment.b"], first_day=date(2024, 2, 1))
+        assert cube.total(mask) == 12.0
+        assert cube.rollup("service", mask=mask).tolist() == [10.0, 2.0]
+
+    def test_top_k(self):
+        assert top_k(np.array([1.0, 5.0, 3.0]), 2).tolist() == [1, 2]
+        assert top_k(np.array([]), 3).tolist() == []
+
+    @pytest.mark.asyncio
+    async def test_cache_reuses_cube_until_version_changes(self):
+        await clear_cube_cache()
+        builds = 0
+
+        async def _build() -> CostCube:
+            nonlocal builds
+            builds += 1
+            return _cube()
+
+        first = await get_cube(TENANCY, DAYS, "v1", _build)
+        second = await get_cube(TENANCY, DAYS, "v1", _build)
+        await get_cube(TENANCY, DAYS, "v2", _build)
+
+        assert first is second
+        assert builds == 2
+
+
+class TestCubeProcessing:
+    """Tests for cost tool aggregation on the cube."""
+
+    def test_service_drilldown_includes_compartments(self):
+        data = _process_service_costs(_cube(), 1, "s", "e")
+        compute = data["services"][0]
+        assert data["total"] == 64.0
+        assert compute["service"] == "Compute"
+        assert [c["cost"] for c in compute["top_compartments"]] == [40.0, 20.0]
+
+    def test_compartments_use_known_names(self):
+        tree = CompartmentTree(TENANCY, [("ocid1.compartment.b", "data", TENANCY)])
+        data = _process_compartment_costs(_cube(), tree, 5, "s", "e")
+        assert [c["name"] for c in data["compartments"]] == ["apps", "data"]
+        assert data["compartments"][1]["path"] == "data"
+        assert data["compartments"][1]["services"][0] == {"service": "Compute", "cost": 20.0}
+
+    def test_scope_mask_limits_compartments(self):
+        cube = _cube()
+        tree = CompartmentTree(TENANCY, [
+            ("ocid1.compartment.a", "apps", TENANCY),
+            ("ocid1.compartment.b", "data", "ocid1.compartment.a"),
+        ])
+        only_apps = cube.mask(compartments=tree.scope("apps"))
+        data = _process_compartment_costs(cube, tree, 5, "s", "e", mask=only_apps)
+        assert [c["path"] for c in data["compartments"]] == ["apps"]
+        assert data["total_cost"] == 40.0
+
+        subtree = cube.mask(compartments=tree.scope("apps", include_subcompartments=True))
+        assert _process_service_costs(cube, 5, "s", "e", mask=subtree)["total"] == 64.0
+
+    def test_monthly_trend(self):
+        data = _process_monthly_trend(_cube(), 2)
+        assert [m["month"] for m in data["monthly_costs"]] == ["2024-01", "2024-02"]
+        assert data["monthly_costs"][1]["change_percent"] == 0.0
+        assert data["summary"]["total_spend"] == 64.0
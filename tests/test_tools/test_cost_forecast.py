@@ -0,0 +1,200 @@
+"""
+Tests for cost forecasting and budget projection.
+"""
+from __future__ import annotations
+
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from mcp_server_oci.core.compartments import CompartmentTree
+from mcp_server_oci.tools.cost.cube import CostCube
+from mcp_server_oci.tools.cost.forecast import (
+    alert_thresholds,
+    budget_period,
+    budget_status,
+    fit_forecast,
+    project_period,
+    trend_direction,
+)
+from mcp_server_oci.tools.cost.tools import (
+    _fetch_budgets,
+    _process_budget_forecast,
+    _trend_forecast,
+)
+
+TENANCY = "ocid1.tenancy.oc1..aaaaaaaexample"
+START = date(2024, 4, 1)  # a Monday
+
+
+def _record(day, service, cost, compartment):
+    return SimpleNamespace(
+        time_usage_started=day,
+        service=service,
+        compartment_id=compartment,
+        compartment_name=compartment.rsplit(".", 1)[-1],
+        computed_amount=cost,
+        currency="USD",
+    )
+
+
+def _cube(n_days=60):
+    days = [START + timedelta(days=i) for i in range(n_days)]
+    records = []
+    for i, day in enumerate(days):
+        records.append(_record(day, "Compute", 10.0 + i, "ocid1.compartment.prod"))
+        records.append(_record(day, "Storage", 5.0, "ocid1.compartment.dev"))
+    return CostCube.from_records(days, records)
+
+
+def _budget(budget_id, amount, targets, **kwargs):
+    return SimpleNamespace(
+        id=budget_id,
+        display_name=budget_id,
+        amount=amount,
+        target_type=kwargs.pop("target_type", "COMPARTMENT"),
+        targets=targets,
+        budget_processing_period_start_offset=1,
+        processing_period_type="MONTH",
+        actual_spend=kwargs.pop("actual_spend", 0),
+        forecasted_spend=kwargs.pop("forecasted_spend", None),
+        alert_rule_count=kwargs.pop("alert_rule_count", 0),
+    )
+
+
+class TestForecastModel:
+    """Tests for the batched least-squares fit."""
+
+    def test_recovers_trend_and_weekday_pattern(self):
+        n = 56
+        t = np.arange(n)
+        weekend = ((START.weekday() + t) % 7 >= 5).astype(float)
+        values = np.column_stack([
+            100 + 2 * t - 40 * weekend,   # trend with weekend dip
+            np.full(n, 7.0),              # flat service
+        ])
+        forecast = fit_forecast(values, START)
+        assert forecast.seasonal
+        np.testing.assert_allclose(forecast.daily_slope, [2.0, 0.0], atol=1e-8)
+
+        future = forecast.predict(START + timedelta(days=n), 7)
+        expected_t = np.arange(n, n + 7)
+        expected_weekend = ((START.weekday() + expected_t) % 7 >= 5).astype(float)
+        np.testing.assert_allclose(future[:, 0], 100 + 2 * expected_t - 40 * expected_weekend)
+        np.testing.assert_allclose(future[:, 1], 7.0)
+
+    def test_short_history_drops_seasonality(self):
+        forecast = fit_forecast(np.arange(10.0), START)
+        assert not forecast.seasonal
+        assert trend_direction(forecast) == "increasing"
+
+    def test_predictions_are_never_negative(self):
+        forecast = fit_forecast(np.arange(30.0, 0.0, -1.0), START)
+        assert (forecast.predict(START + timedelta(days=30), 30) >= 0).all()
+        assert trend_direction(forecast) == "decreasing"
+
+    def test_project_period(self):
+        values = np.full((30, 1), 10.0)
+        forecast = fit_forecast(values, START)
+        as_of = START + timedelta(days=29)  # April 30
+        period = (date(2024, 4, 15), date(2024, 5, 14))
+        projection = project_period(values, START, forecast, *period, as_of)
+        assert projection["actual"][0] == pytest.approx(160.0)
+        assert projection["forecast"][0] == pytest.approx(140.0)
+        assert projection["projected"][0] == pytest.approx(300.0)
+
+
+class TestBudgetRules:
+    """Tests for budget periods, thresholds and status."""
+
+    def test_budget_period(self):
+        assert budget_period(date(2024, 3, 15)) == (date(2024, 3, 1), date(2024, 3, 31))
+        assert budget_period(date(2024, 3, 5), 10) == (date(2024, 2, 10), date(2024, 3, 9))
+        assert budget_period(date(2024, 12, 20), 10) == (date(2024, 12, 10), date(2025, 1, 9))
+
+    def test_alert_thresholds(self):
+        rules = [
+            SimpleNamespace(threshold=80, threshold_type="PERCENTAGE"),
+            SimpleNamespace(threshold=500, threshold_type="ABSOLUTE"),
+        ]
+        assert alert_thresholds(1000, rules) == [500, 800]
+
+    def test_status(self):
+        assert budget_status(1000, 1100, 1200, []) == "over_budget"
+        assert budget_status(1000, 850, 900, [800]) == "at_risk"
+        assert budget_status(1000, 700, 1050, []) == "at_risk"
+        assert budget_status(1000, 700, 750, [800]) == "on_track"
+
+
+class TestBudgetForecast:
+    """Tests for the month-end projection tool logic."""
+
+    def test_projects_services_and_budgets(self):
+        cube = _cube()
+        as_of = START + timedelta(days=44)  # May 15
+        tree = CompartmentTree(TENANCY, [
+            ("ocid1.compartment.prod", "prod", TENANCY),
+            ("ocid1.compartment.dev", "dev", TENANCY),
+        ])
+        budgets = [
+            (_budget("prod", 1500, ["ocid1.compartment.prod"]), []),
+            (_budget("dev", 1000, ["ocid1.compartment.dev"]), []),
+            (_budget("tagged", 100, [], target_type="TAG", actual_spend=50,
+                     forecasted_spend=120), []),
+        ]
+        data = _process_budget_forecast(cube, tree, budgets, as_of, history_days=45)
+
+        assert data["month"] == "2024-05"
+        assert data["days_remaining"] == 16
+        # Compute grows by 1/day: May 1 is day 30 (cost 40), May 31 is day 60 (cost 70)
+        compute = next(s for s in data["services"] if s["service"] == "Compute")
+        assert compute["actual"] == pytest.approx(sum(40 + i for i in range(15)))
+        assert compute["projected"] == pytest.approx(sum(40 + i for i in range(31)))
+        assert compute["daily_trend"] == pytest.approx(1.0)
+        assert data["total"]["projected"] == pytest.approx(sum(40 + i for i in range(31)) + 155)
+
+        by_id = {b["id"]: b for b in data["budgets"]}
+        assert by_id["prod"]["status"] == "over_budget"
+        assert by_id["dev"]["projected_spend"] == pytest.approx(155)
+        assert by_id["dev"]["status"] == "on_track"
+        assert by_id["tagged"]["source"] == "oci"
+        assert by_id["tagged"]["status"] == "over_budget"
+        assert [b["id"] for b in data["budgets_at_risk"]] == ["tagged", "prod"]
+        assert data["summary"] == {"budgets": 3, "over_budget": 2, "at_risk": 0, "on_track": 1}
+
+    def test_trend_forecast(self):
+        cube = _cube(61)
+        forecast = _trend_forecast(cube, START + timedelta(days=60))  # May 31
+        assert forecast["month"] == "2024-06"
+        assert forecast["trend"] == "increasing"
+        assert forecast["current_month"]["projected"] == pytest.approx(
+            forecast["current_month"]["actual"]
+        )
+        assert forecast["top_services"][0]["service"] == "Compute"
+
+    @pytest.mark.asyncio
+    async def test_fetches_alert_rules_concurrently_and_tolerates_failures(self):
+        class FakeBudgets:
+            def list_budgets(self, compartment_id, **kwargs):
+                return SimpleNamespace(
+                    data=[
+                        _budget("a", 100, [TENANCY], alert_rule_count=1),
+                        _budget("b", 100, [TENANCY], alert_rule_count=1),
+                        _budget("c", 100, [TENANCY]),
+                    ],
+                    has_next_page=False, next_page=None, status=200, headers={}, request=None,
+                )
+
+            def list_alert_rules(self, budget_id, **kwargs):
+                if budget_id == "b":
+                    raise RuntimeError("denied")
+                rule = SimpleNamespace(threshold=90, threshold_type="PERCENTAGE")
+                return SimpleNamespace(
+                    data=[rule], has_next_page=False, next_page=None,
+                    status=200, headers={}, request=None,
+                )
+
+        fetched = await _fetch_budgets(FakeBudgets(), TENANCY)
+        assert [(b.id, len(rules)) for b, rules in fetched] == [("a", 1), ("b", 0), ("c", 0)]
@@ -0,0 +1,188 @@
+"""
+Tests for the local incremental cost store.
+"""
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from mcp_server_oci.tools.cost.store import (
+    CostStore,
+    month_chunks,
+    sync_usage,
+    window_days,
+)
+
+TENANCY = "ocid1.tenancy.oc1..aaaaaaaexample"
+
+
+def _item(day: date, service: str, cost: float, compartment: str = "ocid1.compartment.a"):
+    return SimpleNamespace(
+        time_usage_started=datetime(day.year, day.month, day.day, tzinfo=UTC),
+        service=service,
+        compartment_id=compartment,
+        compartment_name="apps",
+        sku_name="B1",
+        computed_amount=cost,
+        currency="USD",
+    )
+
+
+class FakeUsageApi:
+    """Usage API returning one Compute and one Storage item per requested day."""
+
+    def __init__(self, fail: bool = False, page_size: int | None = None):
+        self.ranges: list[tuple[datetime, datetime]] = []
+        self.pages: list[str | None] = []
+        self.fail = fail
+        self.page_size = page_size
+
+    def request_summarized_usages(self, details, page=None, **kwargs):
+        if self.fail:
+            raise RuntimeError("usage api down")
+        self.ranges.append((details.time_usage_started, details.time_usage_ended))
+        self.pages.append(page)
+        items = []
+        day = details.time_usage_started
+        while day < details.time_usage_ended:
+            items.append(_item(day.date(), "Compute", 10.0))
+            items.append(_item(day.date(), "Storage", 1.0))
+            day += timedelta(days=1)
+        if not self.page_size:
+            return SimpleNamespace(data=SimpleNamespace(items=items), next_page=None)
+        offset = int(page or 0)
+        end = offset + self.page_size
+        return SimpleNamespace(
+            data=SimpleNamespace(items=items[offset:end]),
+            next_page=str(end) if end < len(items) else None,
+        )
+
+
+class TestWindowDays:
+    """Tests for window to day conversion."""
+
+    def test_inclusive_and_exclusive_ends(self):
+        start = datetime(2024, 1, 1, tzinfo=UTC)
+        today = date(2025, 1, 1)
+        inclusive = window_days(start, datetime(2024, 1, 31, 23, 59, 59, tzinfo=UTC), today)
+        exclusive = window_days(start, datetime(2024, 2, 1, tzinfo=UTC), today)
+        assert inclusive == exclusive
+        assert len(inclusive) == 31
+
+    def test_capped_at_today(self):
+        days = window_days(
+            datetime(2024, 1, 1, tzinfo=UTC), datetime(2024, 3, 1, tzinfo=UTC), date(2024, 1, 10)
+        )
+        assert days[-1] == date(2024, 1, 10)
+
+    def test_chunks_split_gaps_and_months(self):
+        days = [date(2024, 1, d) for d in (1, 2, 3, 7, 8, 30, 31)] + [date(2024, 2, 1)]
+        assert [len(c) for c in month_chunks(days)] == [3, 2, 2, 1]
+
+
+class TestCostStore:
+    """Tests for incremental sync and local aggregation."""
+
+    @pytest.mark.asyncio
+    async def test_sync_fetches_only_missing_days(self):
+        store = CostStore()
+        api = FakeUsageApi()
+        today = datetime.now(UTC).date()
+        first = today - timedelta(days=59)
+        days = [first + timedelta(days=i) for i in range(60)]
+
+        first_sync = await sync_usage(api, TENANCY, days[:40], store=store)
+        fetched = len(api.ranges)
+        second_sync = await sync_usage(api, TENANCY, days, store=store)
+
+        assert first_sync.days_fetched == 40
+        assert first_sync.calls == len({(d.year, d.month) for d in days[:40]})
+        assert second_sync.days_fetched == 20
+        assert min(start for start, _ in api.ranges[fetched:]).date() == days[40]
+
+    @pytest.mark.asyncio
+    async def test_follows_pagination(self):
+        store = CostStore()
+        api = FakeUsageApi(page_size=7)
+        days = [date(2024, 3, d) for d in range(1, 11)]
+
+        result = await sync_usage(api, TENANCY, days, store=store)
+
+        assert result.calls == 3  # 20 items in pages of 7
+        assert api.pages == [None, "7", "14"]
+        totals = store.query(TENANCY, days, group_by=(), granularity="MONTHLY")
+        assert totals[0].computed_amount == 110.0
+
+    @pytest.mark.asyncio
+    async def test_months_fetched_concurrently(self):
+        store = CostStore()
+        api = FakeUsageApi()
+        days = [date(2024, 1, 1) + timedelta(days=i) for i in range(366)]
+
+        result = await sync_usage(api, TENANCY, days, store=store)
+
+        assert result.calls == 12
+        assert sorted(r[0].month for r in api.ranges) == list(range(1, 13))
+        assert len(store.query(TENANCY, days)) == 2 * 366
+
+    @pytest.mark.asyncio
+    async def test_unsettled_days_resync_when_stale(self):
+        store = CostStore()
+        api = FakeUsageApi()
+        today = datetime.now(UTC).date()
+        days = [today - timedelta(days=i) for i in range(10, -1, -1)]
+
+        await sync_usage(api, TENANCY, days, store=store)
+        fresh = await sync_usage(api, TENANCY, days, store=store)
+        stale = await sync_usage(api, TENANCY, days, store=store, max_age_seconds=0)
+
+        assert fresh.days_fetched == 0
+        assert 0 < stale.days_fetched < len(days)
+
+    def test_query_groups_and_granularity(self):
+        store = CostStore()
+        days = [date(2024, 1, 30) + timedelta(days=i) for i in range(4)]
+        store.replace_days(TENANCY, days, [
+            *[_item(d, "Compute", 10.0) for d in days],
+            *[_item(d, "Storage", 1.0) for d in days],
+        ])
+
+        by_service = store.query(TENANCY, days, group_by=("service",), granularity="MONTHLY")
+        totals = {(r.time_usage_started.month, r.service): r.computed_amount for r in by_service}
+        assert totals == {
+            (1, "Compute"): 20.0, (1, "Storage"): 2.0,
+            (2, "Compute"): 20.0, (2, "Storage"): 2.0,
+        }
+
+        daily_total = store.query(TENANCY, days, group_by=())
+        assert [r.computed_amount for r in daily_total] == [11.0] * 4
+        assert daily_total[0].service is None
+
+    @pytest.mark.asyncio
+    async def test_failed_sync_keeps_local_data(self):
+        store = CostStore()
+        today = datetime.now(UTC).date()
+        days = [today - timedelta(days=i) for i in range(5, -1, -1)]
+        await sync_usage(FakeUsageApi(), TENANCY, days, store=store)
+
+        result = await sync_usage(
+            FakeUsageApi(fail=True), TENANCY, days, store=store, force=True
+        )
+        freshness = store.freshness(TENANCY, days)
+
+        assert result.error == "usage api down"
+        assert freshness["missing_days"] == 0
+        assert len(store.query(TENANCY, days)) == 12
+
+    def test_freshness_reports_missing_days(self):
+        store = CostStore()
+        days = [date(2024, 1, 1), date(2024, 1, 2)]
+        store.replace_days(TENANCY, days[:1], [_item(days[0], "Compute", 1.0)])
+
+        freshness = store.freshness(TENANCY, days)
+
+        assert freshness["missing_days"] == 1
+        assert freshness["stale"] is True
+        assert freshness["as_of"] is not None
@@ -0,0 +1,169 @@
+"""
+Tests for tag cost allocation.
+"""
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from mcp_server_oci.core.compartments import CompartmentTree
+from mcp_server_oci.tools.cost.store import CostStore, sync_usage
+from mcp_server_oci.tools.cost.tags import UNTAGGED, TagCube
+from mcp_server_oci.tools.cost.tools import _process_tag_costs
+
+TENANCY = "ocid1.tenancy.oc1..aaaaaaaexample"
+START = date(2024, 3, 30)
+DAYS = [START + timedelta(days=i) for i in range(3)]  # crosses into April
+
+# resource -> (service, compartment, daily cost, tags)
+RESOURCES = {
+    "ocid1.instance.web": ("Compute", "ocid1.compartment.prod", 10.0, [
+        ("Ops", "CostCenter", "cc-1"), (None, "team", "web"),
+    ]),
+    "ocid1.instance.batch": ("Compute", "ocid1.compartment.prod", 6.0, [
+        ("Ops", "CostCenter", "cc-2"), (None, "team", "data"),
+    ]),
+    "ocid1.bucket.logs": ("Object Storage", "ocid1.compartment.dev", 4.0, [
+        (None, "team", "data"),
+    ]),
+    "ocid1.volume.scratch": ("Block Storage", "ocid1.compartment.dev", 2.0, []),
+}
+
+
+def _items(day: date):
+    """One Usage API item per (resource, tag), as returned for tag group-bys."""
+    items = []
+    for resource, (service, compartment, cost, tags) in RESOURCES.items():
+        for namespace, key, value in tags or [(None, None, None)]:
+            items.append(SimpleNamespace(
+                time_usage_started=datetime(day.year, day.month, day.day, tzinfo=UTC),
+                resource_id=resource,
+                service=service,
+                compartment_id=compartment,
+                tags=[SimpleNamespace(namespace=namespace, key=key, value=value)] if key else [],
+                computed_amount=cost,
+                currency="USD",
+            ))
+    return items
+
+
+class FakeTagUsageApi:
+    """Usage API serving tag-grouped items for every requested day."""
+
+    def __init__(self):
+        self.group_bys = []
+
+    def request_summarized_usages(self, details, page=None, **kwargs):
+        self.group_bys.append(details.group_by)
+        items = []
+        day = details.time_usage_started
+        while day < details.time_usage_ended:
+            items.extend(_items(day.date()))
+            day += timedelta(days=1)
+        return SimpleNamespace(data=SimpleNamespace(items=items), next_page=None)
+
+
+async def _synced_cube():
+    store = CostStore(":memory:")
+    api = FakeTagUsageApi()
+    result = await sync_usage(api, TENANCY, DAYS, store=store, dataset="tags")
+    assert result.days_fetched == 3
+    assert "tagKey" in api.group_bys[0]
+    return store, TagCube.from_records(DAYS, store.query_tags(TENANCY, DAYS))
+
+
+class TestTagStore:
+    """Tests for syncing and storing the tag dataset."""
+
+    @pytest.mark.asyncio
+    async def test_tag_dataset_is_synced_separately(self):
+        store, _ = await _synced_cube()
+        assert store.days_to_sync(TENANCY, DAYS, dataset="tags") == []
+        assert store.days_to_sync(TENANCY, DAYS) == DAYS
+        assert store.freshness(TENANCY, DAYS, dataset="tags")["missing_days"] == 0
+
+    @pytest.mark.asyncio
+    async def test_round_trip_keeps_one_row_per_tag(self):
+        store, _ = await _synced_cube()
+        records = store.query_tags(TENANCY, DAYS[:1])
+        # web and batch carry two tags, logs one, scratch is untagged
+        assert len(records) == 6
+        keys = {(r.resource_id, r.tag_key) for r in records}
+        assert ("ocid1.instance.web", "Ops.CostCenter") in keys
+        assert ("ocid1.instance.web", "team") in keys
+        assert ("ocid1.volume.scratch", "") in keys
+
+
+class TestTagCube:
+    """Tests for in-memory tag group-bys."""
+
+    @pytest.mark.asyncio
+    async def test_lines_carry_full_cost_once(self):
+        _, cube = await _synced_cube()
+        assert len(cube) == 12
+        assert cube.total() == pytest.approx(66.0)
+
+    @pytest.mark.asyncio
+    async def test_multi_tag_group_by(self):
+        _, cube = await _synced_cube()
+        keys, totals = cube.group_by(["team", "Ops.CostCenter"])
+        result = dict(zip(keys, totals.tolist(), strict=True))
+        assert result == {
+            ("web", "cc-1"): pytest.approx(30.0),
+            ("data", "cc-2"): pytest.approx(18.0),
+            ("data", UNTAGGED): pytest.approx(12.0),
+            (UNTAGGED, UNTAGGED): pytest.approx(6.0),
+        }
+
+    @pytest.mark.asyncio
+    async def test_month_and_filters(self):
+        _, cube = await _synced_cube()
+        mask = cube.mask({"team": ["data"], "service": ["Compute"]})
+        keys, totals = cube.group_by(["month"], mask)
+        assert dict(zip(keys, totals.tolist(), strict=True)) == {
+            ("2024-03",): pytest.approx(12.0),
+            ("2024-04",): pytest.approx(6.0),
+        }
+        untagged = cube.mask({"tag:costcenter": [UNTAGGED]})
+        assert cube.total(untagged) == pytest.approx(18.0)
+
+    @pytest.mark.asyncio
+    async def test_resolve(self):
+        _, cube = await _synced_cube()
+        assert cube.resolve("Service") == "service"
+        assert cube.resolve("ops.costcenter") == "Ops.CostCenter"
+        assert cube.resolve("tag:TEAM") == "team"
+        with pytest.raises(ValueError, match="Tag keys in this window"):
+            cube.resolve("owner")
+
+    @pytest.mark.asyncio
+    async def test_coverage_and_key_summary(self):
+        _, cube = await _synced_cube()
+        assert cube.tagged_share("team") == pytest.approx(60 / 66)
+        summary = cube.key_summary()
+        assert [k["key"] for k in summary] == ["team", "Ops.CostCenter"]
+        assert summary[1]["values"] == 2
+        assert summary[1]["tagged_cost"] == pytest.approx(48.0)
+
+
+class TestCostByTag:
+    """Tests for the tool's processing step."""
+
+    @pytest.mark.asyncio
+    async def test_ranks_groups_within_scope(self):
+        _, cube = await _synced_cube()
+        tree = CompartmentTree(TENANCY, [
+            ("ocid1.compartment.prod", "prod", TENANCY),
+            ("ocid1.compartment.dev", "dev", TENANCY),
+        ])
+        data = _process_tag_costs(
+            cube, ["compartment", "team"], None, 2, "2024-03-30", "2024-04-02",
+            scope=["ocid1.compartment.dev"], tree=tree,
+        )
+        assert data["total_cost"] == pytest.approx(18.0)
+        assert data["group_count"] == 2
+        assert data["groups"][0]["keys"] == {"compartment": "dev", "team": "data"}
+        assert data["groups"][0]["percentage"] == pytest.approx(12 / 18 * 100)
+        assert data["tag_coverage"] == {"team": pytest.approx(66.7)}
@@ -0,0 +1,291 @@
+"""
+Tests for the fleet backup recoverability scan.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from mcp_server_oci.core.cache import TTLCache
+from mcp_server_oci.core.concurrency import CallBudget
+from mcp_server_oci.tools.database import backups
+from mcp_server_oci.tools.database.backups import (
+    BackupRecords,
+    get_backup_records,
+    rollup,
+    scan_backups,
+)
+from mcp_server_oci.tools.database.formatters import DatabaseFormatter
+
+NOW = datetime(2024, 5, 1, 12, tzinfo=UTC)
+PROD = "ocid1.compartment.prod"
+DEV = "ocid1.compartment.dev"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(monkeypatch):
+    """Isolate the scan cache per test."""
+    cache = TTLCache(max_size=100, default_ttl=60)
+    monkeypatch.setattr(backups, "get_cache", lambda tier: cache)
+
+
+def _ago(hours):
+    return NOW - timedelta(hours=hours)
+
+
+def _db(database_id, name, state="AVAILABLE", compartment=PROD):
+    return {
+        "id": database_id, "display_name": name, "type": "autonomous",
+        "compartment_id": compartment, "lifecycle_state": state,
+    }
+
+
+def _records():
+    databases = [
+        _db("ocid1.autonomousdatabase.fresh", "fresh"),
+        _db("ocid1.autonomousdatabase.stale", "stale"),
+        _db("ocid1.autonomousdatabase.gappy", "gappy"),
+        _db("ocid1.autonomousdatabase.never", "never"),
+        _db("ocid1.autonomousdatabase.dropped", "dropped", state="TERMINATED"),
+    ]
+    rows = [
+        ("ocid1.autonomousdatabase.fresh", "ACTIVE", _ago(2), 10.0),
+        ("ocid1.autonomousdatabase.fresh", "ACTIVE", _ago(26), 10.0),
+        ("ocid1.autonomousdatabase.fresh", "FAILED", _ago(14), 0.0),
+        ("ocid1.autonomousdatabase.stale", "ACTIVE", _ago(72), 5.0),
+        ("ocid1.autonomousdatabase.gappy", "ACTIVE", _ago(1), 1.0),
+        ("ocid1.autonomousdatabase.gappy", "ACTIVE", _ago(49), 1.0),
+        ("ocid1.autonomousdatabase.never", "CREATING", None, 0.0),
+        ("ocid1.autonomousdatabase.dropped", "ACTIVE", _ago(100), 7.0),
+    ]
+    return BackupRecords.build(databases, rows)
+
+
+def _page(items):
+    return SimpleNamespace(
+        data=items, has_next_page=False, next_page=None, status=200, headers={}, request=None
+    )
+
+
+def _paged(pages):
+    """Serve ``pages`` in order, following the page token."""
+    def _call(*args, page=None, **kwargs):
+        i = int(page or 0)
+        response = _page(pages[i])
+        if i + 1 < len(pages):
+            response.has_next_page = True
+            response.next_page = str(i + 1)
+        return response
+    return _call
+
+
+class FakeDatabaseClient:
+    """Database client with two pages of ADB backups and one DB System."""
+
+    def __init__(self):
+        self.calls = []
+        adb = SimpleNamespace(
+            id="ocid1.autonomousdatabase.a", display_name="sales", compartment_id=PROD,
+            lifecycle_state="AVAILABLE",
+        )
+        system = SimpleNamespace(
+            id="ocid1.dbsystem.s", display_name="erp", lifecycle_state="AVAILABLE"
+        )
+        db = SimpleNamespace(
+            id="ocid1.database.d", db_name="ERP", compartment_id=PROD,
+            lifecycle_state="AVAILABLE",
+        )
+        adb_backups = [
+            [SimpleNamespace(autonomous_database_id=adb.id, lifecycle_state="ACTIVE",
+                             time_ended=_ago(h), size_in_tbs=0.5,
+                             database_size_in_tbs=2.0) for h in (1, 25)],
+            [SimpleNamespace(autonomous_database_id=adb.id, lifecycle_state="FAILED",
+                             time_ended=_ago(49), size_in_tbs=0.5,
+                             database_size_in_tbs=2.0)],
+        ]
+        self._lists = {
+            "list_autonomous_databases": [[adb]],
+            "list_autonomous_database_backups": adb_backups,
+            "list_db_systems": [[system]],
+            "list_backups": [[SimpleNamespace(
+                database_id=db.id, lifecycle_state="ACTIVE", time_ended=_ago(3),
+                database_size_in_gbs=40,
+            )]],
+            "list_databases": [[db]],
+        }
+
+    def __getattr__(self, name):
+        if name not in self._lists:
+            raise AttributeError(name)
+        paged = _paged(self._lists[name])
+
+        def _call(*args, **kwargs):
+            self.calls.append((name, kwargs.get("compartment_id"), kwargs.get("page")))
+            if kwargs.get("compartment_id") == DEV and name == "list_backups":
+                raise RuntimeError("NotAuthorizedOrNotFound")
+            return paged(*args, **kwargs)
+        return _call
+
+
+class TestBackupRollup:
+    """Tests for the per-database roll-up."""
+
+    def test_statuses_worst_first(self):
+        rows, summary = rollup(_records(), NOW, max_age_hours=24, gap_hours=36, lookback_days=30)
+        assert [(r["display_name"], r["status"]) for r in rows] == [
+            ("never", "never_backed_up"),
+            ("stale", "stale"),
+            ("gappy", "gaps"),
+            ("fresh", "ok"),
+        ]
+        fresh = rows[-1]
+        assert fresh["age_hours"] == pytest.approx(2.0)
+        assert fresh["backups"] == 3
+        assert fresh["failed"] == 1
+        assert fresh["size_gb"] == pytest.approx(20.0)
+        assert fresh["max_gap_hours"] == pytest.approx(24.0)
+        assert rows[2]["max_gap_hours"] == pytest.approx(48.0)
+        assert rows[0]["last_backup"] is None
+
+    def test_summary_counts_orphaned_backups(self):
+        _, summary = rollup(_records(), NOW, max_age_hours=24, gap_hours=36, lookback_days=30)
+        assert summary == {
+            "databases": 4,
+            "never_backed_up": 1, "stale": 1, "gaps": 1, "ok": 1,
+            "backups": 8,
+            "failed_backups": 1,
+            "backup_size_gb": pytest.approx(34.0),
+            "database_size_gb": 0.0,
+            "orphaned_backups": 1,
+            "orphaned_size_gb": pytest.approx(7.0),
+        }
+
+    def test_db_system_size_is_not_summed_per_backup(self):
+        records = BackupRecords.build(
+            [{**_db("ocid1.database.erp", "erp"), "type": "db_system"}],
+            [("ocid1.database.erp", "ACTIVE", _ago(h), size) for h, size in
+             ((48, 90.0), (24, 100.0), (2, 110.0))],
+        )
+        rows, summary = rollup(records, NOW, 24, 36, 30)
+        assert (rows[0]["size_gb"], rows[0]["size_basis"]) == (110.0, "database")
+        assert (summary["backup_size_gb"], summary["database_size_gb"]) == (0.0, 110.0)
+
+    def test_thresholds_and_lookback(self):
+        rows, _ = rollup(_records(), NOW, max_age_hours=96, gap_hours=36, lookback_days=1)
+        status = {r["display_name"]: r["status"] for r in rows}
+        # The 49h-old backup is outside a 1-day window, so no gap is seen
+        assert status["gappy"] == "ok"
+        assert status["stale"] == "ok"
+
+    def test_payload_round_trip(self):
+        records = _records()
+        restored = BackupRecords.from_payload(records.to_payload())
+        assert rollup(restored, NOW, 24, 36, 30) == rollup(records, NOW, 24, 36, 30)
+
+
+class TestBackupScan:
+    """Tests for concurrent, paginated listing and caching."""
+
+    @pytest.mark.asyncio
+    async def test_follows_pages_across_database_kinds(self):
+        client = FakeDatabaseClient()
+        records, errors = await scan_backups(client, [PROD])
+        assert errors == []
+        assert len(records) == 4
+        rows, summary = rollup(records, NOW, 24, 36, 30)
+        by_name = {r["display_name"]: r for r in rows}
+        assert by_name["sales"]["backups"] == 3
+        assert by_name["sales"]["size_gb"] == pytest.approx(1024.0)
+        assert by_name["erp/ERP"]["type"] == "db_system"
+        assert by_name["erp/ERP"]["size_gb"] == pytest.approx(40.0)
+        assert by_name["erp/ERP"]["size_basis"] == "database"
+        assert summary["backup_size_gb"] == pytest.approx(1024.0)
+        assert summary["database_size_gb"] == pytest.approx(40.0)
+        pages = [p for name, _, p in client.calls if name == "list_autonomous_database_backups"]
+        assert pages == [None, "1"]
+
+    @pytest.mark.asyncio
+    async def test_listing_errors_are_partial(self):
+        client = FakeDatabaseClient()
+        records, errors = await scan_backups(client, [PROD, DEV], include_autonomous=False)
+        assert errors == [{
+            "compartment_id": DEV, "listing": "backups", "error": "NotAuthorizedOrNotFound",
+        }]
+        assert len(records) == 1
+
+    @pytest.mark.asyncio
+    async def test_complete_scans_are_cached(self):
+        client = FakeDatabaseClient()
+        first, _, info = await get_backup_records(client, [PROD])
+        assert info["cached"] is False
+        calls = len(client.calls)
+
+        second, _, info = await get_backup_records(client, [PROD])
+        assert info["cached"] is True
+        assert len(client.calls) == calls
+        assert rollup(second, NOW, 24, 36, 30) == rollup(first, NOW, 24, 36, 30)
+
+        _, _, info = await get_backup_records(client, [PROD], refresh=True)
+        assert info["cached"] is False
+
+    @pytest.mark.asyncio
+    async def test_partial_scans_are_not_cached(self):
+        client = FakeDatabaseClient()
+        await get_backup_records(client, [DEV], include_autonomous=False)
+        _, errors, info = await get_backup_records(client, [DEV], include_autonomous=False)
+        assert info["cached"] is False
+        assert errors
+
+    @pytest.mark.asyncio
+    async def test_nested_listings_share_one_budget(self):
+        inner = FakeDatabaseClient()
+        lock = threading.Lock()
+        state = {"in_flight": 0, "peak": 0}
+
+        class SlowClient:
+            def __getattr__(self, name):
+                func = getattr(inner, name)
+
+                def _call(*args, **kwargs):
+                    with lock:
+                        state["in_flight"] += 1
+                        state["peak"] = max(state["peak"], state["in_flight"])
+                    try:
+                        time.sleep(0.01)
+                        return func(*args, **kwargs)
+                    finally:
+                        with lock:
+                            state["in_flight"] -= 1
+                return _call
+
+        budget = CallBudget(3)
+        compartments = [f"ocid1.compartment.c{i}" for i in range(4)]
+        await scan_backups(SlowClient(), compartments, budget=budget)
+        assert state["peak"] == 3
+        # Per compartment: 2 autonomous listings, 2 DB System listings and
+        # the databases of its one system
+        assert budget.calls == 4 * 5
+
+
+class TestBackupReportFormatting:
+    """Tests for the markdown report."""
+
+    def test_markdown_lists_worst_databases(self):
+        rows, summary = rollup(_records(), NOW, 24, 36, 30)
+        md = DatabaseFormatter.backup_report_markdown({
+            "scope": {"compartment_id": PROD, "path": "prod", "compartments": 1},
+            "thresholds": {"max_age_hours": 24, "gap_hours": 36, "lookback_days": 30},
+            "summary": summary,
+            "databases": rows[:2],
+            "errors": [],
+            "scanned_at": NOW.isoformat(),
+            "cached": True,
+        })
+        assert "never_backed_up" in md
+        assert "Showing 2 of 4 databases" in md
+        assert "Backups of deleted databases:** 1" in md
+        assert "(cached)" in md
@@ -0,0 +1,128 @@
+"""
+Tests for concurrent database metric collection.
+"""
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from mcp_server_oci.core import metrics
+from mcp_server_oci.tools.database.tools import _collect_database_metrics, _describe_databases
+
+ADB_A = "ocid1.autonomousdatabase.oc1..a"
+ADB_B = "ocid1.autonomousdatabase.oc1..b"
+ADB_OTHER = "ocid1.autonomousdatabase.oc1..other"
+DBSYS = "ocid1.dbsystem.oc1..sys"
+MISSING = "ocid1.autonomousdatabase.oc1..gone"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(monkeypatch):
+    """Isolate the metrics history cache per test."""
+    from mcp_server_oci.core.cache import TTLCache
+    cache = TTLCache(max_size=1000, default_ttl=3600)
+    monkeypatch.setattr(metrics, "get_cache", lambda tier: cache)
+
+
+def _db(database_id, compartment):
+    return SimpleNamespace(
+        id=database_id,
+        display_name=database_id.rsplit(".", 1)[-1],
+        compartment_id=compartment,
+        lifecycle_state="AVAILABLE",
+        db_name="db",
+        time_created=None,
+    )
+
+
+class FakeDatabase:
+    """Database client serving a fixed set of databases."""
+
+    def __init__(self):
+        self.dbs = {
+            ADB_A: _db(ADB_A, "ocid1.compartment.prod"),
+            ADB_B: _db(ADB_B, "ocid1.compartment.prod"),
+            ADB_OTHER: _db(ADB_OTHER, "ocid1.compartment.dev"),
+            DBSYS: _db(DBSYS, "ocid1.compartment.prod"),
+        }
+
+    def get_autonomous_database(self, autonomous_database_id):
+        if autonomous_database_id not in self.dbs:
+            raise RuntimeError("NotAuthorizedOrNotFound")
+        return SimpleNamespace(data=self.dbs[autonomous_database_id])
+
+    def get_db_system(self, db_system_id):
+        return SimpleNamespace(data=self.dbs[db_system_id])
+
+
+class FakeMonitoring:
+    """Monitoring client returning one stream per selected resource."""
+
+    def __init__(self, fail_metric=None, silent=()):
+        self.calls = []
+        self.fail_metric = fail_metric
+        self.silent = set(silent)
+
+    def summarize_metrics_data(self, compartment_id, details, **kwargs):
+        metric = details.query.split("[", 1)[0]
+        self.calls.append((compartment_id, details.namespace, metric))
+        if metric == self.fail_metric:
+            raise RuntimeError("throttled")
+        selector = details.query.split('"')[1]
+        return SimpleNamespace(data=[
+            SimpleNamespace(
+                dimensions={"resourceId": rid},
+                aggregated_datapoints=[
+                    SimpleNamespace(timestamp=details.end_time - timedelta(hours=1), value=40.0),
+                ],
+            )
+            for rid in selector.split("|")
+            if rid not in self.silent
+        ])
+
+
+class TestDatabaseMetrics:
+    """Tests for multi-database, multi-metric collection."""
+
+    @pytest.mark.asyncio
+    async def test_lookup_failures_are_reported_not_raised(self):
+        databases, failures = await _describe_databases(FakeDatabase(), [ADB_A, MISSING, DBSYS])
+        assert list(databases) == [ADB_A, DBSYS]
+        assert [f["database_id"] for f in failures] == [MISSING]
+        assert "NotAuthorizedOrNotFound" in failures[0]["error"]
+
+    @pytest.mark.asyncio
+    async def test_groups_queries_by_namespace_and_compartment(self):
+        databases, _ = await _describe_databases(
+            FakeDatabase(), [ADB_A, ADB_B, ADB_OTHER, DBSYS]
+        )
+        monitoring = FakeMonitoring()
+        end = datetime.now(UTC)
+        results = await _collect_database_metrics(
+            monitoring, databases, ["CpuUtilization", "Sessions"], end - timedelta(hours=6), end
+        )
+        # 3 groups (prod ADB, dev ADB, prod DB system) x 2 metrics
+        assert len(monitoring.calls) == 6
+        assert {(c, ns) for c, ns, _ in monitoring.calls} == {
+            ("ocid1.compartment.prod", "oci_autonomous_database"),
+            ("ocid1.compartment.dev", "oci_autonomous_database"),
+            ("ocid1.compartment.prod", "oci_database"),
+        }
+        assert [r["database"]["id"] for r in results] == [ADB_A, ADB_B, ADB_OTHER, DBSYS]
+        assert all(r["metrics"]["CpuUtilization"]["average"] == 40.0 for r in results)
+
+    @pytest.mark.asyncio
+    async def test_partial_failures_per_metric(self):
+        databases, _ = await _describe_databases(FakeDatabase(), [ADB_A, ADB_B])
+        monitoring = FakeMonitoring(fail_metric="Sessions", silent={ADB_B})
+        end = datetime.now(UTC)
+        results = await _collect_database_metrics(
+            monitoring, databases, ["CpuUtilization", "Sessions"], end - timedelta(hours=6), end
+        )
+        a, b = results
+        assert list(a["metrics"]) == ["CpuUtilization"]
+        assert a["errors"] == {"Sessions": "throttled"}
+        assert b["metrics"] == {}
+        assert b["missing_metrics"] == ["CpuUtilization"]
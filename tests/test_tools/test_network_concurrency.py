@@ -0,0 +1,255 @@
+"""
+Tests that network tools keep the event loop free and avoid N+1 listings.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from fastmcp import FastMCP
+
+from mcp_server_oci.core.cache import TTLCache
+from mcp_server_oci.core.compartments import CompartmentTree
+from mcp_server_oci.tools.network import tools
+from mcp_server_oci.tools.network.models import (
+    GetVcnInput,
+    ListSecurityListsInput,
+    ListSubnetsInput,
+    ListVcnsInput,
+)
+
+COMPARTMENT = "ocid1.compartment.oc1..net"
+VCN = "ocid1.vcn.oc1..main"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(monkeypatch):
+    """Isolate the VCN inventory cache per test."""
+    cache = TTLCache(max_size=100, default_ttl=60)
+    monkeypatch.setattr(tools, "get_cache", lambda tier: cache)
+
+
+def _page(items):
+    return SimpleNamespace(
+        data=items, has_next_page=False, next_page=None, status=200, headers={}, request=None
+    )
+
+
+def _vcn(vcn_id):
+    return SimpleNamespace(
+        id=vcn_id, display_name=vcn_id.rsplit(".", 1)[-1], cidr_block="10.0.0.0/16",
+        cidr_blocks=["10.0.0.0/16"], lifecycle_state="AVAILABLE", dns_label="main",
+        default_dhcp_options_id=None, default_route_table_id=None,
+        default_security_list_id=None, time_created=None, compartment_id=COMPARTMENT,
+    )
+
+
+def _subnet(vcn_id, n=0):
+    return SimpleNamespace(
+        id=f"{vcn_id}.subnet{n}", display_name="app", cidr_block="10.0.1.0/24",
+        lifecycle_state="AVAILABLE", availability_domain=None,
+        prohibit_public_ip_on_vnic=True, dns_label="app", vcn_id=vcn_id,
+        route_table_id=None, security_list_ids=[], time_created=None,
+        compartment_id=COMPARTMENT,
+    )
+
+
+class SlowNetworkClient:
+    """VirtualNetwork client whose calls block the calling thread."""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.calls = []
+
+    def _block(self, name):
+        self.calls.append(name)
+        time.sleep(self.delays.get(name, 0))
+
+    def list_vcns(self, compartment_id, **kwargs):
+        self._block("list_vcns")
+        return _page([_vcn(f"{VCN}{i}") for i in range(4)])
+
+    def get_vcn(self, vcn_id):
+        self._block("get_vcn")
+        return SimpleNamespace(data=_vcn(vcn_id))
+
+    def list_subnets(self, compartment_id, vcn_id=None, **kwargs):
+        self._block("list_subnets")
+        if vcn_id:
+            return _page([_subnet(vcn_id)])
+        # Compartment-wide: VCN i has i subnets
+        return _page([_subnet(f"{VCN}{i}", n) for i in range(4) for n in range(i)])
+
+    def list_security_lists(self, compartment_id, vcn_id=None, **kwargs):
+        self._block("list_security_lists")
+        return SimpleNamespace(data=[])
+
+
+async def _network_tools(monkeypatch, delays, client=None):
+    client = client or SlowNetworkClient(delays)
+
+    @asynccontextmanager
+    async def fake_client(*args, **kwargs):
+        yield SimpleNamespace(virtual_network=client, identity=None, tenancy_id=COMPARTMENT)
+
+    monkeypatch.setattr(tools, "get_oci_client", fake_client)
+    mcp = FastMCP("network-test")
+    tools.register_network_tools(mcp)
+    return {name: (await mcp.get_tool(name)).fn for name in (
+        "oci_network_list_vcns", "oci_network_get_vcn", "oci_network_list_subnets",
+        "oci_network_list_security_lists",
+    )}
+
+
+async def _timed(aw):
+    started = time.monotonic()
+    result = await aw
+    return result, time.monotonic() - started
+
+
+class TestNetworkConcurrency:
+    """Tests for non-blocking VirtualNetwork calls."""
+
+    @pytest.mark.asyncio
+    async def test_slow_call_does_not_delay_other_tools(self, monkeypatch):
+        fns = await _network_tools(monkeypatch, {"list_vcns": 0.5})
+        slow = asyncio.create_task(_timed(fns["oci_network_list_vcns"](
+            ListVcnsInput(compartment_id=COMPARTMENT, response_format="json")
+        )))
+        await asyncio.sleep(0.05)
+        fast, fast_elapsed = await _timed(fns["oci_network_list_subnets"](
+            ListSubnetsInput(compartment_id=COMPARTMENT, response_format="json")
+        ))
+        assert not slow.done()
+        assert fast_elapsed < 0.2
+        assert json.loads(fast)["count"] == 6
+
+        result, slow_elapsed = await slow
+        assert slow_elapsed >= 0.5
+        assert json.loads(result)["count"] == 4
+
+    @pytest.mark.asyncio
+    async def test_fan_out_calls_run_concurrently(self, monkeypatch):
+        fns = await _network_tools(
+            monkeypatch, {"list_vcns": 0.3, "list_subnets": 0.3, "list_security_lists": 0.3}
+        )
+        result, elapsed = await _timed(fns["oci_network_list_vcns"](
+            ListVcnsInput(compartment_id=COMPARTMENT, response_format="json")
+        ))
+        # VCNs and subnets are listed side by side
+        assert elapsed < 0.55
+        assert len(json.loads(result)["vcns"]) == 4
+
+        result, elapsed = await _timed(fns["oci_network_get_vcn"](
+            GetVcnInput(vcn_id=VCN, response_format="json")
+        ))
+        assert elapsed < 0.55
+        data = json.loads(result)
+        assert len(data["subnets"]) == 1
+        assert data["security_lists"] == []
+
+
+class TestVcnSubnetCounts:
+    """Tests for counting subnets without one listing per VCN."""
+
+    @pytest.mark.asyncio
+    async def test_one_subnet_listing_grouped_by_vcn(self, monkeypatch):
+        client = SlowNetworkClient({})
+        fns = await _network_tools(monkeypatch, {}, client)
+        result = await fns["oci_network_list_vcns"](
+            ListVcnsInput(compartment_id=COMPARTMENT, response_format="json")
+        )
+        assert [v["subnet_count"] for v in json.loads(result)["vcns"]] == [0, 1, 2, 3]
+        assert sorted(client.calls) == ["list_subnets", "list_vcns"]
+
+        # Served from the cached inventory
+        await fns["oci_network_list_vcns"](
+            ListVcnsInput(compartment_id=COMPARTMENT, limit=2, display_name="main")
+        )
+        assert len(client.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_counts_are_loaded_only_when_needed(self, monkeypatch):
+        client = SlowNetworkClient({})
+        fns = await _network_tools(monkeypatch, {}, client)
+        result = await fns["oci_network_list_vcns"](ListVcnsInput(
+            compartment_id=COMPARTMENT, include_subnet_counts=False, response_format="json"
+        ))
+        assert "subnet_count" not in json.loads(result)["vcns"][0]
+        assert client.calls == ["list_vcns"]
+
+        result = await fns["oci_network_list_vcns"](
+            ListVcnsInput(compartment_id=COMPARTMENT, response_format="json")
+        )
+        assert json.loads(result)["vcns"][3]["subnet_count"] == 3
+        assert client.calls == ["list_vcns", "list_subnets"]
+
+
+class TestSubcompartments:
+    """Tests for listing a compartment subtree."""
+
+    CHILD = "ocid1.compartment.oc1..child"
+
+    class SubtreeClient:
+        """One VCN, subnet and security list per compartment."""
+
+        def __init__(self):
+            self.compartments = []
+
+        def list_vcns(self, compartment_id, **kwargs):
+            self.compartments.append(compartment_id)
+            return _page([_vcn(f"{VCN}.{compartment_id.rsplit('.', 1)[-1]}")])
+
+        def list_subnets(self, compartment_id, vcn_id=None, **kwargs):
+            self.compartments.append(compartment_id)
+            return _page([_subnet(f"{VCN}.{compartment_id.rsplit('.', 1)[-1]}")])
+
+        def list_security_lists(self, compartment_id, vcn_id=None, **kwargs):
+            self.compartments.append(compartment_id)
+            return _page([SimpleNamespace(
+                id=f"sl.{compartment_id}", display_name="default", vcn_id=VCN,
+                lifecycle_state="AVAILABLE", ingress_security_rules=[],
+                egress_security_rules=[], time_created=None, compartment_id=compartment_id,
+            )])
+
+    @pytest.fixture
+    async def subtree_tools(self, monkeypatch):
+        tree = CompartmentTree(COMPARTMENT, [(self.CHILD, "child", COMPARTMENT)])
+
+        async def fake_tree(identity, tenancy_id, refresh=False):
+            return tree
+
+        monkeypatch.setattr(tools, "get_compartment_tree", fake_tree)
+        client = self.SubtreeClient()
+        return client, await _network_tools(monkeypatch, {}, client)
+
+    @pytest.mark.asyncio
+    async def test_lists_every_compartment_of_the_subtree(self, subtree_tools):
+        client, fns = subtree_tools
+        vcns = json.loads(await fns["oci_network_list_vcns"](ListVcnsInput(
+            compartment_id=COMPARTMENT, include_subcompartments=True, response_format="json",
+        )))
+        assert vcns["count"] == 2
+        assert [v["subnet_count"] for v in vcns["vcns"]] == [1, 1]
+
+        subnets = json.loads(await fns["oci_network_list_subnets"](ListSubnetsInput(
+            compartment_id=COMPARTMENT, include_subcompartments=True, response_format="json",
+        )))
+        lists = json.loads(await fns["oci_network_list_security_lists"](ListSecurityListsInput(
+            compartment_id=COMPARTMENT, include_subcompartments=True, response_format="json",
+        )))
+        assert (subnets["count"], lists["count"]) == (2, 2)
+        assert set(client.compartments) == {COMPARTMENT, self.CHILD}
+
+    @pytest.mark.asyncio
+    async def test_own_compartment_by_default(self, subtree_tools):
+        client, fns = subtree_tools
+        result = json.loads(await fns["oci_network_list_subnets"](
+            ListSubnetsInput(compartment_id=COMPARTMENT, response_format="json")
+        ))
+        assert result["count"] == 1
+        assert client.compartments == [COMPARTMENT]
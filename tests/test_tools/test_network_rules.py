@@ -0,0 +1,189 @@
+"""
+Tests for the indexed security rule engine.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from mcp_server_oci.tools.network.formatters import NetworkFormatter
+from mcp_server_oci.tools.network.models import AnalyzeSecurityRulesInput
+from mcp_server_oci.tools.network.rules import IntervalIndex, RuleTable, parse_cidr
+from mcp_server_oci.tools.network.tools import _analyze_rules
+
+
+def _rule(address, protocol="6", ports=None, direction="INGRESS", **extra):
+    rule = {"direction": direction, "protocol": protocol, "is_stateless": False}
+    side = "source" if direction == "INGRESS" else "destination"
+    rule[side] = address
+    rule[f"{side}_type"] = extra.pop("address_type", "CIDR_BLOCK")
+    if ports:
+        options = "tcp_options" if protocol == "6" else "udp_options"
+        rule[options] = {"destination_port_range": {"min": ports[0], "max": ports[1]}}
+    rule.update(extra)
+    return rule
+
+
+def _table(*owners):
+    return RuleTable.build([
+        {"id": f"ocid1.securitylist.{i}", "display_name": f"list-{i}", "rules": rules}
+        for i, rules in enumerate(owners)
+    ])
+
+
+class TestIntervalIndex:
+    """Tests for the sorted interval index."""
+
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(3)
+        lo = rng.integers(0, 10_000, size=2_000)
+        hi = lo + rng.integers(0, 500, size=2_000)
+        index = IntervalIndex(lo, hi)
+        for qlo in rng.integers(0, 10_500, size=50).tolist():
+            qhi = qlo + 25
+            expected = np.flatnonzero((lo <= qhi) & (hi >= qlo))
+            assert sorted(index.overlapping(qlo, qhi).tolist()) == expected.tolist()
+
+    def test_ipv6_uses_top_64_bits(self):
+        assert parse_cidr("::/0") == (6, 0, (1 << 64) - 1)
+        family, lo, hi = parse_cidr("2001:db8::/32")
+        assert family == 6
+        assert hi - lo == (1 << 32) - 1
+
+
+class TestExposure:
+    """Tests for internet exposure findings."""
+
+    def test_sensitive_tcp_and_udp_ports(self):
+        table = _table([
+            _rule("0.0.0.0/0", ports=(20, 25)),
+            _rule("0.0.0.0/0", "17", ports=(161, 161)),
+            _rule("0.0.0.0/0", ports=(443, 443)),
+            _rule("0.0.0.0/0", ports=(8080, 8080)),
+            _rule("10.0.0.0/8", ports=(22, 22)),
+            _rule("0.0.0.0/0", ports=(22, 22), direction="EGRESS"),
+        ])
+        findings = {f["index"]: f for f in table.exposed()}
+        assert set(findings) == {0, 1, 2, 3}
+        assert findings[0]["exposed_services"] == ["22/TCP (SSH)", "23/TCP (Telnet)"]
+        assert findings[1]["exposed_services"] == ["161/UDP (SNMP)"]
+        assert findings[1]["risk_level"] == "HIGH"
+        assert findings[2]["risk_level"] == "LOW"
+        assert findings[3]["risk_level"] == "MEDIUM"
+
+    def test_all_protocols_from_ipv6_anywhere(self):
+        table = _table([_rule("::/0", "all")])
+        (finding,) = table.exposed()
+        assert finding["risk_level"] == "HIGH"
+        assert "3389/TCP (RDP)" in finding["exposed_services"]
+
+
+class TestRedundancy:
+    """Tests for covered-rule detection."""
+
+    def test_nested_cidrs_and_port_ranges(self):
+        table = _table([
+            _rule("10.0.0.0/8", ports=(1, 65535)),
+            _rule("10.1.0.0/16", ports=(443, 443)),       # covered by 0
+            _rule("10.1.2.0/24", "17", ports=(53, 53)),   # UDP: only rule 4 covers it
+            _rule("192.168.0.0/16", ports=(22, 22)),      # disjoint block
+            _rule("10.1.2.0/24", "all"),                  # wider protocol
+            _rule("10.1.2.3/32", "17", ports=(53, 53)),   # covered by 2 and 4
+        ])
+        redundant = {r["index"]: r["covered_by"]["index"] for r in table.redundant()}
+        assert set(redundant) == {1, 2, 5}
+        assert redundant[1] == 0
+        assert redundant[2] == 4
+        assert redundant[5] in (2, 4)
+
+    def test_duplicates_report_the_later_rule(self):
+        rule = _rule("10.0.0.0/16", ports=(22, 22))
+        table = _table([rule, dict(rule), _rule("10.0.0.0/16", ports=(22, 22),
+                                                is_stateless=True)])
+        assert [(r["index"], r["covered_by"]["index"]) for r in table.redundant()] == [(1, 0)]
+
+    def test_widened_ipv6_rules_cover_nothing(self):
+        table = _table([
+            _rule("2001:db8::1/128", ports=(22, 22)),
+            _rule("2001:db8::/64", ports=(22, 22)),
+            _rule("2001:db8::2/128", ports=(22, 22)),   # covered by the exact /64
+        ])
+        assert [(r["index"], r["covered_by"]["index"]) for r in table.redundant()] == [(2, 1)]
+
+    def test_only_within_one_list_or_nsg(self):
+        table = _table(
+            [_rule("0.0.0.0/0", "all")],
+            [_rule("10.0.0.0/8", ports=(22, 22))],
+        )
+        assert table.redundant() == []
+
+    def test_nsg_sources_are_opaque(self):
+        nsg = "ocid1.networksecuritygroup.a"
+        table = _table([
+            _rule("0.0.0.0/0", ports=(22, 22)),
+            _rule(nsg, ports=(22, 22), address_type="NETWORK_SECURITY_GROUP"),
+            _rule(nsg, ports=(20, 30), address_type="NETWORK_SECURITY_GROUP"),
+        ])
+        assert [(r["index"], r["covered_by"]["index"]) for r in table.redundant()] == [(1, 2)]
+
+
+class TestReachability:
+    """Tests for port-from-CIDR queries."""
+
+    def test_full_partial_and_none(self):
+        table = _table([
+            _rule("10.0.0.0/8", ports=(443, 443)),
+            _rule("10.1.0.0/16", "all"),
+            _rule("0.0.0.0/0", ports=(80, 80)),
+        ])
+        result = table.reachable(443, "10.1.2.0/24")
+        assert result["reachable"]
+        assert [(r["index"], r["coverage"]) for r in result["rules"]] == [
+            (0, "full"), (1, "full"),
+        ]
+
+        result = table.reachable(22, "10.0.0.0/8")
+        assert not result["reachable"]
+        assert result["partially_reachable"]
+        assert result["rules"][0]["index"] == 1
+
+        result = table.reachable(22, "192.0.2.0/24", protocol="udp")
+        assert not result["reachable"] and not result["partially_reachable"]
+
+
+class TestAnalyzeRules:
+    """Tests for the tool's analysis step."""
+
+    def test_security_lists_and_nsgs(self):
+        security_lists = [{
+            "id": "ocid1.securitylist.a", "display_name": "default",
+            "ingress_security_rules": [_rule("0.0.0.0/0", ports=(22, 22)), _rule("bad", "6")],
+            "egress_security_rules": [_rule("0.0.0.0/0", "all", direction="EGRESS")],
+        }]
+        nsgs = [{
+            "id": "ocid1.networksecuritygroup.db", "display_name": "db",
+            "security_rules": [
+                _rule("10.0.0.0/16", ports=(1521, 1522)),
+                _rule("10.0.1.0/24", ports=(1521, 1521)),
+            ],
+        }]
+        params = AnalyzeSecurityRulesInput(
+            vcn_id="ocid1.vcn.a", port=1521, source_cidr="10.0.1.0/24"
+        )
+        analysis = _analyze_rules(security_lists, nsgs, params)
+        assert analysis["total_rules"] == 4
+        assert analysis["summary"] == {
+            "high_risk": 1, "medium_risk": 0, "low_risk": 0, "redundant": 1,
+        }
+        assert analysis["redundant_rules"][0]["owner_type"] == "nsg"
+        assert analysis["unparsed_rules"][0]["index"] == 1
+        assert analysis["reachability"]["reachable"]
+
+        md = NetworkFormatter.security_analysis_markdown(analysis)
+        assert "1 NSGs" in md
+        assert "db #1: INGRESS TCP port 1521 from/to 10.0.1.0/24, covered by db #0" in md
+        assert "is allowed" in md
+
+    def test_rejects_bad_source_cidr(self):
+        with pytest.raises(ValueError, match="Invalid source_cidr"):
+            AnalyzeSecurityRulesInput(vcn_id="ocid1.vcn.a", port=22, source_cidr="10.0.0/33")
@@ -0,0 +1,292 @@
+"""
+Tests for the VCN topology graph and path checks.
+"""
+from __future__ import annotations
+
+import json
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from fastmcp import FastMCP
+
+from mcp_server_oci.core.cache import TTLCache
+from mcp_server_oci.tools.network import tools
+from mcp_server_oci.tools.network.models import CheckNetworkPathInput
+from mcp_server_oci.tools.network.topology import VcnTopology
+
+COMPARTMENT = "ocid1.compartment.oc1..net"
+VCN = "ocid1.vcn.oc1..main"
+IGW = "ocid1.internetgateway.oc1..igw"
+NAT = "ocid1.natgateway.oc1..nat"
+DRG = "ocid1.drg.oc1..drg"
+LPG = "ocid1.localpeeringgateway.oc1..lpg"
+DB_NSG = "ocid1.networksecuritygroup.oc1..db"
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Isolate the topology cache per test."""
+    cache = TTLCache(max_size=100, default_ttl=300)
+    monkeypatch.setattr(tools, "get_cache", lambda tier: cache)
+    return cache
+
+
+def _page(items):
+    return SimpleNamespace(
+        data=items, has_next_page=False, next_page=None, status=200, headers={}, request=None
+    )
+
+
+def _rule(address, protocol="6", port=None, direction="INGRESS"):
+    ports = SimpleNamespace(min=port, max=port) if port else None
+    return SimpleNamespace(
+        direction=direction, protocol=protocol, is_stateless=False,
+        source=address, source_type="CIDR_BLOCK",
+        destination=address, destination_type="CIDR_BLOCK",
+        tcp_options=SimpleNamespace(destination_port_range=ports, source_port_range=None)
+        if protocol == "6" and ports else None,
+        udp_options=None, icmp_options=None,
+    )
+
+
+def _security_list(name, ingress, egress):
+    return SimpleNamespace(
+        id=f"ocid1.securitylist.oc1..{name}", display_name=name, lifecycle_state="AVAILABLE",
+        vcn_id=VCN, time_created=None, compartment_id=COMPARTMENT,
+        ingress_security_rules=ingress, egress_security_rules=egress,
+    )
+
+
+def _subnet(name, cidr, route_table, public=False):
+    return SimpleNamespace(
+        id=f"ocid1.subnet.oc1..{name}", display_name=name, cidr_block=cidr,
+        ipv6_cidr_blocks=None, lifecycle_state="AVAILABLE", availability_domain=None,
+        prohibit_public_ip_on_vnic=not public, dns_label=name, vcn_id=VCN,
+        route_table_id=f"ocid1.routetable.oc1..{route_table}",
+        security_list_ids=[f"ocid1.securitylist.oc1..{name}"], time_created=None,
+        compartment_id=COMPARTMENT,
+    )
+
+
+def _route_table(name, *rules):
+    return SimpleNamespace(
+        id=f"ocid1.routetable.oc1..{name}", display_name=name,
+        route_rules=[
+            SimpleNamespace(destination=d, cidr_block=None, destination_type="CIDR_BLOCK",
+                            network_entity_id=target, description=None)
+            for d, target in rules
+        ],
+    )
+
+
+def _gateway(ocid, name, **extra):
+    return SimpleNamespace(id=ocid, display_name=name, lifecycle_state="AVAILABLE", **extra)
+
+
+class FakeNetworkClient:
+    """A three-tier VCN: public web, private app and db subnets."""
+
+    def __init__(self, failing=()):
+        self.calls = []
+        self.failing = set(failing)
+        self.data = {
+            "list_subnets": [
+                _subnet("web", "10.0.1.0/24", "public", public=True),
+                _subnet("app", "10.0.2.0/24", "private"),
+                _subnet("db", "10.0.3.0/24", "private"),
+            ],
+            "list_route_tables": [
+                _route_table("public", ("0.0.0.0/0", IGW)),
+                _route_table("private", ("0.0.0.0/0", NAT), ("192.168.0.0/16", DRG),
+                             ("192.168.5.0/24", LPG)),
+            ],
+            "list_security_lists": [
+                _security_list("web", [_rule("0.0.0.0/0", port=443)],
+                               [_rule("10.0.0.0/16", "all", direction="EGRESS")]),
+                _security_list("app", [_rule("10.0.1.0/24", port=8080)],
+                               [_rule("0.0.0.0/0", "all", direction="EGRESS")]),
+                _security_list("db", [_rule("10.0.2.0/24", port=1521)], []),
+            ],
+            "list_network_security_groups": [SimpleNamespace(
+                id=DB_NSG, display_name="db-nsg", lifecycle_state="AVAILABLE",
+                vcn_id=VCN, compartment_id=COMPARTMENT,
+            )],
+            "list_network_security_group_security_rules": [_rule("10.0.1.0/24", port=1521)],
+            "list_internet_gateways": [_gateway(IGW, "igw", is_enabled=True)],
+            "list_nat_gateways": [_gateway(NAT, "nat", block_traffic=False)],
+            "list_service_gateways": [],
+            "list_local_peering_gateways": [_gateway(
+                LPG, "lpg", peering_status="PEERED", peer_advertised_cidr="192.168.5.0/24",
+            )],
+            "list_drg_attachments": [SimpleNamespace(
+                id="ocid1.drgattachment.oc1..a", drg_id=DRG, display_name="to-onprem",
+                lifecycle_state="ATTACHED",
+            )],
+        }
+
+    def get_vcn(self, vcn_id):
+        self.calls.append("get_vcn")
+        return SimpleNamespace(data=SimpleNamespace(
+            id=vcn_id, display_name="main", cidr_block="10.0.0.0/16",
+            cidr_blocks=["10.0.0.0/16"], ipv6_cidr_blocks=None, lifecycle_state="AVAILABLE",
+            dns_label="main", default_dhcp_options_id=None, default_route_table_id=None,
+            default_security_list_id=None, time_created=None, compartment_id=COMPARTMENT,
+        ))
+
+    def __getattr__(self, name):
+        if not name.startswith("list_"):
+            raise AttributeError(name)
+
+        def _call(**kwargs):
+            self.calls.append(name)
+            if name in self.failing:
+                raise RuntimeError("NotAuthorizedOrNotFound")
+            return _page(self.data[name])
+        return _call
+
+
+async def _topology(cache):
+    topology, errors, _ = await tools._load_topology(FakeNetworkClient(), VCN)
+    assert errors == []
+    return topology
+
+
+class TestTopologyPaths:
+    """Tests for path checks on the graph."""
+
+    @pytest.mark.asyncio
+    async def test_internet_to_public_subnet(self, cache):
+        topology = await _topology(cache)
+        result = topology.path("203.0.113.7", "10.0.1.20", port=443)
+        assert result["reachable"]
+        assert [h["type"] for h in result["hops"]] == ["external", "internet_gateway", "subnet"]
+        assert [c["check"] for c in result["checks"]] == ["route", "gateway", "ingress"]
+
+        result = topology.path("203.0.113.7", "web", port=22)
+        assert not result["reachable"]
+        assert result["blocked_by"] == "ingress"
+
+    @pytest.mark.asyncio
+    async def test_between_subnets_with_nsgs(self, cache):
+        topology = await _topology(cache)
+        assert topology.path("app", "10.0.3.5", port=1521)["reachable"]
+
+        result = topology.path("10.0.1.4", "db", port=1521)
+        assert result["blocked_by"] == "ingress"
+        assert [h["type"] for h in result["hops"]] == ["subnet", "local_route", "subnet"]
+
+        result = topology.path("10.0.1.4", "db", port=1521, destination_nsg_ids=[DB_NSG])
+        assert result["reachable"]
+        assert result["checks"][1]["rules"][0]["owner_type"] == "nsg"
+
+    @pytest.mark.asyncio
+    async def test_outbound_uses_longest_prefix_route(self, cache):
+        topology = await _topology(cache)
+        result = topology.path("app", "8.8.8.8", port=443)
+        assert result["reachable"]
+        assert result["hops"][2]["type"] == "nat_gateway"
+
+        result = topology.path("app", "192.168.5.10", port=22)
+        assert result["hops"][2]["type"] == "local_peering_gateway"
+        assert result["leaves_vcn"]
+        assert topology.path("app", "192.168.1.1", port=22)["hops"][2]["type"] == "drg"
+
+        # db has no egress rules
+        assert topology.path("db", "8.8.8.8", port=443)["blocked_by"] == "egress"
+
+    @pytest.mark.asyncio
+    async def test_nat_does_not_accept_inbound(self, cache):
+        topology = await _topology(cache)
+        result = topology.path("198.51.100.1", "app", port=8080)
+        assert result["blocked_by"] == "gateway"
+        assert "does not accept connections" in result["checks"][1]["detail"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_queries(self, cache):
+        topology = await _topology(cache)
+        with pytest.raises(ValueError, match="not within a single subnet"):
+            topology.path("10.0.9.9", "web", port=443)
+        with pytest.raises(ValueError, match="port is required"):
+            topology.path("app", "db")
+        with pytest.raises(ValueError, match="Neither"):
+            topology.path("8.8.8.8", "1.1.1.1", port=53)
+        assert topology.path("app", "db", protocol="ICMP")["blocked_by"] == "ingress"
+
+    @pytest.mark.asyncio
+    async def test_payload_round_trip(self, cache):
+        topology = await _topology(cache)
+        restored = VcnTopology.from_payload(json.loads(json.dumps(topology.to_payload())))
+        assert restored.path("app", "8.8.8.8", port=443) == topology.path(
+            "app", "8.8.8.8", port=443
+        )
+        assert restored.summary()["gateways"] == {
+            "internet_gateway": 1, "nat_gateway": 1, "local_peering_gateway": 1, "drg": 1,
+        }
+
+
+async def _check_path(monkeypatch, client):
+    @asynccontextmanager
+    async def fake_client(*args, **kwargs):
+        yield SimpleNamespace(virtual_network=client)
+
+    monkeypatch.setattr(tools, "get_oci_client", fake_client)
+    mcp = FastMCP("network-test")
+    tools.register_network_tools(mcp)
+    return (await mcp.get_tool("oci_network_check_path")).fn
+
+
+class TestCheckPathTool:
+    """Tests for the cached path tool."""
+
+    @pytest.mark.asyncio
+    async def test_queries_after_the_first_make_no_api_calls(self, monkeypatch, cache):
+        client = FakeNetworkClient()
+        check_path = await _check_path(monkeypatch, client)
+        result = json.loads(await check_path(CheckNetworkPathInput(
+            vcn_id=VCN, source="203.0.113.7", destination="web", port=443,
+            response_format="json",
+        )))
+        assert result["reachable"]
+        assert result["topology"]["cached"] is False
+        calls = len(client.calls)
+
+        md = await check_path(CheckNetworkPathInput(
+            vcn_id=VCN, source="web", destination="db", port=1521,
+        ))
+        assert len(client.calls) == calls
+        assert "Blocked** at the ingress check" in md
+        assert "(cached)" in md
+
+        await check_path(CheckNetworkPathInput(
+            vcn_id=VCN, source="web", destination="db", port=1521, refresh=True,
+        ))
+        assert len(client.calls) == 2 * calls
+
+    @pytest.mark.asyncio
+    async def test_invalidated_by_vcn_or_compartment_tag(self, monkeypatch, cache):
+        await tools._load_topology(FakeNetworkClient(), VCN)
+        assert await cache.invalidate_tag(f"compartment:{COMPARTMENT}") == 1
+        assert await cache.get(f"network:topology:{VCN}") is None
+
+    @pytest.mark.asyncio
+    async def test_failed_gateway_listing_is_reported_and_not_cached(self, monkeypatch, cache):
+        client = FakeNetworkClient(failing={"list_nat_gateways"})
+        check_path = await _check_path(monkeypatch, client)
+        result = json.loads(await check_path(CheckNetworkPathInput(
+            vcn_id=VCN, source="app", destination="8.8.8.8", port=443, response_format="json",
+        )))
+        assert result["errors"] == [
+            {"listing": "nat_gateways", "error": "NotAuthorizedOrNotFound"}
+        ]
+        # The route target is still recognized from its OCID
+        assert result["hops"][2]["type"] == "nat_gateway"
+        assert await cache.get(f"network:topology:{VCN}") is None
+
+    @pytest.mark.asyncio
+    async def test_bad_endpoint_is_an_error(self, monkeypatch, cache):
+        check_path = await _check_path(monkeypatch, FakeNetworkClient())
+        result = await check_path(CheckNetworkPathInput(
+            vcn_id=VCN, source="nowhere", destination="web", port=443,
+        ))
+        assert "is not an IP address, CIDR block or subnet" in result
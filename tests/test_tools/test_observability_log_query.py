@@ -0,0 +1,214 @@
+"""
+Tests for the async Log Analytics query engine.
+"""
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastmcp import FastMCP
+
+from mcp_server_oci.tools.observability import log_query, tools
+from mcp_server_oci.tools.observability.log_query import (
+    ResultBuffer,
+    query_details,
+    run_query,
+    should_run_async,
+)
+from mcp_server_oci.tools.observability.models import ExecuteLogQueryInput
+
+TENANCY = "ocid1.tenancy.oc1..root"
+WORK_REQUEST = "ocid1.loganalyticsworkrequest.oc1..q1"
+END = datetime(2024, 6, 1, tzinfo=UTC)
+COLUMNS = [
+    SimpleNamespace(display_name="Log Source", internal_name="logSource"),
+    SimpleNamespace(display_name="Count", internal_name="count"),
+]
+
+
+def _details(run_async, limit=1000):
+    return query_details("* | stats count by 'Log Source'", TENANCY, END - timedelta(days=1),
+                         END, limit, run_async, 60)
+
+
+class FakeLogAnalytics:
+    """Log Analytics client with ``count`` result rows in pages of ``limit``."""
+
+    def __init__(self, count=1200, statuses=("ACCEPTED", "IN_PROGRESS", "SUCCEEDED"),
+                 fail_page=None):
+        self.rows = [{"logSource": f"source{i}", "count": i} for i in range(count)]
+        self.statuses = list(statuses)
+        self.fail_page = fail_page
+        self.calls = []
+
+    def _page(self, page, limit, **extra):
+        i = int(page or 0)
+        if i == self.fail_page:
+            raise RuntimeError("TooManyRequests")
+        end = (i + 1) * limit
+        return SimpleNamespace(
+            data=SimpleNamespace(
+                columns=COLUMNS if i == 0 else None, items=self.rows[i * limit:end],
+                total_count=len(self.rows), query_execution_time_in_ms=42,
+                are_partial_results=False, **extra,
+            ),
+            has_next_page=end < len(self.rows), next_page=str(i + 1), headers={},
+        )
+
+    def get_namespace(self, namespace_name):
+        self.calls.append(("get_namespace", namespace_name))
+        return SimpleNamespace(data=SimpleNamespace(namespace_name="ns"))
+
+    def query(self, namespace_name, query_details, limit=None, page=None):
+        self.calls.append(("query", query_details.get("shouldRunAsync", False)))
+        if query_details.get("shouldRunAsync"):
+            return SimpleNamespace(data=None, headers={"opc-work-request-id": WORK_REQUEST})
+        return self._page(page, limit)
+
+    def get_query_work_request(self, namespace_name, work_request_id):
+        self.calls.append(("get_query_work_request", work_request_id))
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        percent = {"ACCEPTED": 0, "IN_PROGRESS": 50, "SUCCEEDED": 100}.get(status, 0)
+        return SimpleNamespace(
+            data=SimpleNamespace(status=status, percent_complete=percent), headers={},
+        )
+
+    def get_query_result(self, namespace_name, work_request_id, page=None, limit=None,
+                         **kwargs):
+        self.calls.append(("get_query_result", page))
+        return self._page(page, limit)
+
+
+@pytest.fixture(autouse=True)
+def fast_polls(monkeypatch):
+    monkeypatch.setattr(log_query, "POLL_INITIAL_DELAY", 0.01)
+    monkeypatch.setattr(log_query, "POLL_MAX_DELAY", 0.01)
+
+
+class TestResultBuffer:
+    """Tests for columnar decoding."""
+
+    def test_decodes_dict_and_list_rows_into_columns(self):
+        buffer = ResultBuffer()
+        buffer.set_columns(COLUMNS)
+        buffer.append([{"logSource": "a", "count": 1}, {"Log Source": "b"}])
+        buffer.append([["c", 3, "extra"]])
+        assert buffer.columns == ["Log Source", "Count"]
+        assert buffer.data == {"Log Source": ["a", "b", "c"], "Count": [1, None, 3]}
+        assert list(buffer.rows(2)) == [
+            {"Log Source": "a", "Count": 1}, {"Log Source": "b", "Count": None},
+        ]
+
+    def test_limit_and_columns_without_metadata(self):
+        buffer = ResultBuffer()
+        assert buffer.append([{"a": 1}, {"a": 2}, {"a": 3}], limit=2) == 2
+        assert buffer.append([{"a": 4}], limit=2) == 0
+        assert buffer.data == {"a": [1, 2]} and len(buffer) == 2
+
+
+class TestRunQuery:
+    """Tests for the sync and async query paths."""
+
+    def test_async_for_long_windows_and_large_results(self):
+        assert not should_run_async(timedelta(hours=1), 100)
+        assert should_run_async(timedelta(days=1), 100)
+        assert should_run_async(timedelta(hours=1), 1000)
+
+    @pytest.mark.asyncio
+    async def test_sync_query_pages_up_to_the_limit(self):
+        client = FakeLogAnalytics()
+        buffer, info = await run_query(client, "ns", _details(False, 300), 300)
+        assert len(buffer) == 300
+        assert info == {"mode": "sync", "pages": 1, "partial": False, "status": "SUCCEEDED",
+                        "total_count": 1200, "query_execution_time_in_ms": 42}
+
+    @pytest.mark.asyncio
+    async def test_async_query_polls_then_streams_pages(self):
+        client = FakeLogAnalytics()
+        progress = []
+
+        async def on_progress(fraction, message):
+            progress.append((fraction, message))
+
+        buffer, info = await run_query(client, "ns", _details(True), 1000,
+                                       on_progress=on_progress)
+        assert len(buffer) == 1000
+        assert buffer.data["Count"][-1] == 999
+        assert info["work_request_id"] == WORK_REQUEST
+        assert (info["status"], info["pages"], info["partial"]) == ("SUCCEEDED", 2, False)
+        assert [name for name, _ in client.calls] == [
+            "query", "get_query_work_request", "get_query_work_request",
+            "get_query_work_request", "get_query_result", "get_query_result",
+        ]
+        assert [m for _, m in progress] == [
+            "Query is ACCEPTED (0%)", "Query is IN_PROGRESS (50%)", "Query is SUCCEEDED (100%)",
+            "Fetched page 1 (500 rows so far)...", "Fetched page 2 (1000 rows so far)...",
+        ]
+        assert [f for f, _ in progress] == sorted(f for f, _ in progress)
+
+    @pytest.mark.asyncio
+    async def test_timeout_returns_partial_rows_and_resumes(self):
+        client = FakeLogAnalytics(count=20, statuses=("IN_PROGRESS",))
+        buffer, info = await run_query(client, "ns", _details(True), 1000,
+                                       timeout_seconds=0.05)
+        assert info["status"] == "TIMEOUT" and info["partial"]
+        assert len(buffer) == 20
+
+        client.statuses = ["SUCCEEDED"]
+        client.calls.clear()
+        buffer, info = await run_query(client, "ns", _details(True), 1000,
+                                       work_request_id=info["work_request_id"])
+        assert ("query", True) not in client.calls
+        assert info["status"] == "SUCCEEDED" and not info["partial"]
+
+    @pytest.mark.asyncio
+    async def test_failed_page_keeps_rows_read(self):
+        client = FakeLogAnalytics(statuses=("SUCCEEDED",), fail_page=1)
+        buffer, info = await run_query(client, "ns", _details(True), 1000)
+        assert len(buffer) == 500
+        assert info["partial"]
+        assert info["partial_reason"] == "Page 2 failed: TooManyRequests"
+
+    @pytest.mark.asyncio
+    async def test_failed_work_request_raises(self):
+        client = FakeLogAnalytics(statuses=("FAILED",))
+        with pytest.raises(RuntimeError, match="query failed"):
+            await run_query(client, "ns", _details(True), 1000)
+
+
+class TestExecuteLogQueryTool:
+    """Tests for the registered tool."""
+
+    @pytest.mark.asyncio
+    async def test_streams_async_query_on_shared_client(self, monkeypatch):
+        client = FakeLogAnalytics()
+        monkeypatch.delenv("LA_NAMESPACE", raising=False)
+        monkeypatch.setattr(tools, "oci_client_manager",
+                            SimpleNamespace(log_analytics=client, tenancy_id=TENANCY))
+        log_query._namespaces.clear()
+        mcp = FastMCP("observability-test")
+        tools.register_observability_tools(mcp)
+        execute = (await mcp.get_tool("oci_observability_execute_log_query")).fn
+        progress = []
+
+        async def report_progress(value, message=None):
+            progress.append(message)
+
+        ctx = SimpleNamespace(report_progress=report_progress)
+        data = json.loads(await execute(ExecuteLogQueryInput(
+            query="* | stats count by 'Log Source'", time_range="7d", limit=600,
+            response_format="json",
+        ), ctx))
+        assert data["mode"] == "async" and data["total"] == 600
+        assert data["columns"] == ["Log Source", "Count"]
+        assert data["results"][1] == {"Log Source": "source1", "Count": 1}
+        assert "Fetched page 2 (600 rows so far)..." in progress
+
+        client.statuses = ["SUCCEEDED"]
+        md = await execute(ExecuteLogQueryInput(query="*", limit=5), ctx)
+        assert "**Results:** 5 rows of 1200" in md
+        assert "| source4 | 4 |" in md
+        assert client.calls.count(("get_namespace", TENANCY)) == 1
+        assert client.calls[-1] == ("query", False)
@@ -0,0 +1,230 @@
+"""
+Tests for the concurrent security audit.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastmcp import FastMCP
+
+from mcp_server_oci.core.cache import TTLCache
+from mcp_server_oci.core.concurrency import CallBudget
+from mcp_server_oci.tools.security import cloud_guard, identity, tools
+from mcp_server_oci.tools.security.audit import run_audit
+from mcp_server_oci.tools.security.models import SecurityAuditInput
+
+TENANCY = "ocid1.tenancy.oc1..root"
+PROD = "ocid1.compartment.oc1..prod"
+APPS = "ocid1.compartment.oc1..apps"
+
+
+class FakeService:
+    """SDK client whose list calls block, serve pages and track concurrency."""
+
+    def __init__(self, tracker, delay, pages, failing=()):
+        self.tracker = tracker
+        self.delay = delay
+        self.pages = pages
+        self.failing = set(failing)
+
+    def __getattr__(self, name):
+        if name not in self.pages:
+            raise AttributeError(name)
+
+        def _call(compartment_id=None, page=None, **kwargs):
+            self.tracker.enter(name, compartment_id)
+            try:
+                time.sleep(self.delay)
+                if name == "list_user_group_memberships" and not (
+                    kwargs.get("user_id") or kwargs.get("group_id")
+                ):
+                    raise ValueError("Must set one of user_id or group_id")
+                if (name, compartment_id) in self.failing or name in self.failing:
+                    raise RuntimeError("NotAuthorizedOrNotFound")
+                pages = self.pages[name]
+                if callable(pages):
+                    pages = pages(compartment_id)
+                i = int(page or 0)
+                return SimpleNamespace(
+                    data=pages[i], has_next_page=i + 1 < len(pages),
+                    next_page=str(i + 1) if i + 1 < len(pages) else None,
+                    status=200, headers={}, request=None,
+                )
+            finally:
+                self.tracker.leave()
+        return _call
+
+
+class Tracker:
+    """Records every call and the peak number in flight."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+
+    def enter(self, name, compartment_id):
+        with self.lock:
+            self.calls.append((name, compartment_id))
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+
+    def leave(self):
+        with self.lock:
+            self.in_flight -= 1
+
+
+def _clients(delay=0.0, failing=()):
+    tracker = Tracker()
+    users = [
+        SimpleNamespace(id=f"ocid1.user.oc1..u{i}", name=f"user{i}", email=None,
+                        lifecycle_state="ACTIVE", time_created=None, description=None,
+                        compartment_id=TENANCY)
+        for i in range(4)
+    ]
+    groups = [
+        SimpleNamespace(id=f"ocid1.group.oc1..g{i}", name=f"group{i}", description=None,
+                        lifecycle_state="ACTIVE", time_created=None, compartment_id=TENANCY)
+        for i in range(2)
+    ]
+    policy = SimpleNamespace(
+        id="ocid1.policy.oc1..admins", name="admins", compartment_id=TENANCY,
+        statements=["Allow group Admins to manage all-resources in tenancy"],
+    )
+
+    def problem(i, risk_level):
+        return SimpleNamespace(
+            id=f"ocid1.cloudguardproblem.oc1..p{i}", detector_rule_id="RULE",
+            detector_id="IAAS_CONFIGURATION_DETECTOR", risk_level=risk_level,
+            resource_name="bucket", resource_type="Bucket", region="us-ashburn-1",
+            lifecycle_state="ACTIVE", time_first_detected=None,
+        )
+
+    def vcns(compartment_id):
+        # 15 VCNs in two pages: more than the old cap of 10
+        return [[SimpleNamespace(id=f"{compartment_id}.vcn{i}") for i in range(8)],
+                [SimpleNamespace(id=f"{compartment_id}.vcn{i}") for i in range(8, 15)]]
+
+    def subnets(compartment_id):
+        return [[SimpleNamespace(prohibit_public_ip_on_vnic=i % 2 == 0) for i in range(15)]]
+
+    mgr = SimpleNamespace(
+        tenancy_id=TENANCY,
+        identity=FakeService(tracker, delay, {
+            "list_users": [users[:3], users[3:]],
+            "list_groups": [groups],
+            "list_user_group_memberships": [[]],
+            "list_policies": lambda c: [[policy]] if c == TENANCY else [[]],
+        }, failing),
+        cloud_guard=FakeService(tracker, delay, {
+            "list_problems": [[problem(0, "CRITICAL")], [problem(1, "HIGH")]],
+        }, failing),
+        virtual_network=FakeService(tracker, delay, {
+            "list_vcns": vcns, "list_subnets": subnets,
+        }, failing),
+    )
+    return mgr, tracker
+
+
+@pytest.fixture(autouse=True)
+def cache(monkeypatch):
+    """Isolate the identity graph and Cloud Guard caches per test."""
+    cache = TTLCache(max_size=100, default_ttl=300)
+    monkeypatch.setattr(identity, "get_cache", lambda tier: cache)
+    monkeypatch.setattr(cloud_guard, "get_cache", lambda tier: cache)
+    identity._built.clear()
+    cloud_guard._built.clear()
+    return cache
+
+
+class TestRunAudit:
+    """Tests for the concurrent sections."""
+
+    @pytest.mark.asyncio
+    async def test_full_pagination_and_no_vcn_cap(self):
+        mgr, tracker = _clients()
+        data = await run_audit(mgr, [TENANCY])
+        assert data["iam_summary"]["total_users"] == 4
+        assert data["iam_summary"]["findings"] == [
+            "Review MFA status for 4 active users",
+            "1 policies with 'manage all-resources' detected",
+        ]
+        assert data["cloud_guard_summary"] == {"total": 2, "critical": 1, "high": 1, "medium": 0}
+        assert data["network_summary"]["total_vcns"] == 15
+        assert data["network_summary"]["public_subnets"] == 7
+        # One subnet listing for the compartment, not one per VCN
+        assert tracker.calls.count(("list_subnets", TENANCY)) == 1
+        assert data["scores"] == {"iam": 60, "cloud_guard": 40, "network": 65}
+
+    @pytest.mark.asyncio
+    async def test_sections_share_one_budget(self):
+        mgr, tracker = _clients(delay=0.1)
+        started = time.monotonic()
+        data = await run_audit(mgr, [TENANCY, PROD, APPS], budget=CallBudget(limit=4))
+        elapsed = time.monotonic() - started
+        assert tracker.peak <= 4
+        # 15 calls (19 pages) on 4 slots, vs ~1.9s one after another; Cloud
+        # Guard pages are separate calls so they are aggregated as they arrive
+        assert elapsed < 0.9
+        assert data["api_calls"] == 15
+        assert data["iam_summary"]["total_policies"] == 1
+        assert data["network_summary"]["total_vcns"] == 45
+
+    @pytest.mark.asyncio
+    async def test_subtree_scopes_cloud_guard_in_one_call(self):
+        mgr, tracker = _clients()
+        seen = []
+
+        async def on_section(name):
+            seen.append(name)
+
+        await run_audit(mgr, [PROD, APPS], include_iam=False, include_subcompartments=True,
+                        on_section=on_section)
+        assert sorted(seen) == ["cloud_guard", "network"]
+        assert [c for c in tracker.calls if c[0] == "list_problems"] == [
+            ("list_problems", PROD), ("list_problems", PROD),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_failures_are_partial(self):
+        mgr, _ = _clients(failing={"list_problems", ("list_vcns", APPS)})
+        data = await run_audit(mgr, [PROD, APPS])
+        assert data["cloud_guard_summary"] == {"error": "Cloud Guard not enabled or accessible"}
+        assert data["scores"]["cloud_guard"] == 50
+        assert data["network_summary"]["total_vcns"] == 15
+        assert data["network_summary"]["errors"] == [
+            {"compartment_id": APPS, "error": "NotAuthorizedOrNotFound"}
+        ]
+
+
+class TestSecurityAuditTool:
+    """Tests for the registered tool."""
+
+    @pytest.mark.asyncio
+    async def test_report(self, monkeypatch):
+        mgr, _ = _clients()
+        monkeypatch.setattr(tools, "oci_client_manager", mgr)
+        mcp = FastMCP("security-test")
+        tools.register_security_tools(mcp)
+        audit = (await mcp.get_tool("oci_security_audit")).fn
+        progress = []
+
+        async def report_progress(value, message=None):
+            progress.append(value)
+
+        ctx = SimpleNamespace(report_progress=report_progress)
+        data = json.loads(await audit(SecurityAuditInput(response_format="json"), ctx))
+        assert data["security_score"]["overall"] == 55
+        assert data["recommendations"] == [
+            "Address 1 critical Cloud Guard problems immediately",
+            "Review security configuration as overall score is below threshold",
+        ]
+        assert progress == sorted(progress)
+
+        md = await audit(SecurityAuditInput(include_cloud_guard=False), ctx)
+        assert "**VCNs:** 15" in md
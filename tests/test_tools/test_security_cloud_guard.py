@@ -0,0 +1,176 @@
+"""
+Tests for streaming Cloud Guard problem snapshots.
+"""
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastmcp import FastMCP
+
+from mcp_server_oci.core.cache import TTLCache
+from mcp_server_oci.tools.security import cloud_guard, tools
+from mcp_server_oci.tools.security.cloud_guard import get_problem_snapshot
+from mcp_server_oci.tools.security.models import ListCloudGuardProblemsInput
+
+TENANCY = "ocid1.tenancy.oc1..root"
+NOW = datetime(2024, 6, 1, tzinfo=UTC)
+RISKS = ["CRITICAL", "HIGH", "MEDIUM", "LOW"]
+REGIONS = ["us-ashburn-1", "eu-frankfurt-1"]
+
+
+def _problem(i, state="ACTIVE", risk=None, detected=None):
+    return SimpleNamespace(
+        id=f"ocid1.cloudguardproblem.oc1..p{i}", detector_rule_id=f"RULE_{i % 3}",
+        detector_id="IAAS_ACTIVITY_DETECTOR" if i % 5 == 0 else "IAAS_CONFIGURATION_DETECTOR",
+        risk_level=risk or RISKS[i % 4], resource_name=f"res{i}",
+        resource_type="Bucket" if i % 2 else "Instance", region=REGIONS[i % 2],
+        compartment_id=TENANCY, lifecycle_state=state, lifecycle_detail="OPEN",
+        time_first_detected=NOW - timedelta(days=30),
+        time_last_detected=detected or NOW - timedelta(days=i % 7),
+        recommendation=None,
+    )
+
+
+class FakeCloudGuard:
+    """Cloud Guard client returning ProblemCollection pages of 100."""
+
+    def __init__(self, count=250):
+        self.problems = [_problem(i) for i in range(count)]
+        self.calls = []
+
+    def list_problems(self, compartment_id, page=None, **kwargs):
+        self.calls.append(kwargs)
+        # Like the SDK, only active problems are listed unless a state is given
+        state = kwargs.get("lifecycle_state", "ACTIVE")
+        problems = [p for p in self.problems if p.lifecycle_state == state]
+        since = kwargs.get("time_last_detected_greater_than_or_equal_to")
+        if since is not None:
+            problems = [p for p in problems if p.time_last_detected >= since]
+        i = int(page or 0)
+        return SimpleNamespace(
+            data=SimpleNamespace(items=problems[i * 100:(i + 1) * 100]),
+            has_next_page=(i + 1) * 100 < len(problems), next_page=str(i + 1),
+        )
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Isolate the snapshot cache per test."""
+    cache = TTLCache(max_size=100, default_ttl=300)
+    monkeypatch.setattr(cloud_guard, "get_cache", lambda tier: cache)
+    cloud_guard._built.clear()
+    return cache
+
+
+class TestProblemSnapshot:
+    """Tests for the streaming scan and delta refresh."""
+
+    @pytest.mark.asyncio
+    async def test_every_page_is_aggregated_as_it_arrives(self, cache):
+        client = FakeCloudGuard()
+        seen = []
+
+        async def on_page(pages, problems):
+            seen.append((pages, problems))
+
+        snapshot, info = await get_problem_snapshot(client, TENANCY, on_page=on_page)
+        assert seen == [(1, 100), (2, 200), (3, 250)]
+        assert not info["cached"]
+        summary = snapshot.summary()
+        assert summary["total"] == 250
+        assert summary["by_risk"] == {"CRITICAL": 63, "HIGH": 63, "MEDIUM": 62, "LOW": 62}
+        assert summary["by_resource_type"] == {"Instance": 125, "Bucket": 125}
+        assert summary["by_detector"]["IAAS_ACTIVITY_DETECTOR"] == 50
+        assert client.calls[0]["lifecycle_state"] == "ACTIVE"
+
+        again, info = await get_problem_snapshot(client, TENANCY)
+        assert again is snapshot and info["cached"]
+        assert len(client.calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_delta_refresh_by_time_last_detected(self, cache, monkeypatch):
+        client = FakeCloudGuard()
+        snapshot, _ = await get_problem_snapshot(client, TENANCY)
+        client.calls.clear()
+
+        # A minute and a half later: one new problem, one re-detected at a
+        # higher risk, one resolved when it was last seen
+        later = datetime.now(UTC) + timedelta(seconds=90)
+        monkeypatch.setattr(cloud_guard, "time", lambda: later.timestamp())
+        client.problems.append(_problem(900, detected=later))
+        client.problems[3] = _problem(3, risk="CRITICAL", detected=later)
+        client.problems[4] = _problem(4, state="INACTIVE", detected=later)
+
+        snapshot, info = await get_problem_snapshot(client, TENANCY)
+        assert info["delta"] == {"listed": 3, "net_change": 0}
+        assert [c["lifecycle_state"] for c in client.calls] == ["ACTIVE", "INACTIVE"]
+        assert all(c["time_last_detected_greater_than_or_equal_to"] > NOW for c in client.calls)
+        assert snapshot.summary()["by_risk"] == {
+            "CRITICAL": 64, "HIGH": 63, "MEDIUM": 62, "LOW": 61,
+        }
+        assert "ocid1.cloudguardproblem.oc1..p4" not in snapshot.problems
+
+        # The cached payload carries the merged snapshot
+        cloud_guard._built.clear()
+        restored, info = await get_problem_snapshot(client, TENANCY)
+        assert info["cached"] and restored.summary() == snapshot.summary()
+
+    @pytest.mark.asyncio
+    async def test_every_state_lists_active_and_inactive(self, cache):
+        client = FakeCloudGuard(count=10)
+        client.problems[0] = _problem(0, state="INACTIVE")
+        snapshot, _ = await get_problem_snapshot(client, TENANCY, lifecycle_state=None)
+        assert [c["lifecycle_state"] for c in client.calls] == ["ACTIVE", "INACTIVE"]
+        assert len(snapshot) == 10
+
+    @pytest.mark.asyncio
+    async def test_full_rescan_on_schedule_and_on_refresh(self, cache, monkeypatch):
+        client = FakeCloudGuard(count=50)
+        await get_problem_snapshot(client, TENANCY)
+        client.problems = client.problems[:10]
+        snapshot, info = await get_problem_snapshot(client, TENANCY, refresh=True)
+        assert len(snapshot) == 10 and not info["cached"]
+
+        client.problems = client.problems[:5]
+        later = datetime.now(UTC) + timedelta(seconds=cloud_guard.FULL_INTERVAL + 1)
+        monkeypatch.setattr(cloud_guard, "time", lambda: later.timestamp())
+        snapshot, info = await get_problem_snapshot(client, TENANCY)
+        assert len(snapshot) == 5 and "delta" not in info
+
+
+class TestCloudGuardTool:
+    """Tests for the registered tool."""
+
+    @pytest.mark.asyncio
+    async def test_uses_shared_client_and_reports_totals(self, monkeypatch, cache):
+        client = FakeCloudGuard()
+        monkeypatch.setattr(tools, "oci_client_manager",
+                            SimpleNamespace(cloud_guard=client, tenancy_id=TENANCY))
+        mcp = FastMCP("security-test")
+        tools.register_security_tools(mcp)
+        list_problems = (await mcp.get_tool("oci_security_list_cloud_guard_problems")).fn
+        progress = []
+
+        async def report_progress(value, message=None):
+            progress.append(message)
+
+        ctx = SimpleNamespace(report_progress=report_progress)
+        data = json.loads(await list_problems(ListCloudGuardProblemsInput(
+            risk_level="CRITICAL", limit=5, include_subcompartments=True,
+            response_format="json",
+        ), ctx))
+        assert data["total"] == 63
+        assert len(data["problems"]) == 5
+        assert data["summary"]["HIGH"] == 63
+        assert data["snapshot"]["problems"] == 250
+        assert client.calls[0]["compartment_id_in_subtree"] is True
+        assert "Fetched page 3 (250 problems so far)..." in progress
+
+        md = await list_problems(ListCloudGuardProblemsInput(include_subcompartments=True), ctx)
+        assert "_Showing 20 of 250, most severe first._" in md
+        assert "| Bucket | 125 |" in md
+        assert "(cached)" in md
+        assert len(client.calls) == 3
@@ -0,0 +1,188 @@
+"""
+Tests for the concurrent credential age scan.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastmcp import FastMCP
+
+from mcp_server_oci.core.cache import TTLCache
+from mcp_server_oci.core.concurrency import CallBudget
+from mcp_server_oci.tools.security import credentials, identity, tools
+from mcp_server_oci.tools.security.credentials import scan_credentials
+from mcp_server_oci.tools.security.models import ScanCredentialsInput
+
+TENANCY = "ocid1.tenancy.oc1..root"
+NOW = datetime.now(UTC)
+
+
+def _page(items):
+    return SimpleNamespace(
+        data=items, has_next_page=False, next_page=None, status=200, headers={}, request=None,
+    )
+
+
+class FakeIdentity:
+    """Six users; user i has credentials aged 10 * i and 100 * i days."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.calls = []
+        self.in_flight = self.peak = 0
+        self.users = [
+            SimpleNamespace(
+                id=f"ocid1.user.oc1..aaaau{i}", name=f"user{i}", email=None,
+                lifecycle_state="INACTIVE" if i == 5 else "ACTIVE",
+                time_created=NOW - timedelta(days=1000), description=None,
+                compartment_id=TENANCY,
+            )
+            for i in range(6)
+        ]
+
+    def list_users(self, compartment_id, **kwargs):
+        return _page(self.users)
+
+    def list_groups(self, compartment_id, **kwargs):
+        return _page([])
+
+    def list_user_group_memberships(self, compartment_id, user_id=None, group_id=None,
+                                    **kwargs):
+        if user_id is None and group_id is None:
+            raise ValueError("Must set one of user_id or group_id")
+        return _page([])
+
+    def _listing(self, name, user_id, make):
+        with self.lock:
+            self.calls.append((name, user_id))
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            i = int(user_id.rsplit("u", 1)[1])
+            return _page([make(i, days, state) for days, state in (
+                (10 * i, "ACTIVE"), (100 * i, "ACTIVE"), (500, "INACTIVE"),
+            )])
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def list_api_keys(self, user_id):
+        return self._listing("list_api_keys", user_id, lambda i, days, state: SimpleNamespace(
+            key_id=f"{user_id}/{days}", fingerprint=f"fp:{i}:{days}", lifecycle_state=state,
+            time_created=NOW - timedelta(days=days, hours=1),
+        ))
+
+    def list_auth_tokens(self, user_id):
+        return self._listing("list_auth_tokens", user_id, lambda i, days, state: (
+            SimpleNamespace(
+                id=f"ocid1.credential.oc1..t{i}-{days}", description=f"token {days}",
+                lifecycle_state=state, time_created=NOW - timedelta(days=days, hours=1),
+                time_expires=None,
+            )
+        ))
+
+    def list_customer_secret_keys(self, user_id):
+        if user_id.endswith("u4"):
+            with self.lock:
+                self.calls.append(("list_customer_secret_keys", user_id))
+            raise RuntimeError("NotAuthorizedOrNotFound")
+        return _page([])
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Isolate the identity and credential caches per test."""
+    cache = TTLCache(max_size=1000, default_ttl=300)
+    monkeypatch.setattr(identity, "get_cache", lambda tier: cache)
+    monkeypatch.setattr(credentials, "get_cache", lambda tier: cache)
+    identity._built.clear()
+    return cache
+
+
+class TestScanCredentials:
+    """Tests for the scan."""
+
+    @pytest.mark.asyncio
+    async def test_only_violations_oldest_first(self, cache):
+        client = FakeIdentity()
+        result = await scan_credentials(client, TENANCY, max_age_days=90)
+        assert result["users_scanned"] == 5
+        assert [(v["kind"], v["age_days"]) for v in result["violations"]] == [
+            ("api_keys", 400), ("auth_tokens", 400), ("api_keys", 300), ("auth_tokens", 300),
+            ("api_keys", 200), ("auth_tokens", 200), ("api_keys", 100), ("auth_tokens", 100),
+        ]
+        assert result["violations"][0]["user_name"] == "user4"
+        assert result["violations"][0]["name"] == "fp:4:400"
+        assert result["credentials"]["api_keys"] == {"total": 15, "active": 10, "stale": 4}
+        assert result["oldest_days"] == 400
+        # The inactive user is not listed
+        assert not any(u.endswith("u5") for _, u in client.calls)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_within_the_cap(self, cache):
+        client = FakeIdentity(delay=0.05)
+        started = time.monotonic()
+        await scan_credentials(client, TENANCY, max_age_days=90,
+                               kinds=("api_keys", "auth_tokens"), budget=CallBudget(limit=4))
+        # 10 listings of 50ms on 4 slots, vs 0.5s one after another
+        assert time.monotonic() - started < 0.4
+        assert client.peak == 4
+
+    @pytest.mark.asyncio
+    async def test_repeated_scans_are_incremental(self, cache):
+        client = FakeIdentity()
+        first = await scan_credentials(client, TENANCY, max_age_days=90)
+        assert first["listed_users"] == 5
+        assert first["errors"] == [{
+            "user_id": "ocid1.user.oc1..aaaau4", "kind": "customer_secret_keys",
+            "error": "NotAuthorizedOrNotFound",
+        }]
+        calls = len(client.calls)
+
+        second = await scan_credentials(client, TENANCY, max_age_days=250)
+        # Only the failed listing is retried
+        assert client.calls[calls:] == [("list_customer_secret_keys", "ocid1.user.oc1..aaaau4")]
+        assert (second["listed_users"], second["cached_users"]) == (1, 4)
+        assert len(second["violations"]) == 4
+
+        await cache.invalidate_tag("user:ocid1.user.oc1..aaaau1")
+        third = await scan_credentials(client, TENANCY, max_age_days=250)
+        assert third["listed_users"] == 2
+
+
+class TestScanCredentialsTool:
+    """Tests for the registered tool."""
+
+    @pytest.mark.asyncio
+    async def test_report(self, monkeypatch, cache):
+        client = FakeIdentity()
+        monkeypatch.setattr(tools, "oci_client_manager",
+                            SimpleNamespace(identity=client, tenancy_id=TENANCY))
+        mcp = FastMCP("security-test")
+        tools.register_security_tools(mcp)
+        scan = (await mcp.get_tool("oci_security_scan_credentials")).fn
+        progress = []
+
+        async def report_progress(value, message=None):
+            progress.append(value)
+
+        ctx = SimpleNamespace(report_progress=report_progress)
+        data = json.loads(await scan(ScanCredentialsInput(
+            credential_types=["api_keys"], limit=2, response_format="json",
+        ), ctx))
+        assert data["total_violations"] == 4
+        assert len(data["violations"]) == 2
+        assert list(data["credentials"]) == ["api_keys"]
+        assert progress == sorted(progress)
+
+        md = await scan(ScanCredentialsInput(max_age_days=350), ctx)
+        assert "## Violations (2)" in md
+        assert "| Api Keys | 15 | 10 | 1 |" in md
+        assert "Could not list customer_secret_keys" in md
@@ -0,0 +1,244 @@
+"""
+Tests for the identity graph cache.
+"""
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastmcp import FastMCP
+
+from mcp_server_oci.core.cache import TTLCache
+from mcp_server_oci.tools.security import identity, tools
+from mcp_server_oci.tools.security.identity import IdentityGraph, get_identity_graph
+from mcp_server_oci.tools.security.models import GetUserInput, ListGroupsInput, ListUsersInput
+
+TENANCY = "ocid1.tenancy.oc1..root"
+EPOCH = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _user(i, state="ACTIVE"):
+    return SimpleNamespace(
+        id=f"ocid1.user.oc1..aaaau{i}", name=f"user{i:02d}", email=f"user{i}@example.com",
+        lifecycle_state=state, time_created=EPOCH + timedelta(days=i), description=None,
+        compartment_id=TENANCY,
+    )
+
+
+def _group(i):
+    return SimpleNamespace(
+        id=f"ocid1.group.oc1..g{i}", name=f"group{i}", description=f"Group {i}",
+        lifecycle_state="ACTIVE", time_created=EPOCH + timedelta(days=i),
+        compartment_id=TENANCY,
+    )
+
+
+def _membership(user, group, state="ACTIVE"):
+    return SimpleNamespace(
+        id=f"ocid1.groupmembership.oc1..{user}-{group}",
+        user_id=f"ocid1.user.oc1..aaaau{user}", group_id=f"ocid1.group.oc1..g{group}", lifecycle_state=state,
+    )
+
+
+class FakeIdentity:
+    """Identity client serving pages of 5, honoring sort and lifecycle filters."""
+
+    def __init__(self, users=20, groups=4):
+        self.calls = []
+        self.users = [_user(i) for i in range(users)]
+        self.groups = [_group(i) for i in range(groups)]
+        self.memberships = [_membership(i, i % groups) for i in range(users)]
+
+    def _page(self, name, items, page, sort_order=None, **kwargs):
+        self.calls.append(name)
+        if sort_order == "DESC":
+            items = sorted(items, key=lambda x: x.time_created, reverse=True)
+        i = int(page or 0)
+        return SimpleNamespace(
+            data=items[i * 5:(i + 1) * 5], has_next_page=(i + 1) * 5 < len(items),
+            next_page=str(i + 1), status=200, headers={}, request=None,
+        )
+
+    def list_users(self, compartment_id, page=None, lifecycle_state=None, **kwargs):
+        users = [u for u in self.users if lifecycle_state in (None, u.lifecycle_state)]
+        return self._page("list_users", users, page, **kwargs)
+
+    def list_groups(self, compartment_id, page=None, **kwargs):
+        return self._page("list_groups", self.groups, page, **kwargs)
+
+    def list_user_group_memberships(self, compartment_id, page=None, user_id=None,
+                                    group_id=None, **kwargs):
+        # Like the service, memberships are listed per user or per group only
+        if user_id is None and group_id is None:
+            raise ValueError("Must set one of user_id or group_id")
+        memberships = [m for m in self.memberships
+                       if user_id in (None, m.user_id) and group_id in (None, m.group_id)]
+        return self._page("list_user_group_memberships", memberships, page, **kwargs)
+
+    def get_user(self, user_id):
+        self.calls.append("get_user")
+        for user in self.users:
+            if user.id == user_id:
+                return SimpleNamespace(data=user)
+        raise RuntimeError("NotAuthorizedOrNotFound")
+
+    def get_group(self, group_id):
+        self.calls.append("get_group")
+        raise AssertionError("groups are resolved from the graph")
+
+    def list_api_keys(self, user_id):
+        self.calls.append("list_api_keys")
+        return SimpleNamespace(data=[SimpleNamespace(
+            key_id=f"{user_id}/key", fingerprint="aa:bb:cc:dd:ee:ff:00:11:22:33:44",
+            lifecycle_state="ACTIVE", time_created=EPOCH,
+        )])
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Isolate the identity caches per test."""
+    cache = TTLCache(max_size=100, default_ttl=300)
+    monkeypatch.setattr(identity, "get_cache", lambda tier: cache)
+    identity._built.clear()
+    return cache
+
+
+class TestIdentityGraph:
+    """Tests for building and syncing the graph."""
+
+    @pytest.mark.asyncio
+    async def test_built_from_listings_and_group_memberships(self, cache):
+        client = FakeIdentity()
+        graph, info = await get_identity_graph(client, TENANCY)
+        assert not info["cached"]
+        assert sorted(set(client.calls)) == [
+            "list_groups", "list_user_group_memberships", "list_users",
+        ]
+        # One membership listing per group (5 members each, one page)
+        assert client.calls.count("list_user_group_memberships") == 4
+        assert len(graph.users) == 20 and len(graph.groups) == 4
+        assert [g["name"] for g in graph.groups_of("ocid1.user.oc1..aaaau5")] == ["group1"]
+        assert len(graph.members_of("ocid1.group.oc1..g0")) == 5
+
+        calls = len(client.calls)
+        again, info = await get_identity_graph(client, TENANCY)
+        assert again is graph and info["cached"]
+        assert len(client.calls) == calls
+
+    @pytest.mark.asyncio
+    async def test_delta_sync(self, cache):
+        client = FakeIdentity()
+        graph, _ = await get_identity_graph(client, TENANCY)
+        client.calls.clear()
+
+        client.users.append(_user(30))
+        client.groups.append(_group(9))
+        client.users[3] = _user(3, state="INACTIVE")
+        client.memberships = [
+            *client.memberships[1:], _membership(30, 9), _membership(4, 9, "DELETED"),
+        ]
+        graph, info = await get_identity_graph(client, TENANCY, max_age=0)
+        assert info["delta"] == {"new_users": 1, "new_groups": 1, "lifecycle_changes": 0}
+        # Newest-first listings stop at the first known page
+        assert client.calls.count("list_users") == 2
+        assert client.calls.count("list_groups") == 1
+        assert graph.user("ocid1.user.oc1..aaaau30")["name"] == "user30"
+        assert graph.user("ocid1.user.oc1..aaaau3")["lifecycle_state"] == "INACTIVE"
+        assert graph.groups_of("ocid1.user.oc1..aaaau0") == []
+        assert [g["name"] for g in graph.groups_of("ocid1.user.oc1..aaaau30")] == ["group9"]
+        assert [g["name"] for g in graph.groups_of("ocid1.user.oc1..aaaau4")] == ["group0"]
+
+        # Unblocked and deleted users are re-read
+        client.users[3] = _user(3)
+        client.users = [u for u in client.users if u.id != "ocid1.user.oc1..aaaau30"]
+        client.users.append(_user(31, state="INACTIVE"))
+        graph, info = await get_identity_graph(client, TENANCY, max_age=0)
+        assert graph.user("ocid1.user.oc1..aaaau3")["lifecycle_state"] == "ACTIVE"
+        client.users = [u for u in client.users if u.id != "ocid1.user.oc1..aaaau31"]
+        graph, info = await get_identity_graph(client, TENANCY, max_age=0)
+        assert info["delta"]["lifecycle_changes"] == 1
+        assert graph.user("ocid1.user.oc1..aaaau31") is None
+
+    @pytest.mark.asyncio
+    async def test_payload_round_trip_and_tag(self, cache):
+        graph, _ = await get_identity_graph(FakeIdentity(), TENANCY)
+        restored = IdentityGraph.from_payload(json.loads(json.dumps(graph.to_payload())))
+        assert restored.find_users(name_contains="user1") == graph.find_users(
+            name_contains="user1"
+        )
+        user_id = "ocid1.user.oc1..aaaau7"
+        assert restored.groups_of(user_id) == graph.groups_of(user_id)
+        assert await cache.invalidate_tag("iam:identity") == 1
+
+
+async def _tools(monkeypatch, client):
+    monkeypatch.setattr(tools, "oci_client_manager",
+                        SimpleNamespace(identity=client, tenancy_id=TENANCY))
+    mcp = FastMCP("security-test")
+    tools.register_security_tools(mcp)
+
+    async def report_progress(value, message=None):
+        pass
+
+    ctx = SimpleNamespace(report_progress=report_progress)
+    return {
+        name: (lambda fn: lambda params: fn(params, ctx))(
+            (await mcp.get_tool(f"oci_security_{name}")).fn
+        )
+        for name in ("list_users", "get_user", "list_groups")
+    }
+
+
+class TestIdentityTools:
+    """Tests for the tools served from the graph."""
+
+    @pytest.mark.asyncio
+    async def test_get_user_without_per_group_calls(self, monkeypatch, cache):
+        client = FakeIdentity()
+        run = await _tools(monkeypatch, client)
+        data = json.loads(await run["get_user"](GetUserInput(
+            user_id="ocid1.user.oc1..aaaau6", include_api_keys=True, response_format="json",
+        )))
+        assert data["user"]["name"] == "user06"
+        assert data["groups"] == [{"id": "ocid1.group.oc1..g2", "name": "group2"}]
+        assert data["api_keys"][0]["key_id"] == "ocid1.user.oc1..aaaau6/key"
+        calls = len(client.calls)
+
+        md = await run["get_user"](GetUserInput(user_id="ocid1.user.oc1..aaaau6",
+                                                include_api_keys=True))
+        assert "group2" in md
+        assert len(client.calls) == calls
+
+    @pytest.mark.asyncio
+    async def test_new_user_triggers_a_sync(self, monkeypatch, cache):
+        client = FakeIdentity()
+        run = await _tools(monkeypatch, client)
+        await run["list_users"](ListUsersInput())
+        client.users.append(_user(40))
+        client.memberships.append(_membership(40, 1))
+        data = json.loads(await run["get_user"](GetUserInput(
+            user_id="ocid1.user.oc1..aaaau40", response_format="json",
+        )))
+        assert data["groups"] == [{"id": "ocid1.group.oc1..g1", "name": "group1"}]
+        assert "get_user" not in client.calls
+
+    @pytest.mark.asyncio
+    async def test_list_filters(self, monkeypatch, cache):
+        client = FakeIdentity()
+        client.users[2] = _user(2, state="INACTIVE")
+        run = await _tools(monkeypatch, client)
+        data = json.loads(await run["list_users"](ListUsersInput(
+            lifecycle_state="ACTIVE", name_contains="USER1", limit=3, response_format="json",
+        )))
+        assert data["total"] == 10
+        assert [u["name"] for u in data["users"]] == ["user10", "user11", "user12"]
+
+        data = json.loads(await run["list_users"](ListUsersInput(
+            lifecycle_state="INACTIVE", response_format="json",
+        )))
+        assert [u["name"] for u in data["users"]] == ["user02"]
+
+        md = await run["list_groups"](ListGroupsInput(name_contains="group3"))
+        assert "**Total Groups:** 1" in md
@@ -0,0 +1,229 @@
+"""
+Tests for the IAM policy parser and permission index.
+"""
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastmcp import FastMCP
+
+from mcp_server_oci.core.cache import TTLCache
+from mcp_server_oci.core.compartments import CompartmentTree
+from mcp_server_oci.tools.security import policies, tools
+from mcp_server_oci.tools.security.models import ListPoliciesInput, WhatCanInput, WhoCanInput
+from mcp_server_oci.tools.security.policies import PolicyIndex, parse_statement
+
+TENANCY = "ocid1.tenancy.oc1..root"
+PROD = "ocid1.compartment.oc1..prod"
+APPS = "ocid1.compartment.oc1..apps"
+DEV = "ocid1.compartment.oc1..dev"
+
+TREE = CompartmentTree(TENANCY, [
+    (PROD, "prod", TENANCY), (APPS, "apps", PROD), (DEV, "dev", TENANCY),
+])
+
+POLICIES = [
+    {"id": "ocid1.policy.oc1..admins", "name": "admins", "compartment_id": TENANCY,
+     "statements": [
+         "Allow group Administrators to manage all-resources in tenancy",
+         "Define tenancy Partner as ocid1.tenancy.oc1..partner",
+     ]},
+    {"id": "ocid1.policy.oc1..ops", "name": "ops", "compartment_id": TENANCY,
+     "statements": [
+         "Allow group 'Default'/'Ops', NetAdmins to use instance-family in compartment prod",
+         "allow group NetAdmins to manage virtual-network-family in compartment prod:apps",
+         "Allow dynamic-group ci-runners to manage instances in compartment id " + DEV
+         + " where request.permission != 'INSTANCE_DELETE'",
+         "Allow any-user to inspect compartments in tenancy",
+         "Allow group Auditors to {INSTANCE_READ, VCN_READ} in tenancy",
+         "Allow group Ops to do everything",
+     ]},
+    {"id": "ocid1.policy.oc1..apps", "name": "apps-local", "compartment_id": PROD,
+     "statements": ["Allow group AppDevs to manage instances in compartment apps"]},
+]
+
+
+class TestParser:
+    """Tests for statement parsing."""
+
+    def test_verb_resource_location_and_condition(self):
+        statement = parse_statement(POLICIES[1]["statements"][2])
+        assert statement.subjects == (("dynamic-group", "ci-runners"),)
+        assert (statement.verb, statement.resource) == ("manage", "instances")
+        assert statement.location == ("compartment_id", DEV)
+        assert statement.condition == "request.permission != 'INSTANCE_DELETE'"
+
+    def test_subject_lists_and_domains(self):
+        statement = parse_statement(POLICIES[1]["statements"][0])
+        assert statement.subjects == (("group", "ops"), ("group", "netadmins"))
+        assert parse_statement("Allow any-user to read buckets in tenancy").subjects == (
+            ("any-user", ""),
+        )
+
+    def test_permission_lists_and_other_statements(self):
+        statement = parse_statement(POLICIES[1]["statements"][4])
+        assert statement.verb is None
+        assert statement.permissions == ("INSTANCE_READ", "VCN_READ")
+        assert parse_statement(POLICIES[0]["statements"][1]) is None
+        with pytest.raises(ValueError, match="not an 'Allow"):
+            parse_statement(POLICIES[1]["statements"][5])
+
+
+class TestPolicyIndex:
+    """Tests for who-can and what-can queries."""
+
+    def test_who_can_through_families_verbs_and_ancestors(self):
+        index = PolicyIndex.build(POLICIES, TREE)
+        grants = index.who_can("use", "instances", "prod/apps")
+        assert {g["subject"] for g in grants} == {
+            "group:administrators", "group:ops", "group:netadmins", "group:appdevs",
+        }
+        # 'use' does not cover 'manage'; prod/apps grants do not reach prod
+        assert {g["subject"] for g in index.who_can("manage", "instances", "prod")} == {
+            "group:administrators",
+        }
+        assert {g["subject"] for g in index.who_can("manage", "subnets", "prod/apps")} == {
+            "group:administrators", "group:netadmins",
+        }
+
+    def test_compartment_id_locations_and_conditions(self):
+        index = PolicyIndex.build(POLICIES, TREE)
+        grants = index.who_can("manage", "instances", "dev")
+        assert [g["subject"] for g in grants] == [
+            "group:administrators", "dynamic-group:ci-runners",
+        ]
+        assert grants[1]["condition"].startswith("request.permission")
+        assert len(index.who_can("manage", "instances", "dev", include_conditional=False)) == 1
+        # Anywhere in the tenancy
+        assert len(index.who_can("manage", "instances")) == 3
+
+    def test_what_can_includes_any_user(self):
+        index = PolicyIndex.build(POLICIES, TREE)
+        grants = index.what_can("NetAdmins")
+        assert [(g["verb"], g["resource"], g["path"]) for g in grants] == [
+            ("use", "instance-family", "prod"),
+            ("manage", "virtual-network-family", "prod/apps"),
+            ("inspect", "compartments", ""),
+        ]
+        assert grants[-1]["via"] == "any-user"
+        # A bare name falls back to a dynamic group
+        assert index.what_can("ci-runners")[0]["subject"] == "dynamic-group:ci-runners"
+
+    def test_errors_broad_grants_and_round_trip(self):
+        index = PolicyIndex.build(POLICIES, TREE)
+        assert [e["text"] for e in index.errors] == ["Allow group Ops to do everything"]
+        assert [g["policy_name"] for g in index.broad_grants()] == ["admins"]
+        restored = PolicyIndex.from_payload(json.loads(json.dumps(index.to_payload())))
+        assert restored.who_can("read", "vcns", "prod/apps") == index.who_can(
+            "read", "vcns", "prod/apps"
+        )
+
+    def test_unresolved_locations_match_only_unscoped_queries(self):
+        index = PolicyIndex.build(POLICIES)
+        assert index.who_can("manage", "instances", "prod/apps")[0]["subject"] == (
+            "group:administrators"
+        )
+        assert len(index.who_can("manage", "instances", "prod/apps")) == 1
+        assert len(index.who_can("manage", "instances")) == 3
+
+
+class FakeIdentity:
+    """Identity client listing compartments and per-compartment policies."""
+
+    def __init__(self):
+        self.calls = []
+
+    def _page(self, items):
+        return SimpleNamespace(
+            data=items, has_next_page=False, next_page=None, status=200, headers={},
+            request=None,
+        )
+
+    def list_compartments(self, compartment_id, **kwargs):
+        self.calls.append("list_compartments")
+        return self._page([
+            SimpleNamespace(id=c, name=name, compartment_id=parent)
+            for c, name, parent in [(PROD, "prod", TENANCY), (APPS, "apps", PROD),
+                                    (DEV, "dev", TENANCY)]
+        ])
+
+    def list_policies(self, compartment_id, **kwargs):
+        self.calls.append(("list_policies", compartment_id))
+        return self._page([
+            SimpleNamespace(**p) for p in POLICIES if p["compartment_id"] == compartment_id
+        ])
+
+
+class TestPolicyTools:
+    """Tests for the cached query tools."""
+
+    @pytest.mark.asyncio
+    async def test_index_is_built_once(self, monkeypatch):
+        cache = TTLCache(max_size=100, default_ttl=300)
+        monkeypatch.setattr(policies, "get_cache", lambda tier: cache)
+        monkeypatch.setattr("mcp_server_oci.core.compartments.get_cache", lambda tier: cache)
+        policies._built.clear()
+        identity = FakeIdentity()
+        monkeypatch.setattr(tools, "oci_client_manager",
+                            SimpleNamespace(identity=identity, tenancy_id=TENANCY))
+        mcp = FastMCP("security-test")
+        tools.register_security_tools(mcp)
+        who_can = (await mcp.get_tool("oci_security_who_can")).fn
+        what_can = (await mcp.get_tool("oci_security_what_can")).fn
+
+        async def report_progress(value, message=None):
+            pass
+
+        ctx = SimpleNamespace(report_progress=report_progress)
+        data = json.loads(await who_can(WhoCanInput(
+            verb="manage", resource_type="instances", compartment=APPS, response_format="json",
+        ), ctx))
+        assert data["subjects"] == ["group:administrators", "group:appdevs"]
+        assert data["query"]["compartment"] == "prod/apps"
+        assert data["index"]["cached"] is False
+        # One policy listing per compartment
+        assert len([c for c in identity.calls if c[0] == "list_policies"]) == 4
+        calls = len(identity.calls)
+
+        md = await what_can(WhatCanInput(subject="group Administrators"), ctx)
+        assert "manage all-resources" in md
+        assert "(cached)" in md
+        assert len(identity.calls) == calls
+
+        assert await cache.invalidate_tag("iam:policies") == 1
+        md = await who_can(WhoCanInput(verb="read", resource_type="buckets",
+                                       compartment="nowhere"), ctx)
+        assert "Compartment not found: nowhere" in md
+
+    @pytest.mark.asyncio
+    async def test_list_policies_in_subtree(self, monkeypatch):
+        cache = TTLCache(max_size=100, default_ttl=300)
+        monkeypatch.setattr("mcp_server_oci.core.compartments.get_cache", lambda tier: cache)
+        identity = FakeIdentity()
+        monkeypatch.setattr(identity, "list_policies", lambda compartment_id, **kwargs: (
+            identity._page([
+                SimpleNamespace(description=None, time_created=None, **p)
+                for p in POLICIES if p["compartment_id"] == compartment_id
+            ])
+        ))
+        monkeypatch.setattr(tools, "oci_client_manager",
+                            SimpleNamespace(identity=identity, tenancy_id=TENANCY))
+        mcp = FastMCP("security-test")
+        tools.register_security_tools(mcp)
+        list_policies = (await mcp.get_tool("oci_security_list_policies")).fn
+
+        async def report_progress(value, message=None):
+            pass
+
+        ctx = SimpleNamespace(report_progress=report_progress)
+        own = json.loads(await list_policies(ListPoliciesInput(response_format="json"), ctx))
+        assert [p["name"] for p in own["policies"]] == ["admins", "ops"]
+        assert identity.calls == []
+
+        data = json.loads(await list_policies(ListPoliciesInput(
+            include_subcompartments=True, response_format="json",
+        ), ctx))
+        assert [p["name"] for p in data["policies"]] == ["admins", "ops", "apps-local"]
+        assert data["policies"][2]["compartment_id"] == PROD